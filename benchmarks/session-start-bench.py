@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+End-to-end SessionStart latency benchmark for role-context-manager.
+
+Runs the user-facing entry points (load-role-context in all three modes,
+show-role-context, the scripted validate-setup checks and set-role) as fresh
+processes against a synthetic organization, and reports p50/p95/p99 latency
+plus process-spawn counts as JSON. Two result files can be compared with the
+`compare` subcommand to spot regressions between commits.
+
+Usage:
+    python3 benchmarks/session-start-bench.py run [--org DIR] [--iterations N] [-o results.json]
+    python3 benchmarks/session-start-bench.py compare base.json head.json [--threshold 10]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_ROOT = os.path.dirname(BENCH_DIR)
+SCRIPTS_DIR = os.path.join(PLUGIN_ROOT, 'scripts')
+
+sys.path.insert(0, BENCH_DIR)
+import synthetic_org  # noqa: E402
+
+RESULT_SCHEMA = 1
+
+# Scripted part of /validate-setup: the checks the framework-validator and the
+# SessionStart hook run before any agent is involved
+VALIDATE_SETUP_SNIPPET = r'''
+source "$RCM_SCRIPTS/role-manager.sh"
+claude_dir="$(find_claude_dir)" || exit 0
+check_setup_complete "$claude_dir" || true
+get_missing_setup_items "$claude_dir" >/dev/null || true
+check_template_updates "$claude_dir" >/dev/null || true
+validate_hierarchy "$PWD" 2>/dev/null || true
+'''
+
+
+def workload_commands(role):
+    """Return {name: argv} for every benchmarked entry point."""
+    role_manager = os.path.join(SCRIPTS_DIR, 'role-manager.sh')
+    return {
+        'load-role-context-quiet': ['bash', role_manager, 'load-role-context', '--quiet'],
+        'load-role-context-normal': ['bash', role_manager, 'load-role-context'],
+        'load-role-context-verbose': ['bash', role_manager, 'load-role-context', '--verbose'],
+        'show-role-context': ['bash', role_manager, 'show-role-context'],
+        # $0 must point into scripts/ (template-manager.sh sources relative to it)
+        # but must not equal role-manager.sh, or sourcing it would run main
+        'validate-setup': ['bash', '-c', VALIDATE_SETUP_SNIPPET,
+                           os.path.join(SCRIPTS_DIR, 'validate-setup')],
+        'set-role': ['bash', role_manager, 'set-role', role],
+    }
+
+
+def read_fork_counter():
+    """Return the kernel's total fork count, or None where /proc is unavailable."""
+    try:
+        with open('/proc/stat', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('processes '):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def bench_env(org):
+    """Environment for benchmark runs: isolated HOME and no path overrides."""
+    env = {key: value for key, value in os.environ.items() if not key.startswith('RCM_')}
+    env['HOME'] = org['home']
+    env['RCM_SCRIPTS'] = SCRIPTS_DIR
+    return env
+
+
+def run_once(argv, cwd, env):
+    """Run a command once and return (seconds, forks, exit code, stdout bytes)."""
+    forks_before = read_fork_counter()
+    start = time.perf_counter()
+    proc = subprocess.run(argv, cwd=cwd, env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, check=False)
+    elapsed = time.perf_counter() - start
+    forks_after = read_fork_counter()
+    forks = None
+    if forks_before is not None and forks_after is not None:
+        forks = forks_after - forks_before
+    return elapsed, forks, proc.returncode, len(proc.stdout)
+
+
+def traced_execs(argv, cwd, env):
+    """Run once under RCM_TRACE and count external commands and function calls."""
+    with tempfile.NamedTemporaryFile(prefix='rcm-bench-trace-', suffix='.jsonl', delete=False) as f:
+        trace_file = f.name
+    try:
+        traced_env = dict(env)
+        traced_env['RCM_TRACE'] = trace_file
+        subprocess.run(argv, cwd=cwd, env=traced_env, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        commands = Counter()
+        calls = 0
+        with open(trace_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if event.get('ev') == 'exec':
+                    commands[event.get('cmd', '?')] += 1
+                elif event.get('ev') == 'enter':
+                    calls += 1
+        return {'total': sum(commands.values()), 'by_command': dict(commands.most_common()),
+                'function_calls': calls}
+    finally:
+        os.unlink(trace_file)
+
+
+def bench_workload(name, argv, org, iterations, warmup, trace):
+    """Benchmark a single workload and return its result record."""
+    env = bench_env(org)
+    cwd = org['workspace']
+
+    for _ in range(warmup):
+        run_once(argv, cwd, env)
+
+    timings = []
+    fork_counts = []
+    exit_codes = Counter()
+    output_bytes = 0
+    for _ in range(iterations):
+        elapsed, forks, code, size = run_once(argv, cwd, env)
+        timings.append(elapsed * 1000.0)
+        if forks is not None:
+            fork_counts.append(forks)
+        exit_codes[code] += 1
+        output_bytes = size
+
+    timings.sort()
+    fork_counts.sort()
+    result = {
+        'iterations': iterations,
+        'latency_ms': {
+            'min': round(timings[0], 3),
+            'p50': round(percentile(timings, 50), 3),
+            'p95': round(percentile(timings, 95), 3),
+            'p99': round(percentile(timings, 99), 3),
+            'max': round(timings[-1], 3),
+            'mean': round(sum(timings) / len(timings), 3),
+        },
+        # Kernel fork counter deltas include unrelated system activity; the
+        # minimum is the closest estimate of what the command itself spawned
+        'processes_spawned': {
+            'min': fork_counts[0] if fork_counts else None,
+            'p50': percentile(fork_counts, 50) if fork_counts else None,
+        },
+        'exit_codes': {str(code): count for code, count in sorted(exit_codes.items())},
+        'output_bytes': output_bytes,
+    }
+    if trace:
+        result['traced_execs'] = traced_execs(argv, cwd, env)
+    print(f"  {name:<28} p50 {result['latency_ms']['p50']:>9.1f} ms   "
+          f"p95 {result['latency_ms']['p95']:>9.1f} ms   "
+          f"spawns {result['processes_spawned']['min']}", file=sys.stderr)
+    return result
+
+
+def git_revision():
+    """Return (commit, dirty) for the plugin checkout, or (None, None)."""
+    if not shutil.which('git'):
+        return None, None
+    try:
+        commit = subprocess.run(['git', '-C', PLUGIN_ROOT, 'rev-parse', 'HEAD'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', '-C', PLUGIN_ROOT, 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (subprocess.CalledProcessError, OSError):
+        return None, None
+
+
+def cmd_run(args):
+    """Generate (or reuse) an organization and benchmark every workload."""
+    cleanup_dir = None
+    if args.org:
+        org = synthetic_org.load_org(args.org)
+    else:
+        cleanup_dir = tempfile.mkdtemp(prefix='rcm-bench-org-')
+        print(f"Generating synthetic organization in {cleanup_dir}...", file=sys.stderr)
+        org = synthetic_org.generate_org(cleanup_dir, **synthetic_org.generator_options(args))
+
+    commands = workload_commands(org['role'])
+    selected = args.workloads.split(',') if args.workloads else list(commands)
+    unknown = [name for name in selected if name not in commands]
+    if unknown:
+        print(f"Error: Unknown workload(s): {', '.join(unknown)}", file=sys.stderr)
+        print(f"Available: {', '.join(commands)}", file=sys.stderr)
+        return 1
+
+    commit, dirty = git_revision()
+    results = {
+        'schema': RESULT_SCHEMA,
+        'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'commit': commit,
+        'dirty': dirty,
+        'label': args.label,
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'bash': subprocess.run(['bash', '-c', 'echo $BASH_VERSION'],
+                                   capture_output=True, text=True).stdout.strip(),
+            'jq': bool(shutil.which('jq')),
+        },
+        'org': {key: org[key] for key in ('config', 'projects', 'role_guides', 'documents',
+                                          'references', 'stats')},
+        'workloads': {},
+    }
+
+    print(f"Benchmarking {len(selected)} workloads ({args.iterations} iterations, "
+          f"{args.warmup} warmup)...", file=sys.stderr)
+    try:
+        for name in selected:
+            results['workloads'][name] = bench_workload(
+                name, commands[name], org, args.iterations, args.warmup, not args.no_trace)
+    finally:
+        if cleanup_dir and not args.keep_org:
+            shutil.rmtree(cleanup_dir, ignore_errors=True)
+        elif cleanup_dir:
+            print(f"Kept synthetic organization at {cleanup_dir}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✓ Results written to {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(output)
+    return 0
+
+
+def pct_change(base, head):
+    """Relative change in percent, or None when undefined."""
+    if base in (None, 0) or head is None:
+        return None
+    return (head - base) / base * 100.0
+
+
+def cmd_compare(args):
+    """Compare two result files and flag latency regressions."""
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.head, 'r', encoding='utf-8') as f:
+        head = json.load(f)
+
+    print(f"base: {base.get('label') or (base.get('commit') or '?')[:12]}   "
+          f"head: {head.get('label') or (head.get('commit') or '?')[:12]}")
+    if base.get('org', {}).get('config') != head.get('org', {}).get('config'):
+        print("Warning: results were produced with different synthetic org parameters")
+    print()
+    print(f"{'WORKLOAD':<28} {'METRIC':<8} {'BASE':>10} {'HEAD':>10} {'CHANGE':>9}")
+    print('-' * 69)
+
+    regressions = []
+    for name in sorted(set(base['workloads']) & set(head['workloads'])):
+        b = base['workloads'][name]
+        h = head['workloads'][name]
+        rows = [(metric, b['latency_ms'][metric], h['latency_ms'][metric], 'ms')
+                for metric in ('p50', 'p95', 'p99')]
+        rows.append(('spawns', b['processes_spawned']['min'], h['processes_spawned']['min'], ''))
+        for metric, bv, hv, unit in rows:
+            change = pct_change(bv, hv)
+            change_text = f"{change:+.1f}%" if change is not None else 'n/a'
+            print(f"{name:<28} {metric:<8} {str(bv) + unit:>10} {str(hv) + unit:>10} {change_text:>9}")
+            if metric == 'p50' and change is not None and change > args.threshold:
+                regressions.append((name, change))
+            name = ''
+
+    print()
+    if regressions:
+        for name, change in regressions:
+            print(f"✗ {name}: p50 regressed {change:+.1f}% (threshold {args.threshold:.0f}%)")
+        return 1
+    print(f"✓ No p50 regressions above {args.threshold:.0f}%")
+    return 0
+
+
+def main(argv=None):
+    """Parse arguments and dispatch to run/compare."""
+    parser = argparse.ArgumentParser(description='End-to-end SessionStart latency benchmark.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run the benchmark suite')
+    run.add_argument('--org', help='Existing synthetic org (from synthetic_org.py); generated if omitted')
+    run.add_argument('--iterations', type=int, default=20, help='Timed runs per workload (default: 20)')
+    run.add_argument('--warmup', type=int, default=2, help='Untimed warmup runs (default: 2)')
+    run.add_argument('--workloads', help='Comma-separated subset of workloads to run')
+    run.add_argument('--no-trace', action='store_true', help='Skip the RCM_TRACE exec-count run')
+    run.add_argument('--label', help='Free-form label stored in the results (e.g. branch name)')
+    run.add_argument('--keep-org', action='store_true', help='Keep the generated org directory')
+    run.add_argument('-o', '--output', help='Write JSON results here instead of stdout')
+    synthetic_org.add_generator_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser('compare', help='Compare two result files')
+    compare.add_argument('base', help='Baseline results JSON')
+    compare.add_argument('head', help='Candidate results JSON')
+    compare.add_argument('--threshold', type=float, default=10.0,
+                         help='Fail when p50 latency grows by more than this percent (default: 10)')
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run' and args.iterations < 1:
+        parser.error('--iterations must be at least 1')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic organization tree for end-to-end benchmarks.
+
+The generated tree mimics a large hierarchical setup: company → system →
+product → project levels (extra depth becomes plain grouping directories),
+thousands of source directories, hundreds of role guides and thousands of
+referenced documents. Custom directory names are written to paths.json so the
+path-config lookups are exercised as well.
+
+A description of the generated tree, including the benchmark workspace and
+role, is written to <root>/synthetic-org.json.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+LEVELS = ['company', 'system', 'product', 'project']
+BENCH_ROLE = 'bench-engineer'
+MANIFEST_NAME = 'synthetic-org.json'
+
+DEFAULTS = {
+    'depth': 4,
+    'fanout': 3,
+    'dirs_per_project': 60,
+    'role_guides': 200,
+    'documents': 2000,
+    'refs_per_guide': 40,
+    'doc_size': 4096,
+    'claude_dir_name': '.claude',
+    'role_guides_dir': 'role-guides',
+    'seed': 1,
+}
+
+
+def level_for_depth(index, depth):
+    """Map a tree depth to an organizational level, or None for grouping dirs."""
+    if index == depth - 1:
+        return 'project'
+    if index < len(LEVELS) - 1:
+        return LEVELS[index]
+    return None
+
+
+def filler_text(rng, size, title):
+    """Build markdown of roughly <size> bytes."""
+    words = ['standard', 'review', 'deploy', 'service', 'quality', 'latency', 'owner',
+             'roadmap', 'incident', 'contract', 'schema', 'release', 'metric', 'policy']
+    lines = [f'# {title}', '']
+    total = len(lines[0]) + 1
+    section = 0
+    while total < size:
+        if section % 8 == 0:
+            heading = f'## Section {section // 8 + 1}'
+            lines.extend([heading, ''])
+            total += len(heading) + 2
+        line = ' '.join(rng.choice(words) for _ in range(14)).capitalize() + '.'
+        lines.append(line)
+        total += len(line) + 1
+        section += 1
+    return '\n'.join(lines) + '\n'
+
+
+def role_guide_text(role, level, references):
+    """Build a role guide with a Document References section."""
+    lines = [f'# {role} Guide', '', f'**Organizational Level:** {level}', '',
+             '## Role Overview', '', f'Synthetic guide for {role}.', '',
+             '## Document References', '']
+    for index, ref in enumerate(references):
+        # Mix the three reference syntaxes understood by extract_document_references
+        if ref.startswith('/'):
+            lines.append(f'- {ref}')
+        elif index % 2:
+            lines.append(f'- `{ref}`')
+        else:
+            lines.append(f'- {ref}')
+    lines.extend(['', '## Deterministic Behaviors', '', '- Follow the standards above.', ''])
+    return '\n'.join(lines)
+
+
+def write_file(path, content):
+    """Write a text file, creating parent directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return len(content.encode('utf-8'))
+
+
+def generate_org(root, **options):
+    """Generate the synthetic organization under <root> and return its description."""
+    cfg = dict(DEFAULTS)
+    cfg.update({k: v for k, v in options.items() if v is not None})
+    rng = random.Random(cfg['seed'])
+    claude_dir_name = cfg['claude_dir_name']
+    role_guides_dir = cfg['role_guides_dir']
+    depth = max(1, cfg['depth'])
+
+    root = os.path.abspath(root)
+    os.makedirs(root, exist_ok=True)
+    stats = {'directories': 0, 'files': 0, 'bytes': 0, 'claude_dirs': 0}
+
+    def add_file(path, content):
+        stats['files'] += 1
+        stats['bytes'] += write_file(path, content)
+
+    # paths.json is always looked up in .claude/, whatever the configured name
+    add_file(os.path.join(root, '.claude', 'paths.json'), json.dumps({
+        'claude_dir_name': claude_dir_name,
+        'role_guides_dir': role_guides_dir,
+        'version': '1.0.0',
+        'description': 'Synthetic benchmark configuration',
+    }, indent=2) + '\n')
+
+    # Build the directory tree level by level
+    nodes = [(root, 0, [])]
+    projects = []
+    while nodes:
+        path, index, hierarchy = nodes.pop()
+        level = level_for_depth(index, depth)
+        if level:
+            claude_dir = os.path.join(path, claude_dir_name)
+            os.makedirs(os.path.join(claude_dir, role_guides_dir), exist_ok=True)
+            stats['claude_dirs'] += 1
+            hierarchy = hierarchy + [level]
+            add_file(os.path.join(claude_dir, 'organizational-level.json'), json.dumps({
+                'level': level,
+                'level_name': os.path.basename(path),
+                'parent_level': hierarchy[-2] if len(hierarchy) > 1 else None,
+                'is_root': len(hierarchy) == 1,
+                'hierarchy_path': hierarchy,
+            }, indent=2) + '\n')
+        if index == depth - 1:
+            projects.append(path)
+            continue
+        for child in range(cfg['fanout']):
+            name = f'{LEVELS[min(index + 1, 3)]}-{index + 1}-{child}'
+            nodes.append((os.path.join(path, name), index + 1, hierarchy))
+
+    projects.sort()
+    workspace = projects[0]
+
+    # Source-tree noise in every project (including pruning candidates)
+    for project in projects:
+        for i in range(cfg['dirs_per_project']):
+            if i % 10 == 9:
+                sub = os.path.join(project, 'node_modules', f'pkg-{i}', 'lib')
+            else:
+                sub = os.path.join(project, 'src', f'module-{i // 10}', f'component-{i}')
+            os.makedirs(sub, exist_ok=True)
+
+    # Referenced documents live in the workspace: relative ones under docs/,
+    # absolute (/-prefixed, resolved against the project root) under standards/
+    documents = []
+    for i in range(cfg['documents']):
+        if i % 4 == 0:
+            ref = f'/standards/area-{i % 25}/standard-{i}.md'
+            path = os.path.join(workspace, ref.lstrip('/'))
+        else:
+            ref = f'docs/area-{i % 50}/doc-{i}.md'
+            path = os.path.join(workspace, ref)
+        size = max(64, int(rng.gauss(cfg['doc_size'], cfg['doc_size'] / 4)))
+        add_file(path, filler_text(rng, size, f'Document {i}'))
+        documents.append(ref)
+
+    # Role guides: the benchmark role plus <role_guides - 1> others
+    ws_claude = os.path.join(workspace, claude_dir_name)
+    ws_guides = os.path.join(ws_claude, role_guides_dir)
+    refs_per_guide = min(cfg['refs_per_guide'], len(documents))
+    bench_refs = documents[:refs_per_guide]
+    add_file(os.path.join(ws_guides, f'{BENCH_ROLE}-guide.md'),
+             role_guide_text(BENCH_ROLE, 'project', bench_refs + ['missing/never-created.md']))
+    for i in range(max(0, cfg['role_guides'] - 1)):
+        role = f'synthetic-role-{i}'
+        refs = rng.sample(documents, refs_per_guide) if documents else []
+        add_file(os.path.join(ws_guides, f'{role}-guide.md'),
+                 role_guide_text(role, LEVELS[i % 4], refs))
+
+    add_file(os.path.join(ws_claude, 'preferences.json'),
+             json.dumps({'user_role': BENCH_ROLE, 'auto_update_templates': True,
+                         'applied_template': None}, indent=2) + '\n')
+    add_file(os.path.join(ws_claude, 'role-references.json'), json.dumps({
+        BENCH_ROLE: {'default_documents': bench_refs, 'user_customizations': []},
+    }, indent=2) + '\n')
+
+    home = os.path.join(root, '.bench-home')
+    os.makedirs(os.path.join(home, claude_dir_name), exist_ok=True)
+
+    for _, dirnames, _ in os.walk(root):
+        stats['directories'] += len(dirnames)
+
+    description = {
+        'root': root,
+        'workspace': workspace,
+        'home': home,
+        'role': BENCH_ROLE,
+        'config': cfg,
+        'projects': len(projects),
+        'role_guides': cfg['role_guides'],
+        'documents': len(documents),
+        'references': len(bench_refs) + 1,
+        'stats': stats,
+    }
+    with open(os.path.join(root, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(description, f, indent=2)
+        f.write('\n')
+    return description
+
+
+def load_org(root):
+    """Read the description written by generate_org()."""
+    with open(os.path.join(root, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def add_generator_arguments(parser):
+    """Register generator options on an argparse parser."""
+    parser.add_argument('--depth', type=int, help=f"Hierarchy depth (default: {DEFAULTS['depth']})")
+    parser.add_argument('--fanout', type=int, help=f"Children per level (default: {DEFAULTS['fanout']})")
+    parser.add_argument('--dirs-per-project', type=int,
+                        help=f"Source directories per project (default: {DEFAULTS['dirs_per_project']})")
+    parser.add_argument('--role-guides', type=int,
+                        help=f"Role guides in the workspace (default: {DEFAULTS['role_guides']})")
+    parser.add_argument('--documents', type=int,
+                        help=f"Referenceable documents (default: {DEFAULTS['documents']})")
+    parser.add_argument('--refs-per-guide', type=int,
+                        help=f"Document references per guide (default: {DEFAULTS['refs_per_guide']})")
+    parser.add_argument('--doc-size', type=int,
+                        help=f"Mean document size in bytes (default: {DEFAULTS['doc_size']})")
+    parser.add_argument('--claude-dir-name', help=f"Config directory name (default: {DEFAULTS['claude_dir_name']})")
+    parser.add_argument('--role-guides-dir', help=f"Role guides directory name (default: {DEFAULTS['role_guides_dir']})")
+    parser.add_argument('--seed', type=int, help='Random seed (default: 1)')
+
+
+def generator_options(args):
+    """Extract generator keyword arguments from parsed arguments."""
+    return {key: getattr(args, key) for key in DEFAULTS}
+
+
+def main(argv=None):
+    """Generate an organization from the command line."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic organization tree.')
+    parser.add_argument('output_dir', help='Directory to generate into')
+    add_generator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    description = generate_org(args.output_dir, **generator_options(args))
+    stats = description['stats']
+    print(f"✓ Generated synthetic organization at {description['root']}")
+    print(f"  Workspace: {description['workspace']}")
+    print(f"  Directories: {stats['directories']}  Files: {stats['files']}  "
+          f"Size: {stats['bytes'] / (1024 * 1024):.1f} MB")
+    print(f"  Role guides: {description['role_guides']}  Documents: {description['documents']}  "
+          f"References loaded: {description['references']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
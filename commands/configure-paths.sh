@@ -96,9 +96,17 @@ OPTIONS:
         Example: --migrate .claude .myorg-rcm
         This will:
         - Rename all matching directories in the current tree
+        - Update every paths.json that refers to OLD
         - Create or update paths.json with the new name
         - Validate before executing
 
+    --jobs=N
+        Parallel directory walkers and renamers for --migrate
+        (default: CPU count)
+
+    --batch-size=N
+        Renames per verified batch for --migrate (default: 200)
+
 EXAMPLES:
     # Interactive mode (prompts for values)
     /configure-paths
@@ -129,10 +137,13 @@ MIGRATION:
 
     Migration steps:
     1. Validates the old and new directory names
-    2. Searches for directories matching the old name
-    3. Shows a preview of changes
+    2. Searches for directories matching the old name in one parallel walk
+       that skips .git, node_modules, virtualenvs and .backups
+    3. Shows the plan with counts (directories, conflicts, manifests)
     4. Prompts for confirmation (unless --dry-run)
-    5. Renames directories and updates configuration
+    5. Renames directories in batches, then updates every affected
+       paths.json; if any step fails, all renames and manifest edits
+       are rolled back
 
 EXIT CODES:
     0 - Success
@@ -315,40 +326,298 @@ EOF
 # Migration Functions
 # =============================================================================
 
-# Find all directories matching a name
+# Renames per batch, and parallel walkers/renamers (default: CPU count)
+MIGRATION_BATCH_SIZE=200
+MIGRATION_JOBS=""
+
+# Planned by plan_migration
+MIGRATION_SOURCES=()
+MIGRATION_TARGETS=()
+MIGRATION_CONFLICTS=()
+MIGRATION_MANIFESTS=()
+MIGRATION_INVALID=()
+
+# Usage: find_matching_dirs <dir_name> [search_root]
+# Returns: every directory named <dir_name> under <search_root>, sorted
+# Each top-level subtree is walked by its own find process, in parallel.
+# VCS metadata, dependency trees, backups and the contents of matches are
+# never descended into (matches cannot nest, so renames are independent).
 find_matching_dirs() {
     local dir_name="$1"
     local search_root="${2:-.}"
-
-    # Use find to locate all matching directories
-    find "$search_root" -type d -name "$dir_name" 2>/dev/null || true
+    local jobs="${MIGRATION_JOBS:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)}"
+
+    local subtrees=() entry
+    for entry in "$search_root"/* "$search_root"/.[!.]* "$search_root"/..?*; do
+        [[ -d "$entry" && ! -L "$entry" ]] || continue
+        case "${entry##*/}" in
+            "$dir_name") echo "$entry" ;;
+            .git|.hg|.svn|node_modules|__pycache__|.venv|venv|.backups) ;;
+            *) subtrees+=("$entry") ;;
+        esac
+    done
+    [[ ${#subtrees[@]} -gt 0 ]] || return 0
+
+    local out_dir
+    out_dir="$(mktemp -d)" || return 2
+    printf '%s\0' "${subtrees[@]}" | xargs -0 -P "$jobs" -n 1 sh -c '
+        find "$2" \( -name .git -o -name .hg -o -name .svn -o -name node_modules -o -name __pycache__ \
+            -o -name .venv -o -name venv -o -name .backups \) -prune -o \
+            -type d -name "$0" -print -prune 2>/dev/null > "$(mktemp "$1/walk.XXXXXX")"
+        exit 0' "$dir_name" "$out_dir"
+    cat "$out_dir"/walk.* 2>/dev/null | LC_ALL=C sort
+    rm -rf "$out_dir"
 }
 
-# Migrate a single directory
-migrate_directory() {
-    local old_path="$1"
+# Usage: plan_migration <old_name> <new_name> [search_root]
+# Sets: MIGRATION_SOURCES/TARGETS (renames), MIGRATION_CONFLICTS (targets that
+# already exist; skipped), MIGRATION_MANIFESTS (paths.json files, at their
+# post-rename paths, whose claude_dir_name or role_guides_dir is <old_name>)
+# and MIGRATION_INVALID (manifests that are not valid JSON; block the migration)
+plan_migration() {
+    local old_name="$1"
     local new_name="$2"
-    local parent_dir
-    local new_path
+    local search_root="${3:-.}"
+
+    MIGRATION_SOURCES=()
+    MIGRATION_TARGETS=()
+    MIGRATION_CONFLICTS=()
+    MIGRATION_MANIFESTS=()
+    MIGRATION_INVALID=()
+
+    local dir target candidates=()
+    while IFS= read -r dir; do
+        [[ -n "$dir" ]] || continue
+        target="${dir%/*}/$new_name"
+        if [[ -e "$target" ]]; then
+            MIGRATION_CONFLICTS+=("$dir")
+            continue
+        fi
+        MIGRATION_SOURCES+=("$dir")
+        MIGRATION_TARGETS+=("$target")
+        # A renamed config dir's own manifest, or the manifest of the config
+        # dir holding a renamed role guides dir
+        [[ -f "$dir/paths.json" ]] && candidates+=("$dir/paths.json")
+        [[ -f "${dir%/*}/paths.json" ]] && candidates+=("${dir%/*}/paths.json")
+    done < <(find_matching_dirs "$old_name" "$search_root")
+
+    [[ ${#candidates[@]} -gt 0 ]] || return 0
+    if ! command -v jq &> /dev/null; then
+        local manifest
+        for manifest in "${candidates[@]}"; do
+            grep -q "\"$old_name\"" "$manifest" 2>/dev/null && MIGRATION_MANIFESTS+=("$(migrated_path "$manifest")")
+        done
+        return 0
+    fi
+
+    # One jq for every candidate. jq stops at the first malformed manifest,
+    # so the ones after it are read again (in another jq) until none is left.
+    local remaining=("${candidates[@]}") output rc last i
+    local file claude_dir role_guides
+    while [[ ${#remaining[@]} -gt 0 ]]; do
+        rc=0
+        output="$(jq -r '[input_filename, (.claude_dir_name // "" | tostring), (.role_guides_dir // "" | tostring)] | @tsv' \
+            "${remaining[@]}" 2>/dev/null)" || rc=$?
+        last=""
+        while IFS=$'\t' read -r file claude_dir role_guides; do
+            [[ -n "$file" ]] || continue
+            last="$file"
+            if [[ "$claude_dir" == "$old_name" || "$role_guides" == "$old_name" ]]; then
+                MIGRATION_MANIFESTS+=("$(migrated_path "$file")")
+            fi
+        done <<< "$output"
+        [[ $rc -ne 0 ]] || break
+
+        # The malformed one follows the last manifest jq printed
+        i=0
+        if [[ -n "$last" ]]; then
+            for (( i = 0; i < ${#remaining[@]}; i++ )); do
+                [[ "${remaining[$i]}" == "$last" ]] && break
+            done
+            i=$(( i + 1 ))
+        fi
+        while (( i < ${#remaining[@]} )) && jq empty "${remaining[$i]}" 2>/dev/null; do
+            i=$(( i + 1 ))
+        done
+        (( i < ${#remaining[@]} )) || break
+        MIGRATION_INVALID+=("${remaining[$i]}")
+        remaining=("${remaining[@]:i+1}")
+    done
+    return 0
+}
 
-    parent_dir="$(dirname "$old_path")"
-    new_path="$parent_dir/$new_name"
+# Usage: migrated_path <path>
+# Returns: <path> as it will be named once MIGRATION_SOURCES are renamed
+migrated_path() {
+    local path="$1" i
+    for i in "${!MIGRATION_SOURCES[@]}"; do
+        if [[ "$path" == "${MIGRATION_SOURCES[$i]}"/* ]]; then
+            echo "${MIGRATION_TARGETS[$i]}${path#"${MIGRATION_SOURCES[$i]}"}"
+            return 0
+        fi
+    done
+    echo "$path"
+}
 
-    if [[ "$DRY_RUN" == true ]]; then
-        echo "[DRY RUN] Would rename: $old_path -> $new_path"
-        return 0
+# Usage: is_planned_manifest <path>
+# Returns: 0 if <path> (post-rename) is already in MIGRATION_MANIFESTS
+is_planned_manifest() {
+    local manifest
+    for manifest in "${MIGRATION_MANIFESTS[@]}"; do
+        [[ "$manifest" -ef "$1" || "$manifest" == "$1" ]] && return 0
+    done
+    return 1
+}
+
+# Usage: print_migration_plan <old_name> <new_name> <primary_manifest>
+print_migration_plan() {
+    local old_name="$1" new_name="$2" primary="$3" i
+
+    echo "Migration plan: '$old_name' -> '$new_name'"
+    echo "  Directories to rename: ${#MIGRATION_SOURCES[@]}"
+    echo "  Conflicts (skipped):   ${#MIGRATION_CONFLICTS[@]}"
+    echo "  Manifests to update:   ${#MIGRATION_MANIFESTS[@]}"
+    echo "  Batches:               $(( (${#MIGRATION_SOURCES[@]} + MIGRATION_BATCH_SIZE - 1) / MIGRATION_BATCH_SIZE )) of up to $MIGRATION_BATCH_SIZE"
+    echo ""
+    for i in "${!MIGRATION_SOURCES[@]}"; do
+        echo "  - ${MIGRATION_SOURCES[$i]} -> ${MIGRATION_TARGETS[$i]}"
+    done
+    for i in "${MIGRATION_CONFLICTS[@]}"; do
+        echo "  ! $i (target ${i%/*}/$new_name already exists)"
+    done
+    for i in "${MIGRATION_MANIFESTS[@]}"; do
+        echo "  * update $i"
+    done
+    for i in "${MIGRATION_INVALID[@]}"; do
+        echo "  ! $i (invalid JSON)"
+    done
+    if [[ -f "$(rollback_path "$primary" "${#MIGRATION_SOURCES[@]}")" ]]; then
+        is_planned_manifest "$primary" || echo "  * update $primary"
+    else
+        echo "  * create $primary"
     fi
+    echo ""
+}
 
-    # Check if target already exists
-    if [[ -e "$new_path" ]]; then
-        echo "Warning: Target already exists, skipping: $new_path" >&2
-        return 1
+# Usage: rollback_migration <renamed_count> <manifest_backup_dir> [created_manifest]
+# Renames the first <renamed_count> planned directories back and restores
+# every manifest saved in <manifest_backup_dir> (one "<n>" file per manifest)
+rollback_migration() {
+    local renamed="$1" backup_dir="$2" created="${3:-}"
+    local i
+
+    for (( i = renamed - 1; i >= 0; i-- )); do
+        [[ -e "${MIGRATION_TARGETS[$i]}" && ! -e "${MIGRATION_SOURCES[$i]}" ]] && \
+            mv -- "${MIGRATION_TARGETS[$i]}" "${MIGRATION_SOURCES[$i]}"
+    done
+    [[ -n "$created" ]] && rm -f "$created"
+    for i in "${!MIGRATION_MANIFESTS[@]}"; do
+        [[ -f "$backup_dir/$i" ]] || continue
+        local original
+        original="$(rollback_path "${MIGRATION_MANIFESTS[$i]}" "$renamed")"
+        cp "$backup_dir/$i" "$original"
+    done
+    echo "Rolled back: all renames and manifest updates undone" >&2
+}
+
+# Usage: rollback_path <migrated_path> <renamed_count>
+# Returns: where <migrated_path> lives after the first <renamed_count> renames are undone
+rollback_path() {
+    local path="$1" renamed="$2" i
+    for (( i = 0; i < renamed; i++ )); do
+        if [[ "$path" == "${MIGRATION_TARGETS[$i]}"/* ]]; then
+            echo "${MIGRATION_SOURCES[$i]}${path#"${MIGRATION_TARGETS[$i]}"}"
+            return 0
+        fi
+    done
+    echo "$path"
+}
+
+# Usage: execute_migration <old_name> <new_name> <primary_manifest_dir> <key>
+# Returns: 0 on success, 2 after rolling everything back
+# <key> is the primary manifest setting that takes <new_name>
+# (claude_dir_name or role_guides_dir). Renames run in batches (parallel
+# within a batch) and are verified after each batch. Manifests are updated
+# once every rename succeeded; any failure restores all renames and manifests.
+execute_migration() {
+    local old_name="$1" new_name="$2" manifest_dir="$3" key="$4"
+    local jobs="${MIGRATION_JOBS:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)}"
+    local total=${#MIGRATION_SOURCES[@]}
+    local renamed=0 start end i
+
+    local backup_dir
+    backup_dir="$(mktemp -d)" || return 2
+
+    for (( start = 0; start < total; start += MIGRATION_BATCH_SIZE )); do
+        end=$(( start + MIGRATION_BATCH_SIZE ))
+        (( end > total )) && end=$total
+
+        for (( i = start; i < end; i++ )); do
+            printf '%s\0%s\0' "${MIGRATION_SOURCES[$i]}" "${MIGRATION_TARGETS[$i]}"
+        done | xargs -0 -n 2 -P "$jobs" mv -- 2>/dev/null || true
+
+        for (( i = start; i < end; i++ )); do
+            if [[ ! -d "${MIGRATION_TARGETS[$i]}" || -e "${MIGRATION_SOURCES[$i]}" ]]; then
+                echo "Error: Failed to rename ${MIGRATION_SOURCES[$i]}" >&2
+                rollback_migration "$end" "$backup_dir"
+                rm -rf "$backup_dir"
+                return 2
+            fi
+        done
+        renamed=$end
+        echo "Renamed $renamed/$total directories"
+    done
+
+    # Manifests: back up, then rewrite each atomically
+    local manifest failed=false
+    for i in "${!MIGRATION_MANIFESTS[@]}"; do
+        manifest="${MIGRATION_MANIFESTS[$i]}"
+        cp "$manifest" "$backup_dir/$i" || { failed=true; break; }
+        if command -v jq &> /dev/null; then
+            jq --arg old "$old_name" --arg new "$new_name" '
+                (if .claude_dir_name == $old then .claude_dir_name = $new else . end)
+                | (if .role_guides_dir == $old then .role_guides_dir = $new else . end)' \
+                "$backup_dir/$i" > "$manifest.tmp" && mv "$manifest.tmp" "$manifest" || { failed=true; break; }
+        else
+            sed "s/\"$old_name\"/\"$new_name\"/g" "$backup_dir/$i" > "$manifest.tmp" && \
+                mv "$manifest.tmp" "$manifest" || { failed=true; break; }
+        fi
+    done
+
+    # The configuration this migration adopts (unless updated above)
+    local primary="$manifest_dir/paths.json" created=""
+    if [[ "$failed" != true ]] && ! is_planned_manifest "$primary"; then
+        local claude_dir="$new_name" role_guides="${ROLE_GUIDES_DIR_NAME:-role-guides}"
+        if [[ "$key" == "role_guides_dir" ]]; then
+            claude_dir="${manifest_dir##*/}"
+            role_guides="$new_name"
+        fi
+        if [[ -f "$primary" ]]; then
+            local index=${#MIGRATION_MANIFESTS[@]}
+            if [[ "$key" == "claude_dir_name" && -z "$ROLE_GUIDES_DIR_NAME" ]]; then
+                role_guides="$(read_manifest_value "$primary" "role_guides_dir")" || role_guides="role-guides"
+            fi
+            MIGRATION_MANIFESTS+=("$primary")
+            cp "$primary" "$backup_dir/$index" && \
+                update_paths_manifest "$primary" "$claude_dir" "$role_guides" > /dev/null || failed=true
+            rm -f "$primary.bak"
+        else
+            created="$primary"
+            create_paths_manifest "$manifest_dir" "$claude_dir" "$role_guides" > /dev/null || failed=true
+        fi
     fi
 
-    # Rename directory
-    mv "$old_path" "$new_path"
-    echo "Renamed: $old_path -> $new_path"
+    if [[ "$failed" == true ]]; then
+        echo "Error: Failed to update manifests" >&2
+        [[ -n "${manifest:-}" ]] && rm -f "$manifest.tmp"
+        rollback_migration "$renamed" "$backup_dir" "$created"
+        rm -rf "$backup_dir"
+        return 2
+    fi
 
+    rm -rf "$backup_dir"
+    echo "Updated ${#MIGRATION_MANIFESTS[@]} manifest(s)"
+    [[ -n "$created" ]] && echo "Created manifest: $created"
     return 0
 }
 
@@ -356,64 +625,57 @@ migrate_directory() {
 perform_migration() {
     local old_name="$1"
     local new_name="$2"
-    local matching_dirs
-    local dir_count
     local manifest_dir
-    local manifest_path
 
-    echo "Searching for directories named '$old_name'..."
+    # Renaming the configured role guides directory updates role_guides_dir
+    # in the config dir's manifest; any other name is a config dir rename
+    local key="claude_dir_name" config_name="$new_name"
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    if [[ "$old_name" == "$(get_role_guides_dir)" && "$old_name" != "$claude_dir_name" ]]; then
+        key="role_guides_dir"
+        config_name="$claude_dir_name"
+    fi
 
-    # Find all matching directories
-    mapfile -t matching_dirs < <(find_matching_dirs "$old_name" ".")
-    dir_count=${#matching_dirs[@]}
+    echo "Searching for directories named '$old_name'..."
+    plan_migration "$old_name" "$new_name" "."
 
-    if [[ $dir_count -eq 0 ]]; then
+    if [[ ${#MIGRATION_SOURCES[@]} -eq 0 && ${#MIGRATION_CONFLICTS[@]} -eq 0 ]]; then
         echo "No directories found matching '$old_name'"
         return 0
     fi
 
-    # Show preview
-    echo "Found $dir_count director(y|ies) to migrate:"
-    for dir in "${matching_dirs[@]}"; do
-        echo "  - $dir -> $(dirname "$dir")/$new_name"
-    done
-    echo ""
-
-    # Confirm unless dry run
-    if [[ "$DRY_RUN" != true ]]; then
-        if ! confirm "Proceed with migration?"; then
-            echo "Migration cancelled"
-            return 1
-        fi
+    # Determine manifest location
+    if [[ "$GLOBAL_CONFIG" == true ]]; then
+        manifest_dir="$HOME/$config_name"
+    else
+        manifest_dir="./$config_name"
     fi
 
-    # Migrate each directory
-    for dir in "${matching_dirs[@]}"; do
-        migrate_directory "$dir" "$new_name"
-    done
+    print_migration_plan "$old_name" "$new_name" "$manifest_dir/paths.json"
 
-    # Update or create manifest
-    echo ""
-    echo "Updating configuration..."
+    # Renaming around a manifest that cannot be updated leaves a half-migrated tree
+    if [[ ${#MIGRATION_INVALID[@]} -gt 0 ]]; then
+        echo "Error: ${#MIGRATION_INVALID[@]} manifest(s) are not valid JSON; fix them and re-run" >&2
+        return 1
+    fi
 
-    # Determine manifest location
-    if [[ "$GLOBAL_CONFIG" == true ]]; then
-        manifest_dir="$HOME/$new_name"
-    else
-        manifest_dir="./$new_name"
+    if [[ "$DRY_RUN" == true ]]; then
+        echo "[DRY RUN] No changes made"
+        return 0
     fi
 
-    manifest_path="$manifest_dir/paths.json"
+    if [[ ${#MIGRATION_CONFLICTS[@]} -gt 0 ]]; then
+        echo "Warning: ${#MIGRATION_CONFLICTS[@]} director(y|ies) skipped, target already exists" >&2
+    fi
 
-    # Create or update manifest
-    if file_exists "$manifest_path"; then
-        update_paths_manifest "$manifest_path" "$new_name" "$ROLE_GUIDES_DIR_NAME"
-    else
-        # Use default role-guides-dir if not specified
-        local role_guides_dir="${ROLE_GUIDES_DIR_NAME:-role-guides}"
-        create_paths_manifest "$manifest_dir" "$new_name" "$role_guides_dir"
+    if ! confirm "Proceed with migration?"; then
+        echo "Migration cancelled"
+        return 1
     fi
 
+    execute_migration "$old_name" "$new_name" "$manifest_dir" "$key" || return $?
+
     echo ""
     echo "Migration complete!"
 
@@ -556,6 +818,14 @@ parse_arguments() {
                 LOCAL_CONFIG=true
                 shift
                 ;;
+            --jobs=*)
+                MIGRATION_JOBS="${1#*=}"
+                shift
+                ;;
+            --batch-size=*)
+                MIGRATION_BATCH_SIZE="${1#*=}"
+                shift
+                ;;
             --migrate)
                 MIGRATE_MODE=true
                 INTERACTIVE_MODE=false
@@ -608,6 +878,12 @@ main() {
             exit 1
         fi
 
+        if [[ ! "$MIGRATION_BATCH_SIZE" =~ ^[1-9][0-9]*$ ]] || \
+           [[ -n "$MIGRATION_JOBS" && ! "$MIGRATION_JOBS" =~ ^[1-9][0-9]*$ ]]; then
+            echo "Error: --jobs and --batch-size must be positive integers" >&2
+            exit 1
+        fi
+
         # Perform migration
         perform_migration "$OLD_DIR_NAME" "$NEW_DIR_NAME"
         exit $?
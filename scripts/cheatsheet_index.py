@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Search index and quick lookup for the cheatsheet.
+
+generate-cheatsheet.py writes CHEATSHEET.index.json next to CHEATSHEET.md:
+one entry per command, agent, pattern and section of the Markdown, with
+flags and a one-line summary, plus an inverted term table and prefix and
+trigram tables over the terms. A lookup loads the JSON and scores entries
+from those tables, so fuzzy questions ("how do I change role scope",
+"valdate setup") are answered without reading the cheatsheet.
+
+The index records the SHA-256 of the Markdown it was built from and is only
+rewritten when that changes.
+
+Usage:
+    python3 scripts/cheatsheet_index.py query <question...> [--limit N] [--json]
+    python3 scripts/cheatsheet_index.py build [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict, namedtuple
+
+from heading_index import anchor
+
+INDEX_VERSION = 1
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MARKDOWN = os.path.join(PLUGIN_ROOT, 'CHEATSHEET.md')
+DEFAULT_INDEX = os.path.join(PLUGIN_ROOT, 'CHEATSHEET.index.json')
+
+HEADING = re.compile(r'^(#{2,4})\s+(.*?)\s*$')
+FLAG = re.compile(r'(?<![\w-])--[a-z][a-z0-9-]*')
+WORD = re.compile(r'--?[a-z][a-z0-9-]*|/[a-z][a-z0-9-]+|[a-z0-9]+(?:[._-][a-z0-9]+)*')
+TABLE_ROW = re.compile(r'^\|\s*(?:\*\*)?`?([^|`*]+?)`?(?:\*\*)?\s*\|(.*)\|\s*$')
+
+# Field weights: a term in the title counts more than one in the body
+TITLE_WEIGHT = 3.0
+SUMMARY_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+PREFIX_LENGTHS = range(2, 7)
+# BM25 saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_TRIGRAM_SIMILARITY = 0.4
+
+STOPWORDS = frozenset('''
+    a an and are as at be by can do does for from get how i if in into is it
+    its me my of on or so that the their then this to use using want what
+    when where which who why will with you your
+'''.split())
+
+# Query words mapped to the vocabulary the cheatsheet uses
+SYNONYMS = {
+    'change': ('set', 'update', 'configure'),
+    'switch': ('set',),
+    'pick': ('set', 'select'),
+    'choose': ('set', 'select'),
+    'view': ('show', 'display'),
+    'see': ('show', 'display'),
+    'list': ('show',),
+    'check': ('validate', 'verify'),
+    'fix': ('validate', 'repair'),
+    'update': ('sync', 'update'),
+    'upgrade': ('sync', 'update'),
+    'add': ('add', 'create'),
+    'new': ('create', 'init'),
+    'start': ('init', 'setup'),
+    'install': ('setup', 'init'),
+    'rename': ('migrate', 'configure'),
+    'folder': ('directory', 'dir'),
+    'docs': ('document', 'documents'),
+    'doc': ('document',),
+}
+
+Entry = namedtuple('Entry', 'kind title name anchor section summary flags')
+
+
+def sha256(text):
+    """Hex SHA-256 of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def stem(word):
+    """Crude suffix stripping so "roles"/"role" and "loading"/"load" meet."""
+    if word.startswith(('-', '/')) or len(word) <= 4:
+        return word
+    for suffix in ('ing', 'ies', 'es', 'ed', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            return word + 'y' if suffix == 'ies' else word
+    return word
+
+
+def tokenize(text):
+    """Index terms of a piece of text: stemmed words, flags and commands."""
+    terms = []
+    for word in WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        terms.append(stem(word))
+        # "role-guides" and "preferences.json" are also found by their parts
+        if not word.startswith(('-', '/')) and re.search(r'[._-]', word):
+            terms.extend(stem(part) for part in re.split(r'[._-]', word) if part and part not in STOPWORDS)
+        elif word.startswith(('--', '/')):
+            terms.extend(stem(part) for part in re.split(r'[-/]', word) if part and part not in STOPWORDS)
+    return terms
+
+
+def _kind(title, parents):
+    if title.startswith('`/') or title.startswith('/'):
+        return 'command'
+    if title.startswith(('Agent:', 'Agents:')) or any(p.startswith('Agents:') for p in parents):
+        return 'agent'
+    if re.match(r'(Pattern|Scenario|Workflow)\b', title) or any(
+            re.search(r'Patterns|Workflows', p) for p in parents):
+        return 'pattern'
+    return 'section'
+
+
+def _summary(lines):
+    for line in lines:
+        match = re.match(r'\*\*(?:Purpose|When to use):\*\*\s*(.+)', line)
+        if match:
+            return match.group(1).strip()
+    for line in lines:
+        text = line.strip().lstrip('>').strip()
+        if text and not text.startswith(('#', '|', '```', '---', '-', '*', '┌', '│')):
+            return re.sub(r'\*\*|`', '', text)
+    return ''
+
+
+def parse_markdown(markdown):
+    """Entries of the cheatsheet: (Entry, body text) per heading of level 2-4, plus table-only commands."""
+    sections = []
+    parents = {}
+    current = None
+    in_fence = False
+    for line in markdown.split('\n'):
+        if line.startswith('```'):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        if match:
+            level = len(match.group(1))
+            title = match.group(2)
+            parents = {lv: t for lv, t in parents.items() if lv < level}
+            current = {'level': level, 'title': title, 'parents': [parents[lv] for lv in sorted(parents)], 'lines': []}
+            parents[level] = title
+            sections.append(current)
+        elif current is not None:
+            current['lines'].append(line)
+
+    sections = [s for s in sections if s['title'] != 'Table of Contents']
+    entries = []
+    names = {}
+    for section in sections:
+        title = section['title']
+        body = '\n'.join(section['lines'])
+        kind = _kind(title, section['parents'])
+        plain = title.replace('`', '')
+        if kind == 'command':
+            name = plain.split()[0]
+        elif kind == 'agent':
+            name = plain.split(':', 1)[-1].strip()
+        else:
+            name = plain
+        flags = sorted(set(FLAG.findall(title + '\n' + body))) if kind == 'command' else []
+        top = section['parents'][0] if section['parents'] else title
+        entry = Entry(kind, plain, name, anchor(title), top, _summary(section['lines']), flags)
+        names.setdefault(name, len(entries))
+        entries.append((entry, body))
+
+    # Quick-reference rows are added to the command or agent they describe,
+    # or become its entry when it has no heading of its own
+    for section in sections:
+        for line in section['lines']:
+            match = TABLE_ROW.match(line)
+            if not match or set(match.group(1)) <= set('-: '):
+                continue
+            first = match.group(1).strip()
+            cells = [c.strip().replace('`', '') for c in match.group(2).split('|')]
+            if first.startswith('/'):
+                kind = 'command'
+            elif section['title'].startswith('All Agents'):
+                kind = 'agent'
+            else:
+                continue
+            if first in names:
+                entry, body = entries[names[first]]
+                flags = sorted(set(entry.flags) | set(FLAG.findall(line))) if kind == 'command' else entry.flags
+                entries[names[first]] = (entry._replace(flags=flags), body + '\n' + line)
+                continue
+            summary = cells[0] if kind == 'command' else cells[-1]
+            flags = sorted(set(FLAG.findall(line))) if kind == 'command' else []
+            names[first] = len(entries)
+            entries.append((Entry(kind, first, first, anchor(section['title']), section['parents'][0]
+                                  if section['parents'] else section['title'], summary, flags), line))
+    return entries
+
+
+def build_index(markdown):
+    """The search index (a JSON-serializable dict) for cheatsheet Markdown."""
+    entries = parse_markdown(markdown)
+    postings = defaultdict(dict)
+    lengths = []
+    for i, (entry, body) in enumerate(entries):
+        length = 0
+        for text, weight in ((entry.title + ' ' + entry.name, TITLE_WEIGHT),
+                             (entry.summary + ' ' + ' '.join(entry.flags), SUMMARY_WEIGHT),
+                             (body, BODY_WEIGHT)):
+            for term in tokenize(text):
+                postings[term][i] = postings[term].get(i, 0) + weight
+                length += weight
+        lengths.append(round(length, 1))
+
+    terms = sorted(postings)
+    prefixes = defaultdict(list)
+    trigrams = defaultdict(list)
+    for t, term in enumerate(terms):
+        for n in PREFIX_LENGTHS:
+            if len(term) > n:
+                prefixes[term[:n]].append(t)
+        for gram in _trigrams(term):
+            trigrams[gram].append(t)
+
+    return {
+        'version': INDEX_VERSION,
+        'source_sha256': sha256(markdown),
+        'entries': [dict(e._asdict()) for e, _ in entries],
+        'lengths': lengths,
+        'terms': terms,
+        'postings': [sorted([i, round(w, 2)] for i, w in postings[term].items()) for term in terms],
+        'prefixes': dict(prefixes),
+        'trigrams': dict(trigrams),
+    }
+
+
+def _trigrams(term):
+    padded = f'^{term}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def write_index(markdown, path=DEFAULT_INDEX, force=False):
+    """Write the index for <markdown> to <path> unless it already matches; True if written."""
+    if not force:
+        try:
+            with open(path, encoding='utf-8') as f:
+                current = json.load(f)
+            if current.get('version') == INDEX_VERSION and current.get('source_sha256') == sha256(markdown):
+                return False
+        except (OSError, ValueError):
+            pass
+
+    index = build_index(markdown)
+    tmp = f'{path}.tmp.{os.getpid()}'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'), ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp, path)
+    return True
+
+
+def load_index(path=DEFAULT_INDEX):
+    """Load an index written by write_index."""
+    with open(path, encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('version') != INDEX_VERSION:
+        raise ValueError(f'{path}: unsupported index version {index.get("version")}')
+    return index
+
+
+def _expand(token, index, term_ids):
+    """Index terms matching one query token, with a match quality in (0, 1]."""
+    if token in term_ids:
+        return {term_ids[token]: 1.0}
+    if len(token) >= 2:
+        candidates = index['prefixes'].get(token[:max(PREFIX_LENGTHS)], [])
+        found = {t: 0.7 for t in candidates if index['terms'][t].startswith(token)}
+        if found:
+            return found
+    # Typo tolerance: terms sharing enough trigrams with the token
+    grams = _trigrams(token)
+    shared = defaultdict(int)
+    for gram in grams:
+        for t in index['trigrams'].get(gram, ()):
+            shared[t] += 1
+    found = {}
+    for t, count in shared.items():
+        similarity = count / (len(grams) + len(_trigrams(index['terms'][t])) - count)
+        if similarity >= MIN_TRIGRAM_SIMILARITY:
+            found[t] = 0.5 * similarity
+    return found
+
+
+def search(index, question, limit=5):
+    """Best entries for a free-text question: list of (score, entry dict)."""
+    term_ids = {term: t for t, term in enumerate(index['terms'])}
+    total = len(index['entries'])
+    lengths = index['lengths']
+    average = sum(lengths) / total if total else 1
+    scores = defaultdict(float)
+    for token in tokenize(question):
+        alternatives = [(token, 1.0)] + [(stem(s), 0.6) for s in SYNONYMS.get(token, ())]
+        best = defaultdict(float)
+        for word, quality in alternatives:
+            for t, match in _expand(word, index, term_ids).items():
+                postings = index['postings'][t]
+                idf = math.log(1 + total / len(postings))
+                for i, weight in postings:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[i] / average)
+                    bm25 = idf * weight * (BM25_K1 + 1) / (weight + norm)
+                    best[i] = max(best[i], quality * match * bm25)
+        for i, score in best.items():
+            scores[i] += score
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(round(score, 3), index['entries'][i]) for i, score in ranked]
+
+
+def main(argv=None):
+    """Build the index or answer a lookup from the command line."""
+    parser = argparse.ArgumentParser(description='Search the role-context-manager cheatsheet.')
+    parser.add_argument('command', choices=['query', 'build'])
+    parser.add_argument('question', nargs='*', help='Question or keywords (query)')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help='Index file (default: CHEATSHEET.index.json)')
+    parser.add_argument('--markdown', default=DEFAULT_MARKDOWN, help='Cheatsheet to index (build)')
+    parser.add_argument('--limit', type=int, default=5, help='Maximum results (query, default: 5)')
+    parser.add_argument('--json', action='store_true', help='Machine-readable results (query)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the cheatsheet is unchanged (build)')
+    args = parser.parse_intermixed_args(argv)
+
+    if args.command == 'build':
+        try:
+            with open(args.markdown, encoding='utf-8') as f:
+                written = write_index(f.read(), args.index, args.force)
+        except OSError as e:
+            print(f'Error: {e}', file=sys.stderr)
+            return 2
+        print(f"{'✓ Index written' if written else 'Index up to date'}: {args.index}")
+        return 0
+
+    if not args.question:
+        parser.error('query needs a question')
+    try:
+        index = load_index(args.index)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        print('Run: python3 scripts/cheatsheet_index.py build', file=sys.stderr)
+        return 2
+
+    results = search(index, ' '.join(args.question), args.limit)
+    if args.json:
+        print(json.dumps([dict(entry, score=score) for score, entry in results], indent=2))
+        return 0 if results else 1
+    if not results:
+        print('No matches')
+        return 1
+    for score, entry in results:
+        print(f"{entry['kind']:8} {entry['title']}")
+        if entry['summary']:
+            print(f"         {entry['summary']}")
+        if entry['flags']:
+            print(f"         Flags: {' '.join(entry['flags'])}")
+        print(f"         CHEATSHEET.md#{entry['anchor']}  ({entry['section']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
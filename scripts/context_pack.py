@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Read packed role context stores.
+
+role-manager.sh writes one pack per (directory, role) holding the role guide
+and every referenced document, behind a tab-separated index header (see the
+"Packed Context Store" section of role-manager.sh for the format). This module
+maps a pack into memory and serves entries as slices of the mapping, so
+reading a whole context is one mmap instead of an open/read per file.
+
+Usage:
+    python3 scripts/context_pack.py list <pack>
+    python3 scripts/context_pack.py cat <pack> [ref]
+    python3 scripts/context_pack.py verify <pack>
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+from collections import namedtuple
+
+MAGIC = b'RCMPACK 2\n'
+BODY_MARKER = b'\nBODY\n'
+
+PackEntry = namedtuple('PackEntry', 'offset length sha256 size mtime kind ref path')
+MissingPath = namedtuple('MissingPath', 'kind ref path')
+
+
+class PackError(Exception):
+    """The file is not a readable context pack."""
+
+
+class ContextPack:
+    """A memory-mapped context pack."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = {}
+        self.entries = []
+        self.missing = []
+        self._file = open(path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < len(MAGIC):
+                raise PackError(f'{path}: not a context pack')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, PackError):
+            self._file.close()
+            raise
+        try:
+            self._parse()
+        except PackError:
+            self.close()
+            raise
+
+    def _parse(self):
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise PackError(f'{self.path}: not a context pack')
+        end = self._map.find(BODY_MARKER)
+        if end < 0:
+            raise PackError(f'{self.path}: missing BODY marker')
+        self.body_offset = end + len(BODY_MARKER)
+
+        for line in self._map[len(MAGIC):end].decode('utf-8', 'surrogateescape').split('\n'):
+            fields = line.split('\t')
+            if fields[0] == 'E' and len(fields) == 9:
+                ref = '' if fields[7] == '-' else fields[7]
+                self.entries.append(PackEntry(int(fields[1]), int(fields[2]), fields[3],
+                                              fields[4], fields[5], fields[6], ref, fields[8]))
+            elif fields[0] == 'M' and len(fields) == 9:
+                self.missing.append(MissingPath(fields[6], fields[7], fields[8]))
+            elif len(fields) == 2:
+                self.header[fields[0]] = fields[1]
+
+        body_length = len(self._map) - self.body_offset
+        for entry in self.entries:
+            if entry.offset + entry.length > body_length:
+                raise PackError(f'{self.path}: entry {entry.ref or entry.kind} extends past the body')
+
+    def close(self):
+        """Release the mapping."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def guide(self):
+        """The role guide entry, or None."""
+        return next((e for e in self.entries if e.kind == 'guide'), None)
+
+    @property
+    def documents(self):
+        """Document entries in reference order."""
+        return [e for e in self.entries if e.kind == 'doc']
+
+    def content(self, entry):
+        """Bytes of one entry, sliced from the mapping."""
+        start = self.body_offset + entry.offset
+        return self._map[start:start + entry.length]
+
+    def is_fresh(self, cwd=None, config_dir=None, role=None):
+        """Apply the shell loader's validity rules (source sizes and mtimes, missing paths)."""
+        expected = {'cwd': cwd, 'config': config_dir, 'role': role}
+        for key, value in expected.items():
+            if value is not None and self.header.get(key) != value:
+                return False
+        for entry in self.entries:
+            try:
+                st = os.stat(entry.path)
+            except OSError:
+                return False
+            if (str(st.st_size), '%d.%09d' % divmod(st.st_mtime_ns, 10**9)) != (entry.size, entry.mtime):
+                return False
+        return not any(os.path.lexists(m.path) for m in self.missing)
+
+    def verify(self):
+        """Return entries whose content does not match the recorded sha256."""
+        return [entry for entry in self.entries
+                if entry.sha256 != '-' and
+                hashlib.sha256(self.content(entry)).hexdigest() != entry.sha256]
+
+
+def read_pack(path):
+    """Open and index a pack; use as a context manager or call close()."""
+    return ContextPack(path)
+
+
+def main(argv=None):
+    """Inspect a pack from the command line."""
+    parser = argparse.ArgumentParser(description='Inspect a packed role context store.')
+    parser.add_argument('command', choices=['list', 'cat', 'verify'])
+    parser.add_argument('pack', help='Pack file')
+    parser.add_argument('ref', nargs='?', help='Document reference to print (cat; default: all)')
+    parser.add_argument('--json', action='store_true', help='Machine-readable output (list, verify)')
+    args = parser.parse_args(argv)
+
+    try:
+        pack = read_pack(args.pack)
+    except (OSError, PackError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+
+    with pack:
+        if args.command == 'list':
+            if args.json:
+                print(json.dumps({'header': pack.header,
+                                  'entries': [e._asdict() for e in pack.entries],
+                                  'missing': [m._asdict() for m in pack.missing],
+                                  'fresh': pack.is_fresh()}, indent=2))
+            else:
+                for key, value in pack.header.items():
+                    print(f'{key}: {value}')
+                print(f"fresh: {'yes' if pack.is_fresh() else 'no'}")
+                for entry in pack.entries:
+                    print(f'  {entry.kind:5} {entry.length:8d}  {entry.ref or entry.path}')
+                for missing in pack.missing:
+                    print(f'  {missing.kind:7}    -      {missing.ref}  ({missing.path})')
+            return 0
+
+        if args.command == 'cat':
+            entries = pack.entries
+            if args.ref:
+                entries = [e for e in pack.documents if e.ref == args.ref][:1]
+                if not entries:
+                    print(f'Error: {args.ref} is not in the pack', file=sys.stderr)
+                    return 1
+            out = sys.stdout.buffer
+            for entry in entries:
+                out.write(pack.content(entry))
+            out.flush()
+            return 0
+
+        corrupt = pack.verify()
+        if args.json:
+            print(json.dumps({'ok': not corrupt, 'corrupt': [e.ref or e.path for e in corrupt]}))
+        elif corrupt:
+            for entry in corrupt:
+                print(f'✗ Hash mismatch: {entry.ref or entry.path}')
+        else:
+            print(f'✓ {len(pack.entries)} entries verified')
+        return 1 if corrupt else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,891 @@
+#!/usr/bin/env python3
+"""
+Incremental full-text index over organizational documents.
+
+Indexes the Markdown, text, JSON and YAML files under a workspace's config
+dir (role guides included) and the bundled templates (templates/core) into
+an inverted index: each term maps to the documents containing it, with an
+impact score and the byte offsets of its first occurrences. Terms are the
+cheatsheet index's vocabulary (lowercased, stemmed, stopwords dropped).
+
+The index is a directory of immutable segment files and a small manifest:
+
+    manifest.json    segments, deleted documents, corpus statistics
+    seg-NNNNNN.bin   one batch of documents
+
+`update` stats every file and only reads those whose size or mtime changed;
+a file whose content hash is unchanged is not re-tokenized. New and changed
+files go into a new segment and their previous versions are marked deleted,
+so an update costs what changed rather than the corpus. Segments are merged
+into one when there are more than MAX_SEGMENTS of them or more than
+MAX_DELETED_RATIO of their documents are deleted; until then deleted
+documents still count towards term frequencies, so scores drift slightly
+from those of a full rebuild while the matches stay the same.
+
+A query memory-maps the segments and binary-searches their sorted term
+dictionaries. Postings are fixed-width arrays, so a lookup reads only the
+terms asked for. Each posting carries its BM25 term-frequency factor,
+tf / (tf + k1 (1 - b + b len / avglen)), quantized to a byte with the corpus
+average at indexing time, so scoring is one table lookup per posting, done
+with map/zip over whole arrays. Results are ranked by the number of query
+terms matched, then BM25.
+
+Segment layout (little-endian): MAGIC; eight uint64 (document count, term
+count and the offsets of the last six sections); per term, in term order,
+its n postings: document numbers (uint16[n], or uint32[n] in segments of
+more than 65535 documents), impacts uint8[n], offsets lengths uint8[n] and
+the delta-varint byte offsets of each posting; then document lengths
+uint32[d], document records (size, mtime_ns, sha256, path offset, path
+length), the path blob, term offsets uint32[t + 1], term records (postings
+offset, posting count, offsets length) and the term blob.
+
+Usage:
+    python3 scripts/doc_index.py update [--root DIR]... [--full]
+    python3 scripts/doc_index.py query <terms...> [--limit N] [--json]
+    python3 scripts/doc_index.py stats
+"""
+
+import argparse
+import array
+import bisect
+import fcntl
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import mmap
+import operator
+import os
+import re
+import struct
+import sys
+import time
+from collections import Counter, defaultdict, deque, namedtuple
+
+from cheatsheet_index import BM25_B, BM25_K1, STOPWORDS, stem
+
+INDEX_VERSION = 1
+MAGIC = b'RCMDOCIDX 1\n'
+MANIFEST = 'manifest.json'
+HEADER = struct.Struct('<8Q')
+DOC_RECORD = struct.Struct('<Qq32sII')
+TERM_RECORD = struct.Struct('<QII')
+TERM_BOUNDS = struct.Struct('<2I')
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES_ROOT = os.path.join(PLUGIN_ROOT, 'templates', 'core')
+EXTENSIONS = ('.md', '.markdown', '.txt', '.json', '.yaml', '.yml')
+PRUNE_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+TOKEN = re.compile(rb'[0-9A-Za-z\x80-\xff]+')
+MAX_TERM_BYTES = 64
+# Byte offsets kept per (term, document); the frequency counts every occurrence
+MAX_OFFSETS = 16
+IMPACT_LEVELS = 255
+# Segments up to this size number their documents with uint16
+SMALL_SEGMENT = 0xffff
+MAX_SEGMENTS = 8
+MAX_DELETED_RATIO = 0.25
+# A "prefix*" query token matches at most this many terms, each at PREFIX_WEIGHT
+MAX_PREFIX_TERMS = 16
+PREFIX_WEIGHT = 0.7
+# A query token with this many times more postings than the rarer tokens
+# together is only scored for the documents found through them
+LOOKUP_RATIO = 16
+
+DocMeta = namedtuple('DocMeta', 'path size mtime_ns sha256 length')
+Hit = namedtuple('Hit', 'path score matched offsets stale')
+UpdateStats = namedtuple('UpdateStats', 'added changed removed unchanged documents segments written')
+
+
+class DocIndexError(Exception):
+    """The index is missing, unreadable or from another version."""
+
+
+def _pack(typecode, values):
+    data = array.array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _unpack(typecode, buffer, offset, count):
+    data = array.array(typecode)
+    data.frombytes(buffer[offset:offset + data.itemsize * count])
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+def _doc_typecode(doc_count):
+    return 'H' if doc_count <= SMALL_SEGMENT else 'I'
+
+
+def _encode_offsets(offsets):
+    out = bytearray()
+    previous = 0
+    for offset in offsets[:MAX_OFFSETS]:
+        delta = offset - previous
+        previous = offset
+        while delta > 0x7f:
+            out.append(delta & 0x7f | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def _decode_offsets(data):
+    offsets = []
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            previous += value
+            offsets.append(previous)
+            value = shift = 0
+    return offsets
+
+
+def impact(frequency, length, average):
+    """BM25 term-frequency factor of a posting, quantized to 1..IMPACT_LEVELS."""
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+    return max(1, round(IMPACT_LEVELS * frequency / (frequency + norm)))
+
+
+def normalize(word):
+    """Index term (bytes) of one token, or b'' for stopwords and overlong tokens."""
+    if len(word) > MAX_TERM_BYTES:
+        return b''
+    text = word.decode('utf-8', 'surrogateescape').lower()
+    if text in STOPWORDS:
+        return b''
+    return stem(text).encode('utf-8', 'surrogateescape')
+
+
+def scan(data, memo=None):
+    """Terms of a document (bytes) with the byte offsets of each, and the term count."""
+    memo = {} if memo is None else memo
+    found = defaultdict(list)
+    count = 0
+    for match in TOKEN.finditer(data):
+        word = match.group()
+        term = memo.get(word)
+        if term is None:
+            term = memo[word] = normalize(word)
+        if term:
+            found[term].append(match.start())
+            count += 1
+    return found, count
+
+
+def query_terms(question):
+    """(term, is_prefix) pairs of a query; a trailing * asks for a prefix match."""
+    terms = []
+    for raw in question.split():
+        prefix = raw.endswith('*')
+        words = TOKEN.findall(raw.encode('utf-8', 'surrogateescape'))
+        for n, word in enumerate(words):
+            if prefix and n == len(words) - 1:
+                lowered = word.decode('utf-8', 'surrogateescape').lower()
+                terms.append((lowered.encode('utf-8', 'surrogateescape'), True))
+            else:
+                term = normalize(word)
+                if term:
+                    terms.append((term, False))
+    return terms
+
+
+def _write_segment(path, docs, postings):
+    """Write a segment: docs is a list of DocMeta, postings yields
+    (term, [(document number, impact, offsets blob), ...]) in term and
+    document order."""
+    temp = f'{path}.tmp.{os.getpid()}'
+    typecode = _doc_typecode(len(docs))
+    terms = []
+    records = []
+    try:
+        with open(temp, 'wb') as f:
+            f.write(MAGIC + HEADER.pack(*[0] * 8))
+            position = len(MAGIC) + HEADER.size
+            for term, entries in postings:
+                docs_column, impacts, blobs = zip(*entries)
+                blob = b''.join(blobs)
+                chunk = b''.join((_pack(typecode, docs_column), bytes(impacts), bytes(map(len, blobs)), blob))
+                f.write(chunk)
+                terms.append(term)
+                records.append(TERM_RECORD.pack(position, len(entries), len(blob)))
+                position += len(chunk)
+
+            paths = []
+            doc_records = []
+            path_offset = 0
+            for doc in docs:
+                encoded = doc.path.encode('utf-8', 'surrogateescape')
+                paths.append(encoded)
+                doc_records.append(DOC_RECORD.pack(doc.size, doc.mtime_ns, bytes.fromhex(doc.sha256),
+                                                   path_offset, len(encoded)))
+                path_offset += len(encoded)
+            term_offsets = [0]
+            for term in terms:
+                term_offsets.append(term_offsets[-1] + len(term))
+
+            sections = [_pack('I', [doc.length for doc in docs]), b''.join(doc_records), b''.join(paths),
+                        _pack('I', term_offsets), b''.join(records), b''.join(terms)]
+            offsets = []
+            for section in sections:
+                offsets.append(position)
+                f.write(section)
+                position += len(section)
+            f.seek(len(MAGIC))
+            f.write(HEADER.pack(len(docs), len(terms), *offsets))
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.unlink(temp)
+        raise
+
+
+class Segment:
+    """A memory-mapped index segment."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise DocIndexError(f'{path}: empty segment')
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise DocIndexError(f'{path}: not an index segment')
+        (self.doc_count, self.term_count, lengths, self._records, self._paths,
+         self._term_offsets, self._term_records, self._terms) = HEADER.unpack_from(self._map, len(MAGIC))
+        self.lengths = _unpack('I', self._map, lengths, self.doc_count)
+        self._typecode = _doc_typecode(self.doc_count)
+        self._width = array.array(self._typecode).itemsize
+
+    def close(self):
+        self._map.close()
+
+    def term(self, i):
+        """Term number <i> (bytes)."""
+        start, end = TERM_BOUNDS.unpack_from(self._map, self._term_offsets + 4 * i)
+        return self._map[self._terms + start:self._terms + end]
+
+    def _lower_bound(self, term):
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, term, prefix=False):
+        """Numbers of the terms matching <term> (one, or up to MAX_PREFIX_TERMS for a prefix)."""
+        i = self._lower_bound(term)
+        if not prefix:
+            return [i] if i < self.term_count and self.term(i) == term else []
+        found = []
+        while i < self.term_count and len(found) < MAX_PREFIX_TERMS and self.term(i).startswith(term):
+            found.append(i)
+            i += 1
+        return found
+
+    def document_frequency(self, i):
+        """Number of documents containing term <i>."""
+        return TERM_RECORD.unpack_from(self._map, self._term_records + TERM_RECORD.size * i)[1]
+
+    def postings(self, i):
+        """Document numbers (ascending) and impacts (bytes) of term <i>."""
+        offset, count, _ = TERM_RECORD.unpack_from(self._map, self._term_records + TERM_RECORD.size * i)
+        impacts = offset + self._width * count
+        return (_unpack(self._typecode, self._map, offset, count),
+                self._map[impacts:impacts + count])
+
+    def raw_postings(self, i):
+        """Document numbers, impacts, offsets lengths and offsets blob of term <i>."""
+        offset, count, length = TERM_RECORD.unpack_from(self._map, self._term_records + TERM_RECORD.size * i)
+        impacts = offset + self._width * count
+        blob = impacts + 2 * count
+        return (_unpack(self._typecode, self._map, offset, count),
+                self._map[impacts:impacts + count],
+                self._map[impacts + count:blob], self._map[blob:blob + length])
+
+    def offsets(self, i, doc):
+        """Byte offsets of term <i> in document <doc>, or [] if it does not occur there."""
+        docs, _, lengths, blob = self.raw_postings(i)
+        j = bisect.bisect_left(docs, doc)
+        if j == len(docs) or docs[j] != doc:
+            return []
+        start = sum(lengths[:j])
+        return _decode_offsets(blob[start:start + lengths[j]])
+
+    def document(self, k):
+        """DocMeta of document <k>."""
+        record = self._records + DOC_RECORD.size * k
+        size, mtime_ns, digest, start, length = DOC_RECORD.unpack_from(self._map, record)
+        path = self._map[self._paths + start:self._paths + start + length].decode('utf-8', 'surrogateescape')
+        return DocMeta(path, size, mtime_ns, digest.hex(), self.lengths[k])
+
+
+def index_dir_for(workspace, env=None):
+    """Index directory of a workspace (under RCM_DOC_INDEX_DIR or ~/.cache/.../doc-index)."""
+    env = os.environ if env is None else env
+    home = env.get('HOME') or os.path.expanduser('~')
+    base = env.get('RCM_DOC_INDEX_DIR') or os.path.join(
+        env.get('XDG_CACHE_HOME') or os.path.join(home, '.cache'), 'role-context-manager', 'doc-index')
+    key = os.path.abspath(workspace).replace('%', '%25').replace('/', '%2F')
+    if len(key) > 200:
+        key = hashlib.sha256(key.encode('utf-8', 'surrogateescape')).hexdigest()
+    return os.path.join(base, key)
+
+
+def find_index_dir(start, env=None):
+    """Index directory of <start> or of its nearest ancestor that has one, or None."""
+    current = os.path.abspath(start)
+    while True:
+        candidate = index_dir_for(current, env)
+        if os.path.isfile(os.path.join(candidate, MANIFEST)):
+            return candidate
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def default_roots(workspace, env=None):
+    """Workspace the index belongs to and the roots it covers: the effective
+    config dir (as role-manager.sh resolves it) and the bundled templates."""
+    # Only update needs the path config; keep it off the query path
+    from workspace_context import resolve_workspace_config
+    workspace = os.path.abspath(workspace)
+    config_dir, project_root, _, _, _ = resolve_workspace_config(workspace, env)
+    roots = [d for d in (config_dir, TEMPLATES_ROOT) if os.path.isdir(d)]
+    return project_root or workspace, roots
+
+
+def walk(roots):
+    """path -> os.stat_result of every indexable file under <roots>."""
+    files = {}
+    for root in roots:
+        root = os.path.abspath(root)
+        if os.path.isfile(root):
+            files[root] = os.stat(root)
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS)
+            for name in sorted(filenames):
+                if name.lower().endswith(EXTENSIONS):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        files[path] = os.stat(path)
+                    except OSError:
+                        pass
+    return files
+
+
+def load_manifest(index_dir):
+    """The index manifest; raises DocIndexError if missing or unreadable."""
+    path = os.path.join(index_dir, MANIFEST)
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise DocIndexError(f'{path}: {e}')
+    if manifest.get('version') != INDEX_VERSION:
+        raise DocIndexError(f'{path}: unsupported index version {manifest.get("version")}')
+    return manifest
+
+
+def _write_manifest(index_dir, manifest):
+    path = os.path.join(index_dir, MANIFEST)
+    temp = f'{path}.tmp.{os.getpid()}'
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+        f.write('\n')
+    os.replace(temp, path)
+
+
+def _open_segments(index_dir, manifest):
+    segments = []
+    try:
+        for entry in manifest['segments']:
+            segments.append(Segment(os.path.join(index_dir, entry['name'])))
+    except (OSError, DocIndexError):
+        for segment in segments:
+            segment.close()
+        raise
+    return segments
+
+
+def _merged_postings(live):
+    """Postings of every term across segments, renumbered, without deleted documents."""
+    def stream(n, segment):
+        return ((segment.term(i), n, i) for i in range(segment.term_count))
+
+    streams = [stream(n, segment) for n, (segment, _) in enumerate(live)]
+    for term, group in itertools.groupby(heapq.merge(*streams), key=lambda item: item[0]):
+        entries = []
+        for _, n, i in group:
+            segment, numbers = live[n]
+            docs, impacts, lengths, blob = segment.raw_postings(i)
+            end = 0
+            for doc, value, length in zip(docs, impacts, lengths):
+                start, end = end, end + length
+                number = numbers[doc]
+                if number >= 0:
+                    entries.append((number, value, blob[start:end]))
+        if entries:
+            yield term, entries
+
+
+def _merge(index_dir, manifest, segments, name):
+    """Rewrite all segments as one without deleted documents; returns its manifest entry."""
+    restat = manifest['restat']
+    docs = []
+    live = []
+    for entry, segment in zip(manifest['segments'], segments):
+        deleted = set(entry['deleted'])
+        numbers = []
+        for k in range(segment.doc_count):
+            if k in deleted:
+                numbers.append(-1)
+                continue
+            doc = segment.document(k)
+            if doc.path in restat:
+                doc = doc._replace(size=restat[doc.path][0], mtime_ns=restat[doc.path][1])
+            numbers.append(len(docs))
+            docs.append(doc)
+        live.append((segment, numbers))
+    _write_segment(os.path.join(index_dir, name), docs, _merged_postings(live))
+    return {'name': name, 'documents': len(docs), 'deleted': []}
+
+
+def update_index(index_dir, roots, full=False):
+    """Bring the index in <index_dir> up to date with the files under <roots>."""
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, 'lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = None
+        if not full:
+            try:
+                manifest = load_manifest(index_dir)
+            except DocIndexError:
+                pass
+        if manifest is None:
+            manifest = {'version': INDEX_VERSION, 'roots': [], 'segments': [], 'next_segment': 1,
+                        'documents': 0, 'tokens': 0, 'restat': {}}
+        segments = _open_segments(index_dir, manifest)
+        try:
+            return _update(index_dir, manifest, segments, [os.path.abspath(r) for r in roots])
+        finally:
+            for segment in segments:
+                segment.close()
+
+
+def _update(index_dir, manifest, segments, roots):
+    known = {}
+    for entry, segment in zip(manifest['segments'], segments):
+        deleted = set(entry['deleted'])
+        for k in range(segment.doc_count):
+            if k not in deleted:
+                doc = segment.document(k)
+                known[doc.path] = (entry, k, doc)
+
+    restat = manifest['restat']
+    new_restat = {}
+    docs = []
+    postings = defaultdict(list)
+    memo = {}
+    added = changed = unchanged = dropped_tokens = 0
+    for path, st in walk(roots).items():
+        previous = known.pop(path, None)
+        if previous:
+            entry, k, doc = previous
+            if [st.st_size, st.st_mtime_ns] == restat.get(path, [doc.size, doc.mtime_ns]):
+                if path in restat:
+                    new_restat[path] = restat[path]
+                unchanged += 1
+                continue
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            if previous:
+                known[path] = previous
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if previous:
+            if digest == previous[2].sha256:
+                # Touched but not edited: remember the new stat, keep the postings
+                new_restat[path] = [st.st_size, st.st_mtime_ns]
+                unchanged += 1
+                continue
+            previous[0]['deleted'].append(previous[1])
+            dropped_tokens += previous[2].length
+            changed += 1
+        else:
+            added += 1
+        found, length = scan(data, memo)
+        number = len(docs)
+        docs.append(DocMeta(path, st.st_size, st.st_mtime_ns, digest, length))
+        for term, offsets in found.items():
+            postings[term].append((number, len(offsets), _encode_offsets(offsets)))
+
+    for entry, k, doc in known.values():
+        entry['deleted'].append(k)
+        dropped_tokens += doc.length
+    removed = len(known)
+
+    # Impacts use the average document length of the index after this update
+    live_docs = manifest['documents'] + len(docs) - changed - removed
+    live_tokens = manifest['tokens'] + sum(doc.length for doc in docs) - dropped_tokens
+    average = live_tokens / live_docs if live_docs > 0 and live_tokens > 0 else 1
+    for entries in postings.values():
+        entries[:] = [(number, impact(frequency, docs[number].length, average), blob)
+                      for number, frequency, blob in entries]
+
+    written = bool(docs or removed or new_restat != restat or roots != manifest['roots'])
+    if written:
+        if docs:
+            name = f"seg-{manifest['next_segment']:06d}.bin"
+            manifest['next_segment'] += 1
+            _write_segment(os.path.join(index_dir, name), docs, sorted(postings.items()))
+            manifest['segments'].append({'name': name, 'documents': len(docs), 'deleted': []})
+            segments.append(Segment(os.path.join(index_dir, name)))
+        manifest['restat'] = new_restat
+        manifest['roots'] = roots
+
+        total = sum(entry['documents'] for entry in manifest['segments'])
+        deleted = sum(len(entry['deleted']) for entry in manifest['segments'])
+        if len(manifest['segments']) > MAX_SEGMENTS or (total and deleted / total > MAX_DELETED_RATIO):
+            name = f"seg-{manifest['next_segment']:06d}.bin"
+            manifest['next_segment'] += 1
+            manifest['segments'] = [_merge(index_dir, manifest, segments, name)]
+            manifest['restat'] = {}
+            segments.append(Segment(os.path.join(index_dir, name)))
+            segments_by_name = {os.path.basename(s.path): s for s in segments}
+            live_segments = [segments_by_name[name]]
+        else:
+            segments_by_name = {os.path.basename(s.path): s for s in segments}
+            manifest['segments'] = [e for e in manifest['segments'] if len(e['deleted']) < e['documents']]
+            live_segments = [segments_by_name[e['name']] for e in manifest['segments']]
+
+        manifest['documents'] = 0
+        manifest['tokens'] = 0
+        for entry, segment in zip(manifest['segments'], live_segments):
+            deleted = set(entry['deleted'])
+            manifest['documents'] += segment.doc_count - len(deleted)
+            manifest['tokens'] += sum(segment.lengths) - sum(segment.lengths[k] for k in deleted)
+        _write_manifest(index_dir, manifest)
+
+        # Readers holding a mapping of a dropped segment keep working until they close it
+        keep = {entry['name'] for entry in manifest['segments']}
+        for name in os.listdir(index_dir):
+            if name.startswith('seg-') and name not in keep:
+                os.unlink(os.path.join(index_dir, name))
+
+    return UpdateStats(added, changed, removed, unchanged, manifest['documents'],
+                       len(manifest['segments']), written)
+
+
+class DocIndex:
+    """An open index: the manifest and its memory-mapped segments."""
+
+    def __init__(self, index_dir):
+        # An update may drop segments between reading the manifest and opening them
+        for attempt in range(3):
+            self.manifest = load_manifest(index_dir)
+            try:
+                self.segments = _open_segments(index_dir, self.manifest)
+                break
+            except (OSError, DocIndexError):
+                if attempt == 2:
+                    raise
+        self.deleted = [set(entry['deleted']) for entry in self.manifest['segments']]
+        # Documents are numbered across segments: segment n starts at bases[n]
+        self._bases = list(itertools.accumulate([0] + [s.doc_count for s in self.segments]))[:-1]
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _scored_postings(self, n, i, weight):
+        """Document numbers of term <i> of segment <n> and their BM25 contributions."""
+        docs, impacts = self.segments[n].postings(i)
+        table = [weight * level / IMPACT_LEVELS for level in range(IMPACT_LEVELS + 1)]
+        return docs, list(map(table.__getitem__, impacts))
+
+    def _token_scores(self, postings, only=None):
+        """{document: contribution} of one query token (the best of its terms per
+        document); with <only>, just for those documents, looked up by bisection."""
+        parts = []
+        for n, i, weight in postings:
+            base = self._bases[n]
+            if only is None:
+                docs, values = self._scored_postings(n, i, weight)
+                scores = dict(zip(map(base.__add__, docs), values))
+            else:
+                docs, impacts = self.segments[n].postings(i)
+                scores = {}
+                for key in only:
+                    j = bisect.bisect_left(docs, key - base)
+                    if j < len(docs) and docs[j] == key - base:
+                        scores[key] = weight * impacts[j] / IMPACT_LEVELS
+            for doc in self.deleted[n]:
+                scores.pop(base + doc, None)
+            parts.append(scores)
+        if len(parts) == 1:
+            return parts[0]
+        keys = set().union(*parts)
+        return dict(zip(keys, map(max, *[map(part.get, keys, itertools.repeat(0.0)) for part in parts])))
+
+    def _top_single(self, postings, limit):
+        """Ranking of a one-term query, selected from the impact bytes directly."""
+        candidates = []
+        for n, i, weight in postings:
+            docs, impacts = self.segments[n].postings(i)
+            deleted = self.deleted[n]
+            keep = limit + len(deleted)
+            # Lowest impact level that still yields <keep> postings
+            level, count = IMPACT_LEVELS, 0
+            while level > 1 and count < keep:
+                count += impacts.count(level)
+                level -= 1
+            if count >= keep:
+                level += 1
+            chosen = itertools.compress(zip(impacts, docs), map(level.__le__, impacts))
+            candidates.extend((1, weight * value / IMPACT_LEVELS, -(self._bases[n] + doc))
+                              for value, doc in chosen if doc not in deleted)
+        return heapq.nlargest(limit, candidates)
+
+    def _dense_scores(self, postings, scale):
+        """One query token over every document: scale + its contribution where it
+        matches, else 0. Filled by C-level scatters rather than a loop."""
+        dense = [0.0] * (self._bases[-1] + self.segments[-1].doc_count)
+        for n, i, weight in postings:
+            docs, impacts = self.segments[n].postings(i)
+            table = [scale + weight * level / IMPACT_LEVELS for level in range(IMPACT_LEVELS + 1)]
+            keys = list(map(self._bases[n].__add__, docs)) if self._bases[n] else docs
+            values = map(table.__getitem__, impacts)
+            if len(postings) > 1:
+                # Prefix expansions: keep the best match per document
+                values = map(max, map(dense.__getitem__, keys), values)
+            deque(map(dense.__setitem__, keys, values), 0)
+        for n, deleted in enumerate(self.deleted):
+            for doc in deleted:
+                dense[self._bases[n] + doc] = 0.0
+        return dense
+
+    def _rank(self, tokens, limit, rest=()):
+        """(matched, score, -document) of the best documents. Tokens in <rest> are
+        only scored for documents matching one of <tokens>."""
+        # One float orders by matched tokens, then score: no score reaches <scale>
+        scale = sum(max(w for _, _, w in postings) for postings, _ in itertools.chain(tokens, rest)) + 1.0
+        size = self._bases[-1] + self.segments[-1].doc_count
+        if not rest and 4 * sum(df for _, df in tokens) > size * len(tokens):
+            # Most documents match: sum dense per-token lists
+            totals = self._dense_scores(tokens[0][0], scale)
+            for postings, _ in tokens[1:]:
+                totals = list(map(operator.add, totals, self._dense_scores(postings, scale)))
+            keys = range(size)
+        else:
+            contributions = [self._token_scores(postings) for postings, _ in tokens]
+            if rest:
+                candidates = set().union(*contributions)
+                contributions += [self._token_scores(postings, candidates) for postings, _ in rest]
+            matched = Counter(itertools.chain.from_iterable(contributions))
+            keys = list(matched)
+            totals = map(scale.__mul__, map(matched.__getitem__, keys))
+            for scores in contributions:
+                totals = map(operator.add, totals, map(scores.get, keys, itertools.repeat(0.0)))
+            totals = list(totals)
+
+        # Best totals first, ties broken by the lower document number
+        threshold = max(heapq.nlargest(limit, totals)[-1] if len(totals) >= limit else 0.0, scale / 2)
+        chosen = sorted(itertools.compress(zip(totals, keys), map(threshold.__le__, totals)),
+                        key=lambda item: (-item[0], item[1]))[:limit]
+        return [(int(total // scale), total % scale, -key) for total, key in chosen]
+
+    def search(self, question, limit=10):
+        """Best documents for <question>: list of Hit, most query terms matched first, then by BM25."""
+        total = self.manifest['documents']
+        if not total:
+            return []
+        tokens = []
+        for term, prefix in query_terms(question):
+            found = [(n, i) for n, segment in enumerate(self.segments) for i in segment.lookup(term, prefix)]
+            df = sum(self.segments[n].document_frequency(i) for n, i in found)
+            if df:
+                idf = math.log(1 + total / df)
+                weight = idf * (BM25_K1 + 1)
+                tokens.append(([(n, i, weight if self.segments[n].term(i) == term else weight * PREFIX_WEIGHT)
+                                for n, i in found], df))
+        if not tokens:
+            return []
+
+        if len(tokens) == 1 and len({n for n, _, _ in tokens[0][0]}) == len(tokens[0][0]):
+            ranked = self._top_single(tokens[0][0], limit)
+        else:
+            # MaxScore: tokens far commoner than the rest only score the documents
+            # found through the rarer ones. A document matching none of those
+            # matches at most len(rest) tokens, each contributing less than its
+            # weight, so the ranking is exact unless such a document could still
+            # make the cut; then everything is scored.
+            tokens.sort(key=lambda token: token[1])
+            split = next((j for j in range(1, len(tokens))
+                          if tokens[j][1] > LOOKUP_RATIO * sum(df for _, df in tokens[:j])), len(tokens))
+            rest = tokens[split:]
+            ranked = self._rank(tokens[:split], limit, rest)
+            if rest:
+                bound = (len(rest), sum(max(w for _, _, w in postings) for postings, _ in rest))
+                if len(ranked) < limit or ranked[-1][:2] <= bound:
+                    ranked = self._rank(tokens, limit)
+
+        restat = self.manifest['restat']
+        hits = []
+        for count, score, key in ranked:
+            n = bisect.bisect_right(self._bases, -key) - 1
+            doc = -key - self._bases[n]
+            segment = self.segments[n]
+            meta = segment.document(doc)
+            offsets = []
+            for postings, _ in tokens:
+                offsets = next(filter(None, (segment.offsets(i, doc) for m, i, _ in postings if m == n)), [])
+                if offsets:
+                    break
+            try:
+                st = os.stat(meta.path)
+                stale = [st.st_size, st.st_mtime_ns] != restat.get(meta.path, [meta.size, meta.mtime_ns])
+            except OSError:
+                stale = True
+            hits.append(Hit(meta.path, round(score, 3), count, offsets, stale))
+        return hits
+
+    def stats(self):
+        """Counts and on-disk size of the index."""
+        size = sum(os.path.getsize(segment.path) for segment in self.segments)
+        return {
+            'documents': self.manifest['documents'],
+            'deleted': sum(len(d) for d in self.deleted),
+            'segments': len(self.segments),
+            'terms': sum(segment.term_count for segment in self.segments),
+            'tokens': self.manifest['tokens'],
+            'bytes': size,
+            'roots': self.manifest['roots'],
+        }
+
+
+def line_at(path, offset):
+    """Line number and text of the line holding byte <offset> of <path>, or (None, None)."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None, None
+    if offset > len(data):
+        return None, None
+    start = data.rfind(b'\n', 0, offset) + 1
+    end = data.find(b'\n', offset)
+    line = data[start:end if end >= 0 else len(data)]
+    return data.count(b'\n', 0, offset) + 1, line.decode('utf-8', 'replace').strip()
+
+
+def _display(path):
+    relative = os.path.relpath(path)
+    return path if relative.startswith('..') else relative
+
+
+def main(argv=None):
+    """Update, query or describe the document index from the command line."""
+    parser = argparse.ArgumentParser(description='Full-text index over organizational documents.')
+    parser.add_argument('command', choices=['update', 'query', 'stats'])
+    parser.add_argument('terms', nargs='*', help='Query terms; end one with * for a prefix match (query)')
+    parser.add_argument('--index', help='Index directory (default: per workspace, under ~/.cache)')
+    parser.add_argument('--root', action='append', help='Directory to index, repeatable '
+                        '(update, default: the config dir and templates/core)')
+    parser.add_argument('--full', action='store_true', help='Rebuild from scratch (update)')
+    parser.add_argument('--limit', type=int, default=10, help='Maximum results (query, default: 10)')
+    parser.add_argument('--json', action='store_true', help='Machine-readable output')
+    args = parser.parse_intermixed_args(argv)
+
+    if args.command == 'update':
+        if args.root:
+            workspace, roots = os.getcwd(), args.root
+        else:
+            workspace, roots = default_roots(os.getcwd())
+        index_dir = args.index or index_dir_for(workspace)
+        start = time.perf_counter()
+        try:
+            result = update_index(index_dir, roots, args.full)
+        except (OSError, DocIndexError) as e:
+            print(f'Error: {e}', file=sys.stderr)
+            return 2
+        elapsed = (time.perf_counter() - start) * 1000
+        if args.json:
+            print(json.dumps(dict(result._asdict(), index=index_dir, ms=round(elapsed, 1)), indent=2))
+            return 0
+        print(f"{'✓ Index updated' if result.written else 'Index up to date'}: "
+              f'{result.added} added, {result.changed} changed, {result.removed} removed, '
+              f'{result.unchanged} unchanged ({result.documents} documents, '
+              f'{result.segments} segments, {elapsed:.0f} ms)')
+        return 0
+
+    if args.command == 'query' and not args.terms:
+        parser.error('query needs terms')
+    index_dir = args.index or find_index_dir(os.getcwd())
+    try:
+        if index_dir is None:
+            raise DocIndexError('no document index for this workspace')
+        with DocIndex(index_dir) as index:
+            if args.command == 'stats':
+                stats = index.stats()
+                if args.json:
+                    print(json.dumps(dict(stats, index=index_dir), indent=2))
+                else:
+                    print(f'Index: {index_dir}')
+                    print(f"Documents: {stats['documents']} ({stats['deleted']} deleted awaiting merge)")
+                    print(f"Segments: {stats['segments']}, terms: {stats['terms']}, "
+                          f"tokens: {stats['tokens']}, size: {stats['bytes']} bytes")
+                    for root in stats['roots']:
+                        print(f'Root: {root}')
+                return 0
+            hits = index.search(' '.join(args.terms), args.limit)
+    except (OSError, DocIndexError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        print('Run: python3 scripts/doc_index.py update', file=sys.stderr)
+        return 2
+
+    results = []
+    for hit in hits:
+        line, text = line_at(hit.path, hit.offsets[0]) if hit.offsets and not hit.stale else (None, None)
+        results.append(dict(hit._asdict(), line=line, text=text))
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0 if results else 1
+    if not results:
+        print('No matches')
+        return 1
+    for result in results:
+        location = _display(result['path'])
+        if result['line']:
+            location += f":{result['line']}"
+        print(f"{result['score']:8.2f}  {location}{'  (changed since indexed)' if result['stale'] else ''}")
+        if result['text']:
+            print(f"          {result['text'][:160]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
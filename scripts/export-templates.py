@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Export a template tree of Markdown documents as styled PDF and HTML files.
+
+Every *.md file under the source directories (role guides in .claude/ included)
+is converted to HTML and rendered to PDF with the cheatsheet stylesheet from
+generate-cheatsheet.py. Each worker process parses the stylesheet and loads
+fonts once and reuses them for every file it renders. Files whose content
+hash has not changed since the previous export are skipped, and an index
+document linking every exported file is written to the output directory.
+
+Python-Markdown is used for the Markdown conversion when installed; otherwise
+a built-in converter handles the subset used by the templates (headings,
+lists, task lists, tables, code blocks, block quotes and inline markup).
+"""
+
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import markdown as markdown_lib
+except ImportError:
+    markdown_lib = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_SOURCES = [os.path.join(PLUGIN_ROOT, 'templates', 'core')]
+DEFAULT_OUTPUT = os.path.join(PLUGIN_ROOT, 'build', 'template-exports')
+MANIFEST_NAME = '.export-manifest.json'
+STYLESHEET_NAME = 'style.css'
+
+# Bump when the conversion changes so every file is re-exported
+EXPORT_VERSION = 1
+
+# Document pages extend the cheatsheet stylesheet; it forces a page break
+# before every h1 and has no table styling of its own
+DOCUMENT_CSS = """
+        h1 { page-break-before: auto; margin-top: 0; }
+        table { border-collapse: collapse; width: 100%; margin: 10px 0 15px 0; font-size: 9.5pt; }
+        th, td { border: 1px solid #CBD5E0; padding: 5px 8px; text-align: left; vertical-align: top; }
+        th { background: #EDF2F7; }
+        blockquote { border-left: 4px solid #CBD5E0; padding-left: 12px; color: #4A5568; margin: 10px 0; }
+        hr { border: none; border-top: 1px solid #E2E8F0; margin: 20px 0; }
+        .breadcrumb { font-size: 9pt; color: #4A5568; margin-bottom: 10px; }
+        .index-group { margin-bottom: 20px; }
+"""
+
+_cheatsheet = None
+_worker_state = {}
+
+
+def load_cheatsheet_module():
+    """Import generate-cheatsheet.py (not importable by name because of the dash)."""
+    global _cheatsheet
+    if _cheatsheet is None:
+        path = os.path.join(SCRIPT_DIR, 'generate-cheatsheet.py')
+        spec = importlib.util.spec_from_file_location('generate_cheatsheet', path)
+        _cheatsheet = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_cheatsheet)
+    return _cheatsheet
+
+
+def stylesheet_text():
+    """Return the cheatsheet stylesheet plus the document additions.
+
+    generate-cheatsheet.py only imports WeasyPrint when it renders, so this
+    works for HTML-only exports on hosts without it.
+    """
+    return load_cheatsheet_module().generate_css() + DOCUMENT_CSS
+
+
+# ============================================================================
+# Markdown conversion
+# ============================================================================
+
+def slugify(text):
+    """GitHub-style heading anchor."""
+    text = re.sub(r'<[^>]+>', '', text).strip().lower()
+    text = re.sub(r'[^\w\- ]', '', text)
+    return re.sub(r'\s', '-', text)
+
+
+def rewrite_link(url, link_ext):
+    """Point relative links at other Markdown files to their exported form."""
+    if re.match(r'^[a-z][a-z0-9+.-]*:|^#|^/', url, re.IGNORECASE):
+        return url
+    path, sep, fragment = url.partition('#')
+    if path.endswith('.md'):
+        path = path[:-3] + link_ext
+    return path + sep + fragment
+
+
+def render_inline(text, link_ext):
+    """Convert inline Markdown (code, links, emphasis) to HTML."""
+    parts = re.split(r'(`+[^`]*?`+)', text)
+    out = []
+    for part in parts:
+        if part.startswith('`') and part.endswith('`') and len(part) > 1:
+            out.append(f"<code>{html.escape(part.strip('`'))}</code>")
+            continue
+        part = html.escape(part, quote=False)
+        part = re.sub(r'!\[([^\]]*)\]\(([^)\s]+)\)', r'\1', part)
+        part = re.sub(r'\[([^\]]+)\]\(([^)\s]+)\)',
+                      lambda m: f'<a href="{html.escape(rewrite_link(m.group(2), link_ext))}">{m.group(1)}</a>',
+                      part)
+        part = re.sub(r'\*\*(.+?)\*\*|__(.+?)__', lambda m: f'<strong>{m.group(1) or m.group(2)}</strong>', part)
+        part = re.sub(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])', r'<em>\1</em>', part)
+        out.append(part)
+    return ''.join(out)
+
+
+LIST_ITEM = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+
+
+def render_list(items, link_ext):
+    """Render [(indent, marker, text)] as nested <ul>/<ol> elements."""
+    out = []
+    stack = []  # [(indent, tag)]
+    for indent, marker, text in items:
+        tag = 'ol' if marker[0].isdigit() else 'ul'
+        while stack and indent < stack[-1][0]:
+            out.append(f'</li></{stack.pop()[1]}>')
+        if not stack or indent > stack[-1][0]:
+            out.append(f'<{tag}>')
+            stack.append((indent, tag))
+        else:
+            out.append('</li>')
+        task = re.match(r'^\[([ xX])\]\s+(.*)$', text)
+        if task:
+            text = ('☑ ' if task.group(1) in 'xX' else '☐ ') + task.group(2)
+        out.append(f'<li>{render_inline(text, link_ext)}')
+    while stack:
+        out.append(f'</li></{stack.pop()[1]}>')
+    return ''.join(out)
+
+
+def split_table_row(line):
+    """Split a pipe table row into cells."""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+
+def markdown_to_html(text, link_ext='.html'):
+    """Convert Markdown to an HTML fragment."""
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
+    if markdown_lib is not None:
+        body = markdown_lib.markdown(text, extensions=['tables', 'fenced_code', 'toc'])
+        return re.sub(r'href="([^"]+)"',
+                      lambda m: f'href="{rewrite_link(html.unescape(m.group(1)), link_ext)}"', body)
+
+    lines = text.splitlines()
+    out = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+
+        if not stripped:
+            i += 1
+            continue
+
+        fence = re.match(r'^\s*(```+|~~~+)', line)
+        if fence:
+            marker = fence.group(1)
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            out.append(f"<pre><code>{html.escape(chr(10).join(code))}</code></pre>")
+            i += 1
+            continue
+
+        heading = re.match(r'^(#{1,6})\s+(.*?)\s*#*\s*$', line)
+        if heading:
+            level = len(heading.group(1))
+            content = render_inline(heading.group(2), link_ext)
+            out.append(f'<h{level} id="{slugify(content)}">{content}</h{level}>')
+            i += 1
+            continue
+
+        if re.match(r'^\s*([-*_])(\s*\1){2,}\s*$', line):
+            out.append('<hr>')
+            i += 1
+            continue
+
+        if stripped.startswith('|') and i + 1 < len(lines) and \
+                re.match(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$', lines[i + 1]):
+            header = split_table_row(line)
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                rows.append(split_table_row(lines[i]))
+                i += 1
+            table = ['<table><thead><tr>']
+            table.extend(f'<th>{render_inline(cell, link_ext)}</th>' for cell in header)
+            table.append('</tr></thead><tbody>')
+            for row in rows:
+                table.append('<tr>' + ''.join(f'<td>{render_inline(cell, link_ext)}</td>' for cell in row) + '</tr>')
+            table.append('</tbody></table>')
+            out.append(''.join(table))
+            continue
+
+        if stripped.startswith('>'):
+            quoted = []
+            while i < len(lines) and lines[i].strip().startswith('>'):
+                quoted.append(re.sub(r'^\s*>\s?', '', lines[i]))
+                i += 1
+            out.append(f"<blockquote>{markdown_to_html(chr(10).join(quoted), link_ext)}</blockquote>")
+            continue
+
+        if LIST_ITEM.match(line):
+            items = []
+            while i < len(lines):
+                item = LIST_ITEM.match(lines[i])
+                if item:
+                    items.append((len(item.group(1).expandtabs(4)), item.group(2), item.group(3)))
+                elif lines[i].strip() and lines[i].startswith((' ', '\t')) and items:
+                    # Continuation line of the previous item
+                    indent, marker, previous = items[-1]
+                    items[-1] = (indent, marker, f'{previous} {lines[i].strip()}')
+                else:
+                    break
+                i += 1
+            out.append(render_list(items, link_ext))
+            continue
+
+        paragraph = []
+        while i < len(lines) and lines[i].strip() and not re.match(
+                r'^\s*(#{1,6}\s|```|~~~|>|\||([-*_])(\s*\2){2,}\s*$)', lines[i]) and \
+                not LIST_ITEM.match(lines[i]):
+            paragraph.append(lines[i].strip())
+            i += 1
+        if not paragraph:
+            # Line looked like a block start but did not form one
+            paragraph.append(stripped)
+            i += 1
+        out.append(f"<p>{render_inline(chr(10).join(paragraph), link_ext)}</p>")
+
+    return '\n'.join(out)
+
+
+def document_title(text, fallback):
+    """First level-1 heading of a Markdown document."""
+    match = re.search(r'^#\s+(.+?)\s*#*\s*$', text, re.MULTILINE)
+    return match.group(1).strip() if match else fallback
+
+
+def wrap_html(title, body, stylesheet_href=None, breadcrumb=None):
+    """Wrap an HTML fragment in a full document."""
+    style = f'<link rel="stylesheet" href="{html.escape(stylesheet_href)}">' if stylesheet_href else ''
+    crumb = f'<div class="breadcrumb">{html.escape(breadcrumb)}</div>' if breadcrumb else ''
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{html.escape(title)}</title>
+    {style}
+</head>
+<body>
+{crumb}
+{body}
+</body>
+</html>
+"""
+
+
+# ============================================================================
+# Rendering
+# ============================================================================
+
+def _init_worker():
+    """Parse the stylesheet and set up fonts once per PDF worker process."""
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+    font_config = FontConfiguration()
+    _worker_state['font_config'] = font_config
+    _worker_state['stylesheet'] = CSS(string=stylesheet_text(), font_config=font_config)
+
+
+def _export_file(job):
+    """Convert one Markdown file to HTML and/or PDF in a worker process."""
+    source, rel_path, output_dir, formats = job
+    started = time.perf_counter()
+    with open(source, 'r', encoding='utf-8') as f:
+        text = f.read()
+    title = document_title(text, os.path.basename(rel_path))
+    stem = os.path.splitext(rel_path)[0]
+    written = []
+
+    if 'html' in formats:
+        depth = rel_path.count('/')
+        target = os.path.join(output_dir, stem + '.html')
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(wrap_html(title, markdown_to_html(text, '.html'),
+                              '../' * depth + STYLESHEET_NAME, rel_path))
+        written.append(target)
+
+    if 'pdf' in formats:
+        from weasyprint import HTML
+        if not _worker_state:
+            _init_worker()
+        target = os.path.join(output_dir, stem + '.pdf')
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        document = wrap_html(title, markdown_to_html(text, '.pdf'), breadcrumb=rel_path)
+        HTML(string=document, base_url=os.path.dirname(source)).write_pdf(
+            target, stylesheets=[_worker_state['stylesheet']],
+            font_config=_worker_state['font_config'])
+        written.append(target)
+
+    return {'path': rel_path, 'title': title, 'outputs': written,
+            'seconds': time.perf_counter() - started}
+
+
+def content_hash(path, style_hash, formats):
+    """Hash of a source file plus everything else that affects its outputs."""
+    digest = hashlib.sha256()
+    digest.update(f'{EXPORT_VERSION}:{style_hash}:{",".join(sorted(formats))}:'.encode())
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def discover(sources):
+    """Return [(absolute path, path relative to the output root)] for every *.md file."""
+    found = []
+    for source in sources:
+        source = os.path.abspath(source)
+        prefix = os.path.basename(source.rstrip(os.sep)) if len(sources) > 1 else ''
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith('.md'):
+                    full = os.path.join(dirpath, name)
+                    rel = os.path.relpath(full, source)
+                    found.append((full, os.path.join(prefix, rel).replace(os.sep, '/')))
+    return found
+
+
+def write_index(output_dir, entries, formats):
+    """Write index.html (and index.pdf) linking every exported document."""
+    groups = {}
+    for entry in sorted(entries, key=lambda e: e['path']):
+        groups.setdefault(os.path.dirname(entry['path']) or '.', []).append(entry)
+
+    def body(ext):
+        parts = ['<h1>Template Documents</h1>',
+                 f'<p>{len(entries)} documents exported.</p>']
+        for group, items in groups.items():
+            parts.append(f'<div class="index-group"><h3>{html.escape(group)}</h3><ul>')
+            for item in items:
+                href = os.path.splitext(item['path'])[0] + ext
+                parts.append(f'<li><a href="{html.escape(href)}">{html.escape(item["title"])}</a> '
+                             f'<span class="breadcrumb">{html.escape(item["path"])}</span></li>')
+            parts.append('</ul></div>')
+        return '\n'.join(parts)
+
+    written = []
+    if 'html' in formats:
+        path = os.path.join(output_dir, 'index.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(wrap_html('Template Documents', body('.html'), STYLESHEET_NAME))
+        written.append(path)
+    if 'pdf' in formats:
+        from weasyprint import CSS, HTML
+        path = os.path.join(output_dir, 'index.pdf')
+        HTML(string=wrap_html('Template Documents', body('.pdf')), base_url=output_dir).write_pdf(
+            path, stylesheets=[CSS(string=stylesheet_text())])
+        written.append(path)
+    return written
+
+
+def export_tree(sources, output_dir, formats, jobs, force=False):
+    """Export every Markdown file under <sources>; returns a summary dict."""
+    os.makedirs(output_dir, exist_ok=True)
+    css = stylesheet_text()
+    style_hash = hashlib.sha256(css.encode()).hexdigest()
+    if 'html' in formats:
+        with open(os.path.join(output_dir, STYLESHEET_NAME), 'w', encoding='utf-8') as f:
+            f.write(css)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        manifest = {}
+    files = manifest.get('files', {})
+
+    work = []
+    entries = []
+    current = {}
+    for source, rel_path in discover(sources):
+        digest = content_hash(source, style_hash, formats)
+        previous = files.get(rel_path)
+        current[rel_path] = previous
+        if not force and previous and previous['hash'] == digest and \
+                all(os.path.exists(p) for p in previous['outputs']):
+            entries.append(previous)
+            continue
+        work.append((source, rel_path, digest))
+
+    started = time.perf_counter()
+    if work:
+        jobs = max(1, min(jobs, len(work)))
+        payload = [(source, rel_path, output_dir, formats) for source, rel_path, _ in work]
+        if jobs == 1:
+            results = [_export_file(job) for job in payload]
+        else:
+            initializer = _init_worker if 'pdf' in formats else None
+            with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as pool:
+                results = list(pool.map(_export_file, payload))
+        for (_, rel_path, digest), result in zip(work, results):
+            result['hash'] = digest
+            current[rel_path] = {key: result[key] for key in ('path', 'title', 'outputs', 'hash')}
+            entries.append(current[rel_path])
+            print(f"  ✓ {rel_path} ({result['seconds']:.2f}s)")
+
+    # Outputs of sources that no longer exist are stale
+    removed = [rel_path for rel_path in files if rel_path not in current]
+    for rel_path in removed:
+        for output in files[rel_path].get('outputs', []):
+            if os.path.exists(output):
+                os.remove(output)
+
+    index = []
+    index_files = [os.path.join(output_dir, f'index.{fmt}') for fmt in formats]
+    if work or removed or not all(os.path.exists(path) for path in index_files):
+        index = write_index(output_dir, entries, formats)
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': EXPORT_VERSION, 'formats': sorted(formats),
+                   'files': {k: v for k, v in sorted(current.items()) if v}}, f, indent=2)
+        f.write('\n')
+
+    return {'exported': len(work), 'skipped': len(entries) - len(work),
+            'index': index, 'seconds': time.perf_counter() - started}
+
+
+def main(argv=None):
+    """Parse arguments and export the template tree."""
+    parser = argparse.ArgumentParser(description='Export Markdown template trees as styled PDF and HTML.')
+    parser.add_argument('sources', nargs='*', default=DEFAULT_SOURCES,
+                        help='Template directories to export (default: templates/core)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help='Output directory (default: build/template-exports)')
+    parser.add_argument('--format', default='pdf,html',
+                        help='Comma-separated output formats: pdf, html (default: pdf,html)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Re-export unchanged files')
+    args = parser.parse_args(argv)
+
+    formats = {fmt.strip() for fmt in args.format.split(',') if fmt.strip()}
+    if not formats or formats - {'pdf', 'html'}:
+        print(f"Error: Invalid --format '{args.format}' (use pdf, html or pdf,html)", file=sys.stderr)
+        return 1
+    for source in args.sources:
+        if not os.path.isdir(source):
+            print(f"Error: Source directory not found: {source}", file=sys.stderr)
+            return 1
+    if 'pdf' in formats:
+        try:
+            import weasyprint  # noqa: F401
+        except (ImportError, OSError) as e:
+            print(f"Error: PDF export needs WeasyPrint ({e}); use --format html", file=sys.stderr)
+            return 2
+
+    print(f"Exporting {', '.join(args.sources)} → {args.output}")
+    summary = export_tree(args.sources, args.output, formats, args.jobs, args.force)
+    print(f"\n✓ Exported {summary['exported']} file(s), skipped {summary['skipped']} unchanged "
+          f"in {summary['seconds']:.2f}s")
+    for path in summary['index']:
+        print(f"  Index: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,65 @@
 """
 Generate a comprehensive cheatsheet PDF for the role-context-manager plugin.
 This script creates an HTML document with embedded CSS and converts it to PDF using WeasyPrint.
+
+When pypdf is installed the PDF is laid out section by section in parallel
+worker processes and the pages are merged afterwards; otherwise (or with
+--single-pass) the whole document goes through one write_pdf() call.
+
+CHEATSHEET.index.json, the search index used by cheatsheet_index.py, is
+written alongside CHEATSHEET.md whenever the Markdown content changes.
+
+--variants renders several versions of the PDF in one process: the built-in
+a4-print, a4-screen, letter-print and letter-screen, and any named variants
+from --variants-file, a JSON object such as
+
+    {"startup-letter": {"size": "Letter", "media": "print",
+                        "commands": ["/init-org-template", "/set-role"]}}
+
+where "size" is a CSS page size name (A4, Letter, "A5 landscape", ...) or
+"<width> <height>" lengths and "commands" keeps only those command blocks.
+Variant definitions are checked before anything is rendered. WeasyPrint,
+the fonts and the generate_css() stylesheet are loaded once and shared by
+every render.
+
+WeasyPrint is imported by the functions that render, so the HTML, Markdown,
+section and variant helpers can be used (and tested) without it.
 """
 
-from weasyprint import HTML
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import ctypes
+import ctypes.util
+import importlib.util
+import io
+import json
 import os
+import re
+import select
+import signal
+import struct
+import subprocess
+import sys
+import time
+
+from cheatsheet_index import write_index
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.annotations import Link
+    from pypdf.generic import Fit
+except ImportError:
+    PdfWriter = None
+
+# Top-level phase sections marked in generate_html(), in document order
+PHASE_SECTIONS = ['setup', 'configuration', 'daily', 'maintenance',
+                  'scope', 'reference', 'patterns', 'hooks']
+
+# CSS pixels to PDF points (WeasyPrint renders at 96 dpi)
+PX_TO_PT = 0.75
+
+# Page numbers are stamped after merging, so section renders leave the footer empty
+NO_FOOTER_CSS = '@page { @bottom-center { content: none; } }'
 
 def generate_css():
     """Generate professional/corporate CSS styling."""
@@ -320,9 +375,9 @@ def generate_css():
         }
     """
 
-def generate_html():
+def generate_html(embed_css=True):
     """Generate the complete HTML content for the cheatsheet."""
-    css = generate_css()
+    css = generate_css() if embed_css else ''
 
     html = f"""
 <!DOCTYPE html>
@@ -1329,22 +1384,632 @@ Issues detected:
 
     return md
 
-def main():
-    """Main function to generate both PDF and Markdown cheatsheets."""
-    print("Generating Role Context Manager Cheatsheet...")
+def split_sections(html):
+    """Split the cheatsheet HTML into standalone documents, one per phase section.
+
+    The header, table of contents and #setup share the first chunk because
+    #setup is the first h1 and does not start a new page; every later phase
+    h1 forces a page break, so laying it out separately gives the same pages.
+    """
+    head, body_start, rest = html.partition('<body>')
+    body, body_end, tail = rest.rpartition('</body>')
+    pattern = '|'.join(re.escape(name) for name in PHASE_SECTIONS[1:])
+    starts = [m.start() for m in re.finditer(rf'<h1 id="(?:{pattern})">', body)]
+    bounds = [0] + starts + [len(body)]
+    return [f"{head}{body_start}{body[start:end]}{body_end}{tail}"
+            for start, end in zip(bounds, bounds[1:])]
+
+
+def _render_section(job):
+    """Lay out one section in a worker process and return its PDF and link data."""
+    from weasyprint import CSS, HTML
+
+    index, html = job
+    started = time.perf_counter()
+    document = HTML(string=html).render(stylesheets=[CSS(string=NO_FOOTER_CSS)])
+
+    anchors = {}
+    links = []
+    for page_index, page in enumerate(document.pages):
+        for name, point in page.anchors.items():
+            anchors.setdefault(name, (page_index, point[0], point[1]))
+        # Internal links are re-created after merging, when every anchor's
+        # final page is known; dropping them here also keeps WeasyPrint from
+        # logging the anchors that live in other sections as missing
+        for link in page.links:
+            if link[0] == 'internal':
+                links.append((page_index, link[1], tuple(link[2])))
+        page.links[:] = [link for link in page.links if link[0] != 'internal']
+
+    pdf = document.write_pdf()
+    return {
+        'index': index,
+        'pdf': pdf,
+        'pages': len(document.pages),
+        'height': document.pages[0].height if document.pages else 0,
+        'anchors': anchors,
+        'links': links,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def render_page_numbers(count):
+    """Render <count> transparent pages carrying only the generate_css() footer."""
+    from weasyprint import HTML
+
+    pages = '<div style="break-before: page"></div>' * (count - 1)
+    html = f"""<!DOCTYPE html>
+<html><head><style>{generate_css()} html, body {{ background: none; }}</style></head>
+<body><div></div>{pages}</body></html>"""
+    return HTML(string=html).write_pdf()
+
+
+def merge_sections(results, pdf_path, page_numbers=render_page_numbers):
+    """Merge rendered sections into one PDF with page numbers, TOC links and outline.
+
+    page_numbers(count) returns the PDF whose <count> pages are stamped onto
+    the merged pages.
+    """
+    results = sorted(results, key=lambda r: r['index'])
+    writer = PdfWriter()
+    offsets = []
+    for result in results:
+        offsets.append(len(writer.pages))
+        writer.append(io.BytesIO(result['pdf']), import_outline=True)
+
+    stamps = PdfReader(io.BytesIO(page_numbers(len(writer.pages))))
+    for page, stamp in zip(writer.pages, stamps.pages):
+        page.merge_page(stamp)
+
+    # Resolve every internal link against the merged page order
+    targets = {}
+    for result, offset in zip(results, offsets):
+        for name, (page_index, x, y) in result['anchors'].items():
+            targets.setdefault(name, (offset + page_index, x, y))
+
+    for result, offset in zip(results, offsets):
+        for page_index, name, (x, y, width, height) in result['links']:
+            if name not in targets:
+                print(f"  Warning: No anchor #{name} for internal link")
+                continue
+            target_page, target_x, target_y = targets[name]
+            page_height = float(writer.pages[offset + page_index].mediabox.height)
+            target_height = float(writer.pages[target_page].mediabox.height)
+            rect = (x * PX_TO_PT, page_height - (y + height) * PX_TO_PT,
+                    (x + width) * PX_TO_PT, page_height - y * PX_TO_PT)
+            writer.add_annotation(offset + page_index, Link(
+                rect=rect, target_page_index=target_page,
+                fit=Fit.xyz(left=target_x * PX_TO_PT,
+                            top=target_height - target_y * PX_TO_PT)))
+
+    with open(pdf_path, 'wb') as f:
+        writer.write(f)
+    return len(writer.pages)
+
+
+def render_pdf_parallel(html_content, pdf_path, jobs):
+    """Render sections in a process pool and merge them into <pdf_path>."""
+    chunks = split_sections(html_content)
+    # Largest sections first so the longest layout starts immediately
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]), reverse=True)
+    workers = min(jobs, len(chunks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_render_section, [(i, chunks[i]) for i in order]))
+    for result in sorted(results, key=lambda r: r['index']):
+        print(f"  Section {result['index'] + 1}/{len(chunks)}: "
+              f"{result['pages']} page(s) in {result['seconds']:.2f}s")
+    page_count = merge_sections(results, pdf_path)
+    print(f"  Merged {page_count} pages from {len(chunks)} sections using {workers} workers")
+    return page_count
+
+
+def render_pdf_single(html_content, pdf_path):
+    """Render the whole document with a single write_pdf() call."""
+    from weasyprint import HTML
+
+    HTML(string=html_content).write_pdf(pdf_path)
+
+
+def write_pdf(html_content, pdf_path, jobs, single_pass=False, report_speedup=False):
+    """Render the cheatsheet PDF, in parallel sections when possible."""
+    parallel = not single_pass and jobs > 1
+    if parallel and PdfWriter is None:
+        print("  pypdf not installed - falling back to single-pass rendering")
+        parallel = False
+
+    print(f"Converting to PDF at {pdf_path}...")
+    started = time.perf_counter()
+    if parallel:
+        render_pdf_parallel(html_content, pdf_path, jobs)
+    else:
+        render_pdf_single(html_content, pdf_path)
+    render_seconds = time.perf_counter() - started
+    print(f"  Render time: {render_seconds:.2f}s")
+
+    if report_speedup and parallel:
+        started = time.perf_counter()
+        render_pdf_single(html_content, pdf_path + '.single-pass')
+        single_seconds = time.perf_counter() - started
+        os.remove(pdf_path + '.single-pass')
+        print(f"  Single-pass render time: {single_seconds:.2f}s "
+              f"(speedup {single_seconds / render_seconds:.2f}x)")
+
+
+# ============================================================================
+# Variants
+# ============================================================================
+
+# Built-in variants are named <size>-<media>
+VARIANT_SIZES = {'a4': 'A4', 'letter': 'Letter'}
+VARIANT_MEDIA = ['print', 'screen']
+DEFAULT_VARIANTS = [f'{size}-{media}' for size in VARIANT_SIZES for media in VARIANT_MEDIA]
+
+# A --variants-file "size" is a CSS page size: a name (optionally with an
+# orientation) or one or two lengths. It is spliced into an @page rule, so
+# nothing else is accepted.
+_PAGE_LENGTH = r'\d+(?:\.\d+)?(?:in|cm|mm|pt|pc|px)'
+PAGE_SIZE = re.compile(
+    rf'(?:A[3-5]|B[45]|JIS-B[45]|letter|legal|ledger)(?: (?:portrait|landscape))?'
+    rf'|{_PAGE_LENGTH}(?: {_PAGE_LENGTH})?',
+    re.IGNORECASE)
+
+# Screen variants have no page footer, narrower margins and larger type
+SCREEN_CSS = """
+    @page { margin: 0.4in; @bottom-center { content: none; } }
+    body { font-size: 12pt; }
+"""
+
+COMMAND_NAME = re.compile(r'<div class="command-name"><span class="command">(/[\w-]+)')
+DIV_TAG = re.compile(r'<div\b|</div>')
+
+
+def _remove_divs(html, cls, predicate):
+    """Remove the outermost <div class="<cls> ..."> elements for which predicate(element) is true."""
+    pieces = []
+    pos = 0
+    for match in re.finditer(rf'<div class="{cls}[ "]', html):
+        if match.start() < pos:
+            continue
+        depth = 0
+        for tag in DIV_TAG.finditer(html, match.start()):
+            depth += 1 if tag.group() == '<div' else -1
+            if depth == 0:
+                break
+        if predicate(html[match.start():tag.end()]):
+            pieces.append(html[pos:match.start()])
+            pos = tag.end()
+    pieces.append(html[pos:])
+    return ''.join(pieces)
+
+
+def filter_commands(html, commands):
+    """Keep only the command blocks of <commands>, dropping phase sections left empty."""
+    keep = {'/' + command.lstrip('/') for command in commands}
+    unknown = keep - set(COMMAND_NAME.findall(html))
+    if unknown:
+        raise ValueError(f"unknown command(s): {', '.join(sorted(unknown))}")
+
+    def unlisted(block):
+        return COMMAND_NAME.search(block).group(1) not in keep
+
+    def emptied(section):
+        filtered = _remove_divs(section, 'command-block', unlisted)
+        return filtered != section and 'class="command-block"' not in filtered
+
+    return _remove_divs(_remove_divs(html, 'phase-section', emptied), 'command-block', unlisted)
+
+
+def load_variants(names, path=None):
+    """Variants for the built-in <names> and those defined in the JSON file <path>."""
+    variants = []
+    for name in names:
+        size, _, media = name.partition('-')
+        if size not in VARIANT_SIZES or media not in VARIANT_MEDIA:
+            raise ValueError(f"unknown variant '{name}' (built-in: {', '.join(DEFAULT_VARIANTS)})")
+        variants.append({'name': name, 'size': VARIANT_SIZES[size], 'media': media, 'commands': None})
+    if path:
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+        if not isinstance(spec, dict):
+            raise ValueError(f'{path} must hold a JSON object of named variants')
+        for name, fields in spec.items():
+            if not re.fullmatch(r'[\w.-]+', name) or not isinstance(fields, dict):
+                raise ValueError(f"invalid variant '{name}' in {path}")
+            media = fields.get('media', 'print')
+            if media not in VARIANT_MEDIA:
+                raise ValueError(f"variant '{name}': media must be one of {', '.join(VARIANT_MEDIA)}")
+            size = fields.get('size', 'A4')
+            if not isinstance(size, str) or not PAGE_SIZE.fullmatch(size):
+                raise ValueError(f"variant '{name}': size must be a page size name such as A4 or "
+                                 f"Letter, or '<width> <height>' lengths such as '210mm 297mm'")
+            commands = fields.get('commands')
+            if commands is not None and (not isinstance(commands, list)
+                                         or not all(isinstance(c, str) for c in commands)):
+                raise ValueError(f"variant '{name}': commands must be a list of command names")
+            variants.append({'name': name, 'size': size, 'media': media,
+                             'commands': commands})
+    return variants
+
+
+def _document_key(variant):
+    """Variants with the same media and commands render the same parsed document."""
+    commands = variant['commands']
+    return variant['media'], tuple(commands) if commands is not None else None
+
+
+def render_variants(variants, output_dir):
+    """Render every variant to <output_dir>/CHEATSHEET-<name>.pdf in this process.
+
+    One FontConfiguration and one compiled generate_css() stylesheet serve
+    every render (it has no @media rules, so print and screen can share it);
+    each variant adds only a small page-size/media stylesheet, and variants
+    with the same media and commands share one parsed document.
+    """
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    started = time.perf_counter()
+    font_config = FontConfiguration()
+    stylesheet = CSS(string=generate_css(), font_config=font_config)
+    html_content = generate_html(embed_css=False)
+    # Every document is parsed (and its command list checked) before any render
+    documents = {}
+    for variant in variants:
+        key = _document_key(variant)
+        if key not in documents:
+            media, commands = key
+            html = html_content if commands is None else filter_commands(html_content, commands)
+            documents[key] = HTML(string=html, media_type=media)
+    setup_seconds = time.perf_counter() - started
+    print(f"  Shared setup (fonts, stylesheet, {len(documents)} document(s)): {setup_seconds:.2f}s")
+
+    overrides = {}
+    results = []
+    for variant in variants:
+        started = time.perf_counter()
+        override = f"@page {{ size: {variant['size']}; }}"
+        if variant['media'] == 'screen':
+            override += SCREEN_CSS
+        if override not in overrides:
+            overrides[override] = CSS(string=override, font_config=font_config)
+        document = documents[_document_key(variant)].render(
+            stylesheets=[stylesheet, overrides[override]], font_config=font_config)
+        laid_out = time.perf_counter()
+        path = os.path.join(output_dir, f"CHEATSHEET-{variant['name']}.pdf")
+        document.write_pdf(path)
+        finished = time.perf_counter()
+        results.append({'name': variant['name'], 'path': path, 'pages': len(document.pages),
+                        'layout_seconds': laid_out - started, 'write_seconds': finished - laid_out,
+                        'seconds': finished - started})
+        print(f"  {variant['name']}: {len(document.pages)} page(s) in {finished - started:.2f}s "
+              f"(layout {laid_out - started:.2f}s, write {finished - laid_out:.2f}s) -> {path}")
+
+    total = setup_seconds + sum(result['seconds'] for result in results)
+    print(f"  Total: {total:.2f}s for {len(results)} variant(s), "
+          f"{total / len(results):.2f}s per variant with setup paid once")
+    return results
+
+
+# ============================================================================
+# Watch mode
+# ============================================================================
+
+# Seconds without further changes before regenerating
+WATCH_DEBOUNCE = 0.3
+WATCH_POLL_INTERVAL = 0.5
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Report changes to a set of files using Linux inotify via ctypes.
+
+    The parent directories are watched rather than the files themselves, so
+    editors that save by writing a new file and renaming it are still seen.
+    """
+
+    def __init__(self, paths):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError('libc not found')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError('inotify not supported')
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.names = {}  # watch descriptor -> (directory, {basename})
+        by_dir = {}
+        for path in paths:
+            by_dir.setdefault(os.path.dirname(path), set()).add(os.path.basename(path))
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for directory, names in by_dir.items():
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+            self.names[wd] = (directory, names)
+
+    def wait(self, timeout):
+        """Return the set of watched paths changed within <timeout> seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + IN_EVENT_HEADER.size <= len(data):
+            wd, _, _, length = IN_EVENT_HEADER.unpack_from(data, offset)
+            offset += IN_EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            directory, names = self.names.get(wd, (None, ()))
+            if name in names:
+                changed.add(os.path.join(directory, name))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Report changes to a set of files by polling their mtime and size."""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.state = {path: self._stat(path) for path in self.paths}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def wait(self, timeout):
+        """Return the set of watched paths changed within <timeout> seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                current = self._stat(path)
+                if current != self.state[path]:
+                    self.state[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            interval = WATCH_POLL_INTERVAL
+            if deadline is not None:
+                interval = min(interval, max(deadline - time.monotonic(), 0))
+            time.sleep(interval)
+
+    def close(self):
+        pass
+
+
+def debounce(watcher, changed, quiet=WATCH_DEBOUNCE):
+    """Add further changes to <changed> until none arrive for <quiet> seconds.
+
+    Editors often write several times per save.
+    """
+    while True:
+        more = watcher.wait(quiet)
+        if not more:
+            return changed
+        changed |= more
+
+
+def load_generator():
+    """Load a fresh copy of this script so edits to its content functions are picked up."""
+    spec = importlib.util.spec_from_file_location('generate_cheatsheet_live', os.path.abspath(__file__))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class BackgroundRender:
+    """A PDF render running in a child process, replaced atomically on success."""
+
+    def __init__(self, pdf_path, jobs, single_pass):
+        self.pdf_path = pdf_path
+        self.tmp_path = f"{pdf_path}.rendering"
+        self.started = time.perf_counter()
+        command = [sys.executable, os.path.abspath(__file__), '--pdf-only',
+                   '--pdf-path', self.tmp_path, '--jobs', str(jobs)]
+        if single_pass:
+            command.append('--single-pass')
+        # A new session lets cancel() stop the render's section workers as well
+        self.process = subprocess.Popen(command, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE, start_new_session=True)
+
+    def poll(self):
+        """Return None while running, else True/False for success and publish the PDF."""
+        if self.process.poll() is None:
+            return None
+        stderr = self.process.stderr.read().decode(errors='replace')
+        self.process.stderr.close()
+        elapsed = time.perf_counter() - self.started
+        if self.process.returncode == 0 and os.path.exists(self.tmp_path):
+            os.replace(self.tmp_path, self.pdf_path)
+            print(f"  ✓ PDF updated ({elapsed:.2f}s)")
+            return True
+        print(f"  ✗ PDF render failed ({elapsed:.2f}s)")
+        if stderr.strip():
+            print('    ' + stderr.strip().splitlines()[-1])
+        self._remove_tmp()
+        return False
+
+    def cancel(self):
+        """Stop a render that has been superseded by a newer edit."""
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            self.process.wait()
+        self.process.stderr.close()
+        self._remove_tmp()
+
+    def _remove_tmp(self):
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def index_path_for(md_path):
+    """Search index written next to a Markdown cheatsheet."""
+    return os.path.splitext(md_path)[0] + '.index.json'
+
+
+def watch(pdf_path, md_path, jobs, single_pass=False, extra_paths=()):
+    """Regenerate the cheatsheets whenever the generator or its inputs change."""
+    paths = [os.path.abspath(__file__)] + [os.path.abspath(p) for p in extra_paths]
+    try:
+        watcher = InotifyWatcher(paths)
+        backend = 'inotify'
+    except (OSError, AttributeError):
+        watcher = PollingWatcher(paths)
+        backend = f'polling every {WATCH_POLL_INTERVAL}s'
+
+    print(f"Watching {len(paths)} file(s) ({backend}) - press Ctrl+C to stop")
+    last = {'markdown': None, 'html': None}
+    render = None
+
+    def regenerate():
+        nonlocal render
+        try:
+            generator = load_generator()
+            md_content = generator.generate_markdown()
+            html_content = generator.generate_html()
+        except Exception as e:
+            print(f"  ✗ Generator failed: {type(e).__name__}: {e}")
+            return
+
+        # Markdown is cheap: write it (and its search index) straight away
+        if md_content != last['markdown']:
+            with open(md_path, 'w', encoding='utf-8') as f:
+                f.write(md_content)
+            last['markdown'] = md_content
+            print(f"  ✓ Markdown updated")
+            if write_index(md_content, index_path_for(md_path)):
+                print(f"  ✓ Search index updated")
+
+        # The PDF only depends on the HTML; re-render when that changed
+        if html_content != last['html']:
+            if render is not None:
+                render.cancel()
+                print("  … cancelled stale PDF render")
+            render = BackgroundRender(pdf_path, jobs, single_pass)
+            last['html'] = html_content
+            print("  … rendering PDF in background")
+
+    try:
+        print(f"[{time.strftime('%H:%M:%S')}] Initial build")
+        regenerate()
+        while True:
+            changed = watcher.wait(WATCH_POLL_INTERVAL if render else None)
+            if render is not None and render.poll() is not None:
+                render = None
+            if not changed:
+                continue
+            changed = debounce(watcher, changed)
+            names = ', '.join(sorted(os.path.basename(p) for p in changed))
+            print(f"[{time.strftime('%H:%M:%S')}] Changed: {names}")
+            regenerate()
+    except KeyboardInterrupt:
+        print("\nStopping watch mode")
+    finally:
+        if render is not None:
+            render.cancel()
+        watcher.close()
+    return 0
+
+
+def weasyprint_error():
+    """Return why WeasyPrint cannot be imported, or None if it can."""
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as e:
+        return str(e)
+    return None
+
+
+def main(argv=None):
+    """Generate the PDF and Markdown cheatsheets; returns the exit status."""
+    parser = argparse.ArgumentParser(description='Generate the role-context-manager cheatsheet.')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for section rendering (default: CPU count)')
+    parser.add_argument('--single-pass', action='store_true',
+                        help='Render the PDF with one write_pdf() call')
+    parser.add_argument('--report-speedup', action='store_true',
+                        help='Also time a single-pass render and report the speedup')
+    parser.add_argument('--watch', action='store_true',
+                        help='Regenerate whenever the generator (or a --watch-path) changes')
+    parser.add_argument('--watch-path', action='append', default=[], metavar='PATH',
+                        help='Additional input file to watch (repeatable)')
+    parser.add_argument('--pdf-only', action='store_true', help='Only generate the PDF')
+    parser.add_argument('--pdf-path', help='Write the PDF here (default: CHEATSHEET.pdf)')
+    parser.add_argument('--variants', nargs='*', metavar='VARIANT',
+                        help='Render these PDF variants in one process instead '
+                             f"(default with --variants: {', '.join(DEFAULT_VARIANTS)})")
+    parser.add_argument('--variants-file', metavar='FILE',
+                        help='JSON object of named variants (size, media, commands) to render')
+    parser.add_argument('--variants-dir', metavar='DIR',
+                        help='Directory for CHEATSHEET-<variant>.pdf (default: plugin root)')
+    args = parser.parse_args(argv)
 
     # Get the plugin root directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     plugin_root = os.path.dirname(script_dir)
-    pdf_path = os.path.join(plugin_root, 'CHEATSHEET.pdf')
+    pdf_path = args.pdf_path or os.path.join(plugin_root, 'CHEATSHEET.pdf')
     md_path = os.path.join(plugin_root, 'CHEATSHEET.md')
 
+    if args.watch:
+        return watch(pdf_path, md_path, args.jobs, args.single_pass, args.watch_path)
+
+    if args.variants is not None or args.variants_file:
+        names = args.variants or ([] if args.variants_file else DEFAULT_VARIANTS)
+        output_dir = args.variants_dir or plugin_root
+        try:
+            variants = load_variants(names, args.variants_file)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        error = weasyprint_error()
+        if error:
+            print(f"Error: Rendering the PDF needs WeasyPrint ({error})", file=sys.stderr)
+            return 2
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            print(f"Rendering {len(variants)} cheatsheet variant(s)...")
+            render_variants(variants, output_dir)
+        except Exception as e:
+            # WeasyPrint raises its own exception types for fonts, CSS and layout
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    error = weasyprint_error()
+    if error:
+        print(f"Error: Rendering the PDF needs WeasyPrint ({error})", file=sys.stderr)
+        return 2
+
+    print("Generating Role Context Manager Cheatsheet...")
+
     # Generate PDF
     print("\n[1/2] Creating HTML content...")
     html_content = generate_html()
-
-    print(f"Converting to PDF at {pdf_path}...")
-    HTML(string=html_content).write_pdf(pdf_path)
+    write_pdf(html_content, pdf_path, args.jobs, args.single_pass, args.report_speedup)
 
     # Get PDF file size
     pdf_size = os.path.getsize(pdf_path)
@@ -1354,6 +2019,9 @@ def main():
     print(f"  Location: {pdf_path}")
     print(f"  File size: {pdf_size_mb:.2f} MB")
 
+    if args.pdf_only:
+        return 0
+
     # Generate Markdown
     print(f"\n[2/2] Creating Markdown content...")
     md_content = generate_markdown()
@@ -1369,9 +2037,16 @@ def main():
     print(f"  Location: {md_path}")
     print(f"  File size: {md_size_kb:.2f} KB")
 
+    # The search index is rebuilt only when the Markdown changed
+    index_path = index_path_for(md_path)
+    if write_index(md_content, index_path):
+        print(f"✓ Search index generated: {index_path}")
+    else:
+        print(f"  Search index unchanged: {index_path}")
+
     print(f"\n✓ Both cheatsheets generated successfully!")
 
-    return pdf_path, md_path
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
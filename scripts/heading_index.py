@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Serve sections of Markdown documents through a persistent heading index.
+
+A document reference of the form `path.md#heading` loads one section: the
+heading line and everything up to the next heading of the same or a higher
+level, matched by its GitHub-style anchor. Each document's headings are
+indexed once into a small file shared with role-manager.sh (see its
+"Document Sections" section for the format); the index records the
+document's size and mtime as taken before the scan, so a lookup is one stat
+and one small read, and the section itself is sliced from a memory mapping
+of the document.
+
+Usage:
+    python3 scripts/heading_index.py <document>            # list headings
+    python3 scripts/heading_index.py <document> <heading>  # print a section
+"""
+
+import argparse
+import mmap
+import os
+import re
+import sys
+import tempfile
+from collections import namedtuple
+
+MAGIC = 'RCMHEADINGS 2'
+HEADING = re.compile(rb'^(#{1,6})(?:[ \t\r\v\f]+(.*))?$')
+FENCES = (b'```', b'~~~')
+
+Heading = namedtuple('Heading', 'start end level anchor')
+
+
+def anchor(text):
+    """GitHub-style anchor of heading text (ASCII lowercase, punctuation dropped)."""
+    if isinstance(text, str):
+        text = text.encode('utf-8', 'surrogateescape')
+    return re.sub(rb'[^a-z0-9 _-]', b'', text.lower()).replace(b' ', b'-').decode('ascii')
+
+
+def scan(data):
+    """Headings of a document (bytes) with the byte range of each section."""
+    found = []
+    fence = None
+    offset = 0
+    for line in data.split(b'\n'):
+        if fence:
+            if line.startswith(fence):
+                fence = None
+        elif line.startswith(FENCES):
+            fence = line[:3]
+        else:
+            match = HEADING.match(line)
+            if match:
+                text = (match.group(2) or b'').rstrip(b'# \t\r\v\f')
+                found.append((offset, len(match.group(1)), anchor(text) or '-'))
+        offset += len(line) + 1
+
+    headings = []
+    for i, (start, level, name) in enumerate(found):
+        end = next((s for s, lv, _ in found[i + 1:] if lv <= level), len(data))
+        headings.append(Heading(start, end, level, name))
+    return headings
+
+
+def index_path(document, env=None):
+    """Index file role-manager.sh uses for <document>, or None if its key is hashed."""
+    env = os.environ if env is None else env
+    key = os.path.abspath(document).replace('%', '%25').replace('/', '%2F')
+    if len(key) > 200:
+        return None
+    home = env.get('HOME') or os.path.expanduser('~')
+    directory = env.get('RCM_HEADING_INDEX_DIR') or os.path.join(
+        env.get('XDG_CACHE_HOME') or os.path.join(home, '.cache'),
+        'role-context-manager', 'headings')
+    return os.path.join(directory, f'{key}.idx')
+
+
+def _signature(st):
+    """(size, mtime) of a stat result, formatted as role-manager.sh's file_signatures."""
+    seconds, nanoseconds = divmod(st.st_mtime_ns, 1_000_000_000)
+    return (str(st.st_size), f'{seconds}.{nanoseconds:09d}')
+
+
+def _read_index(path, expected):
+    with open(path, encoding='utf-8', errors='surrogateescape') as f:
+        if f.readline().rstrip('\n') != MAGIC:
+            return None
+        headings = []
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if fields[0] == 'S' and tuple(fields[1:]) != expected:
+                return None
+            if fields[0] == 'H' and len(fields) == 5:
+                headings.append(Heading(int(fields[1]), int(fields[2]), int(fields[3]), fields[4]))
+        return headings
+
+
+def _write_index(path, headings, sig):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp = tempfile.mkstemp(prefix=os.path.basename(path) + '.tmp.', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', errors='surrogateescape') as f:
+            f.write(MAGIC + '\n')
+            f.write(f'S\t{sig[0]}\t{sig[1]}\n')
+            for h in headings:
+                f.write(f'H\t{h.start}\t{h.end}\t{h.level}\t{h.anchor}\n')
+        os.replace(temp, path)
+    except OSError:
+        os.unlink(temp)
+        raise
+
+
+def load_index(document, env=None):
+    """Headings of <document>, from its index when the signatures match, else rescanned and stored."""
+    # Taken before the scan, so an edit made during it leaves the index stale
+    sig = _signature(os.stat(document))
+    path = index_path(document, env)
+    if path:
+        try:
+            headings = _read_index(path, sig)
+            if headings is not None:
+                return headings
+        except (OSError, ValueError):
+            pass
+
+    with open(document, 'rb') as f:
+        headings = scan(f.read())
+    if path:
+        try:
+            _write_index(path, headings, sig)
+        except OSError:
+            pass
+    return headings
+
+
+def find_section(document, heading, env=None):
+    """The first Heading whose anchor matches <heading>, or None."""
+    wanted = anchor(heading)
+    return next((h for h in load_index(document, env) if h.anchor == wanted), None)
+
+
+def read_section(document, heading, env=None):
+    """Bytes of one section of <document>, or None if the heading does not exist."""
+    section = find_section(document, heading, env)
+    if section is None:
+        return None
+    if section.end <= section.start:
+        return b''
+    with open(document, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return data[section.start:section.end]
+
+
+def main(argv=None):
+    """List a document's headings or print one section."""
+    parser = argparse.ArgumentParser(description='Inspect the heading index of a Markdown document.')
+    parser.add_argument('document', help='Markdown file')
+    parser.add_argument('heading', nargs='?', help='Heading text or anchor to print')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.heading is None:
+            for h in load_index(args.document):
+                print(f"{'#' * h.level} {h.anchor}  [{h.start}:{h.end}]")
+            return 0
+        content = read_section(args.document, args.heading)
+    except OSError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+
+    if content is None:
+        print(f'Error: no heading matching "{args.heading}" in {args.document}', file=sys.stderr)
+        return 1
+    sys.stdout.buffer.write(content)
+    sys.stdout.buffer.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
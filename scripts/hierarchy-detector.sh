@@ -9,6 +9,7 @@
 #   - build_hierarchy_path: Construct full hierarchy array from root to current
 #   - is_valid_child_level: Validate parent-child relationships
 #   - save_level_with_hierarchy: Write organizational-level.json with extended schema
+#   - audit_hierarchy: Validate every parent/child edge under a root in one pass
 #
 # Exit codes:
 #   0 - Success
@@ -122,8 +123,7 @@ get_level_value() {
         jq -r '.level // empty' "$level_file" 2>/dev/null || echo ""
     else
         # Fallback without jq
-        grep -o '"level"[[:space:]]*:[[:space:]]*"[^"]*"' "$level_file" 2>/dev/null | \
-            sed 's/.*"\([^"]*\)"/\1/' || echo ""
+        json_value "$level_file" level || echo ""
     fi
 }
 
@@ -496,6 +496,330 @@ show_hierarchy() {
     fi
 }
 
+# =============================================================================
+# Whole-Tree Audit
+# =============================================================================
+
+# Tree built by audit_hierarchy, keyed by the directory containing the config dir
+declare -gA AUDIT_LEVEL=()
+declare -gA AUDIT_RECORDED_PARENT=()
+declare -gA AUDIT_PARENT=()
+declare -gA AUDIT_CHILDREN=()
+AUDIT_NODES=()
+AUDIT_ROOTS=()
+AUDIT_VIOLATIONS=()
+
+# Usage: discover_claude_dirs <root> <claude_dir_name>
+# Returns: Project directories that contain a config dir, one per line
+# One find(1) walk; config dirs, .git and node_modules are never descended into.
+discover_claude_dirs() {
+    local root="$1"
+    local claude_dir_name="$2"
+
+    # -name takes a glob pattern: escape it so the name matches literally
+    local pattern="${claude_dir_name//\\/\\\\}"
+    pattern="${pattern//\*/\\*}"
+    pattern="${pattern//\?/\\?}"
+    pattern="${pattern//\[/\\[}"
+
+    local path
+    find "$root" \( -name .git -o -name node_modules \) -prune -o \
+        -type d -name "$pattern" -prune -print 2>/dev/null | \
+        while IFS= read -r path; do
+            path="${path%/"$claude_dir_name"}"
+            printf '%s\n' "${path:-/}"
+        done | LC_ALL=C sort
+}
+
+# Usage: read_level_files <jobs> <level_file>...
+# Returns: "<level_file>\t<level>\t<parent_level>" per readable file
+# Files are read in parallel batches; each batch writes its own output file
+# so lines from concurrent readers never interleave.
+read_level_files() {
+    local jobs="$1"
+    shift
+    [[ $# -eq 0 ]] && return 0
+
+    if ! command -v jq &> /dev/null; then
+        # One parse per file for both keys; invalid files stay unread
+        local file
+        for file in "$@"; do
+            json_read "$file" level parent_level || continue
+            printf '%s\t%s\t%s\n' "$file" "${JSON_VALUES[level]:-}" "${JSON_VALUES[parent_level]:-}"
+        done
+        return 0
+    fi
+
+    local batch=$(( ($# + jobs - 1) / jobs ))
+    (( batch > 500 )) && batch=500
+    (( batch < 1 )) && batch=1
+
+    local out_dir
+    out_dir="$(mktemp -d)" || return 2
+    printf '%s\0' "$@" | xargs -0 -P "$jobs" -n "$batch" sh -c '
+        out="$(mktemp "$0/batch.XXXXXX")"
+        jq -r "[input_filename, (.level // \"\" | tostring), (.parent_level // \"\" | tostring)] | @tsv" "$@" > "$out" 2>/dev/null
+        exit 0' "$out_dir"
+    cat "$out_dir"/batch.* 2>/dev/null || true
+    rm -rf "$out_dir"
+}
+
+# Usage: add_audit_violation <project_dir> <message>
+add_audit_violation() {
+    AUDIT_VIOLATIONS+=("$1"$'\t'"$2")
+}
+
+# Usage: build_audit_tree <root> <claude_dir_name> <jobs>
+# Fills AUDIT_* with every config dir under <root>, its level and its nearest
+# ancestor config dir, then checks every parent/child edge.
+build_audit_tree() {
+    local root="$1"
+    local claude_dir_name="$2"
+    local jobs="$3"
+
+    AUDIT_LEVEL=()
+    AUDIT_RECORDED_PARENT=()
+    AUDIT_PARENT=()
+    AUDIT_CHILDREN=()
+    AUDIT_NODES=()
+    AUDIT_ROOTS=()
+    AUDIT_VIOLATIONS=()
+
+    mapfile -t AUDIT_NODES < <(discover_claude_dirs "$root" "$claude_dir_name")
+
+    local node
+    local level_files=()
+    declare -A is_node=()
+    for node in "${AUDIT_NODES[@]}"; do
+        is_node[$node]=1
+        if [[ -f "$node/$claude_dir_name/organizational-level.json" ]]; then
+            level_files+=("$node/$claude_dir_name/organizational-level.json")
+        else
+            add_audit_violation "$node" "missing organizational-level.json"
+        fi
+    done
+
+    local file level parent_level
+    declare -A was_read=()
+    while IFS=$'\t' read -r file level parent_level; do
+        [[ -n "$file" ]] || continue
+        node="${file%/*}"
+        node="${node%/*}"
+        was_read[$node]=1
+        AUDIT_LEVEL[$node]="$level"
+        AUDIT_RECORDED_PARENT[$node]="$parent_level"
+    done < <(read_level_files "$jobs" "${level_files[@]}")
+
+    for file in "${level_files[@]}"; do
+        node="${file%/*}"
+        node="${node%/*}"
+        # A malformed file ends its jq batch early; re-read the rest one by one
+        if [[ -z "${was_read[$node]:-}" ]] && command -v jq &> /dev/null && \
+           IFS=$'\t' read -r level parent_level < <(jq -r '[(.level // "" | tostring), (.parent_level // "" | tostring)] | @tsv' "$file" 2>/dev/null); then
+            was_read[$node]=1
+            AUDIT_LEVEL[$node]="$level"
+            AUDIT_RECORDED_PARENT[$node]="$parent_level"
+        fi
+
+        if [[ -z "${was_read[$node]:-}" ]]; then
+            add_audit_violation "$node" "unreadable organizational-level.json (invalid JSON)"
+        elif [[ -z "${AUDIT_LEVEL[$node]}" ]]; then
+            add_audit_violation "$node" "organizational-level.json has no level"
+        elif [[ ! "${AUDIT_LEVEL[$node]}" =~ ^(company|system|product|project)$ ]]; then
+            add_audit_violation "$node" "invalid level: ${AUDIT_LEVEL[$node]}"
+        fi
+    done
+
+    # Parent = nearest ancestor with a config dir (same rule as get_nearest_parent)
+    local dir
+    for node in "${AUDIT_NODES[@]}"; do
+        dir="${node%/*}"
+        AUDIT_PARENT[$node]=""
+        while [[ ${#dir} -ge ${#root} && -n "$dir" ]]; do
+            if [[ -n "${is_node[$dir]:-}" ]]; then
+                AUDIT_PARENT[$node]="$dir"
+                AUDIT_CHILDREN[$dir]+="$node"$'\n'
+                break
+            fi
+            dir="${dir%/*}"
+        done
+        if [[ -z "${AUDIT_PARENT[$node]}" ]]; then
+            AUDIT_ROOTS+=("$node")
+        fi
+    done
+
+    # Check every edge
+    local parent child_level
+    for node in "${AUDIT_NODES[@]}"; do
+        parent="${AUDIT_PARENT[$node]}"
+        child_level="${AUDIT_LEVEL[$node]:-}"
+        [[ -n "$parent" && -n "$child_level" ]] || continue
+        parent_level="${AUDIT_LEVEL[$parent]:-}"
+        [[ -n "$parent_level" ]] || continue
+
+        if [[ "$parent_level" =~ ^(company|system|product|project)$ && \
+              "$child_level" =~ ^(company|system|product|project)$ ]]; then
+            if ! is_valid_child_level "$parent_level" "$child_level"; then
+                add_audit_violation "$node" "$child_level cannot be a child of $parent_level (${parent#"$root"}/)"
+                continue
+            fi
+        fi
+        if [[ -n "${AUDIT_RECORDED_PARENT[$node]:-}" && "${AUDIT_RECORDED_PARENT[$node]}" != "$parent_level" ]]; then
+            add_audit_violation "$node" "recorded parent_level ${AUDIT_RECORDED_PARENT[$node]} does not match parent $parent_level"
+        fi
+    done
+
+    return 0
+}
+
+# Usage: print_audit_node <root> <node> <indent>
+print_audit_node() {
+    local root="$1"
+    local node="$2"
+    local indent="$3"
+    local name="${node#"$root"}"
+    name="${name#/}"
+    [[ -n "$name" ]] || name="."
+
+    local marker="✓"
+    local entry
+    for entry in "${AUDIT_VIOLATIONS[@]}"; do
+        if [[ "${entry%%$'\t'*}" == "$node" ]]; then
+            marker="✗"
+            break
+        fi
+    done
+
+    echo "${indent}${marker} ${name} [${AUDIT_LEVEL[$node]:-unknown}]"
+
+    local child
+    while IFS= read -r child; do
+        [[ -n "$child" ]] || continue
+        print_audit_node "$root" "$child" "$indent  "
+    done <<< "${AUDIT_CHILDREN[$node]:-}"
+}
+
+# Usage: audit_hierarchy_json <root>
+# Returns: JSON report of the audited tree (requires jq)
+audit_hierarchy_json() {
+    local root="$1"
+    local node entry
+
+    {
+        for node in "${AUDIT_NODES[@]}"; do
+            printf 'N\t%s\t%s\t%s\n' "$node" "${AUDIT_LEVEL[$node]:-}" "${AUDIT_PARENT[$node]}"
+        done
+        for entry in "${AUDIT_VIOLATIONS[@]}"; do
+            printf 'V\t%s\n' "$entry"
+        done
+    } | jq -R -s --arg root "$root" '
+        def rel: if . == $root then "."
+                 elif $root == "/" then ltrimstr("/")
+                 else ltrimstr($root + "/") end;
+        (split("\n") | map(select(length > 0) | split("\t"))) as $rows
+        | ($rows | map(select(.[0] == "V")) | group_by(.[1])
+           | map({key: .[0][1], value: map(.[2])}) | from_entries) as $violations
+        | {
+            root: $root,
+            summary: {
+              directories: ($rows | map(select(.[0] == "N")) | length),
+              violations: ($rows | map(select(.[0] == "V")) | length)
+            },
+            nodes: [$rows[] | select(.[0] == "N") | {
+              directory: (.[1] | rel),
+              level: (if .[2] == "" then null else .[2] end),
+              parent: (if .[3] == "" then null else (.[3] | rel) end),
+              violations: ($violations[.[1]] // [])
+            }]
+          }'
+}
+
+# Audit every config dir under a root in one traversal
+# Args:
+#   $1: root directory (default: PWD)
+#   --jobs N: parallel level-file readers (default: CPU count)
+#   --json: print a JSON report instead of the tree
+# Returns:
+#   0 if every edge is valid, 1 if violations were found, 2 on usage error
+audit_hierarchy() {
+    local root=""
+    local jobs=""
+    local json=false
+
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --jobs)
+                jobs="${2:-}"
+                shift 2 || { echo "Error: --jobs requires a value" >&2; return 2; }
+                ;;
+            --json)
+                json=true
+                shift
+                ;;
+            *)
+                root="$1"
+                shift
+                ;;
+        esac
+    done
+
+    root="${root:-$PWD}"
+    if [[ ! -d "$root" ]]; then
+        echo "Error: Not a directory: $root" >&2
+        return 2
+    fi
+    root="$(cd "$root" && pwd)"
+
+    if [[ -z "$jobs" ]]; then
+        jobs="$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)"
+    fi
+    if [[ ! "$jobs" =~ ^[1-9][0-9]*$ ]]; then
+        echo "Error: --jobs must be a positive integer" >&2
+        return 2
+    fi
+    if [[ "$json" == "true" ]] && ! command -v jq &> /dev/null; then
+        echo "Error: --json requires jq" >&2
+        return 2
+    fi
+
+    # The config dir name is the one in effect at the audited root
+    clear_path_config_cache
+    load_path_config "$root"
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    build_audit_tree "$root" "$claude_dir_name" "$jobs"
+
+    if [[ "$json" == "true" ]]; then
+        audit_hierarchy_json "$root"
+    else
+        echo "Hierarchy audit: $root"
+        echo ""
+        local node
+        for node in "${AUDIT_ROOTS[@]}"; do
+            print_audit_node "$root" "$node" "  "
+        done
+        if [[ ${#AUDIT_NODES[@]} -eq 0 ]]; then
+            echo "  No $claude_dir_name directories found"
+        fi
+
+        if [[ ${#AUDIT_VIOLATIONS[@]} -gt 0 ]]; then
+            echo ""
+            echo "Violations:"
+            local entry dir
+            for entry in "${AUDIT_VIOLATIONS[@]}"; do
+                dir="${entry%%$'\t'*}"
+                [[ "$root" == "/" ]] || dir="${dir#"$root"}"
+                echo "  ${dir:-/}: ${entry#*$'\t'}"
+            done
+        fi
+        echo ""
+        echo "${#AUDIT_NODES[@]} directories, ${#AUDIT_VIOLATIONS[@]} violation(s)"
+    fi
+
+    [[ ${#AUDIT_VIOLATIONS[@]} -eq 0 ]] && return 0
+    return 1
+}
+
 # =============================================================================
 # Main dispatcher (for direct script execution)
 # =============================================================================
@@ -543,8 +867,11 @@ main() {
         show)
             show_hierarchy "$@"
             ;;
+        audit)
+            audit_hierarchy "$@"
+            ;;
         *)
-            echo "Usage: $0 {find-parents|get-parent|read-level|build-hierarchy|validate-child|save-level|validate|show} [args...]" >&2
+            echo "Usage: $0 {find-parents|get-parent|read-level|build-hierarchy|validate-child|save-level|validate|show|audit} [args...]" >&2
             echo "" >&2
             echo "Commands:" >&2
             echo "  find-parents [dir]              - Find all parent .claude directories" >&2
@@ -555,6 +882,7 @@ main() {
             echo "  save-level <dir> <level> [name] - Save level with hierarchy info" >&2
             echo "  validate [dir]                  - Validate hierarchy at directory" >&2
             echo "  show [dir]                      - Show hierarchy information" >&2
+            echo "  audit [root] [--jobs N] [--json] - Audit every hierarchy edge under root" >&2
             exit 2
             ;;
     esac
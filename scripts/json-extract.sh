@@ -0,0 +1,248 @@
+#!/usr/bin/env bash
+
+# json-extract.sh - Single-pass JSON value extraction for hosts without jq
+#
+# The jq-less fallbacks read configuration through this library instead of
+# per-key grep/sed pipelines. One awk process parses the whole file (nested
+# objects, arrays, escaped quotes, \uXXXX escapes) and returns every
+# requested path at once.
+#
+# Paths use jq's syntax without filters: ".key", ".a.b", ".list[0]",
+# ".list[]" (every element) and ".[]" for a top-level array; the leading
+# dot is optional. null values and missing paths produce nothing, so a
+# lookup behaves like `jq -r '.path // empty'` for strings. Numbers are
+# returned as written, objects and arrays as their JSON text.
+#
+# Functions:
+#   - json_extract: Print "<path><TAB><value>" for every value found
+#   - json_read: Load the values of several paths into JSON_VALUES
+#   - json_value: Print the value of one path
+#
+# Exit codes:
+#   0 - Success
+#   1 - File missing, unreadable or not valid JSON
+
+# Loaded by json_read: path -> value (elements of a [] path joined by newlines)
+declare -gA JSON_VALUES=()
+
+# Recursive-descent parser. Requested paths arrive in JSON_EXTRACT_PATHS
+# (newline-separated) so awk does not interpret escapes in them. Values are
+# printed one per line with backslashes doubled and newlines as \n.
+JSON_EXTRACT_AWK='
+function fail() { error = 1; pos = len + 1 }
+
+function ws() {
+    while (pos <= len && index(" \t\r\n", substr(text, pos, 1))) pos++
+}
+
+function wanted_path(path,    wild) {
+    if (path in wanted) return 1
+    wild = path
+    gsub(/\[[0-9]+\]/, "[]", wild)
+    return (wild in wanted)
+}
+
+function esc(v,    r, i, c) {
+    if (v !~ /[\\\n]/) return v
+    r = ""
+    for (i = 1; i <= length(v); i++) {
+        c = substr(v, i, 1)
+        if (c == "\\") r = r "\\\\"
+        else if (c == "\n") r = r "\\n"
+        else r = r c
+    }
+    return r
+}
+
+function emit(path, v,    wild) {
+    v = esc(v)
+    if (path in wanted) out[path, ++count[path]] = v
+    wild = path
+    gsub(/\[[0-9]+\]/, "[]", wild)
+    if (wild != path && (wild in wanted)) out[wild, ++count[wild]] = v
+}
+
+function hex4(s,    i, d, n) {
+    if (length(s) != 4) return -1
+    n = 0
+    for (i = 1; i <= 4; i++) {
+        d = index("0123456789abcdef", tolower(substr(s, i, 1)))
+        if (!d) return -1
+        n = n * 16 + d - 1
+    }
+    return n
+}
+
+function utf8(cp) {
+    if (cp < 1) return ""
+    if (cp < 128) return sprintf("%c", cp)
+    if (cp < 2048) return sprintf("%c%c", 192 + int(cp / 64), 128 + cp % 64)
+    if (cp < 65536) return sprintf("%c%c%c", 224 + int(cp / 4096), 128 + int(cp / 64) % 64, 128 + cp % 64)
+    return sprintf("%c%c%c%c", 240 + int(cp / 262144), 128 + int(cp / 4096) % 64, 128 + int(cp / 64) % 64, 128 + cp % 64)
+}
+
+function str(    r, chunk, c, cp, lo) {
+    pos++
+    r = ""
+    while (pos <= len) {
+        chunk = substr(text, pos, 512)
+        if (!match(chunk, /["\\]/)) {
+            r = r chunk
+            pos += length(chunk)
+            continue
+        }
+        r = r substr(chunk, 1, RSTART - 1)
+        pos += RSTART - 1
+        if (substr(text, pos, 1) == "\"") {
+            pos++
+            return r
+        }
+        c = substr(text, pos + 1, 1)
+        pos += 2
+        if (c == "\"" || c == "\\" || c == "/") r = r c
+        else if (c == "n") r = r "\n"
+        else if (c == "t") r = r "\t"
+        else if (c == "r") r = r "\r"
+        else if (c == "b") r = r "\b"
+        else if (c == "f") r = r "\f"
+        else if (c == "u") {
+            cp = hex4(substr(text, pos, 4))
+            if (cp < 0) { fail(); return "" }
+            pos += 4
+            if (cp >= 55296 && cp < 56320 && substr(text, pos, 2) == "\\u") {
+                lo = hex4(substr(text, pos + 2, 4))
+                if (lo >= 56320 && lo < 57344) {
+                    cp = 65536 + (cp - 55296) * 1024 + (lo - 56320)
+                    pos += 6
+                }
+            }
+            r = r utf8(cp)
+        } else { fail(); return "" }
+    }
+    fail()
+    return ""
+}
+
+function object(path,    key, c) {
+    pos++
+    ws()
+    if (substr(text, pos, 1) == "}") { pos++; return }
+    while (!error) {
+        ws()
+        if (substr(text, pos, 1) != "\"") { fail(); return }
+        key = str()
+        ws()
+        if (error || substr(text, pos, 1) != ":") { fail(); return }
+        pos++
+        value(path == "" ? key : path "." key)
+        ws()
+        c = substr(text, pos, 1)
+        pos++
+        if (c == "}") return
+        if (c != ",") { fail(); return }
+    }
+}
+
+function array(path,    i, c) {
+    pos++
+    ws()
+    if (substr(text, pos, 1) == "]") { pos++; return }
+    for (i = 0; !error; i++) {
+        value(path "[" i "]")
+        ws()
+        c = substr(text, pos, 1)
+        pos++
+        if (c == "]") return
+        if (c != ",") { fail(); return }
+    }
+}
+
+function value(path,    c, start, s) {
+    ws()
+    c = substr(text, pos, 1)
+    start = pos
+    if (c == "{" || c == "[") {
+        if (c == "{") object(path)
+        else array(path)
+        if (!error && wanted_path(path)) emit(path, substr(text, start, pos - start))
+    } else if (c == "\"") {
+        s = str()
+        if (!error) emit(path, s)
+    } else if (match(substr(text, pos, 64), /^(true|false|null|-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?)/)) {
+        s = substr(text, pos, RLENGTH)
+        pos += RLENGTH
+        if (s != "null") emit(path, s)
+    } else {
+        fail()
+    }
+}
+
+BEGIN {
+    n = split(ENVIRON["JSON_EXTRACT_PATHS"], request, "\n")
+    for (i = 1; i <= n; i++) {
+        key[i] = request[i]
+        sub(/^\./, "", key[i])
+        wanted[key[i]] = 1
+    }
+}
+
+{ text = text $0 "\n" }
+
+END {
+    len = length(text)
+    pos = 1
+    value("")
+    ws()
+    if (error || pos <= len) exit 1
+    for (i = 1; i <= n; i++)
+        for (j = 1; j <= count[key[i]]; j++)
+            printf "%s\t%s\n", request[i], out[key[i], j]
+}
+'
+
+# Usage: json_extract <file|-> <path>...
+# Returns: One "<path><TAB><value>" line per value found, in argument order
+# (several for [] paths); backslashes in values are doubled and newlines
+# written as \n. Exits 1 without output if the input is not valid JSON.
+json_extract() {
+    local file="$1"
+    shift
+    local IFS=$'\n'
+    JSON_EXTRACT_PATHS="$*" LC_ALL=C awk "$JSON_EXTRACT_AWK" "$file"
+}
+
+# Usage: json_read <file|-> <path>...
+# Sets: JSON_VALUES (requested path -> value, elements of a [] path joined by
+# newlines; paths without a value are unset)
+# Returns: 0 if the input parsed, 1 if it is missing or not valid JSON
+json_read() {
+    local file="$1"
+    JSON_VALUES=()
+
+    [[ "$file" == "-" || -r "$file" ]] || return 1
+
+    local output line path value
+    output="$(json_extract "$@")" || return 1
+    while IFS= read -r line; do
+        [[ -n "$line" ]] || continue
+        path="${line%%$'\t'*}"
+        value="${line#*$'\t'}"
+        # Decode the \\ and \n escapes added by the parser
+        [[ "$value" == *\\* ]] && printf -v value '%b' "$value"
+        if [[ -n "${JSON_VALUES[$path]+set}" ]]; then
+            JSON_VALUES[$path]+=$'\n'"$value"
+        else
+            JSON_VALUES[$path]="$value"
+        fi
+    done <<< "$output"
+    return 0
+}
+
+# Usage: json_value <file> <path>
+# Returns: The value at <path> (every element, one per line, for a [] path);
+# 1 if the file is missing or invalid or the path has no value
+json_value() {
+    json_read "$1" "$2" || return 1
+    [[ -n "${JSON_VALUES[$2]+set}" ]] || return 1
+    printf '%s\n' "${JSON_VALUES[$2]}"
+}
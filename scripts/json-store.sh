@@ -0,0 +1,217 @@
+#!/usr/bin/env bash
+
+# json-store.sh - Locked, atomic updates for JSON state files
+#
+# preferences.json and role-references.json are shared by every session
+# and provisioning job working in a config directory. All writers go
+# through this library so concurrent updates are serialized and readers
+# never observe a partially written file.
+#
+# Functions:
+#   - json_lock / json_unlock: Exclusive lock on a config directory
+#   - json_update: Apply one jq program to a file under the lock
+#   - json_set_strings: Set several string keys in one parse/serialize cycle
+#   - json_write_atomic: Replace a file's content with stdin atomically
+#   - with_json_lock: Run any command while holding the lock
+#
+# Environment Variables:
+#   RCM_LOCK_TIMEOUT: Seconds to wait for a lock (default: 10)
+#
+# Exit codes:
+#   0 - Success
+#   1 - Lock timeout or update failed (file left unchanged)
+
+set -euo pipefail
+
+# File descriptor / lock directory held by the current process
+JSON_LOCK_FD=""
+JSON_LOCK_PATH=""
+
+# =============================================================================
+# Locking
+# =============================================================================
+
+# Usage: json_lock <dir>
+# Returns: 0 when the lock is held, 1 on timeout
+# Locks the directory itself (flock on a read-only directory descriptor), so
+# no lock files are left behind and replacing files by rename is safe. Where
+# flock(1) is unavailable (macOS), an atomic mkdir lock is used instead.
+json_lock() {
+    local dir="$1"
+    local timeout="${RCM_LOCK_TIMEOUT:-10}"
+
+    if command -v flock &> /dev/null; then
+        exec {JSON_LOCK_FD}<"$dir" || return 1
+        if ! flock -x -w "$timeout" "$JSON_LOCK_FD"; then
+            exec {JSON_LOCK_FD}<&-
+            JSON_LOCK_FD=""
+            echo "Error: Timed out waiting for lock on $dir" >&2
+            return 1
+        fi
+        return 0
+    fi
+
+    local lock_path="$dir/.rcm-lock"
+    local waited=0
+    until mkdir "$lock_path" 2>/dev/null; do
+        if (( waited >= timeout * 10 )); then
+            echo "Error: Timed out waiting for lock on $dir (remove $lock_path if stale)" >&2
+            return 1
+        fi
+        sleep 0.1
+        waited=$((waited + 1))
+    done
+    JSON_LOCK_PATH="$lock_path"
+    return 0
+}
+
+# Usage: json_unlock
+json_unlock() {
+    if [[ -n "$JSON_LOCK_FD" ]]; then
+        exec {JSON_LOCK_FD}<&-
+        JSON_LOCK_FD=""
+    fi
+    if [[ -n "$JSON_LOCK_PATH" ]]; then
+        rmdir "$JSON_LOCK_PATH" 2>/dev/null || true
+        JSON_LOCK_PATH=""
+    fi
+    return 0
+}
+
+# Usage: with_json_lock <file> <command> [args...]
+# Returns: the command's exit code, or 1 on lock timeout
+with_json_lock() {
+    local file="$1"
+    shift
+    local dir
+    dir="$(dirname "$file")"
+    mkdir -p "$dir"
+
+    json_lock "$dir" || return 1
+    local rc=0
+    "$@" || rc=$?
+    json_unlock
+    return $rc
+}
+
+# =============================================================================
+# Atomic Writes
+# =============================================================================
+
+# Usage: json_write_atomic <file> < content
+# Returns: 0 on success, 1 if the content could not be written
+# Writes to a temp file in the same directory and renames it over <file>.
+# Call with the lock held when other writers may be active.
+json_write_atomic() {
+    local file="$1"
+    local temp_file
+    temp_file="$(mktemp "$file.tmp.XXXXXX")" || return 1
+
+    if ! cat > "$temp_file" || [[ ! -s "$temp_file" ]]; then
+        rm -f "$temp_file"
+        return 1
+    fi
+    chmod 644 "$temp_file" 2>/dev/null || true
+    mv -f "$temp_file" "$file"
+}
+
+# Usage: _json_apply <file> <filter> [jq options...]
+# Runs jq over <file> (or {} when missing/empty) and commits atomically.
+_json_apply() {
+    local file="$1"
+    local filter="$2"
+    shift 2
+
+    local temp_file
+    temp_file="$(mktemp "$file.tmp.XXXXXX")" || return 1
+
+    local rc=0
+    if [[ -s "$file" ]]; then
+        jq "$@" "$filter" "$file" > "$temp_file" 2>/dev/null || rc=$?
+    else
+        echo '{}' | jq "$@" "$filter" > "$temp_file" 2>/dev/null || rc=$?
+    fi
+
+    if [[ $rc -ne 0 || ! -s "$temp_file" ]]; then
+        rm -f "$temp_file"
+        echo "Error: Failed to update $file" >&2
+        return 1
+    fi
+    chmod 644 "$temp_file" 2>/dev/null || true
+    mv -f "$temp_file" "$file"
+}
+
+# =============================================================================
+# Transactional Updates
+# =============================================================================
+
+# Usage: json_update <file> <jq-filter> [jq options...]
+# Returns: 0 on success, 1 on lock timeout or jq failure (file unchanged)
+# Read, transform and replace happen under one lock, so concurrent updates to
+# different keys are never lost. Combine several changes in one filter, e.g.
+#   json_update prefs.json '.a = $a | .b = $b' --arg a 1 --arg b 2
+json_update() {
+    local file="$1"
+    shift
+    with_json_lock "$file" _json_apply "$file" "$@"
+}
+
+# Usage: json_set_strings <file> <key> <value> [<key> <value>...]
+# Returns: 0 on success, 1 on failure
+# Sets every key in a single parse/serialize cycle.
+json_set_strings() {
+    local file="$1"
+    shift
+
+    if (( $# == 0 || $# % 2 != 0 )); then
+        echo "Error: json_set_strings requires key/value pairs" >&2
+        return 1
+    fi
+
+    if ! command -v jq &> /dev/null; then
+        with_json_lock "$file" _json_set_strings_sed "$file" "$@"
+        return
+    fi
+
+    local filter="."
+    local args=()
+    local i=0
+    while [[ $# -gt 0 ]]; do
+        filter+=" | .[\$k$i] = \$v$i"
+        args+=(--arg "k$i" "$1" --arg "v$i" "$2")
+        shift 2
+        i=$((i + 1))
+    done
+
+    json_update "$file" "$filter" "${args[@]}"
+}
+
+# Usage: _json_set_strings_sed <file> <key> <value> [...]
+# jq-less fallback for json_set_strings: flat string keys only.
+_json_set_strings_sed() {
+    local file="$1"
+    shift
+
+    local content='{}'
+    if [[ -s "$file" ]]; then
+        content="$(cat "$file")"
+    fi
+
+    while [[ $# -gt 0 ]]; do
+        local key="$1"
+        local value="$2"
+        shift 2
+
+        if grep -q "\"$key\"" <<< "$content"; then
+            content="$(sed "s/\"$key\"[[:space:]]*:[[:space:]]*\"[^\"]*\"/\"$key\": \"$value\"/" <<< "$content")"
+        elif [[ "$content" =~ ^[[:space:]]*\{[[:space:]]*\}[[:space:]]*$ ]]; then
+            content="{
+  \"$key\": \"$value\"
+}"
+        else
+            content="$(sed 's/{/{\n  "'"$key"'": "'"$value"'",/' <<< "$content")"
+        fi
+    done
+
+    printf '%s\n' "$content" | json_write_atomic "$file"
+}
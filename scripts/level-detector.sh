@@ -46,8 +46,7 @@ read_explicit_level() {
             jq -r '.level // empty' "$level_file" 2>/dev/null || echo ""
         else
             # Fallback without jq
-            grep -o '"level"[[:space:]]*:[[:space:]]*"[^"]*"' "$level_file" 2>/dev/null | \
-                sed 's/.*"\([^"]*\)"/\1/' || echo ""
+            json_value "$level_file" level || echo ""
         fi
     else
         echo ""
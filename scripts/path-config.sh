@@ -14,6 +14,7 @@
 #   RCM_ROLE_GUIDES_DIR: Override role-guides directory name (default: role-guides)
 #   RCM_PATHS_MANIFEST: Override paths manifest file location (default: paths.json)
 #   RCM_CACHE_ENABLED: Enable/disable caching (default: true)
+#   RCM_TRACE: Write a JSON-lines function/fork trace to this file (see trace.sh)
 #
 # Exit codes:
 #   0 - Success
@@ -22,6 +23,22 @@
 
 set -euo pipefail
 
+# Structured tracing (RCM_TRACE=<file>): every script sources this library
+# first, so enabling it here covers the whole call graph
+if [[ -n "${RCM_TRACE:-}" ]]; then
+    # shellcheck source=scripts/trace.sh
+    source "$(dirname "${BASH_SOURCE[0]}")/trace.sh"
+fi
+
+# jq-less JSON reads for the fallbacks in every script. json-extract.sh is
+# only sourced on first use (it redefines these stubs), so hosts with jq
+# never pay for loading it.
+JSON_EXTRACT_LIB="${BASH_SOURCE[0]%/*}/json-extract.sh"
+[[ "${BASH_SOURCE[0]}" == */* ]] || JSON_EXTRACT_LIB="json-extract.sh"
+json_extract() { source "$JSON_EXTRACT_LIB" && json_extract "$@"; }
+json_read() { source "$JSON_EXTRACT_LIB" && json_read "$@"; }
+json_value() { source "$JSON_EXTRACT_LIB" && json_value "$@"; }
+
 # =============================================================================
 # Global Configuration Cache
 # =============================================================================
@@ -218,12 +235,9 @@ read_manifest_value() {
             return 0
         fi
     else
-        # Fallback without jq - simple grep and sed
-        local value
-        value=$(grep -o "\"$key\"[[:space:]]*:[[:space:]]*\"[^\"]*\"" "$manifest_file" 2>/dev/null | \
-            sed 's/.*"\([^"]*\)"/\1/' | head -1)
-        if [[ -n "$value" ]]; then
-            echo "$value"
+        # Fallback without jq - single-pass parser
+        if json_read "$manifest_file" "$key" && [[ -n "${JSON_VALUES[$key]:-}" ]]; then
+            echo "${JSON_VALUES[$key]}"
             return 0
         fi
     fi
@@ -478,8 +492,11 @@ main() {
             local claude_dir="${1:-.claude}"
             create_default_manifest "$claude_dir"
             ;;
+        audit)
+            python3 "$(dirname "${BASH_SOURCE[0]}")/validate-paths.py" "$@"
+            ;;
         *)
-            echo "Usage: $0 {load|show|validate|clear-cache|get-claude-dir|get-role-guides-dir|get-manifest|create-manifest} [args...]" >&2
+            echo "Usage: $0 {load|show|validate|clear-cache|get-claude-dir|get-role-guides-dir|get-manifest|create-manifest|audit} [args...]" >&2
             echo "" >&2
             echo "Commands:" >&2
             echo "  load [dir]              Load path configuration from directory" >&2
@@ -490,6 +507,7 @@ main() {
             echo "  get-role-guides-dir     Get role guides directory name" >&2
             echo "  get-manifest            Get manifest file path" >&2
             echo "  create-manifest [dir]   Create default manifest file" >&2
+            echo "  audit [root] [opts]     Validate every paths.json under root (JSON report)" >&2
             return 2
             ;;
     esac
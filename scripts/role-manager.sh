@@ -1,6 +1,6 @@
 #!/usr/bin/env bash
 
-# role-manager.sh - Core role management logic
+# role-manager.sh - Core role management logic and command dispatcher
 #
 # Functions:
 #   - set_role: Set user role
@@ -8,9 +8,15 @@
 #   - update_role_docs: Add/remove documents
 #   - init_role_docs: Initialize role documents from guide
 #   - get_role_guide_path: Find role guide file
-#   - extract_document_references: Parse documents from role guide
+#   - collect_document_references: Parse documents from role guide
+#   - extract_document_references: Same, as a JSON array
 #   - merge_role_references: Merge team defaults with user overrides
 #
+# The commands and most of these functions live in function groups under
+# role-manager/ that are loaded on first use (see "Lazy Loading"), so a
+# command only parses the code it runs. `build-entries` writes optional
+# standalone per-command scripts (see "Per-Command Entry Scripts").
+#
 # Exit codes:
 #   0 - Success
 #   1 - Validation/logic error
@@ -25,9 +31,137 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/path-config.sh"
 load_path_config
 
-# Source helper scripts
-source "$SCRIPT_DIR/level-detector.sh" 2>/dev/null || true
-source "$SCRIPT_DIR/doc-validator.sh" 2>/dev/null || true
+# Source locked/atomic JSON update library
+source "$SCRIPT_DIR/json-store.sh"
+
+# =============================================================================
+# Lazy Loading
+# =============================================================================
+#
+# Commands and their helpers live in function groups (role-manager/<group>.sh)
+# and in the helper scripts level-detector.sh (which brings in
+# hierarchy-detector.sh) and doc-validator.sh. Each of their functions starts
+# out as a stub that loads its file and calls the real definition, so every
+# function is available to scripts that source this one, while a command
+# only parses what it calls. main preloads a command's groups
+# (COMMAND_GROUPS) so they are loaded once in the main shell rather than in
+# every $(...) subshell that calls them.
+
+ROLE_MANAGER_LIB="$SCRIPT_DIR/role-manager"
+
+# Function group -> the functions it defines
+declare -gA ROLE_MANAGER_GROUPS=(
+    [documents]="init_document_resolver resolve_document_ref resolve_document_paths resolve_document_path
+        heading_anchor get_heading_index_path build_heading_index find_document_section
+        find_section_in_index read_document_ref"
+    [roles]="get_preference set_preference ensure_claude_dir get_current_role set_user_role
+        get_role_guide_path list_available_roles collect_document_references
+        extract_document_references read_role_references write_role_references merge_role_documents"
+    [role-commands]="cmd_show_role_context cmd_set_role cmd_init_role_docs cmd_update_role_docs"
+    [layers]="get_layer_cache_dir find_ancestor_config_dirs is_layer_fresh record_layer_inputs
+        build_context_layer load_context_layers print_context_layers is_layer_part_unchanged
+        is_layer_unchanged print_context_layers_delta"
+    [packs]="get_context_pack_path write_context_pack load_context_pack open_context_pack_body
+        read_context_pack_entry build_context_pack"
+    [delta]="get_last_context_path load_last_context write_last_context"
+    [load]="json_content emit_context_json prefetch_documents cmd_load_role_context"
+    [setup-state]="get_setup_state_path load_setup_state probe_setup_state get_template_update_status
+        collect_missing_setup_items check_setup_complete get_missing_setup_items
+        check_template_updates cmd_setup_state"
+    [role-guides]="cmd_add_role_guides"
+    [role-selection]="cmd_list_roles_json infer_org_level_from_role cmd_get_all_roles_by_level"
+)
+
+# Helper script -> its functions (their find_claude_dir and main are not
+# exposed: role-manager.sh defines its own)
+declare -gA HELPER_SCRIPT_FUNCTIONS=(
+    [level-detector.sh]="read_explicit_level detect_by_heuristics prompt_user_for_level save_level
+        find_parent_claude_dirs get_nearest_parent read_level_from_claude_dir get_level_value
+        build_hierarchy_path is_valid_child_level save_level_with_hierarchy validate_hierarchy
+        show_hierarchy discover_claude_dirs read_level_files add_audit_violation build_audit_tree
+        print_audit_node audit_hierarchy_json audit_hierarchy"
+    [doc-validator.sh]="find_repo_root resolve_path check_document_exists get_status_indicator
+        validate_documents print_validation_results is_standardized_document"
+)
+
+# Command function -> the groups and helper scripts it calls (set, init and
+# update finish by showing the role context). load-role-context only needs
+# level-detector.sh to rebuild a stale layer, which build_context_layer loads.
+declare -gA COMMAND_GROUPS=(
+    [cmd_show_role_context]="roles role-commands level-detector.sh doc-validator.sh"
+    [cmd_set_role]="documents roles role-commands packs level-detector.sh doc-validator.sh"
+    [cmd_init_role_docs]="roles role-commands level-detector.sh doc-validator.sh"
+    [cmd_update_role_docs]="documents roles role-commands packs level-detector.sh doc-validator.sh"
+    [cmd_load_role_context]="documents roles layers packs delta load"
+    [cmd_setup_state]="setup-state"
+    [cmd_add_role_guides]="role-guides"
+    [cmd_list_roles_json]="role-selection"
+    [cmd_get_all_roles_by_level]="role-selection"
+)
+
+# Groups and helper scripts loaded so far
+declare -gA ROLE_MANAGER_LOADED=()
+
+# Usage: load_function_group <group>
+# Returns: 0 on success, 2 if the group file cannot be read
+load_function_group() {
+    [[ -z "${ROLE_MANAGER_LOADED[$1]:-}" ]] || return 0
+    source "$ROLE_MANAGER_LIB/$1.sh" || {
+        echo "Error: cannot load $ROLE_MANAGER_LIB/$1.sh" >&2
+        return 2
+    }
+    ROLE_MANAGER_LOADED[$1]=1
+}
+
+# Usage: load_helper_script <script>
+# The helper scripts re-source path-config.sh and define their own
+# find_claude_dir and main; role-manager.sh's versions and the loaded path
+# configuration are kept.
+load_helper_script() {
+    [[ -z "${ROLE_MANAGER_LOADED[$1]:-}" ]] || return 0
+    local own_functions
+    local initialized="$PATH_CONFIG_INITIALIZED"
+    local cache_time="$PATH_CONFIG_CACHE_TIME"
+    own_functions="$(declare -f find_claude_dir main)"
+    source "$SCRIPT_DIR/$1" 2>/dev/null || true
+    eval "$own_functions"
+    PATH_CONFIG_INITIALIZED="$initialized"
+    PATH_CONFIG_CACHE_TIME="$cache_time"
+    ROLE_MANAGER_LOADED[$1]=1
+}
+
+# Usage: load_command_groups <command function>
+load_command_groups() {
+    local unit
+    for unit in ${COMMAND_GROUPS[$1]:-}; do
+        if [[ "$unit" == *.sh ]]; then
+            load_helper_script "$unit"
+        else
+            load_function_group "$unit"
+        fi
+    done
+}
+
+# Usage: define_lazy_stubs <loader> <unit> <functions...>
+# Defines each function as a stub that runs "<loader> <unit>" (which
+# replaces it with the real definition) and calls it again
+define_lazy_stubs() {
+    local loader="$1"
+    local unit="$2"
+    local fn
+    shift 2
+    for fn in "$@"; do
+        eval "$fn() { $loader $unit && $fn \"\$@\"; }"
+    done
+}
+
+for _group in "${!ROLE_MANAGER_GROUPS[@]}"; do
+    define_lazy_stubs load_function_group "$_group" ${ROLE_MANAGER_GROUPS[$_group]}
+done
+for _group in "${!HELPER_SCRIPT_FUNCTIONS[@]}"; do
+    define_lazy_stubs load_helper_script "$_group" ${HELPER_SCRIPT_FUNCTIONS[$_group]}
+done
+unset _group
 
 # =============================================================================
 # Multi-Scope Configuration Support (v1.4.0)
@@ -38,12 +172,12 @@ find_claude_dir_upward() {
     local claude_dir_name
     claude_dir_name="$(get_claude_dir_name)"
     local dir="$PWD"
-    while [[ "$dir" != "/" ]]; do
+    while [[ -n "$dir" && "$dir" != "/" ]]; do
         if [[ -d "$dir/$claude_dir_name" ]]; then
             echo "$dir/$claude_dir_name"
             return 0
         fi
-        dir="$(dirname "$dir")"
+        dir="${dir%/*}"
     done
     return 1
 }
@@ -132,1374 +266,251 @@ get_template_path() {
     echo "$plugin_dir/templates/$template_name"
 }
 
-# Resolve document paths with multi-scope support
-# Args:
-#   $1: document path (absolute from root or relative)
-# Returns:
-#   Resolved absolute path if found, otherwise original path
-resolve_document_path() {
-    local doc_path="$1"
-
-    # Absolute path from project root (starts with /)
-    if [[ "$doc_path" =~ ^/ ]]; then
-        local project_root
-        project_root="$(git rev-parse --show-toplevel 2>/dev/null || pwd)"
-        local resolved="$project_root${doc_path}"
-        if [[ -f "$resolved" ]]; then
-            echo "$resolved"
-            return 0
-        fi
-        # Return path even if not found, for error reporting
-        echo "$resolved"
-        return 1
-    fi
-
-    # Relative path - search in order of precedence
-
-    # 1. Current directory
-    if [[ -f "$PWD/$doc_path" ]]; then
-        echo "$PWD/$doc_path"
-        return 0
-    fi
-
-    # 2. Project root (if in project context)
-    if is_project_context; then
-        local project_root
-        project_root="$(dirname "$(find_claude_dir_upward)")"
-        if [[ -f "$project_root/$doc_path" ]]; then
-            echo "$project_root/$doc_path"
-            return 0
-        fi
-    fi
+# =============================================================================
+# Shared Helpers
+# =============================================================================
 
-    # 3. Global .claude directory (for global-only docs)
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    if [[ -f "$HOME/$claude_dir_name/$doc_path" ]]; then
-        echo "$HOME/$claude_dir_name/$doc_path"
-        return 0
+# Usage: cache_key_for_path <path>
+# Sets: CACHE_KEY (a file name derived from <path>, without forking for
+# ordinary paths)
+cache_key_for_path() {
+    CACHE_KEY="${1//%/%25}"
+    CACHE_KEY="${CACHE_KEY//\//%2F}"
+    if [[ ${#CACHE_KEY} -gt 200 ]]; then
+        CACHE_KEY="$(printf '%s' "$1" | cksum | tr ' ' '-')"
+    fi
+}
+
+# Usage: file_signatures <path>...
+# Sets: FILE_SIGNATURES (one "<size>:<mtime>" per path, in order; the mtime
+# has nanoseconds where the filesystem records them)
+# Returns: 0 on success, 1 if a path is missing or could not be stat'ed
+# Caches compare these for equality, so a file replaced by an older copy or
+# rewritten within the same mtime tick (with a new size) is still noticed.
+# One stat process covers every path.
+file_signatures() {
+    FILE_SIGNATURES=()
+    [[ $# -gt 0 ]] || return 0
+    local path
+    for path in "$@"; do
+        [[ -e "$path" ]] || return 1
+    done
+    mapfile -t FILE_SIGNATURES < <(stat -c '%s:%.9Y' -- "$@" 2>/dev/null || stat -f '%z:%.9Fm' -- "$@" 2>/dev/null)
+    [[ ${#FILE_SIGNATURES[@]} -eq $# ]]
+}
+
+# Usage: sha256_string <value>
+# Sets: SHA256 (hex sha256 of <value>, or "-" without sha256sum/shasum)
+sha256_string() {
+    SHA256="-"
+    if command -v sha256sum &> /dev/null; then
+        read -r SHA256 _ < <(printf '%s' "$1" | sha256sum)
+    elif command -v shasum &> /dev/null; then
+        read -r SHA256 _ < <(printf '%s' "$1" | shasum -a 256)
+    fi
+}
+
+# One well-formed UTF-8 sequence (no NUL, surrogates or overlongs), as an ERE
+# to match bytewise under LC_ALL=C
+UTF8_SEQUENCE=$'[\x01-\x7f]|[\xc2-\xdf][\x80-\xbf]|\xe0[\xa0-\xbf][\x80-\xbf]'
+UTF8_SEQUENCE+=$'|[\xe1-\xec\xee\xef][\x80-\xbf][\x80-\xbf]|\xed[\x80-\x9f][\x80-\xbf]'
+UTF8_SEQUENCE+=$'|\xf0[\x90-\xbf][\x80-\xbf][\x80-\xbf]|[\xf1-\xf3][\x80-\xbf][\x80-\xbf][\x80-\xbf]'
+UTF8_SEQUENCE+=$'|\xf4[\x80-\x8f][\x80-\xbf][\x80-\xbf]'
+
+# Usage: is_utf8 <value>
+# Returns: 0 if <value> is valid UTF-8 (ASCII is checked without the regex)
+is_utf8() {
+    local LC_ALL=C
+    [[ "$1" != *[$'\x80'-$'\xff']* ]] && return 0
+    [[ "$1" =~ ^($UTF8_SEQUENCE)*$ ]]
+}
+
+# Usage: json_string <value>
+# Sets: JSON_STRING (<value> as a quoted JSON string, escaped without forking)
+# Bytes that are not valid UTF-8 are replaced with U+FFFD, so the result is
+# always valid JSON; use json_content where the exact bytes matter.
+json_string() {
+    local LC_ALL=C
+    local value="$1"
+    value="${value//\\/\\\\}"
+    value="${value//\"/\\\"}"
+    value="${value//$'\n'/\\n}"
+    value="${value//$'\r'/\\r}"
+    value="${value//$'\t'/\\t}"
+    if [[ "$value" == *[$'\001'-$'\037']* ]]; then
+        local code hex char
+        for ((code = 1; code < 32; code++)); do
+            printf -v hex '%02x' "$code"
+            printf -v char "\\x$hex"
+            value="${value//"$char"/\\u00$hex}"
+        done
     fi
-
-    # Not found - return original for error reporting
-    echo "$doc_path"
-    return 1
-}
-
-# Read preference with scope hierarchy (project overrides global)
-# Args:
-#   $1: preference key (e.g., "user_role")
-# Returns:
-#   Preference value (project > global > empty)
-get_preference() {
-    local key="$1"
-
-    # Try project config first
-    if is_project_context; then
-        local project_config="$(find_claude_dir_upward)/preferences.json"
-        if [[ -f "$project_config" ]]; then
-            local value
-            if command -v jq &> /dev/null; then
-                value=$(jq -r ".$key // empty" "$project_config" 2>/dev/null)
-            else
-                value=$(grep -o "\"$key\"[[:space:]]*:[[:space:]]*\"[^\"]*\"" "$project_config" 2>/dev/null | \
-                    sed 's/.*"\([^"]*\)"/\1/')
-            fi
+    if ! is_utf8 "$value"; then
+        # Keep the longest valid prefix, replace one byte, repeat
+        local valid=""
+        while [[ -n "$value" ]]; do
+            [[ "$value" =~ ^($UTF8_SEQUENCE)* ]]
+            valid+="${BASH_REMATCH[0]}"
+            value="${value:${#BASH_REMATCH[0]}}"
             if [[ -n "$value" ]]; then
-                echo "$value"
-                return 0
-            fi
-        fi
-    fi
-
-    # Fallback to global config
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    local global_config="$HOME/$claude_dir_name/preferences.json"
-    if [[ -f "$global_config" ]]; then
-        if command -v jq &> /dev/null; then
-            jq -r ".$key // empty" "$global_config" 2>/dev/null || echo ""
-        else
-            grep -o "\"$key\"[[:space:]]*:[[:space:]]*\"[^\"]*\"" "$global_config" 2>/dev/null | \
-                sed 's/.*"\([^"]*\)"/\1/' || echo ""
-        fi
-    fi
-}
-
-# Set preference with scope control
-# Args:
-#   $1: key
-#   $2: value
-#   $3: scope (auto|project|global) - default: auto
-set_preference() {
-    local key="$1"
-    local value="$2"
-    local scope="${3:-auto}"
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-
-    local config_dir
-    case "$scope" in
-        global)
-            config_dir="$HOME/$claude_dir_name"
-            ensure_global_config
-            ;;
-        project)
-            config_dir="$(find_claude_dir_upward)"
-            if [[ -z "$config_dir" ]]; then
-                echo "Error: Not in a project context. Cannot use --project scope." >&2
-                return 1
-            fi
-            ;;
-        auto)
-            # Write to project if in project, else global
-            if is_project_context; then
-                config_dir="$(find_claude_dir_upward)"
-            else
-                config_dir="$HOME/$claude_dir_name"
-                ensure_global_config
+                valid+='\ufffd'
+                value="${value:1}"
             fi
-            ;;
-        *)
-            echo "Error: Invalid scope '$scope'" >&2
-            return 1
-            ;;
-    esac
-
-    mkdir -p "$config_dir"
-    local prefs_file="$config_dir/preferences.json"
-
-    # Create file if doesn't exist
-    if [[ ! -f "$prefs_file" ]]; then
-        echo "{}" > "$prefs_file"
-    fi
-
-    # Update using jq
-    if command -v jq &> /dev/null; then
-        local temp_file
-        temp_file="$(mktemp)"
-        jq --arg key "$key" --arg value "$value" '.[$key] = $value' "$prefs_file" > "$temp_file"
-        mv "$temp_file" "$prefs_file"
-    else
-        # Fallback: simple sed replacement
-        if grep -q "\"$key\"" "$prefs_file"; then
-            sed -i.bak "s/\"$key\"[[:space:]]*:[[:space:]]*\"[^\"]*\"/\"$key\": \"$value\"/" "$prefs_file"
-            rm -f "$prefs_file.bak"
-        else
-            sed -i.bak 's/{/{\n  "'"$key"'": "'"$value"'",/' "$prefs_file"
-            rm -f "$prefs_file.bak"
-        fi
-    fi
-
-    echo "✓ Updated $key in: $prefs_file" >&2
-}
-
-# Ensure .claude directory exists
-ensure_claude_dir() {
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    if [[ ! -d "$claude_dir_name" ]]; then
-        mkdir -p "$claude_dir_name"
-        echo "Created $claude_dir_name directory" >&2
-    fi
-}
-
-# Read current role from preferences.json
-get_current_role() {
-    local claude_dir="$1"
-    local prefs_file="$claude_dir/preferences.json"
-
-    if [[ ! -f "$prefs_file" ]]; then
-        echo ""
-        return 1
-    fi
-
-    if command -v jq &> /dev/null; then
-        jq -r '.user_role // empty' "$prefs_file" 2>/dev/null || echo ""
-    else
-        grep -o '"user_role"[[:space:]]*:[[:space:]]*"[^"]*"' "$prefs_file" 2>/dev/null | \
-            sed 's/.*"\([^"]*\)"/\1/' || echo ""
-    fi
-}
-
-# Update role in preferences.json
-set_user_role() {
-    local claude_dir="$1"
-    local role="$2"
-    local prefs_file="$claude_dir/preferences.json"
-
-    # Create preferences.json if it doesn't exist
-    if [[ ! -f "$prefs_file" ]]; then
-        echo "{}" > "$prefs_file"
-    fi
-
-    if command -v jq &> /dev/null; then
-        local temp_file
-        temp_file="$(mktemp)"
-        jq --arg role "$role" '.user_role = $role' "$prefs_file" > "$temp_file"
-        mv "$temp_file" "$prefs_file"
-    else
-        # Fallback: simple sed replacement or append
-        if grep -q '"user_role"' "$prefs_file"; then
-            sed -i.bak "s/\"user_role\"[[:space:]]*:[[:space:]]*\"[^\"]*\"/\"user_role\": \"$role\"/" "$prefs_file"
-            rm -f "$prefs_file.bak"
-        else
-            # Add user_role field
-            sed -i.bak 's/{/{\n  "user_role": "'"$role"'",/' "$prefs_file"
-            rm -f "$prefs_file.bak"
-        fi
-    fi
-
-    echo "✓ Role set to: $role" >&2
-    echo "✓ Updated: $prefs_file" >&2
-}
-
-# Get role guide path for given role and level
-get_role_guide_path() {
-    local claude_dir="$1"
-    local role="$2"
-    local role_guides_dir
-    role_guides_dir="$(get_role_guides_dir)"
-
-    local role_guide="$claude_dir/$role_guides_dir/${role}-guide.md"
-
-    if [[ -f "$role_guide" ]]; then
-        echo "$role_guide"
-        return 0
-    fi
-
-    # Try without -guide suffix
-    role_guide="$claude_dir/$role_guides_dir/${role}.md"
-    if [[ -f "$role_guide" ]]; then
-        echo "$role_guide"
-        return 0
+        done
+        value="$valid"
     fi
-
-    echo "" >&2
-    return 1
+    JSON_STRING="\"$value\""
 }
 
-# List available roles for current level
-list_available_roles() {
-    local claude_dir="$1"
-    local role_guides_dirname
-    role_guides_dirname="$(get_role_guides_dir)"
-    local role_guides_dir="$claude_dir/$role_guides_dirname"
-
-    if [[ ! -d "$role_guides_dir" ]]; then
-        echo "No roles defined at this level" >&2
+# =============================================================================
+# Per-Command Entry Scripts
+# =============================================================================
+#
+# `role-manager.sh build-entries` writes one standalone script per command
+# holding just the functions and globals that command can reach, so hooks
+# can skip sourcing and stubbing altogether. An entry re-runs the command
+# through role-manager.sh whenever one of its sources is newer than it (or
+# RCM_TRACE is set, so traces keep their per-file source names).
+
+# Subcommand -> command function
+declare -gA COMMAND_FUNCTIONS=(
+    [show-role-context]=cmd_show_role_context
+    [set-role]=cmd_set_role
+    [init-role-docs]=cmd_init_role_docs
+    [update-role-docs]=cmd_update_role_docs
+    [load-role-context]=cmd_load_role_context
+    [list-roles-json]=cmd_list_roles_json
+    [get-all-roles-by-level]=cmd_get_all_roles_by_level
+    [add-role-guides]=cmd_add_role_guides
+    [setup-state]=cmd_setup_state
+    [build-entries]=cmd_build_entries
+)
+
+# Scripts an entry is generated from (checked by the entry's freshness test)
+ENTRY_SOURCES=(role-manager.sh 'role-manager/*.sh' path-config.sh json-store.sh json-extract.sh
+    level-detector.sh doc-validator.sh hierarchy-detector.sh)
+
+# Get the directory per-command entry scripts are written to
+get_entry_dir() {
+    echo "${RCM_ENTRY_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/role-context-manager/entries}"
+}
+
+# Usage: write_entry_script <command> <output-file>
+# Loads every group, then writes the functions reachable from the command's
+# handler and the globals they read. Run it in a fresh shell (see
+# cmd_build_entries) so no caller state leaks into the entry.
+write_entry_script() {
+    local _entry_command="$1"
+    local _entry_out="$2"
+    local _entry_handler="${COMMAND_FUNCTIONS[$_entry_command]:-}"
+    local _entry_unit _entry_fn _entry_word _entry_body _entry_tmp
+    local -A _entry_reached=() _entry_words=() _entry_baseline=()
+    local -a _entry_queue=()
+
+    if [[ -z "$_entry_handler" ]]; then
+        echo "Error: Unknown command: $_entry_command" >&2
         return 1
     fi
 
-    echo "Available roles:" >&2
-    for guide in "$role_guides_dir"/*.md; do
-        if [[ -f "$guide" ]]; then
-            local basename="$(basename "$guide" .md)"
-            # Remove -guide suffix if present
-            basename="${basename%-guide}"
-            echo "  - $basename" >&2
-        fi
+    for _entry_unit in "${!ROLE_MANAGER_GROUPS[@]}"; do
+        load_function_group "$_entry_unit" || return 2
     done
-}
-
-# Extract document references from role guide
-extract_document_references() {
-    local role_guide="$1"
-
-    if [[ ! -f "$role_guide" ]]; then
-        echo "[]"
-        return 1
-    fi
-
-    local docs=()
-    local in_section=false
-
-    while IFS= read -r line; do
-        # Check if we're entering the Document References section
-        if [[ "$line" =~ ^##[[:space:]]*Document[[:space:]]*References ]]; then
-            in_section=true
-            continue
-        fi
-
-        # Check if we're leaving the section (next ## heading)
-        if [[ "$line" =~ ^##[[:space:]] ]] && [[ "$in_section" == "true" ]]; then
-            break
-        fi
-
-        # Extract document paths from markdown list items
-        if [[ "$in_section" == "true" ]]; then
-            # Match: - `path.md`
-            if [[ "$line" =~ ^[[:space:]]*-[[:space:]]*\`([^\`]+\.md)\` ]]; then
-                local doc_path="${BASH_REMATCH[1]}"
-                docs+=("$doc_path")
-            # Match: - /absolute/path.md
-            elif [[ "$line" =~ ^[[:space:]]*-[[:space:]]*(/[^[:space:]]+\.md) ]]; then
-                local doc_path="${BASH_REMATCH[1]}"
-                docs+=("$doc_path")
-            # Match: - relative/path.md
-            elif [[ "$line" =~ ^[[:space:]]*-[[:space:]]*([^[:space:]]+\.md) ]]; then
-                local doc_path="${BASH_REMATCH[1]}"
-                docs+=("$doc_path")
-            fi
-        fi
-    done < "$role_guide"
-
-    # Output as JSON array
-    if command -v jq &> /dev/null; then
-        printf '%s\n' "${docs[@]}" | jq -R -s -c 'split("\n") | map(select(length > 0))'
-    else
-        # Fallback without jq
-        echo -n "["
-        local first=true
-        for doc in "${docs[@]}"; do
-            if [[ "$first" == "true" ]]; then
-                first=false
-            else
-                echo -n ","
+    for _entry_unit in "${!HELPER_SCRIPT_FUNCTIONS[@]}"; do
+        load_helper_script "$_entry_unit"
+    done
+    # The entry loads the path configuration itself
+    clear_path_config_cache
+
+    # Function closure: every defined function named in a reached body
+    # (main is never called from a function, only named in text)
+    _entry_reached[main]=1
+    _entry_queue=("$_entry_handler" load_path_config)
+    while [[ ${#_entry_queue[@]} -gt 0 ]]; do
+        _entry_fn="${_entry_queue[0]}"
+        _entry_queue=("${_entry_queue[@]:1}")
+        [[ -z "${_entry_reached[$_entry_fn]:-}" ]] || continue
+        _entry_reached[$_entry_fn]=1
+        _entry_body="$(declare -f "$_entry_fn")"
+        for _entry_word in ${_entry_body//[^A-Za-z0-9_]/ }; do
+            [[ -z "${_entry_words[$_entry_word]:-}" ]] || continue
+            _entry_words[$_entry_word]=1
+            if [[ -z "${_entry_reached[$_entry_word]:-}" ]] && declare -F "$_entry_word" > /dev/null; then
+                _entry_queue+=("$_entry_word")
             fi
-            echo -n "\"$doc\""
         done
-        echo "]"
-    fi
-}
-
-# Read role-references.json (team defaults or local overrides)
-read_role_references() {
-    local claude_dir="$1"
-    local role="$2"
-    local use_local="${3:-false}"
-
-    local ref_file="$claude_dir/role-references.json"
-    if [[ "$use_local" == "true" ]]; then
-        ref_file="$claude_dir/role-references.local.json"
-    fi
-
-    if [[ ! -f "$ref_file" ]]; then
-        echo "{}"
-        return 1
-    fi
-
-    if command -v jq &> /dev/null; then
-        jq --arg role "$role" '.[$role] // {}' "$ref_file" 2>/dev/null || echo "{}"
-    else
-        echo "{}"
-    fi
-}
-
-# Write role-references.json
-write_role_references() {
-    local claude_dir="$1"
-    local role="$2"
-    local default_docs="$3"
-    local custom_docs="$4"
-    local use_local="${5:-false}"
-
-    local ref_file="$claude_dir/role-references.json"
-    if [[ "$use_local" == "true" ]]; then
-        ref_file="$claude_dir/role-references.local.json"
-    fi
-
-    if command -v jq &> /dev/null; then
-        local temp_file
-        temp_file="$(mktemp)"
-
-        # Read existing file or create empty object
-        if [[ -f "$ref_file" ]]; then
-            cat "$ref_file" > "$temp_file"
-        else
-            echo "{}" > "$temp_file"
-        fi
-
-        # Update role entry
-        jq --arg role "$role" \
-           --argjson defaults "$default_docs" \
-           --argjson customs "$custom_docs" \
-           '.[$role] = {default_documents: $defaults, user_customizations: $customs}' \
-           "$temp_file" > "$ref_file"
-
-        rm -f "$temp_file"
-    else
-        # Fallback - simple write
-        cat > "$ref_file" <<EOF
-{
-  "$role": {
-    "default_documents": $default_docs,
-    "user_customizations": $custom_docs
-  }
-}
-EOF
-    fi
-}
-
-# Merge team defaults with local overrides
-merge_role_documents() {
-    local claude_dir="$1"
-    local role="$2"
-
-    # Read team defaults
-    local team_defaults
-    team_defaults="$(read_role_references "$claude_dir" "$role" false)"
-
-    # Read local overrides
-    local local_overrides
-    local_overrides="$(read_role_references "$claude_dir" "$role" true)"
-
-    # Extract default documents
-    local default_docs
-    if command -v jq &> /dev/null; then
-        default_docs="$(echo "$team_defaults" | jq -r '.default_documents[]? // empty' 2>/dev/null)"
-    else
-        default_docs=""
-    fi
-
-    # Extract customizations from local
-    local custom_docs
-    if command -v jq &> /dev/null; then
-        custom_docs="$(echo "$local_overrides" | jq -r '.user_customizations[]? // empty' 2>/dev/null)"
-    else
-        custom_docs=""
-    fi
-
-    # Build final list
-    local final_docs=()
-
-    # Add default docs
-    while IFS= read -r doc; do
-        [[ -z "$doc" ]] && continue
-        final_docs+=("$doc")
-    done <<< "$default_docs"
-
-    # Apply customizations
-    while IFS= read -r custom; do
-        [[ -z "$custom" ]] && continue
-
-        if [[ "$custom" =~ ^\+ ]]; then
-            # Add document
-            local doc_to_add="${custom#+}"
-            final_docs+=("$doc_to_add")
-        elif [[ "$custom" =~ ^\- ]]; then
-            # Remove document
-            local doc_to_remove="${custom#-}"
-            local new_docs=()
-            for doc in "${final_docs[@]}"; do
-                if [[ "$doc" != "$doc_to_remove" ]]; then
-                    new_docs+=("$doc")
-                fi
-            done
-            final_docs=("${new_docs[@]}")
-        fi
-    done <<< "$custom_docs"
-
-    # Output final list
-    printf '%s\n' "${final_docs[@]}"
-}
-
-# Display role context
-cmd_show_role_context() {
-    local claude_dir
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    claude_dir="$(find_claude_dir)" || {
-        echo "Error: No $claude_dir_name directory found" >&2
-        return 2
-    }
-
-    # Get organizational level
-    local org_level
-    org_level="$(detect_by_heuristics "$claude_dir" 2>/dev/null)" || org_level="project"
-
-    echo "Organizational level: $org_level"
-    echo ""
+    done
 
-    # Get current role
-    local current_role
-    current_role="$(get_current_role "$claude_dir")"
+    # Shell and environment variables are the caller's, not the entry's
+    for _entry_word in $(bash -c 'compgen -v') $(compgen -e); do
+        _entry_baseline[$_entry_word]=1
+    done
 
-    if [[ -z "$current_role" ]]; then
-        echo "No role set."
+    mkdir -p "$(dirname "$_entry_out")" || return 2
+    _entry_tmp="$(mktemp "$_entry_out.tmp.XXXXXX")" || return 2
+    {
+        echo "#!/usr/bin/env bash"
+        echo "# Generated by role-manager.sh build-entries for '$_entry_command'; do not edit."
         echo ""
-        list_available_roles "$claude_dir"
+        echo "set -euo pipefail"
         echo ""
-        echo "Use /set-role [role-name] to set your role."
-        return 0
-    fi
-
-    echo "Current role: $current_role"
-    echo ""
-
-    # Get merged documents
-    echo "Documents that will load on next session:"
-    echo ""
-
-    local docs
-    docs=($(merge_role_documents "$claude_dir" "$current_role"))
-
-    if [[ ${#docs[@]} -eq 0 ]]; then
-        echo "  No documents configured."
+        printf 'for src in %q/{%s}; do\n' "$SCRIPT_DIR" "$(IFS=,; echo "${ENTRY_SOURCES[*]}")"
+        echo "    if [[ -n \"\${RCM_TRACE:-}\" || ! \"\$src\" -ot \"\${BASH_SOURCE[0]}\" ]]; then"
+        printf '        exec bash %q %s "$@"\n' "$SCRIPT_DIR/role-manager.sh" "$_entry_command"
+        echo "    fi"
+        echo "done"
+        echo "unset src"
         echo ""
-        echo "Use /init-role-docs to initialize from role guide."
-        return 0
-    fi
-
-    # Check existence and display
-    for doc in "${docs[@]}"; do
-        local indicator
-        local resolved
-
-        # Skip wildcards or show them specially
-        if [[ "$doc" == *"*"* ]]; then
-            echo "  ~ $doc (pattern)"
-            continue
-        fi
-
-        resolved="$(resolve_path "$doc" 2>/dev/null)" || true
-
-        if [[ -n "$resolved" ]]; then
-            indicator="✓"
-        else
-            if is_standardized_document "$doc"; then
-                indicator="?"
-            else
-                indicator="!"
-            fi
-        fi
-
-        echo "  $indicator $doc"
-    done
-
-    echo ""
-    echo "Legend: ✓ exists | ! missing | ? can be generated"
-    echo ""
-    echo "Start a new session to load this context."
-}
-
-# Set role command
-cmd_set_role() {
-    local role="$1"
-
-    if [[ -z "$role" ]]; then
-        echo "Usage: /set-role [role-name]" >&2
-        return 1
-    fi
-
-    local claude_dir
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    claude_dir="$(find_claude_dir)" || {
-        ensure_claude_dir
-        claude_dir="./$claude_dir_name"
-    }
-
-    # Check if role exists
-    local role_guide
-    role_guide="$(get_role_guide_path "$claude_dir" "$role")"
-
-    if [[ -z "$role_guide" ]]; then
-        echo "Error: Role '$role' not found at this organizational level" >&2
-        echo "" >&2
-        list_available_roles "$claude_dir"
-        return 1
-    fi
-
-    # Set role in preferences
-    set_user_role "$claude_dir" "$role"
-
-    # Initialize role documents if not exists
-    local ref_file="$claude_dir/role-references.json"
-    if [[ ! -f "$ref_file" ]] || ! grep -q "\"$role\"" "$ref_file" 2>/dev/null; then
-        echo "" >&2
-        echo "Initializing document references from role guide..." >&2
-        cmd_init_role_docs
-    else
-        echo "" >&2
-        cmd_show_role_context
-    fi
-}
-
-# Initialize role documents from guide
-cmd_init_role_docs() {
-    local reset="${1:-false}"
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-
-    local claude_dir
-    claude_dir="$(find_claude_dir)" || {
-        echo "Error: No $claude_dir_name directory found" >&2
-        return 2
-    }
-
-    local current_role
-    current_role="$(get_current_role "$claude_dir")"
-
-    if [[ -z "$current_role" ]]; then
-        echo "Error: No role set. Use /set-role first." >&2
-        return 1
-    fi
-
-    # Get role guide
-    local role_guide
-    role_guide="$(get_role_guide_path "$claude_dir" "$current_role")"
-
-    if [[ -z "$role_guide" ]]; then
-        echo "Error: Role guide not found for role: $current_role" >&2
-        return 1
-    fi
-
-    # Extract document references
-    local doc_refs
-    doc_refs="$(extract_document_references "$role_guide")"
-
-    # Write to role-references.json
-    if [[ "$reset" == "--reset" ]] || [[ "$reset" == "true" ]]; then
-        # Reset: clear customizations
-        write_role_references "$claude_dir" "$current_role" "$doc_refs" "[]" false
-        echo "✓ Reset role documents to defaults for: $current_role"
-    else
-        # Initialize: keep existing customizations if any
-        local existing_customs
-        existing_customs="$(read_role_references "$claude_dir" "$current_role" false | jq -c '.user_customizations // []' 2>/dev/null)" || existing_customs="[]"
-        write_role_references "$claude_dir" "$current_role" "$doc_refs" "$existing_customs" false
-        echo "✓ Initialized role documents for: $current_role"
-    fi
-
-    echo ""
-    cmd_show_role_context
-}
-
-# Update role documents (+/- syntax)
-cmd_update_role_docs() {
-    local modifications=("$@")
-
-    if [[ ${#modifications[@]} -eq 0 ]]; then
-        echo "Usage: /update-role-docs [+/-]file ..." >&2
-        echo "Examples:" >&2
-        echo "  /update-role-docs +docs/custom.md" >&2
-        echo "  /update-role-docs -/quality-standards.md" >&2
-        echo "  /update-role-docs +new.md -old.md" >&2
-        return 1
-    fi
-
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    local claude_dir
-    claude_dir="$(find_claude_dir)" || {
-        echo "Error: No $claude_dir_name directory found" >&2
-        return 2
-    }
-
-    local current_role
-    current_role="$(get_current_role "$claude_dir")"
-
-    if [[ -z "$current_role" ]]; then
-        echo "Error: No role set. Use /set-role first." >&2
-        return 1
-    fi
-
-    # Read existing customizations from local file
-    local ref_file_local="$claude_dir/role-references.local.json"
-    local existing_customs=()
-
-    if [[ -f "$ref_file_local" ]]; then
-        while IFS= read -r custom; do
-            [[ -z "$custom" ]] && continue
-            existing_customs+=("$custom")
-        done < <(jq -r --arg role "$current_role" '.[$role].user_customizations[]? // empty' "$ref_file_local" 2>/dev/null)
-    fi
-
-    # Apply modifications
-    local additions=()
-    local removals=()
-
-    for mod in "${modifications[@]}"; do
-        if [[ "$mod" =~ ^\+ ]]; then
-            local doc_path="${mod#+}"
-            # Check if already in customizations
-            local already_exists=false
-            for existing in "${existing_customs[@]}"; do
-                if [[ "$existing" == "+$doc_path" ]]; then
-                    already_exists=true
-                    break
-                fi
-            done
-            if [[ "$already_exists" == "false" ]]; then
-                existing_customs+=("$mod")
-                additions+=("$doc_path")
-            fi
-        elif [[ "$mod" =~ ^\- ]]; then
-            local doc_path="${mod#-}"
-            # Check if removal already in customizations
-            local already_exists=false
-            for existing in "${existing_customs[@]}"; do
-                if [[ "$existing" == "-$doc_path" ]]; then
-                    already_exists=true
-                    break
-                fi
-            done
-            if [[ "$already_exists" == "false" ]]; then
-                existing_customs+=("$mod")
-                removals+=("$doc_path")
-            fi
-        else
-            echo "Warning: Invalid modification format: $mod (must start with + or -)" >&2
-        fi
-    done
-
-    # Convert to JSON array
-    local customs_json
-    if command -v jq &> /dev/null; then
-        customs_json="$(printf '%s\n' "${existing_customs[@]}" | jq -R -s -c 'split("\n") | map(select(length > 0))')"
-    else
-        customs_json="["
-        local first=true
-        for custom in "${existing_customs[@]}"; do
-            if [[ "$first" == "true" ]]; then
-                first=false
-            else
-                customs_json+=","
-            fi
-            customs_json+="\"$custom\""
-        done
-        customs_json+="]"
-    fi
-
-    # Write to local file
-    write_role_references "$claude_dir" "$current_role" "[]" "$customs_json" true
-
-    echo "✓ Updated role documents for: $current_role"
-    echo ""
-
-    if [[ ${#additions[@]} -gt 0 ]]; then
-        echo "Added:"
-        for doc in "${additions[@]}"; do
-            echo "  + $doc"
+        for _entry_word in $(printf '%s\n' "${!_entry_words[@]}" | sort); do
+            [[ "$_entry_word" == [A-Za-z_]* && "$_entry_word" != _entry_* && "$_entry_word" != BASH_* ]] || continue
+            [[ -z "${_entry_baseline[$_entry_word]:-}" ]] || continue
+            declare -p "$_entry_word" 2> /dev/null | sed 's/^declare -\([^ ]*\)/declare -g\1/; s/^declare -g-/declare -g/'
         done
         echo ""
-    fi
-
-    if [[ ${#removals[@]} -gt 0 ]]; then
-        echo "Removed:"
-        for doc in "${removals[@]}"; do
-            echo "  - $doc"
+        for _entry_fn in $(printf '%s\n' "${!_entry_reached[@]}" | sort); do
+            [[ "$_entry_fn" == main ]] || declare -f "$_entry_fn"
         done
         echo ""
-    fi
-
-    cmd_show_role_context
-}
-
-# Load role context for session (automatic loading on SessionStart)
-cmd_load_role_context() {
-    local mode="normal"
+        echo "load_path_config"
+        echo "$_entry_handler \"\$@\""
+    } > "$_entry_tmp" || { rm -f "$_entry_tmp"; return 2; }
+    chmod +x "$_entry_tmp"
+    mv "$_entry_tmp" "$_entry_out"
+}
+
+# Usage: cmd_build_entries [--output DIR]
+# Writes <command>.sh for each command into DIR (default: get_entry_dir).
+# add-role-guides sources template-manager.sh at run time and is left to
+# the dispatcher.
+cmd_build_entries() {
+    local out_dir
+    local command
+    out_dir="$(get_entry_dir)"
 
-    # Parse arguments
     while [[ $# -gt 0 ]]; do
         case "$1" in
-            --quiet)
-                mode="quiet"
-                shift
-                ;;
-            --verbose)
-                mode="verbose"
-                shift
+            --output)
+                out_dir="${2:-}"
+                shift 2 || true
                 ;;
             *)
-                shift
+                echo "Error: Unknown option: $1" >&2
+                echo "Usage: role-manager.sh build-entries [--output DIR]" >&2
+                return 1
                 ;;
         esac
     done
 
-    # Get effective config directory (project overrides global)
-    local config_dir
-    config_dir="$(get_effective_config_dir)"
-
-    # Get current role using multi-scope hierarchy
-    local current_role
-    current_role="$(get_preference "user_role")"
-
-    # No role set - exit silently (not an error)
-    if [[ -z "$current_role" || "$current_role" == "null" ]]; then
-        exit 0
-    fi
-
-    # Get role guide path
-    local role_guide
-    role_guide="$(get_role_guide_path "$config_dir" "$current_role")"
-
-    # Role guide missing - exit silently in quiet mode, warn in normal/verbose
-    if [[ -z "$role_guide" || ! -f "$role_guide" ]]; then
-        if [[ "$mode" != "quiet" ]]; then
-            echo "Warning: Role guide not found for role: $current_role" >&2
-        fi
-        exit 0
-    fi
-
-    # Read role guide content
-    local role_guide_content
-    role_guide_content="$(cat "$role_guide")"
-
-    # Extract document references
-    local doc_refs_json
-    doc_refs_json="$(extract_document_references "$role_guide")"
-
-    # Parse document references into array
-    local doc_paths=()
-    if command -v jq &> /dev/null; then
-        while IFS= read -r doc_path; do
-            [[ -n "$doc_path" ]] && doc_paths+=("$doc_path")
-        done < <(echo "$doc_refs_json" | jq -r '.[]' 2>/dev/null)
-    fi
-
-    # Read each document (best effort)
-    local doc_contents=()
-    local loaded_count=0
-
-    for doc_path in "${doc_paths[@]}"; do
-        local resolved_path
-        resolved_path="$(resolve_document_path "$doc_path" 2>/dev/null)" || resolved_path=""
-
-        if [[ -n "$resolved_path" && -f "$resolved_path" ]]; then
-            local doc_content
-            doc_content="$(cat "$resolved_path" 2>/dev/null)" || doc_content=""
-
-            if [[ -n "$doc_content" ]]; then
-                doc_contents+=("$doc_path|$doc_content")
-                ((loaded_count++))
-            fi
-        fi
-    done
-
-    # Output based on mode
-    case "$mode" in
-        quiet)
-            # One-line summary for SessionStart hook
-            echo "✓ Role context loaded: $current_role ($loaded_count documents)"
-            ;;
-        verbose)
-            # Full output with metadata
-            echo "=== ROLE CONTEXT LOADED ==="
-            echo ""
-            echo "Role: $current_role"
-            echo "Scope: $(is_project_context && echo "project" || echo "global")"
-            echo "Role guide: $role_guide"
-            echo "Documents loaded: $loaded_count/${#doc_paths[@]}"
-            echo ""
-
-            if [[ $loaded_count -gt 0 ]]; then
-                echo "Document list:"
-                for doc_info in "${doc_contents[@]}"; do
-                    local doc_path="${doc_info%%|*}"
-                    echo "  - $doc_path"
-                done
-                echo ""
-            fi
-
-            echo "You are collaborating with a user in the role: $current_role"
-            echo ""
-            echo "The following role guide defines how you should assist this user:"
-            echo ""
-            echo "---"
-            echo "$role_guide_content"
-            echo "---"
-            echo ""
-
-            if [[ $loaded_count -gt 0 ]]; then
-                echo "## Referenced Documents"
-                echo ""
-                echo "The following documents are part of this role's context:"
-                echo ""
-
-                for doc_info in "${doc_contents[@]}"; do
-                    local doc_path="${doc_info%%|*}"
-                    local doc_content="${doc_info#*|}"
-
-                    echo "### Document: $doc_path"
-                    echo "---"
-                    echo "$doc_content"
-                    echo "---"
-                    echo ""
-                done
-            fi
-
-            echo "This context is automatically loaded for this session. Follow the"
-            echo "deterministic behaviors and leverage the agentic opportunities defined above."
-            echo ""
-            echo "=== END ROLE CONTEXT ==="
-            ;;
-        *)
-            # Normal mode - full role guide + documents with context wrapper
-            echo "=== ROLE CONTEXT LOADED ==="
-            echo ""
-            echo "You are collaborating with a user in the role: $current_role"
-            echo ""
-            echo "The following role guide defines how you should assist this user:"
-            echo ""
-            echo "---"
-            echo "$role_guide_content"
-            echo "---"
-            echo ""
-
-            if [[ $loaded_count -gt 0 ]]; then
-                echo "## Referenced Documents"
-                echo ""
-                echo "The following documents are part of this role's context:"
-                echo ""
-
-                for doc_info in "${doc_contents[@]}"; do
-                    local doc_path="${doc_info%%|*}"
-                    local doc_content="${doc_info#*|}"
-
-                    echo "### Document: $doc_path"
-                    echo "---"
-                    echo "$doc_content"
-                    echo "---"
-                    echo ""
-                done
-            fi
-
-            echo "This context is automatically loaded for this session. Follow the"
-            echo "deterministic behaviors and leverage the agentic opportunities defined above."
-            echo ""
-            echo "=== END ROLE CONTEXT ==="
-            ;;
-    esac
-
-    exit 0
-}
-
-# =============================================================================
-# Template Integration Functions (v1.1.0)
-# =============================================================================
-
-# Check if .claude setup is complete and ready to use
-check_setup_complete() {
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    local role_guides_dirname
-    role_guides_dirname="$(get_role_guides_dir)"
-    local claude_dir="${1:-$claude_dir_name}"
-
-    # Check if .claude directory exists
-    if [[ ! -d "$claude_dir" ]]; then
-        return 1
-    fi
-
-    # Check if role-guides directory exists and has files
-    if [[ ! -d "$claude_dir/$role_guides_dirname" ]]; then
-        return 1
-    fi
-
-    local guide_count
-    guide_count=$(find "$claude_dir/$role_guides_dirname" -name "*.md" 2>/dev/null | wc -l)
-    if [[ $guide_count -eq 0 ]]; then
-        return 1
-    fi
-
-    # Check if organizational-level.json exists
-    if [[ ! -f "$claude_dir/organizational-level.json" ]]; then
-        # This is not critical, but preferred
-        :
-    fi
-
-    # Check if preferences.json exists
-    if [[ ! -f "$claude_dir/preferences.json" ]]; then
-        # This will be created on first use, so not critical
-        :
-    fi
-
-    # Setup appears complete
-    return 0
-}
-
-# Get list of missing setup items
-get_missing_setup_items() {
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    local role_guides_dirname
-    role_guides_dirname="$(get_role_guides_dir)"
-    local claude_dir="${1:-$claude_dir_name}"
-    local missing=()
-
-    if [[ ! -d "$claude_dir" ]]; then
-        missing+=("$claude_dir_name directory")
-    fi
-
-    if [[ ! -d "$claude_dir/$role_guides_dirname" ]]; then
-        missing+=("$role_guides_dirname directory")
-    elif [[ $(find "$claude_dir/$role_guides_dirname" -name "*.md" 2>/dev/null | wc -l) -eq 0 ]]; then
-        missing+=("role guide files")
-    fi
-
-    if [[ ! -f "$claude_dir/organizational-level.json" ]]; then
-        missing+=("organizational-level.json (recommended)")
-    fi
-
-    if [[ ! -f "$claude_dir/preferences.json" ]]; then
-        missing+=("preferences.json (will be created)")
-    fi
-
-    if [[ ! -f "$claude_dir/role-references.json" ]]; then
-        missing+=("role-references.json (will be created)")
-    fi
-
-    # Print missing items as JSON array for easy parsing
-    if command -v jq &>/dev/null; then
-        printf '%s\n' "${missing[@]}" | jq -R . | jq -s .
-    else
-        # Fallback to newline-separated list
-        printf '%s\n' "${missing[@]}"
-    fi
-}
-
-# Check if template updates are available
-check_template_updates() {
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    local claude_dir="${1:-$claude_dir_name}"
-
-    # Source template-manager.sh to access its functions
-    local script_dir="$(dirname "${BASH_SOURCE[0]}")"
-    if [[ -f "$script_dir/template-manager.sh" ]]; then
-        source "$script_dir/template-manager.sh"
-
-        local version_check
-        version_check=$(check_template_version "$claude_dir/preferences.json" 2>/dev/null)
-
-        if [[ $version_check == update-available:* ]]; then
-            echo "true"
-            return 0
-        fi
-    fi
-
-    echo "false"
-    return 0
-}
-
-# =============================================================================
-# Role Guide Management Functions
-# =============================================================================
-
-# Add role guides to current organizational level
-cmd_add_role_guides() {
-    # Source template-manager for helper functions
-    local template_manager="$SCRIPT_DIR/template-manager.sh"
-    if [ ! -f "$template_manager" ]; then
-        echo "Error: template-manager.sh not found" >&2
+    if [[ -z "$out_dir" ]]; then
+        echo "Error: --output requires a directory" >&2
         return 1
     fi
-    source "$template_manager"
-
-    # Also source hierarchy-detector if available
-    local hierarchy_detector="$SCRIPT_DIR/hierarchy-detector.sh"
-    if [ -f "$hierarchy_detector" ]; then
-        source "$hierarchy_detector"
-    fi
-
-    # Find .claude directory
-    local claude_dir
-    local claude_dir_name
-    claude_dir_name="$(get_claude_dir_name)"
-    claude_dir=$(find_claude_dir) || {
-        echo "Error: Not in a role-context-manager setup ($claude_dir_name directory not found)" >&2
-        echo "Run /init-org-template first to initialize the organizational structure" >&2
-        return 2
-    }
-
-    # Check if arguments provided
-    if [ $# -eq 0 ]; then
-        echo "Usage: /add-role-guides <guide1> [guide2] [CUSTOM:name] ..." >&2
-        echo "" >&2
-        echo "Examples:" >&2
-        echo "  /add-role-guides software-engineer-guide.md" >&2
-        echo "  /add-role-guides qa-engineer-guide.md CUSTOM:devops-lead" >&2
-        echo "  /add-role-guides CUSTOM:platform-sre CUSTOM:security-engineer" >&2
-        return 1
-    fi
-
-    # Get current organizational level
-    local org_level="project"
-    local org_level_file="$claude_dir/organizational-level.json"
-    if [ -f "$org_level_file" ]; then
-        org_level=$(jq -r '.level // "project"' "$org_level_file" 2>/dev/null || echo "project")
-    fi
-
-    # Get parent level if it exists
-    local parent_level=""
-    if [ -f "$org_level_file" ]; then
-        parent_level=$(jq -r '.parent_level // empty' "$org_level_file" 2>/dev/null || echo "")
-    fi
-
-    # Get role-guides directory using path-config API
-    local role_guides_dir
-    local role_guides_dirname
-    role_guides_dirname="$(get_role_guides_dir)"
-    role_guides_dir="$claude_dir/$role_guides_dirname"
-
-    # Ensure role-guides directory exists
-    mkdir -p "$role_guides_dir"
-
-    echo "Adding role guides to: $claude_dir"
-    echo "Organizational level: $org_level"
-    if [ -n "$parent_level" ]; then
-        echo "Parent level: $parent_level (will filter inherited guides)"
-    fi
-    echo ""
-
-    local added_count=0
-    local skipped_count=0
-    local custom_count=0
-
-    # Process each argument
-    for guide_arg in "$@"; do
-        # Check for CUSTOM: prefix
-        if [[ "$guide_arg" =~ ^CUSTOM: ]]; then
-            # Extract custom guide name
-            local custom_name="${guide_arg#CUSTOM:}"
-            custom_name=$(echo "$custom_name" | xargs)
-
-            # Validate custom name
-            if [[ "$custom_name" =~ \.\. ]] || [[ "$custom_name" =~ / ]]; then
-                echo "Error: Invalid custom guide name '$custom_name' (no path traversal allowed)" >&2
-                continue
-            fi
-
-            if [[ ! "$custom_name" =~ ^[a-z][a-z0-9-]*$ ]]; then
-                echo "Error: Custom guide name '$custom_name' must be kebab-case (lowercase, hyphens only)" >&2
-                continue
-            fi
-
-            # Generate custom guide placeholder
-            local custom_file="$role_guides_dir/${custom_name}-guide.md"
 
-            if [ -f "$custom_file" ]; then
-                echo "  Skipped: ${custom_name}-guide.md (already exists)" >&2
-                ((skipped_count++))
-                continue
-            fi
-
-            if generate_custom_role_guide_placeholder "$custom_name" "$org_level" > "$custom_file"; then
-                echo "  ✓ Created custom guide: ${custom_name}-guide.md"
-                ((custom_count++))
-                ((added_count++))
-            else
-                echo "  Error: Failed to create custom guide: $custom_name" >&2
-            fi
-
-        else
-            # Regular guide file - find in templates
-            local guide_name="$guide_arg"
-
-            # Ensure .md extension
-            if [[ ! "$guide_name" =~ \.md$ ]]; then
-                guide_name="${guide_name}.md"
-            fi
-
-            # Check if guide should be included (parent filtering)
-            if [ -n "$parent_level" ]; then
-                if ! should_include_role_guide "$guide_name" "$org_level" "$parent_level"; then
-                    echo "  Skipped: $guide_name (inherited from parent $parent_level level)" >&2
-                    ((skipped_count++))
-                    continue
-                fi
-            fi
-
-            # Check if already exists
-            if [ -f "$role_guides_dir/$guide_name" ]; then
-                echo "  Skipped: $guide_name (already exists)" >&2
-                ((skipped_count++))
-                continue
-            fi
-
-            # Find guide in template system using path-config API
-            local plugin_dir
-            plugin_dir="$(get_plugin_dir)"
-            local template_base="$plugin_dir/templates/core"
-            local guide_found=""
-
-            # Search for guide in template hierarchy (using dynamic path construction)
-            for template_dir in "$template_base"/*-template; do
-                if [ -d "$template_dir" ]; then
-                    # Construct full path to role-guides using path-config API
-                    local template_claude_dir="$template_dir/$claude_dir_name"
-                    local template_role_guides="$template_claude_dir/$role_guides_dirname"
-
-                    if [ -f "$template_role_guides/$guide_name" ]; then
-                        guide_found="$template_role_guides/$guide_name"
-                        break
-                    fi
-                fi
-            done
-
-            if [ -z "$guide_found" ]; then
-                echo "  Warning: Guide '$guide_name' not found in template system" >&2
-                echo "           Available guides can be listed with: /list-roles" >&2
-                ((skipped_count++))
-                continue
-            fi
-
-            # Copy guide
-            cp "$guide_found" "$role_guides_dir/"
-            echo "  ✓ Added: $guide_name"
-            ((added_count++))
-        fi
+    for command in $(printf '%s\n' "${!COMMAND_FUNCTIONS[@]}" | sort); do
+        [[ "$command" != build-entries && "$command" != add-role-guides ]] || continue
+        bash -c 'source "$1"; write_entry_script "$2" "$3"' _ \
+            "$SCRIPT_DIR/role-manager.sh" "$command" "$out_dir/$command.sh" || return $?
+        echo "✓ $out_dir/$command.sh"
     done
-
-    echo ""
-    echo "Summary: Added $added_count guides, created $custom_count custom placeholders, skipped $skipped_count"
-
-    if [ $added_count -gt 0 ] || [ $custom_count -gt 0 ]; then
-        echo ""
-        echo "Role guides have been added. To use them:"
-        echo "  1. Customize any placeholder content in new guides"
-        echo "  2. Run /set-role <role-name> to activate a role"
-        echo "  3. Run /load-role-context to load role context into session"
-    fi
-
-    return 0
-}
-
-# =============================================================================
-# Role Selection Assistant Helper Functions (v1.4.0)
-# =============================================================================
-
-# List all available roles as JSON array
-cmd_list_roles_json() {
-    local claude_dir
-    claude_dir="$(find_claude_dir)" || {
-        echo "[]"
-        return 0
-    }
-
-    local role_guides_dirname
-    role_guides_dirname="$(get_role_guides_dir)"
-    local role_guides_dir="$claude_dir/$role_guides_dirname"
-
-    if [[ ! -d "$role_guides_dir" ]]; then
-        echo "[]"
-        return 0
-    fi
-
-    # Build JSON array of role names
-    local roles=()
-    while IFS= read -r file; do
-        local basename=$(basename "$file" .md)
-        # Remove -guide suffix if present
-        basename=${basename%-guide}
-        roles+=("\"$basename\"")
-    done < <(find "$role_guides_dir" -maxdepth 1 -name "*.md" 2>/dev/null | sort)
-
-    # Generate JSON array
-    if [[ ${#roles[@]} -eq 0 ]]; then
-        echo "[]"
-    else
-        echo "["
-        local first=true
-        for role in "${roles[@]}"; do
-            if [[ "$first" == "true" ]]; then
-                echo -n "  $role"
-                first=false
-            else
-                echo ","
-                echo -n "  $role"
-            fi
-        done
-        echo ""
-        echo "]"
-    fi
-}
-
-# Infer organizational level from role name using heuristics
-infer_org_level_from_role() {
-    local role="$1"
-
-    # Convert to lowercase for matching
-    local role_lower=$(echo "$role" | tr '[:upper:]' '[:lower:]')
-
-    # Executive roles -> company
-    if [[ "$role_lower" =~ ^(cto|cpo|ciso|vp-|chief-|executive) ]]; then
-        echo "company"
-        return 0
-    fi
-
-    # Management/architect roles -> system
-    if [[ "$role_lower" =~ (manager|architect|platform-engineer|technical-lead|director|lead) ]]; then
-        echo "system"
-        return 0
-    fi
-
-    # Product roles -> product
-    if [[ "$role_lower" =~ (product-manager|designer|ux-|ui-|qa-manager|product-owner) ]]; then
-        echo "product"
-        return 0
-    fi
-
-    # Default to project (implementation roles)
-    echo "project"
-    return 0
-}
-
-# Get all roles grouped by organizational level as JSON
-cmd_get_all_roles_by_level() {
-    local claude_dir
-    claude_dir="$(find_claude_dir)" || {
-        echo '{"company":[],"system":[],"product":[],"project":[]}'
-        return 0
-    }
-
-    local role_guides_dirname
-    role_guides_dirname="$(get_role_guides_dir)"
-    local role_guides_dir="$claude_dir/$role_guides_dirname"
-
-    if [[ ! -d "$role_guides_dir" ]]; then
-        echo '{"company":[],"system":[],"product":[],"project":[]}'
-        return 0
-    fi
-
-    # Initialize associative arrays for levels
-    declare -A levels
-    levels[company]=""
-    levels[system]=""
-    levels[product]=""
-    levels[project]=""
-
-    # Read each role guide and categorize
-    while IFS= read -r file; do
-        local basename=$(basename "$file" .md)
-        # Remove -guide suffix if present
-        basename=${basename%-guide}
-
-        # Try to extract org level from file content
-        local org_level=""
-        if grep -qi "Organizational Level:" "$file"; then
-            # Extract the level from the file (case-insensitive)
-            org_level=$(grep -i "Organizational Level:" "$file" | head -1 | \
-                sed 's/.*[Oo]rganizational [Ll]evel: *\([^ ,]*\).*/\1/' | \
-                tr '[:upper:]' '[:lower:]')
-
-            # Validate the extracted level
-            if [[ ! "$org_level" =~ ^(company|system|product|project)$ ]]; then
-                org_level=""
-            fi
-        fi
-
-        # If no explicit level found, use heuristic
-        if [[ -z "$org_level" ]]; then
-            org_level=$(infer_org_level_from_role "$basename")
-        fi
-
-        # Add to appropriate level
-        if [[ -n "${levels[$org_level]}" ]]; then
-            levels[$org_level]="${levels[$org_level]},\"$basename\""
-        else
-            levels[$org_level]="\"$basename\""
-        fi
-    done < <(find "$role_guides_dir" -maxdepth 1 -name "*.md" 2>/dev/null | sort)
-
-    # Build JSON output
-    echo "{"
-    echo "  \"company\": [${levels[company]}],"
-    echo "  \"system\": [${levels[system]}],"
-    echo "  \"product\": [${levels[product]}],"
-    echo "  \"project\": [${levels[project]}]"
-    echo "}"
 }
 
 # =============================================================================
@@ -1508,38 +519,25 @@ cmd_get_all_roles_by_level() {
 
 main() {
     local command="${1:-}"
+    local handler=""
     shift || true
 
     case "$command" in
-        show|show-role-context)
-            cmd_show_role_context "$@"
-            ;;
-        set|set-role)
-            cmd_set_role "$@"
-            ;;
-        init|init-role-docs)
-            cmd_init_role_docs "$@"
-            ;;
-        update|update-role-docs)
-            cmd_update_role_docs "$@"
-            ;;
-        load|load-role-context)
-            cmd_load_role_context "$@"
-            ;;
-        list-roles-json)
-            cmd_list_roles_json "$@"
-            ;;
-        get-all-roles-by-level)
-            cmd_get_all_roles_by_level "$@"
-            ;;
-        add-role-guides)
-            cmd_add_role_guides "$@"
-            ;;
-        *)
-            echo "Usage: $0 {show|set|init|update|load|list-roles-json|get-all-roles-by-level|add-role-guides} [args...]" >&2
-            exit 2
-            ;;
+        show) command=show-role-context ;;
+        set) command=set-role ;;
+        init) command=init-role-docs ;;
+        update) command=update-role-docs ;;
+        load) command=load-role-context ;;
     esac
+    [[ -z "$command" ]] || handler="${COMMAND_FUNCTIONS[$command]:-}"
+
+    if [[ -z "$handler" ]]; then
+        echo "Usage: $0 {show|set|init|update|load|list-roles-json|get-all-roles-by-level|add-role-guides|setup-state|build-entries} [args...]" >&2
+        exit 2
+    fi
+
+    load_command_groups "$handler"
+    "$handler" "$@"
 }
 
 # Run if executed directly
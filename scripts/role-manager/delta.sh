@@ -0,0 +1,110 @@
+#!/usr/bin/env bash
+
+# role-manager/delta.sh - Delta context state (load-role-context --since-last SESSION)
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - load_last_context: Read the fingerprints recorded by a session's last load
+#   - write_last_context: Record the fingerprints of what was emitted
+
+# =============================================================================
+# Delta Context (--since-last SESSION)
+# =============================================================================
+#
+# After each --since-last load, the fingerprints of what was emitted are
+# recorded for the session the caller named, since only that session holds
+# the earlier context:
+#
+#   RCMLAST 3
+#   role<TAB><role>
+#   config<TAB><config dir>
+#   guide<TAB><sha256 of the role guide>
+#   D<TAB><sha256><TAB><document reference>
+#   L<TAB><sha256><TAB><ancestor config dir><TAB>G|D<TAB><guide path|reference>
+#
+# L lines fingerprint the role guides and documents of inherited layers
+# (--inherit). Hashes come from the pack and layer indexes, so recording
+# them costs no extra reads.
+# Session files not written for LAST_CONTEXT_MAX_AGE_DAYS are pruned.
+
+LAST_CONTEXT_MAX_AGE_DAYS=7
+
+# Loaded by load_last_context
+LAST_GUIDE_HASH=""
+declare -gA LAST_DOC_HASHES=()
+declare -gA LAST_LAYER_HASHES=()
+
+# Usage: get_last_context_path <session_id>
+# Returns: Fingerprint file for the session
+get_last_context_path() {
+    cache_key_for_path "$1"
+    echo "${RCM_SESSION_STATE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/role-context-manager/sessions}/$CACHE_KEY.last"
+}
+
+# Usage: load_last_context <state_file> <role> <config_dir>
+# Sets: LAST_GUIDE_HASH, LAST_DOC_HASHES (reference -> sha256) and
+# LAST_LAYER_HASHES ("<config dir><TAB>G|D<TAB><path|reference>" -> sha256)
+# Returns: 0 if the session's last load was of <role> from <config_dir>,
+# 1 otherwise
+load_last_context() {
+    local state_file="$1"
+    local role="$2"
+    local config_dir="$3"
+
+    LAST_GUIDE_HASH=""
+    LAST_DOC_HASHES=()
+    LAST_LAYER_HASHES=()
+    [[ -f "$state_file" ]] || return 1
+
+    local tag value ref first=true
+    while IFS=$'\t' read -r tag value ref; do
+        if [[ "$first" == true ]]; then
+            [[ "$tag" == "RCMLAST 3" ]] || return 1
+            first=false
+            continue
+        fi
+        case "$tag" in
+            role) [[ "$value" == "$role" ]] || return 1 ;;
+            config) [[ "$value" == "$config_dir" ]] || return 1 ;;
+            guide) LAST_GUIDE_HASH="$value" ;;
+            D) LAST_DOC_HASHES[$ref]="$value" ;;
+            L) LAST_LAYER_HASHES[$ref]="$value" ;;
+        esac
+    done < "$state_file"
+    [[ "$first" == false && -n "$LAST_GUIDE_HASH" ]]
+}
+
+# Usage: write_last_context <state_file> <role> <config_dir> <guide_hash> [<hash> <ref>]...
+# Also records the parts of the layers loaded by load_context_layers, if any
+# Returns: 0 on success, 2 if the file could not be written
+write_last_context() {
+    local state_file="$1"
+    local role="$2"
+    local config_dir="$3"
+    local guide_hash="$4"
+    shift 4
+
+    mkdir -p "${state_file%/*}" 2>/dev/null || return 2
+    find "${state_file%/*}" -maxdepth 1 -name '*.last' -mtime +"$LAST_CONTEXT_MAX_AGE_DAYS" -delete 2>/dev/null || true
+    local temp_file
+    temp_file="$(mktemp "$state_file.tmp.XXXXXX")" || return 2
+    {
+        echo "RCMLAST 3"
+        printf 'role\t%s\n' "$role"
+        printf 'config\t%s\n' "$config_dir"
+        printf 'guide\t%s\n' "$guide_hash"
+        while [[ $# -ge 2 ]]; do
+            printf 'D\t%s\t%s\n' "$1" "$2"
+            shift 2
+        done
+        local i
+        for i in "${!CONTEXT_LAYER_PART_LAYERS[@]}"; do
+            printf 'L\t%s\t%s\t%s\n' "${CONTEXT_LAYER_PART_HASHES[$i]}" \
+                "${CONTEXT_LAYER_DIRS[${CONTEXT_LAYER_PART_LAYERS[$i]}]}" "${CONTEXT_LAYER_PART_KEYS[$i]}"
+        done
+    } > "$temp_file" || { rm -f "$temp_file"; return 2; }
+    mv -f "$temp_file" "$state_file"
+}
@@ -0,0 +1,335 @@
+#!/usr/bin/env bash
+
+# role-manager/documents.sh - Document path resolution and section references
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - resolve_document_paths: Resolve many references relative to the project/global roots
+#   - find_document_section: Locate a #heading section through the heading index
+#   - read_document_ref: Print a document, or only its referenced section
+
+# =============================================================================
+# Document Path Resolver
+# =============================================================================
+
+# Lookup roots, computed once per working directory by init_document_resolver
+DOC_RESOLVER_PWD=""
+DOC_RESOLVER_PROJECT_ROOT=""
+DOC_RESOLVER_GLOBAL_DIR=""
+DOC_RESOLVER_GIT_ROOT=""
+DOC_RESOLVER_GIT_RESOLVED=false
+
+# Memoized results: reference -> "1:<resolved path>" or "0:<reported path>"
+declare -gA DOC_RESOLVE_CACHE=()
+
+# Result of the last resolve_document_ref call
+DOC_RESOLVED=""
+
+# Results of the last resolve_document_paths call (parallel to its arguments)
+RESOLVED_DOC_PATHS=()
+RESOLVED_DOC_FOUND=()
+
+# Usage: init_document_resolver
+# Computes the project root and global config dir for $PWD once. Called
+# again from another directory, it recomputes them and drops cached results.
+# Call it before resolving in a subshell so the subshell inherits the roots.
+init_document_resolver() {
+    if [[ "$DOC_RESOLVER_PWD" == "$PWD" ]]; then
+        return 0
+    fi
+
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+
+    local project_claude_dir
+    project_claude_dir="$(find_claude_dir_upward)" || project_claude_dir=""
+
+    DOC_RESOLVER_PWD="$PWD"
+    DOC_RESOLVER_PROJECT_ROOT=""
+    if [[ -n "$project_claude_dir" ]]; then
+        DOC_RESOLVER_PROJECT_ROOT="${project_claude_dir%/*}"
+        DOC_RESOLVER_PROJECT_ROOT="${DOC_RESOLVER_PROJECT_ROOT:-/}"
+    fi
+    DOC_RESOLVER_GLOBAL_DIR="$HOME/$claude_dir_name"
+    DOC_RESOLVER_GIT_ROOT=""
+    DOC_RESOLVER_GIT_RESOLVED=false
+    DOC_RESOLVE_CACHE=()
+}
+
+# Usage: resolve_document_ref <document path>[#heading]
+# Sets: DOC_RESOLVED (resolved absolute path, or the path reported when missing)
+# Returns: 0 if found, 1 if not
+# Runs in the current shell without forking; found and missing results are
+# both cached, so repeated references cost one hash lookup.
+resolve_document_ref() {
+    local doc_path="$1"
+
+    init_document_resolver
+
+    if [[ -z "$doc_path" ]]; then
+        DOC_RESOLVED=""
+        return 1
+    fi
+
+    # Section references (path.md#heading) resolve to their document
+    doc_path="${doc_path%%#*}"
+
+    local cached="${DOC_RESOLVE_CACHE[$doc_path]-}"
+    if [[ -n "$cached" ]]; then
+        DOC_RESOLVED="${cached#?:}"
+        [[ "${cached%%:*}" == "1" ]] && return 0
+        return 1
+    fi
+
+    local found=0
+    local resolved="$doc_path"
+
+    if [[ "$doc_path" == /* ]]; then
+        # Absolute path from project root (git top-level, else $PWD)
+        if [[ "$DOC_RESOLVER_GIT_RESOLVED" != true ]]; then
+            DOC_RESOLVER_GIT_ROOT="$(git rev-parse --show-toplevel 2>/dev/null || pwd)"
+            DOC_RESOLVER_GIT_RESOLVED=true
+        fi
+        # Reported even if not found, for error reporting
+        resolved="$DOC_RESOLVER_GIT_ROOT$doc_path"
+        [[ -f "$resolved" ]] && found=1
+    else
+        # Relative path - current directory, project root, global config dir
+        local candidate
+        for candidate in "$PWD/$doc_path" \
+                         ${DOC_RESOLVER_PROJECT_ROOT:+"$DOC_RESOLVER_PROJECT_ROOT/$doc_path"} \
+                         "$DOC_RESOLVER_GLOBAL_DIR/$doc_path"; do
+            if [[ -f "$candidate" ]]; then
+                resolved="$candidate"
+                found=1
+                break
+            fi
+        done
+    fi
+
+    DOC_RESOLVE_CACHE[$doc_path]="$found:$resolved"
+    DOC_RESOLVED="$resolved"
+    [[ $found -eq 1 ]] && return 0
+    return 1
+}
+
+# Usage: resolve_document_paths <document path>...
+# Sets: RESOLVED_DOC_PATHS and RESOLVED_DOC_FOUND (1/0), one entry per argument
+# Returns: 0 if every reference was found, 1 otherwise
+resolve_document_paths() {
+    RESOLVED_DOC_PATHS=()
+    RESOLVED_DOC_FOUND=()
+    local all_found=0
+    local doc_path
+
+    for doc_path in "$@"; do
+        if resolve_document_ref "$doc_path"; then
+            RESOLVED_DOC_FOUND+=(1)
+        else
+            RESOLVED_DOC_FOUND+=(0)
+            all_found=1
+        fi
+        RESOLVED_DOC_PATHS+=("$DOC_RESOLVED")
+    done
+    return $all_found
+}
+
+# Resolve document paths with multi-scope support
+# Args:
+#   $1: document path (absolute from root or relative)
+# Returns:
+#   Resolved absolute path if found, otherwise original path
+resolve_document_path() {
+    local rc=0
+    resolve_document_ref "$1" || rc=$?
+    echo "$DOC_RESOLVED"
+    return $rc
+}
+
+# =============================================================================
+# Document Sections
+# =============================================================================
+#
+# A reference of the form path.md#heading loads one section of a document:
+# the heading line and everything up to the next heading of the same or a
+# higher level. The heading is matched by its GitHub-style anchor, so
+# #code-review and `#Code Review` both select "## Code Review".
+#
+# Each document's headings are indexed once into a persistent file:
+#
+#   RCMHEADINGS 2
+#   S<TAB><size><TAB><mtime>
+#   H<TAB><start><TAB><end><TAB><level><TAB><anchor>
+#
+# start/end are byte offsets of the section. S is the document's signature
+# (see file_signatures), taken before the document is scanned; the index is
+# valid while the document still has it, so lookups stat the document and
+# read the small index instead of scanning the document. An edit made during
+# a scan leaves the index stale rather than wrong.
+
+# Set by find_document_section
+SECTION_START=0
+SECTION_LENGTH=0
+
+# Usage: heading_anchor <heading text>
+# Sets: HEADING_ANCHOR (lowercase, punctuation dropped, spaces as hyphens)
+heading_anchor() {
+    local LC_ALL=C
+    local text="${1,,}"
+    text="${text//[^a-z0-9 _-]/}"
+    HEADING_ANCHOR="${text// /-}"
+}
+
+# Usage: get_heading_index_path <document>
+# Sets: HEADING_INDEX_FILE
+get_heading_index_path() {
+    local doc="$1"
+    [[ "$doc" == /* ]] || doc="$PWD/$doc"
+    cache_key_for_path "$doc"
+    HEADING_INDEX_FILE="${RCM_HEADING_INDEX_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/role-context-manager/headings}/$CACHE_KEY.idx"
+}
+
+# Usage: build_heading_index <document> <index_file> [<signature>]
+# Returns: 0 on success, 2 if the document could not be stat'ed or the index
+# could not be written
+# Scans the document once (fenced code blocks are skipped) and writes the
+# index atomically under <signature>, which must be taken before the scan
+# (by default, the document's signature now).
+build_heading_index() {
+    local doc="$1"
+    local index_file="$2"
+    local signature="${3:-}"
+    local LC_ALL=C
+
+    if [[ -z "$signature" ]]; then
+        file_signatures "$doc" || return 2
+        signature="${FILE_SIGNATURES[0]}"
+    fi
+
+    local starts=() levels=() anchors=()
+    local offset=0 fence="" line hashes text
+    while IFS= read -r line || [[ -n "$line" ]]; do
+        if [[ -n "$fence" ]]; then
+            [[ "$line" == "$fence"* ]] && fence=""
+        elif [[ "$line" == '```'* || "$line" == '~~~'* ]]; then
+            fence="${line:0:3}"
+        elif [[ "$line" =~ ^(#{1,6})([[:space:]]+(.*))?$ ]]; then
+            hashes="${BASH_REMATCH[1]}"
+            text="${BASH_REMATCH[3]}"
+            # Closing hashes and trailing whitespace are not part of the text
+            text="${text%"${text##*[!#[:space:]]}"}"
+            heading_anchor "$text"
+            starts+=("$offset")
+            levels+=("${#hashes}")
+            anchors+=("$HEADING_ANCHOR")
+        fi
+        offset=$((offset + ${#line} + 1))
+    done < "$doc"
+
+    # The last line may lack a newline
+    local size=$offset
+    if [[ $size -gt 0 && -s "$doc" ]]; then
+        local last=""
+        IFS= read -r -d '' last < <(tail -c 1 -- "$doc") || true
+        [[ "$last" == $'\n' ]] || size=$((size - 1))
+    fi
+
+    mkdir -p "${index_file%/*}" 2>/dev/null || return 2
+    local temp_file
+    temp_file="$(mktemp "$index_file.tmp.XXXXXX")" || return 2
+    {
+        echo "RCMHEADINGS 2"
+        printf 'S\t%s\t%s\n' "${signature%%:*}" "${signature#*:}"
+        local i j end
+        for i in "${!starts[@]}"; do
+            end=$size
+            for ((j = i + 1; j < ${#starts[@]}; j++)); do
+                if [[ ${levels[$j]} -le ${levels[$i]} ]]; then
+                    end=${starts[$j]}
+                    break
+                fi
+            done
+            printf 'H\t%s\t%s\t%s\t%s\n' "${starts[$i]}" "$end" "${levels[$i]}" "${anchors[$i]:--}"
+        done
+    } > "$temp_file" || { rm -f "$temp_file"; return 2; }
+    mv -f "$temp_file" "$index_file"
+}
+
+# Usage: find_document_section <document> <heading>
+# Sets: SECTION_START and SECTION_LENGTH (bytes)
+# Returns: 0 if the section exists, 1 if not, 2 if the document is unreadable
+# The first heading with a matching anchor wins. The index is rebuilt when
+# the document's size or mtime changed; if it cannot be stored, a temporary
+# one is used.
+find_document_section() {
+    local doc="$1"
+    SECTION_START=0
+    SECTION_LENGTH=0
+
+    [[ -f "$doc" && -r "$doc" ]] || return 2
+    heading_anchor "$2"
+    local wanted="$HEADING_ANCHOR"
+
+    # Taken before any read: if the document changes during a rebuild, the
+    # index keeps the older signature and is rebuilt by the next lookup
+    file_signatures "$doc" || return 2
+    local signature="${FILE_SIGNATURES[0]}"
+
+    get_heading_index_path "$doc"
+    local index_file="$HEADING_INDEX_FILE"
+    local rc=0
+    find_section_in_index "$index_file" "$wanted" "$signature" || rc=$?
+    [[ $rc -eq 3 ]] || return $rc
+
+    if ! build_heading_index "$doc" "$index_file" "$signature" 2>/dev/null; then
+        index_file="$(mktemp)" || return 2
+        build_heading_index "$doc" "$index_file" "$signature" 2>/dev/null
+        rc=0
+        find_section_in_index "$index_file" "$wanted" || rc=$?
+        rm -f "$index_file"
+        return $rc
+    fi
+    find_section_in_index "$index_file" "$wanted"
+}
+
+# Usage: find_section_in_index <index_file> <anchor> [<signature>]
+# Sets: SECTION_START and SECTION_LENGTH
+# Returns: 0 if the anchor is indexed, 1 if not, 3 if the index is missing,
+# of another format, or recorded under a signature other than <signature>
+find_section_in_index() {
+    [[ -f "$1" ]] || return 3
+    local tag start end level anchor first=true
+    while IFS=$'\t' read -r tag start end level anchor; do
+        if [[ "$first" == true ]]; then
+            [[ "$tag" == "RCMHEADINGS 2" ]] || return 3
+            first=false
+        elif [[ "$tag" == "S" ]]; then
+            [[ -z "${3:-}" || "$start:$end" == "$3" ]] || return 3
+        elif [[ "$tag" == "H" && "$anchor" == "$2" ]]; then
+            SECTION_START=$start
+            SECTION_LENGTH=$((end - start))
+            return 0
+        fi
+    done < "$1"
+    [[ "$first" == false ]] || return 3
+    return 1
+}
+
+# Usage: read_document_ref <document reference> <resolved path>
+# Returns: Contents of the document, or only the referenced section
+# (seeking to its offset); 1 if the section does not exist
+read_document_ref() {
+    local doc_ref="$1"
+    local resolved="$2"
+
+    if [[ "$doc_ref" != *"#"* ]]; then
+        cat -- "$resolved"
+        return
+    fi
+    find_document_section "$resolved" "${doc_ref#*#}" || return 1
+    [[ $SECTION_LENGTH -gt 0 ]] || return 0
+    tail -c +$((SECTION_START + 1)) -- "$resolved" | head -c "$SECTION_LENGTH"
+}
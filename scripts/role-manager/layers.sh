@@ -0,0 +1,377 @@
+#!/usr/bin/env bash
+
+# role-manager/layers.sh - Inherited context layers (load-role-context --inherit)
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - find_ancestor_config_dirs: Config dirs above the project
+#   - load_context_layers: Resolve (and rebuild when stale) every ancestor layer
+#   - print_context_layers: Print the loaded layers, farthest first
+#   - print_context_layers_delta: Print them, listing parts unchanged since the last load
+
+# =============================================================================
+# Inherited Context Layers
+# =============================================================================
+
+# Ancestor config dirs of the current project, farthest (company) first
+ANCESTOR_CONFIG_DIRS=()
+
+# Layers resolved by load_context_layers, parallel arrays (farthest first)
+CONTEXT_LAYER_FILES=()
+CONTEXT_LAYER_LEVELS=()
+CONTEXT_LAYER_DOCS=()
+CONTEXT_LAYER_STATUS=()
+CONTEXT_LAYER_DIRS=()
+
+# Parts of the loaded layers (a role guide or document block each), parallel
+# arrays: layer index, byte offset and length in the layer file, sha256 of
+# the text, and key ("G<TAB><guide path>" or "D<TAB><reference>")
+CONTEXT_LAYER_PART_LAYERS=()
+CONTEXT_LAYER_PART_OFFSETS=()
+CONTEXT_LAYER_PART_LENGTHS=()
+CONTEXT_LAYER_PART_HASHES=()
+CONTEXT_LAYER_PART_KEYS=()
+
+# Usage: get_layer_cache_dir
+# Returns: Directory holding prebuilt layer bundles (shared by all projects)
+get_layer_cache_dir() {
+    echo "${RCM_LAYER_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/role-context-manager/layers}"
+}
+
+# Usage: find_ancestor_config_dirs <project_root>
+# Sets: ANCESTOR_CONFIG_DIRS (config dirs above the project, farthest first)
+# The global config dir is not a hierarchy level and is skipped.
+find_ancestor_config_dirs() {
+    local project_root="$1"
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    local global_dir="$HOME/$claude_dir_name"
+
+    ANCESTOR_CONFIG_DIRS=()
+    local dir="${project_root%/*}"
+    while [[ -n "$dir" ]]; do
+        if [[ -d "$dir/$claude_dir_name" && "$dir/$claude_dir_name" != "$global_dir" ]]; then
+            ANCESTOR_CONFIG_DIRS=("$dir/$claude_dir_name" "${ANCESTOR_CONFIG_DIRS[@]}")
+        fi
+        dir="${dir%/*}"
+    done
+    return 0
+}
+
+# Usage: is_layer_fresh <inputs_file> <layer_file>
+# Returns: 0 if every recorded input is unchanged since the layer was built
+# Stat-only: inputs recorded as present must still have the recorded size
+# and mtime (one stat for all of them); inputs recorded as missing must
+# still be missing. Inputs files of an older format are never fresh.
+is_layer_fresh() {
+    local inputs_file="$1"
+    local layer_file="$2"
+
+    [[ -f "$inputs_file" && -f "$layer_file" ]] || return 1
+
+    local state size mtime path first=true
+    local present=() recorded=()
+    while IFS=$'\t' read -r state size mtime path; do
+        if [[ "$first" == true ]]; then
+            [[ "$state" == "RCMLAYER 2" ]] || return 1
+            first=false
+            continue
+        fi
+        case "$state" in
+            1)
+                present+=("$path")
+                recorded+=("$size:$mtime")
+                ;;
+            0) [[ ! -e "$path" ]] || return 1 ;;
+        esac
+    done < "$inputs_file"
+    [[ "$first" == false ]] || return 1
+
+    file_signatures "${present[@]}" || return 1
+    local i
+    for i in "${!present[@]}"; do
+        [[ "${FILE_SIGNATURES[$i]}" == "${recorded[$i]}" ]] || return 1
+    done
+    return 0
+}
+
+# Usage: record_layer_inputs <path>...
+# Appends the paths to the "inputs" array of the caller as present inputs,
+# with their current size and mtime (or "-", which never matches)
+record_layer_inputs() {
+    [[ $# -gt 0 ]] || return 0
+    local signed=false i
+    file_signatures "$@" && signed=true
+    for ((i = 1; i <= $#; i++)); do
+        if [[ "$signed" == true ]]; then
+            local signature="${FILE_SIGNATURES[$((i - 1))]}"
+            inputs+=("1"$'\t'"${signature%%:*}"$'\t'"${signature#*:}"$'\t'"${!i}")
+        else
+            inputs+=("1"$'\t'"-"$'\t'"-"$'\t'"${!i}")
+        fi
+    done
+}
+
+# Usage: build_context_layer <ancestor_config_dir> <role> <layer_file> <inputs_file>
+# Renders one level's role guide and documents into <layer_file> and records
+# every file it depended on (present or missing) in <inputs_file>, after the
+# offset, length and sha256 of each rendered part. Inputs are stat'ed before
+# they are read, so an edit made during the build leaves the layer stale
+# rather than wrong.
+build_context_layer() {
+    local claude_dir="$1"
+    local role="$2"
+    local layer_file="$3"
+    local inputs_file="$4"
+
+    local level_dir="${claude_dir%/*}"
+    local level_file="$claude_dir/organizational-level.json"
+    local inputs=()
+    local present=()
+    if [[ -f "$level_file" ]]; then
+        present+=("$level_file")
+    else
+        inputs+=("0"$'\t'"-"$'\t'"-"$'\t'"$level_file")
+    fi
+
+    # Record both guide names while missing so adding either rebuilds the layer
+    local role_guides_dir
+    role_guides_dir="$(get_role_guides_dir)"
+    local role_guide=""
+    local candidate
+    for candidate in "$claude_dir/$role_guides_dir/${role}-guide.md" "$claude_dir/$role_guides_dir/${role}.md"; do
+        if [[ -f "$candidate" ]]; then
+            role_guide="$candidate"
+            present+=("$candidate")
+            break
+        fi
+        inputs+=("0"$'\t'"-"$'\t'"-"$'\t'"$candidate")
+    done
+    record_layer_inputs "${present[@]}"
+
+    local level=""
+    if [[ -f "$level_file" ]]; then
+        # Load here, not in the $(...) subshell, so it is loaded only once
+        load_helper_script level-detector.sh
+        level="$(get_level_value "$claude_dir" 2>/dev/null)" || level=""
+    fi
+    level="${level:-unknown}"
+
+    local doc_count=0
+    local layer="" parts=()
+    if [[ -n "$role_guide" ]]; then
+        collect_document_references "$role_guide" || true
+
+        # Resolve every reference first, so the documents are stat'ed in one
+        # call before any of them is read
+        local git_root=""
+        local global_dir="$HOME/$(get_claude_dir_name)"
+        local doc_refs=() doc_paths=() doc_ref resolved
+        present=()
+        for doc_ref in "${DOCUMENT_REFERENCES[@]}"; do
+            [[ -n "$doc_ref" ]] || continue
+            if [[ "$doc_ref" == /* ]]; then
+                if [[ -z "$git_root" ]]; then
+                    git_root="$(git -C "$level_dir" rev-parse --show-toplevel 2>/dev/null || echo "$level_dir")"
+                fi
+                resolved="$git_root$doc_ref"
+            elif [[ -f "$level_dir/${doc_ref%%#*}" ]]; then
+                resolved="$level_dir/${doc_ref%%#*}"
+            else
+                inputs+=("0"$'\t'"-"$'\t'"-"$'\t'"$level_dir/${doc_ref%%#*}")
+                resolved="$global_dir/${doc_ref%%#*}"
+            fi
+            if [[ -s "$resolved" && -r "$resolved" ]]; then
+                present+=("$resolved")
+            else
+                inputs+=("0"$'\t'"-"$'\t'"-"$'\t'"$resolved")
+            fi
+            doc_refs+=("$doc_ref")
+            doc_paths+=("$resolved")
+        done
+        record_layer_inputs "${present[@]}"
+
+        # Offsets and lengths are in bytes
+        local LC_ALL=C
+        local i content block
+        layer="## Inherited Context: $level (${level_dir})"$'\n\n'
+
+        content=""
+        IFS= read -r -d '' content < "$role_guide" || true
+        block="### Role guide: $role_guide"$'\n---\n'"$content---"$'\n\n'
+        sha256_string "$content"
+        parts+=("part"$'\t'"${#layer}"$'\t'"${#block}"$'\t'"$SHA256"$'\t'"G"$'\t'"$role_guide")
+        layer+="$block"
+
+        for i in "${!doc_refs[@]}"; do
+            resolved="${doc_paths[$i]}"
+            [[ -s "$resolved" && -r "$resolved" ]] || continue
+            content="$(read_document_ref "${doc_refs[$i]}" "$resolved" 2>/dev/null)" || content=""
+            if [[ -n "$content" ]]; then
+                doc_count=$((doc_count + 1))
+                block="### Document: ${doc_refs[$i]}"$'\n---\n'"$content"$'\n---\n\n'
+                sha256_string "$content"
+                parts+=("part"$'\t'"${#layer}"$'\t'"${#block}"$'\t'"$SHA256"$'\t'"D"$'\t'"${doc_refs[$i]}")
+                layer+="$block"
+            fi
+        done
+    fi
+
+    local temp_layer
+    mkdir -p "${layer_file%/*}"
+    temp_layer="$(mktemp "$layer_file.tmp.XXXXXX")" || return 2
+    printf '%s' "$layer" > "$temp_layer"
+    mv -f "$temp_layer" "$layer_file"
+
+    # Inputs are written last: a layer without a matching inputs file is stale
+    local temp_inputs
+    temp_inputs="$(mktemp "$inputs_file.tmp.XXXXXX")" || return 2
+    {
+        echo "RCMLAYER 2"
+        printf 'level\t%s\n' "$level"
+        printf 'documents\t%s\n' "$doc_count"
+        [[ ${#parts[@]} -eq 0 ]] || printf '%s\n' "${parts[@]}"
+        printf '%s\n' "${inputs[@]}"
+    } > "$temp_inputs"
+    mv -f "$temp_inputs" "$inputs_file"
+}
+
+# Usage: load_context_layers <project_root> <role>
+# Sets: CONTEXT_LAYER_FILES/LEVELS/DOCS/STATUS/DIRS and CONTEXT_LAYER_PART_*
+# for every ancestor level that has a role guide for <role>. Up-to-date layers are reused as-is; only layers
+# whose inputs changed are rebuilt (STATUS "cached" or "built").
+load_context_layers() {
+    local project_root="$1"
+    local role="$2"
+
+    CONTEXT_LAYER_FILES=()
+    CONTEXT_LAYER_LEVELS=()
+    CONTEXT_LAYER_DOCS=()
+    CONTEXT_LAYER_STATUS=()
+    CONTEXT_LAYER_DIRS=()
+    CONTEXT_LAYER_PART_LAYERS=()
+    CONTEXT_LAYER_PART_OFFSETS=()
+    CONTEXT_LAYER_PART_LENGTHS=()
+    CONTEXT_LAYER_PART_HASHES=()
+    CONTEXT_LAYER_PART_KEYS=()
+
+    find_ancestor_config_dirs "$project_root"
+    [[ ${#ANCESTOR_CONFIG_DIRS[@]} -gt 0 ]] || return 0
+
+    local cache_dir
+    cache_dir="$(get_layer_cache_dir)"
+
+    local claude_dir key layer_file inputs_file status
+    for claude_dir in "${ANCESTOR_CONFIG_DIRS[@]}"; do
+        # One bundle per (level, role)
+        cache_key_for_path "$claude_dir"
+        key="$CACHE_KEY--${role}"
+        layer_file="$cache_dir/$key.md"
+        inputs_file="$cache_dir/$key.inputs"
+
+        status="cached"
+        if ! is_layer_fresh "$inputs_file" "$layer_file"; then
+            build_context_layer "$claude_dir" "$role" "$layer_file" "$inputs_file" || continue
+            status="built"
+        fi
+
+        # Levels without a guide for this role contribute nothing
+        [[ -s "$layer_file" ]] || continue
+
+        local level="" docs=0 name value length hash kind label
+        while IFS=$'\t' read -r name value length hash kind label; do
+            case "$name" in
+                "RCMLAYER 2") ;;
+                level) level="$value" ;;
+                documents) docs="$value" ;;
+                part)
+                    CONTEXT_LAYER_PART_LAYERS+=("${#CONTEXT_LAYER_FILES[@]}")
+                    CONTEXT_LAYER_PART_OFFSETS+=("$value")
+                    CONTEXT_LAYER_PART_LENGTHS+=("$length")
+                    CONTEXT_LAYER_PART_HASHES+=("$hash")
+                    CONTEXT_LAYER_PART_KEYS+=("$kind"$'\t'"$label")
+                    ;;
+                *) break ;;
+            esac
+        done < "$inputs_file"
+
+        CONTEXT_LAYER_FILES+=("$layer_file")
+        CONTEXT_LAYER_LEVELS+=("$level")
+        CONTEXT_LAYER_DOCS+=("$docs")
+        CONTEXT_LAYER_STATUS+=("$status")
+        CONTEXT_LAYER_DIRS+=("$claude_dir")
+    done
+    return 0
+}
+
+# Usage: print_context_layers
+# Prints the layers loaded by load_context_layers, farthest level first
+print_context_layers() {
+    [[ ${#CONTEXT_LAYER_FILES[@]} -gt 0 ]] || return 0
+    cat -- "${CONTEXT_LAYER_FILES[@]}"
+}
+
+# Usage: is_layer_part_unchanged <part_index>
+# Returns: 0 if the part's sha256 matches the one recorded by the session's
+# last load (LAST_LAYER_HASHES, see load_last_context)
+is_layer_part_unchanged() {
+    local hash="${CONTEXT_LAYER_PART_HASHES[$1]}"
+    local key="${CONTEXT_LAYER_DIRS[${CONTEXT_LAYER_PART_LAYERS[$1]}]}"$'\t'"${CONTEXT_LAYER_PART_KEYS[$1]}"
+    [[ "$hash" != "-" && "${LAST_LAYER_HASHES[$key]-}" == "$hash" ]]
+}
+
+# Usage: is_layer_unchanged <layer_index>
+# Returns: 0 if every part of the layer is unchanged since the last load
+is_layer_unchanged() {
+    local pi
+    for pi in "${!CONTEXT_LAYER_PART_LAYERS[@]}"; do
+        [[ "${CONTEXT_LAYER_PART_LAYERS[$pi]}" == "$1" ]] || continue
+        is_layer_part_unchanged "$pi" || return 1
+    done
+    return 0
+}
+
+# Usage: print_context_layers_delta
+# Prints the loaded layers like print_context_layers, except that role guides
+# and documents unchanged since the session's last load are listed under
+# their level instead of repeated
+print_context_layers_delta() {
+    local LC_ALL=C
+    local li pi content key header unchanged
+    for li in "${!CONTEXT_LAYER_FILES[@]}"; do
+        content=""
+        IFS= read -r -d '' content < "${CONTEXT_LAYER_FILES[$li]}" || true
+
+        header=true
+        unchanged=()
+        for pi in "${!CONTEXT_LAYER_PART_LAYERS[@]}"; do
+            [[ "${CONTEXT_LAYER_PART_LAYERS[$pi]}" == "$li" ]] || continue
+            if [[ "$header" == true ]]; then
+                printf '%s' "${content:0:${CONTEXT_LAYER_PART_OFFSETS[$pi]}}"
+                header=false
+            fi
+            is_layer_part_unchanged "$pi" || continue
+            key="${CONTEXT_LAYER_PART_KEYS[$pi]}"
+            if [[ "${key%%$'\t'*}" == "G" ]]; then
+                unchanged+=("Role guide: ${key#*$'\t'}")
+            else
+                unchanged+=("${key#*$'\t'}")
+            fi
+        done
+
+        if [[ ${#unchanged[@]} -gt 0 ]]; then
+            echo "Unchanged (already provided in this session):"
+            printf '  - %s\n' "${unchanged[@]}"
+            echo ""
+        fi
+
+        for pi in "${!CONTEXT_LAYER_PART_LAYERS[@]}"; do
+            [[ "${CONTEXT_LAYER_PART_LAYERS[$pi]}" == "$li" ]] || continue
+            is_layer_part_unchanged "$pi" && continue
+            printf '%s' "${content:${CONTEXT_LAYER_PART_OFFSETS[$pi]}:${CONTEXT_LAYER_PART_LENGTHS[$pi]}}"
+        done
+    done
+}
@@ -0,0 +1,667 @@
+#!/usr/bin/env bash
+
+# role-manager/load.sh - load-role-context and its structured output
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - cmd_load_role_context: Load the role guide and documents into context
+#   - emit_context_json: Print the loaded context as JSON or NDJSON
+#   - json_content: Encode a guide, document or layer for that output
+#   - prefetch_documents: Warm the page cache in the background
+
+# =============================================================================
+# Structured Output (--format json|ndjson)
+# =============================================================================
+
+# Usage: json_content <value>
+# Sets: JSON_CONTENT (a "content" member holding <value> exactly: a JSON
+# string, or base64 with "encoding":"base64" when <value> is not valid UTF-8)
+json_content() {
+    if is_utf8 "$1"; then
+        json_string "$1"
+        JSON_CONTENT="\"content\":$JSON_STRING"
+    else
+        JSON_CONTENT="\"content\":\"$(printf '%s' "$1" | base64 | tr -d '\n')\",\"encoding\":\"base64\""
+    fi
+}
+
+# Usage: emit_context_json <json|ndjson> <role> <config_dir> <role_guide> <delta> <pack_file|-> [doc_ref...]
+# Sets: CONTEXT_GUIDE_HASH and CONTEXT_FINGERPRINTS (sha256 and ref of each
+# emitted document, for write_last_context)
+# Prints the role context as JSON or NDJSON, and any inherited layers. The
+# guide and documents come from <pack_file> (whose index load_context_pack
+# --index-only has loaded) or, with "-", from the files the <doc_ref>s
+# resolve to. Each is read and hashed only when its record is due, and
+# ndjson writes one record per line (context, guide, document..., missing,
+# removed, layer, end) as soon as it is encoded; json writes one object with
+# the same fields. Sizes are in bytes and content is the exact file or
+# section text. With <delta> true, entries whose sha256 matches the last
+# load are marked "unchanged" and carry no content, as are layers whose role
+# guide and documents all match.
+emit_context_json() {
+    local format="$1"
+    local role="$2"
+    local config_dir="$3"
+    local role_guide="$4"
+    local delta="$5"
+    local pack_file="$6"
+    shift 6
+    local LC_ALL=C
+
+    CONTEXT_GUIDE_HASH="-"
+    CONTEXT_FINGERPRINTS=()
+
+    local scope="global"
+    is_project_context && scope="project"
+
+    local ref_count=$#
+    if [[ "$pack_file" != "-" ]]; then
+        ref_count="$PACK_REF_COUNT"
+        open_context_pack_body "$pack_file" || return 1
+    fi
+
+    local context guide record content="" hash
+    json_string "$role"
+    context="\"role\":$JSON_STRING,\"scope\":\"$scope\""
+    json_string "$config_dir"
+    context+=",\"config_dir\":$JSON_STRING,\"references\":$ref_count"
+    if [[ "$format" == "ndjson" ]]; then
+        printf '{"type":"context",%s}\n' "$context"
+    fi
+
+    if [[ "$pack_file" != "-" ]]; then
+        read_context_pack_entry "$PACK_GUIDE_OFFSET" "$PACK_GUIDE_LENGTH"
+        content="$PACK_ENTRY"
+        hash="$PACK_GUIDE_HASH"
+    else
+        IFS= read -r -d '' content < "$role_guide" || true
+        sha256_string "$content"
+        hash="$SHA256"
+    fi
+    CONTEXT_GUIDE_HASH="$hash"
+    json_string "$role_guide"
+    guide="\"path\":$JSON_STRING,\"size\":${#content},\"sha256\":\"$hash\""
+    if [[ "$delta" == true && "$hash" == "$LAST_GUIDE_HASH" && "$hash" != "-" ]]; then
+        guide+=",\"unchanged\":true"
+    else
+        json_content "$content"
+        guide+=",$JSON_CONTENT"
+    fi
+
+    if [[ "$format" == "ndjson" ]]; then
+        printf '{"type":"guide",%s}\n' "$guide"
+    else
+        printf '{%s,"guide":{%s},"documents":[' "$context" "$guide"
+    fi
+
+    # (ref, path, offset, length, hash) per document: from the pack index, or
+    # resolved now (the content is read, and hashed, in the loop below)
+    local refs=() paths=() offsets=() lengths=() hashes=() missing_refs=() i
+    if [[ "$pack_file" != "-" ]]; then
+        refs=("${PACK_DOC_REFS[@]}")
+        paths=("${PACK_DOC_PATHS[@]}")
+        offsets=("${PACK_DOC_OFFSETS[@]}")
+        lengths=("${PACK_DOC_LENGTHS[@]}")
+        hashes=("${PACK_DOC_HASHES[@]}")
+        missing_refs=("${PACK_MISSING_REFS[@]}")
+    else
+        resolve_document_paths "$@" || true
+        for ((i = 0; i < $#; i++)); do
+            if [[ "${RESOLVED_DOC_FOUND[$i]}" == "1" ]]; then
+                [[ -r "${RESOLVED_DOC_PATHS[$i]}" ]] || continue
+                refs+=("${@:i+1:1}")
+                paths+=("${RESOLVED_DOC_PATHS[$i]}")
+            else
+                missing_refs+=("${@:i+1:1}")
+            fi
+        done
+    fi
+
+    local ref sep="" loaded=0 unchanged=0
+    declare -A emitted=()
+    for i in "${!refs[@]}"; do
+        ref="${refs[$i]}"
+        if [[ "$pack_file" != "-" ]]; then
+            read_context_pack_entry "${offsets[$i]}" "${lengths[$i]}"
+            content="$PACK_ENTRY"
+            hash="${hashes[$i]}"
+        else
+            content=""
+            if [[ "$ref" == *"#"* ]]; then
+                if ! find_document_section "${paths[$i]}" "${ref#*#}"; then
+                    missing_refs+=("$ref")
+                    continue
+                fi
+                [[ $SECTION_LENGTH -gt 0 ]] && IFS= read -r -d '' content < \
+                    <(tail -c +$((SECTION_START + 1)) -- "${paths[$i]}" | head -c "$SECTION_LENGTH") || true
+            else
+                IFS= read -r -d '' content < "${paths[$i]}" || true
+            fi
+            sha256_string "$content"
+            hash="$SHA256"
+        fi
+        # Same documents as the markdown output: blank ones are skipped
+        [[ -n "${content//$'\n'/}" ]] || continue
+        emitted[$ref]=1
+        loaded=$((loaded + 1))
+        CONTEXT_FINGERPRINTS+=("$hash" "$ref")
+
+        json_string "$ref"
+        record="\"ref\":$JSON_STRING"
+        json_string "${paths[$i]}"
+        record+=",\"path\":$JSON_STRING,\"size\":${#content},\"sha256\":\"$hash\""
+        if [[ "$delta" == true && "${LAST_DOC_HASHES[$ref]-}" == "$hash" && "$hash" != "-" ]]; then
+            record+=",\"unchanged\":true"
+            unchanged=$((unchanged + 1))
+        else
+            json_content "$content"
+            record+=",$JSON_CONTENT"
+        fi
+
+        if [[ "$format" == "ndjson" ]]; then
+            printf '{"type":"document",%s}\n' "$record"
+        else
+            printf '%s\n{%s}' "$sep" "$record"
+            sep=","
+        fi
+    done
+    [[ "$pack_file" == "-" ]] || exec {PACK_BODY_FD}<&-
+
+    local missing=() removed=()
+    for ref in "${missing_refs[@]}"; do
+        json_string "$ref"
+        missing+=("$JSON_STRING")
+    done
+    if [[ "$delta" == true ]]; then
+        for ref in "${!LAST_DOC_HASHES[@]}"; do
+            [[ -n "${emitted[$ref]-}" ]] && continue
+            json_string "$ref"
+            removed+=("$JSON_STRING")
+        done
+    fi
+
+    if [[ "$format" == "ndjson" ]]; then
+        for ref in "${missing[@]}"; do
+            printf '{"type":"missing","ref":%s}\n' "$ref"
+        done
+        for ref in "${removed[@]}"; do
+            printf '{"type":"removed","ref":%s}\n' "$ref"
+        done
+    else
+        local IFS=,
+        printf '],"missing":[%s],"removed":[%s],"inherited":[' "${missing[*]}" "${removed[*]}"
+        IFS=$' \t\n'
+    fi
+
+    local li layer
+    sep=""
+    for li in "${!CONTEXT_LAYER_FILES[@]}"; do
+        json_string "${CONTEXT_LAYER_LEVELS[$li]}"
+        layer="\"level\":$JSON_STRING,\"documents\":${CONTEXT_LAYER_DOCS[$li]},\"status\":\"${CONTEXT_LAYER_STATUS[$li]}\""
+        if [[ "$delta" == true ]] && is_layer_unchanged "$li"; then
+            JSON_CONTENT="\"unchanged\":true"
+        else
+            content=""
+            IFS= read -r -d '' content < "${CONTEXT_LAYER_FILES[$li]}" || true
+            json_content "$content"
+        fi
+        if [[ "$format" == "ndjson" ]]; then
+            printf '{"type":"layer",%s,%s}\n' "$layer" "$JSON_CONTENT"
+        else
+            printf '%s{%s,%s}' "$sep" "$layer" "$JSON_CONTENT"
+            sep=","
+        fi
+    done
+
+    if [[ "$format" == "ndjson" ]]; then
+        printf '{"type":"end","documents":%s,"unchanged":%s,"missing":%s}\n' "$loaded" "$unchanged" "${#missing[@]}"
+    else
+        printf '],"loaded":%s,"unchanged":%s}\n' "$loaded" "$unchanged"
+    fi
+}
+
+# Warm the page cache with role context files without delaying the caller
+# Usage: prefetch_documents <file>...
+# The reader is fully detached from stdin/stdout/stderr so a hook capturing
+# our output does not wait for it
+prefetch_documents() {
+    [[ $# -gt 0 ]] || return 0
+    (cat -- "$@" >/dev/null 2>&1 </dev/null &)
+    return 0
+}
+
+# Load role context for session (automatic loading on SessionStart)
+cmd_load_role_context() {
+    local mode="normal"
+    local prefetch=false
+    local inherit=false
+    local since_last=""
+    local format="markdown"
+
+    # Parse arguments
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --quiet)
+                mode="quiet"
+                shift
+                ;;
+            --verbose)
+                mode="verbose"
+                shift
+                ;;
+            --prefetch)
+                prefetch=true
+                shift
+                ;;
+            --inherit)
+                inherit=true
+                shift
+                ;;
+            --since-last|--since-last=*)
+                if [[ "$1" == --since-last=* ]]; then
+                    since_last="${1#--since-last=}"
+                    shift
+                else
+                    since_last="${2:-}"
+                    shift $(($# > 1 ? 2 : 1))
+                fi
+                if [[ -z "$since_last" || "$since_last" == --* ]]; then
+                    echo "Error: --since-last needs the ID of the session that holds the earlier context" >&2
+                    exit 1
+                fi
+                ;;
+            --format|--format=*)
+                if [[ "$1" == --format=* ]]; then
+                    format="${1#--format=}"
+                    shift
+                else
+                    format="${2:-}"
+                    shift $(($# > 1 ? 2 : 1))
+                fi
+                case "$format" in
+                    markdown|json|ndjson) ;;
+                    *)
+                        echo "Error: --format must be markdown, json or ndjson" >&2
+                        exit 1
+                        ;;
+                esac
+                ;;
+            *)
+                shift
+                ;;
+        esac
+    done
+
+    # Get effective config directory (project overrides global)
+    local config_dir
+    config_dir="$(get_effective_config_dir)"
+
+    # Get current role using multi-scope hierarchy
+    local current_role
+    current_role="$(get_preference "user_role")"
+
+    # No role set - exit silently (not an error)
+    if [[ -z "$current_role" || "$current_role" == "null" ]]; then
+        exit 0
+    fi
+
+    # Get role guide path
+    local role_guide
+    role_guide="$(get_role_guide_path "$config_dir" "$current_role")"
+
+    # Role guide missing - exit silently in quiet mode, warn in normal/verbose
+    if [[ -z "$role_guide" || ! -f "$role_guide" ]]; then
+        if [[ "$mode" != "quiet" ]]; then
+            echo "Warning: Role guide not found for role: $current_role" >&2
+        fi
+        exit 0
+    fi
+
+    # Packed store (built by set-role/update-role-docs): one read replaces
+    # extracting references and opening every document
+    local pack_file
+    pack_file="$(get_context_pack_path "$current_role")"
+    local pack_valid=false
+    if [[ "$mode" == "quiet" || "$format" != "markdown" ]]; then
+        # Quiet mode only needs the index; structured output reads each entry
+        # when it is emitted
+        load_context_pack "$pack_file" "$config_dir" "$current_role" --index-only && pack_valid=true
+    else
+        load_context_pack "$pack_file" "$config_dir" "$current_role" && pack_valid=true
+    fi
+
+    # Parse document references into array
+    local doc_paths=()
+    if [[ "$pack_valid" != true ]]; then
+        collect_document_references "$role_guide" || true
+        doc_paths=("${DOCUMENT_REFERENCES[@]}")
+    fi
+
+    # Inherited layers from ancestor levels (project context only)
+    local inherited_docs=0
+    if [[ "$inherit" == true && "$config_dir" != "$HOME/$(get_claude_dir_name)" ]]; then
+        load_context_layers "${config_dir%/*}" "$current_role"
+        local layer_docs
+        for layer_docs in "${CONTEXT_LAYER_DOCS[@]}"; do
+            inherited_docs=$((inherited_docs + layer_docs))
+        done
+    fi
+
+    # Quiet mode only reports a count: stat the documents instead of reading
+    # them, so hook latency does not depend on document sizes
+    if [[ "$mode" == "quiet" ]]; then
+        local available_count=0
+        if [[ "$pack_valid" == true ]]; then
+            # The pack index records each document's length
+            local length
+            for length in "${PACK_DOC_LENGTHS[@]}"; do
+                [[ "$length" -gt 0 ]] && available_count=$((available_count + 1))
+            done
+            if [[ "$prefetch" == true ]]; then
+                prefetch_documents "$pack_file" "${CONTEXT_LAYER_FILES[@]}"
+            fi
+        else
+            resolve_document_paths "${doc_paths[@]}" || true
+            local available_paths=() i
+            for i in "${!RESOLVED_DOC_PATHS[@]}"; do
+                local resolved_path="${RESOLVED_DOC_PATHS[$i]}"
+                if [[ "${RESOLVED_DOC_FOUND[$i]}" == "1" && -s "$resolved_path" && -r "$resolved_path" ]]; then
+                    # Sections are counted from the heading index
+                    if [[ "${doc_paths[$i]}" == *"#"* ]]; then
+                        find_document_section "$resolved_path" "${doc_paths[$i]#*#}" && \
+                            [[ $SECTION_LENGTH -gt 0 ]] || continue
+                    fi
+                    available_paths+=("$resolved_path")
+                fi
+            done
+
+            available_count=${#available_paths[@]}
+
+            if [[ "$prefetch" == true ]]; then
+                prefetch_documents "$role_guide" "${available_paths[@]}" "${CONTEXT_LAYER_FILES[@]}"
+            fi
+        fi
+
+        # One-line summary for SessionStart hook
+        if [[ "$format" != "markdown" ]]; then
+            json_string "$current_role"
+            printf '{"role":%s,"documents":%s,"inherited_levels":%s}\n' "$JSON_STRING" \
+                "$((available_count + inherited_docs))" "${#CONTEXT_LAYER_FILES[@]}"
+        elif [[ ${#CONTEXT_LAYER_FILES[@]} -gt 0 ]]; then
+            echo "✓ Role context loaded: $current_role ($((available_count + inherited_docs)) documents, ${#CONTEXT_LAYER_FILES[@]} inherited levels)"
+        else
+            echo "✓ Role context loaded: $current_role ($available_count documents)"
+        fi
+        exit 0
+    fi
+
+    # Structured output streams each record as its document is read and
+    # hashed: from the pack when it is valid, otherwise from the files (the
+    # pack for the next session is written once the output is done)
+    if [[ "$format" != "markdown" ]]; then
+        local last_file="" delta=false
+        if [[ -n "$since_last" ]]; then
+            last_file="$(get_last_context_path "$since_last")"
+            load_last_context "$last_file" "$current_role" "$config_dir" && delta=true
+        fi
+        if [[ "$pack_valid" == true ]]; then
+            emit_context_json "$format" "$current_role" "$config_dir" "$role_guide" "$delta" "$pack_file"
+        else
+            emit_context_json "$format" "$current_role" "$config_dir" "$role_guide" "$delta" - "${doc_paths[@]}"
+            write_context_pack "$pack_file" "$config_dir" "$current_role" "$role_guide" "${doc_paths[@]}" 2>/dev/null || true
+        fi
+        if [[ -n "$last_file" ]]; then
+            write_last_context "$last_file" "$current_role" "$config_dir" "$CONTEXT_GUIDE_HASH" \
+                "${CONTEXT_FINGERPRINTS[@]}" 2>/dev/null || true
+        fi
+        exit 0
+    fi
+
+    local role_guide_content
+    local doc_contents=()
+    local doc_hashes=()
+    local loaded_count=0
+    local ref_count
+
+    if [[ "$pack_valid" != true ]]; then
+        # Refresh the pack for the next session, then load from it
+        write_context_pack "$pack_file" "$config_dir" "$current_role" "$role_guide" "${doc_paths[@]}" 2>/dev/null && \
+            load_context_pack "$pack_file" "$config_dir" "$current_role" && pack_valid=true
+    fi
+
+    if [[ "$pack_valid" == true ]]; then
+        # Trailing newlines are dropped, as command substitution did
+        role_guide_content="${PACK_GUIDE_CONTENT%"${PACK_GUIDE_CONTENT##*[!$'\n']}"}"
+        ref_count="$PACK_REF_COUNT"
+
+        local i
+        for i in "${!PACK_DOC_REFS[@]}"; do
+            local doc_content="${PACK_DOC_CONTENTS[$i]}"
+            doc_content="${doc_content%"${doc_content##*[!$'\n']}"}"
+            if [[ -n "$doc_content" ]]; then
+                doc_contents+=("${PACK_DOC_REFS[$i]}|$doc_content")
+                doc_hashes+=("${PACK_DOC_HASHES[$i]}")
+                loaded_count=$((loaded_count + 1))
+            fi
+        done
+    else
+        # Read role guide content
+        role_guide_content="$(cat "$role_guide")"
+        ref_count="${#doc_paths[@]}"
+
+        # Read each document (best effort)
+        resolve_document_paths "${doc_paths[@]}" || true
+        local i
+        for i in "${!doc_paths[@]}"; do
+            local doc_path="${doc_paths[$i]}"
+            local resolved_path="${RESOLVED_DOC_PATHS[$i]}"
+
+            if [[ "${RESOLVED_DOC_FOUND[$i]}" == "1" ]]; then
+                local doc_content
+                doc_content="$(read_document_ref "$doc_path" "$resolved_path" 2>/dev/null)" || doc_content=""
+
+                if [[ -n "$doc_content" ]]; then
+                    doc_contents+=("$doc_path|$doc_content")
+                    loaded_count=$((loaded_count + 1))
+                fi
+            fi
+        done
+    fi
+
+    # Delta mode: after a recorded load of this role in the named session,
+    # repeat only what changed. Fingerprints come from the pack, so without
+    # one the full context is emitted and nothing is recorded.
+    local last_file="" delta=false
+    if [[ -n "$since_last" && "$pack_valid" == true ]]; then
+        last_file="$(get_last_context_path "$since_last")"
+        load_last_context "$last_file" "$current_role" "$config_dir" && delta=true
+
+        local fingerprints=() i
+        for i in "${!doc_contents[@]}"; do
+            fingerprints+=("${doc_hashes[$i]}" "${doc_contents[$i]%%|*}")
+        done
+        write_last_context "$last_file" "$current_role" "$config_dir" "$PACK_GUIDE_HASH" "${fingerprints[@]}" 2>/dev/null || true
+    fi
+
+    if [[ "$delta" == true ]]; then
+        local unchanged=() changed=() removed=()
+        local i doc_info doc_ref
+        declare -A current_refs=()
+        for i in "${!doc_contents[@]}"; do
+            doc_ref="${doc_contents[$i]%%|*}"
+            current_refs[$doc_ref]=1
+            if [[ "${LAST_DOC_HASHES[$doc_ref]-}" == "${doc_hashes[$i]}" && "${doc_hashes[$i]}" != "-" ]]; then
+                unchanged+=("$doc_ref")
+            else
+                changed+=("$i")
+            fi
+        done
+        for doc_ref in "${!LAST_DOC_HASHES[@]}"; do
+            [[ -n "${current_refs[$doc_ref]-}" ]] || removed+=("$doc_ref")
+        done
+
+        echo "=== ROLE CONTEXT LOADED (changes since the last load in this session) ==="
+        echo ""
+        echo "You are collaborating with a user in the role: $current_role"
+        echo ""
+        if [[ "$mode" == "verbose" ]]; then
+            echo "Role guide: $role_guide"
+            echo "Documents: ${#changed[@]} changed, ${#unchanged[@]} unchanged, ${#removed[@]} removed ($loaded_count/$ref_count loaded)"
+            echo ""
+        fi
+
+        if [[ "$PACK_GUIDE_HASH" == "$LAST_GUIDE_HASH" && "$PACK_GUIDE_HASH" != "-" ]]; then
+            echo "The role guide is unchanged since the last load."
+        else
+            echo "The role guide has changed. It defines how you should assist this user:"
+            echo ""
+            echo "---"
+            echo "$role_guide_content"
+            echo "---"
+        fi
+        echo ""
+
+        if [[ ${#unchanged[@]} -gt 0 ]]; then
+            echo "Unchanged documents (already provided in this session):"
+            for doc_ref in "${unchanged[@]}"; do
+                echo "  - $doc_ref"
+            done
+            echo ""
+        fi
+
+        if [[ ${#removed[@]} -gt 0 ]]; then
+            echo "Documents no longer part of this role's context:"
+            for doc_ref in "${removed[@]}"; do
+                echo "  - $doc_ref"
+            done
+            echo ""
+        fi
+
+        if [[ ${#changed[@]} -gt 0 ]]; then
+            echo "## Changed Documents"
+            echo ""
+            for i in "${changed[@]}"; do
+                doc_info="${doc_contents[$i]}"
+                echo "### Document: ${doc_info%%|*}"
+                echo "---"
+                echo "${doc_info#*|}"
+                echo "---"
+                echo ""
+            done
+        fi
+
+        print_context_layers_delta
+
+        echo "=== END ROLE CONTEXT ==="
+        exit 0
+    fi
+
+    # Output based on mode
+    case "$mode" in
+        verbose)
+            # Full output with metadata
+            echo "=== ROLE CONTEXT LOADED ==="
+            echo ""
+            echo "Role: $current_role"
+            echo "Scope: $(is_project_context && echo "project" || echo "global")"
+            echo "Role guide: $role_guide"
+            echo "Documents loaded: $loaded_count/$ref_count"
+            echo ""
+
+            if [[ $loaded_count -gt 0 ]]; then
+                echo "Document list:"
+                for doc_info in "${doc_contents[@]}"; do
+                    local doc_path="${doc_info%%|*}"
+                    echo "  - $doc_path"
+                done
+                echo ""
+            fi
+
+            if [[ ${#CONTEXT_LAYER_FILES[@]} -gt 0 ]]; then
+                echo "Inherited levels:"
+                local li
+                for li in "${!CONTEXT_LAYER_FILES[@]}"; do
+                    echo "  - ${CONTEXT_LAYER_LEVELS[$li]}: ${CONTEXT_LAYER_DOCS[$li]} documents (${CONTEXT_LAYER_STATUS[$li]})"
+                done
+                echo ""
+            fi
+
+            echo "You are collaborating with a user in the role: $current_role"
+            echo ""
+            echo "The following role guide defines how you should assist this user:"
+            echo ""
+            echo "---"
+            echo "$role_guide_content"
+            echo "---"
+            echo ""
+
+            if [[ $loaded_count -gt 0 ]]; then
+                echo "## Referenced Documents"
+                echo ""
+                echo "The following documents are part of this role's context:"
+                echo ""
+
+                for doc_info in "${doc_contents[@]}"; do
+                    local doc_path="${doc_info%%|*}"
+                    local doc_content="${doc_info#*|}"
+
+                    echo "### Document: $doc_path"
+                    echo "---"
+                    echo "$doc_content"
+                    echo "---"
+                    echo ""
+                done
+            fi
+
+            print_context_layers
+
+            echo "This context is automatically loaded for this session. Follow the"
+            echo "deterministic behaviors and leverage the agentic opportunities defined above."
+            echo ""
+            echo "=== END ROLE CONTEXT ==="
+            ;;
+        *)
+            # Normal mode - full role guide + documents with context wrapper
+            echo "=== ROLE CONTEXT LOADED ==="
+            echo ""
+            echo "You are collaborating with a user in the role: $current_role"
+            echo ""
+            echo "The following role guide defines how you should assist this user:"
+            echo ""
+            echo "---"
+            echo "$role_guide_content"
+            echo "---"
+            echo ""
+
+            if [[ $loaded_count -gt 0 ]]; then
+                echo "## Referenced Documents"
+                echo ""
+                echo "The following documents are part of this role's context:"
+                echo ""
+
+                for doc_info in "${doc_contents[@]}"; do
+                    local doc_path="${doc_info%%|*}"
+                    local doc_content="${doc_info#*|}"
+
+                    echo "### Document: $doc_path"
+                    echo "---"
+                    echo "$doc_content"
+                    echo "---"
+                    echo ""
+                done
+            fi
+
+            print_context_layers
+
+            echo "This context is automatically loaded for this session. Follow the"
+            echo "deterministic behaviors and leverage the agentic opportunities defined above."
+            echo ""
+            echo "=== END ROLE CONTEXT ==="
+            ;;
+    esac
+
+    exit 0
+}
@@ -0,0 +1,341 @@
+#!/usr/bin/env bash
+
+# role-manager/packs.sh - Packed context store
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - write_context_pack: Write the role guide and documents to one pack file
+#   - load_context_pack: Validate and load a pack (index only with --index-only)
+#   - open_context_pack_body / read_context_pack_entry: Read entries one at a time
+#   - build_context_pack: Rebuild the pack for the current role
+
+# =============================================================================
+# Packed Context Store
+# =============================================================================
+#
+# A pack holds the role guide and every referenced document in one file:
+#
+#   RCMPACK 2
+#   cwd<TAB><directory the references were resolved from>
+#   config<TAB><effective config dir>
+#   role<TAB><role>
+#   refs<TAB><number of document references>
+#   E<TAB><offset><TAB><length><TAB><sha256><TAB><size><TAB><mtime><TAB><guide|doc|nosection><TAB><ref><TAB><path>
+#   M<TAB>-<TAB>-<TAB>-<TAB>-<TAB>-<TAB><missing|shadow><TAB><ref><TAB><path>
+#   BODY
+#   <contents of every E entry, concatenated>
+#
+# Offsets and lengths are in bytes from the start of the body; size and
+# mtime are those of the E path when it was read (see file_signatures).
+# Empty fields are written as "-" (read splits on runs of tabs). M lines are
+# paths that must stay missing: unresolved references and candidates that
+# would shadow a resolved one. A pack is valid while every E path has the
+# recorded size and mtime and no M path exists. Section references
+# (path.md#heading) store and hash only the section; "nosection" entries
+# record a document whose heading was not found, with no content.
+#
+# There is one pack per directory and role, written whenever a full load finds
+# none that is valid. Packs not rewritten for PACK_MAX_AGE_DAYS are pruned
+# when another pack is written.
+
+PACK_MAX_AGE_DAYS=30
+
+# Loaded by load_context_pack
+PACK_GUIDE_CONTENT=""
+PACK_GUIDE_HASH=""
+PACK_GUIDE_OFFSET=0
+PACK_GUIDE_LENGTH=0
+PACK_REF_COUNT=0
+PACK_DOC_REFS=()
+PACK_DOC_PATHS=()
+PACK_DOC_HASHES=()
+PACK_DOC_OFFSETS=()
+PACK_DOC_LENGTHS=()
+PACK_DOC_CONTENTS=()
+PACK_MISSING_REFS=()
+
+# Usage: get_context_pack_path <role>
+# Returns: Pack file for <role> in the current directory
+get_context_pack_path() {
+    local role="$1"
+    cache_key_for_path "$PWD"
+    echo "${RCM_PACK_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/role-context-manager/packs}/$CACHE_KEY--$role.pack"
+}
+
+# Usage: write_context_pack <pack_file> <config_dir> <role> <role_guide> [doc_ref...]
+# Returns: 0 on success, 2 if the pack could not be written
+# Resolves the references like load-role-context and writes the pack atomically.
+write_context_pack() {
+    local pack_file="$1"
+    local config_dir="$2"
+    local role="$3"
+    local role_guide="$4"
+    shift 4
+
+    # Byte offsets: string lengths must count bytes, not characters
+    local LC_ALL=C
+
+    init_document_resolver
+
+    # Sizes and mtimes are taken before anything is read, so a file edited
+    # while the pack is written leaves the pack stale rather than wrong
+    resolve_document_paths "$@" || true
+    local sources=("$role_guide") i
+    for i in "${!RESOLVED_DOC_PATHS[@]}"; do
+        [[ "${RESOLVED_DOC_FOUND[$i]}" == "1" && -r "${RESOLVED_DOC_PATHS[$i]}" ]] && \
+            sources+=("${RESOLVED_DOC_PATHS[$i]}")
+    done
+    # Size and mtime index fields per path; "-" fields never match
+    local -A signatures=()
+    if file_signatures "${sources[@]}"; then
+        for i in "${!sources[@]}"; do
+            signatures[${sources[$i]}]="${FILE_SIGNATURES[$i]%%:*}"$'\t'"${FILE_SIGNATURES[$i]#*:}"
+        done
+    fi
+    local unsigned="-"$'\t'"-"
+
+    local index=()
+    local body=""
+    local offset=0
+    local files=()
+    local content="" path="" candidate=""
+
+    IFS= read -r -d '' content < "$role_guide" || true
+    index+=("E"$'\t'"$offset"$'\t'"${#content}"$'\t'"%HASH%"$'\t'"${signatures[$role_guide]:-$unsigned}"$'\t'"guide"$'\t'"-"$'\t'"$role_guide")
+    files+=("$role_guide")
+    body+="$content"
+    offset=$((offset + ${#content}))
+
+    local doc_ref
+    for doc_ref in "$@"; do
+        local found=0
+        resolve_document_ref "$doc_ref" && found=1
+        path="$DOC_RESOLVED"
+
+        # Earlier lookup candidates must stay missing, or resolution would change
+        if [[ "$doc_ref" != /* ]]; then
+            local kind="shadow" previous=""
+            [[ $found -eq 1 ]] || kind="missing"
+            local file_ref="${doc_ref%%#*}"
+            for candidate in "$PWD/$file_ref" \
+                             ${DOC_RESOLVER_PROJECT_ROOT:+"$DOC_RESOLVER_PROJECT_ROOT/$file_ref"} \
+                             "$DOC_RESOLVER_GLOBAL_DIR/$file_ref"; do
+                [[ "$candidate" == "$path" ]] && break
+                [[ "$candidate" == "$previous" ]] && continue
+                index+=("M"$'\t'"-"$'\t'"-"$'\t'"-"$'\t'"-"$'\t'"-"$'\t'"$kind"$'\t'"$doc_ref"$'\t'"$candidate")
+                previous="$candidate"
+            done
+        fi
+
+        if [[ $found -eq 1 && -r "$path" && "$doc_ref" == *"#"* ]]; then
+            # Sections are hashed separately from their document's file; an
+            # absent heading keeps the document as an input with kind "nosection"
+            content=""
+            local kind="doc" section_hash="-"
+            if find_document_section "$path" "${doc_ref#*#}"; then
+                [[ $SECTION_LENGTH -gt 0 ]] && IFS= read -r -d '' content < \
+                    <(tail -c +$((SECTION_START + 1)) -- "$path" | head -c "$SECTION_LENGTH") || true
+                sha256_string "$content"
+                section_hash="$SHA256"
+            else
+                kind="nosection"
+            fi
+            index+=("E"$'\t'"$offset"$'\t'"${#content}"$'\t'"$section_hash"$'\t'"${signatures[$path]:-$unsigned}"$'\t'"$kind"$'\t'"$doc_ref"$'\t'"$path")
+            body+="$content"
+            offset=$((offset + ${#content}))
+        elif [[ $found -eq 1 && -r "$path" ]]; then
+            content=""
+            IFS= read -r -d '' content < "$path" || true
+            index+=("E"$'\t'"$offset"$'\t'"${#content}"$'\t'"%HASH%"$'\t'"${signatures[$path]:-$unsigned}"$'\t'"doc"$'\t'"$doc_ref"$'\t'"$path")
+            files+=("$path")
+            body+="$content"
+            offset=$((offset + ${#content}))
+        elif [[ "$doc_ref" == /* ]]; then
+            index+=("M"$'\t'"-"$'\t'"-"$'\t'"-"$'\t'"-"$'\t'"-"$'\t'"missing"$'\t'"$doc_ref"$'\t'"$path")
+        fi
+    done
+
+    # One hashing process for every file, in index order
+    local hashes=()
+    if command -v sha256sum &> /dev/null; then
+        mapfile -t hashes < <(sha256sum -- "${files[@]}" 2>/dev/null | cut -d' ' -f1)
+    elif command -v shasum &> /dev/null; then
+        mapfile -t hashes < <(shasum -a 256 -- "${files[@]}" 2>/dev/null | cut -d' ' -f1)
+    fi
+    local entry
+    i=0
+    for entry in "${!index[@]}"; do
+        if [[ "${index[$entry]}" == *"%HASH%"* ]]; then
+            index[$entry]="${index[$entry]/\%HASH\%/${hashes[$i]:--}}"
+            i=$((i + 1))
+        fi
+    done
+
+    mkdir -p "${pack_file%/*}" 2>/dev/null || return 2
+    find "${pack_file%/*}" -maxdepth 1 -name '*.pack' -mtime +"$PACK_MAX_AGE_DAYS" -delete 2>/dev/null || true
+    local temp_file
+    temp_file="$(mktemp "$pack_file.tmp.XXXXXX")" || return 2
+    {
+        echo "RCMPACK 2"
+        printf 'cwd\t%s\n' "$PWD"
+        printf 'config\t%s\n' "$config_dir"
+        printf 'role\t%s\n' "$role"
+        printf 'refs\t%s\n' "$#"
+        printf '%s\n' "${index[@]}"
+        echo "BODY"
+        printf '%s' "$body"
+    } > "$temp_file" || { rm -f "$temp_file"; return 2; }
+    mv -f "$temp_file" "$pack_file"
+}
+
+# Usage: load_context_pack <pack_file> <config_dir> <role> [--index-only]
+# Sets: PACK_GUIDE_CONTENT/HASH/OFFSET/LENGTH, PACK_REF_COUNT,
+# PACK_DOC_REFS/PATHS/HASHES/OFFSETS/LENGTHS/CONTENTS (documents that were
+# found, in reference order) and PACK_MISSING_REFS (unresolved references and
+# absent sections)
+# Returns: 0 if the pack is valid, 1 if missing or stale
+# The whole pack is read with one read; with --index-only only the header is
+# read and contents are left empty (see read_context_pack_entry).
+load_context_pack() {
+    local pack_file="$1"
+    local config_dir="$2"
+    local role="$3"
+    local index_only="${4:-}"
+    local LC_ALL=C
+
+    PACK_GUIDE_CONTENT=""
+    PACK_GUIDE_HASH=""
+    PACK_GUIDE_OFFSET=0
+    PACK_GUIDE_LENGTH=0
+    PACK_REF_COUNT=0
+    PACK_DOC_REFS=()
+    PACK_DOC_PATHS=()
+    PACK_DOC_HASHES=()
+    PACK_DOC_OFFSETS=()
+    PACK_DOC_LENGTHS=()
+    PACK_DOC_CONTENTS=()
+    PACK_MISSING_REFS=()
+
+    [[ -f "$pack_file" ]] || return 1
+
+    local header="" body="" line
+    if [[ "$index_only" == "--index-only" ]]; then
+        while IFS= read -r line; do
+            [[ "$line" == "BODY" ]] && break
+            header+="$line"$'\n'
+        done < "$pack_file"
+    else
+        local data=""
+        IFS= read -r -d '' data < "$pack_file" || true
+        [[ "$data" == *$'\n'"BODY"$'\n'* ]] || return 1
+        header="${data%%$'\n'BODY$'\n'*}"$'\n'
+        body="${data#*$'\n'BODY$'\n'}"
+    fi
+    [[ "$header" == "RCMPACK 2"$'\n'* ]] || return 1
+
+    local tag offset length hash size mtime kind ref path previous_missing=""
+    local entries=() sources=() recorded=()
+    while IFS=$'\t' read -r tag offset length hash size mtime kind ref path; do
+        case "$tag" in
+            cwd) [[ "$offset" == "$PWD" ]] || return 1 ;;
+            config) [[ "$offset" == "$config_dir" ]] || return 1 ;;
+            role) [[ "$offset" == "$role" ]] || return 1 ;;
+            refs) PACK_REF_COUNT="$offset" ;;
+            E)
+                sources+=("$path")
+                recorded+=("$size:$mtime")
+                entries+=("$offset"$'\t'"$length"$'\t'"$hash"$'\t'"$kind"$'\t'"$ref"$'\t'"$path")
+                ;;
+            M)
+                [[ ! -e "$path" ]] || return 1
+                # One line per lookup candidate; report each reference once
+                if [[ "$kind" == "missing" && "$ref" != "$previous_missing" ]]; then
+                    PACK_MISSING_REFS+=("$ref")
+                    previous_missing="$ref"
+                fi
+                ;;
+        esac
+    done <<< "$header"
+
+    # Every source must still have the size and mtime it had when packed
+    file_signatures "${sources[@]}" || return 1
+    local i
+    for i in "${!sources[@]}"; do
+        [[ "${FILE_SIGNATURES[$i]}" == "${recorded[$i]}" ]] || return 1
+    done
+
+    local entry
+    for entry in "${entries[@]}"; do
+        IFS=$'\t' read -r offset length hash kind ref path <<< "$entry"
+        if [[ "$kind" == "guide" ]]; then
+            PACK_GUIDE_CONTENT="${body:$offset:$length}"
+            PACK_GUIDE_HASH="$hash"
+            PACK_GUIDE_OFFSET="$offset"
+            PACK_GUIDE_LENGTH="$length"
+        elif [[ "$kind" == "nosection" ]]; then
+            PACK_MISSING_REFS+=("$ref")
+        elif [[ "$kind" == "doc" ]]; then
+            PACK_DOC_REFS+=("$ref")
+            PACK_DOC_PATHS+=("$path")
+            PACK_DOC_HASHES+=("$hash")
+            PACK_DOC_OFFSETS+=("$offset")
+            PACK_DOC_LENGTHS+=("$length")
+            PACK_DOC_CONTENTS+=("${body:$offset:$length}")
+        fi
+    done
+    return 0
+}
+
+# Usage: open_context_pack_body <pack_file>
+# Sets: PACK_BODY_FD (a descriptor positioned at the start of the body)
+# Returns: 0 on success, 1 if the pack has no body
+open_context_pack_body() {
+    local line
+    PACK_BODY_POSITION=0
+    exec {PACK_BODY_FD}< "$1" || return 1
+    while IFS= read -r line <&"$PACK_BODY_FD"; do
+        [[ "$line" == "BODY" ]] && return 0
+    done
+    exec {PACK_BODY_FD}<&-
+    return 1
+}
+
+# Usage: read_context_pack_entry <offset> <length>
+# Sets: PACK_ENTRY (the entry's bytes, read from PACK_BODY_FD)
+# Entries must be read in body order (the order of the index); each is read
+# only when asked for, so a caller can emit one before reading the next.
+read_context_pack_entry() {
+    local offset="$1"
+    local length="$2"
+    local LC_ALL=C skipped
+
+    PACK_ENTRY=""
+    if [[ $offset -gt $PACK_BODY_POSITION ]]; then
+        IFS= read -r -N $((offset - PACK_BODY_POSITION)) skipped <&"$PACK_BODY_FD" || true
+    fi
+    [[ $length -gt 0 ]] && { IFS= read -r -N "$length" PACK_ENTRY <&"$PACK_BODY_FD" || true; }
+    PACK_BODY_POSITION=$((offset + length))
+}
+
+# Usage: build_context_pack
+# Rebuilds the pack for the role load-role-context would load here
+# Returns: 0 on success or when there is nothing to pack
+build_context_pack() {
+    local config_dir
+    config_dir="$(get_effective_config_dir)"
+
+    local role
+    role="$(get_preference "user_role")"
+    [[ -n "$role" && "$role" != "null" ]] || return 0
+
+    local role_guide
+    role_guide="$(get_role_guide_path "$config_dir" "$role" 2>/dev/null)" || return 0
+
+    collect_document_references "$role_guide" || true
+    local doc_paths=("${DOCUMENT_REFERENCES[@]}")
+
+    write_context_pack "$(get_context_pack_path "$role")" "$config_dir" "$role" "$role_guide" "${doc_paths[@]}"
+}
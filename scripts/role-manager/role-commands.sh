@@ -0,0 +1,315 @@
+#!/usr/bin/env bash
+
+# role-manager/role-commands.sh - show-role-context, set-role, init-role-docs and update-role-docs
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - cmd_show_role_context: Display current role and documents
+#   - cmd_set_role: Set user role
+#   - cmd_init_role_docs: Initialize role documents from guide
+#   - cmd_update_role_docs: Add/remove documents
+
+# =============================================================================
+# Role Commands (show, set, init, update)
+# =============================================================================
+
+# Display role context
+cmd_show_role_context() {
+    local claude_dir
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    claude_dir="$(find_claude_dir)" || {
+        echo "Error: No $claude_dir_name directory found" >&2
+        return 2
+    }
+
+    # Get organizational level
+    local org_level
+    org_level="$(detect_by_heuristics "$claude_dir" 2>/dev/null)" || org_level="project"
+
+    echo "Organizational level: $org_level"
+    echo ""
+
+    # Get current role
+    local current_role
+    current_role="$(get_current_role "$claude_dir")"
+
+    if [[ -z "$current_role" ]]; then
+        echo "No role set."
+        echo ""
+        list_available_roles "$claude_dir"
+        echo ""
+        echo "Use /set-role [role-name] to set your role."
+        return 0
+    fi
+
+    echo "Current role: $current_role"
+    echo ""
+
+    # Get merged documents
+    echo "Documents that will load on next session:"
+    echo ""
+
+    local docs
+    docs=($(merge_role_documents "$claude_dir" "$current_role"))
+
+    if [[ ${#docs[@]} -eq 0 ]]; then
+        echo "  No documents configured."
+        echo ""
+        echo "Use /init-role-docs to initialize from role guide."
+        return 0
+    fi
+
+    # Check existence and display
+    for doc in "${docs[@]}"; do
+        local indicator
+        local resolved
+
+        # Skip wildcards or show them specially
+        if [[ "$doc" == *"*"* ]]; then
+            echo "  ~ $doc (pattern)"
+            continue
+        fi
+
+        resolved="$(resolve_path "${doc%%#*}" 2>/dev/null)" || true
+
+        if [[ -n "$resolved" ]]; then
+            indicator="✓"
+        else
+            if is_standardized_document "$doc"; then
+                indicator="?"
+            else
+                indicator="!"
+            fi
+        fi
+
+        echo "  $indicator $doc"
+    done
+
+    echo ""
+    echo "Legend: ✓ exists | ! missing | ? can be generated"
+    echo ""
+    echo "Start a new session to load this context."
+}
+
+# Set role command
+cmd_set_role() {
+    local role="$1"
+
+    if [[ -z "$role" ]]; then
+        echo "Usage: /set-role [role-name]" >&2
+        return 1
+    fi
+
+    local claude_dir
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    claude_dir="$(find_claude_dir)" || {
+        ensure_claude_dir
+        claude_dir="./$claude_dir_name"
+    }
+
+    # Check if role exists
+    local role_guide
+    role_guide="$(get_role_guide_path "$claude_dir" "$role")"
+
+    if [[ -z "$role_guide" ]]; then
+        echo "Error: Role '$role' not found at this organizational level" >&2
+        echo "" >&2
+        list_available_roles "$claude_dir"
+        return 1
+    fi
+
+    # Set role in preferences
+    set_user_role "$claude_dir" "$role"
+
+    # Initialize role documents if not exists
+    local ref_file="$claude_dir/role-references.json"
+    if [[ ! -f "$ref_file" ]] || ! grep -q "\"$role\"" "$ref_file" 2>/dev/null; then
+        echo "" >&2
+        echo "Initializing document references from role guide..." >&2
+        cmd_init_role_docs
+    else
+        echo "" >&2
+        cmd_show_role_context
+    fi
+
+    # Pack the new role's context so the next session start is one read
+    build_context_pack 2>/dev/null || true
+}
+
+# Initialize role documents from guide
+cmd_init_role_docs() {
+    local reset="${1:-false}"
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+
+    local claude_dir
+    claude_dir="$(find_claude_dir)" || {
+        echo "Error: No $claude_dir_name directory found" >&2
+        return 2
+    }
+
+    local current_role
+    current_role="$(get_current_role "$claude_dir")"
+
+    if [[ -z "$current_role" ]]; then
+        echo "Error: No role set. Use /set-role first." >&2
+        return 1
+    fi
+
+    # Get role guide
+    local role_guide
+    role_guide="$(get_role_guide_path "$claude_dir" "$current_role")"
+
+    if [[ -z "$role_guide" ]]; then
+        echo "Error: Role guide not found for role: $current_role" >&2
+        return 1
+    fi
+
+    # Extract document references
+    local doc_refs
+    doc_refs="$(extract_document_references "$role_guide")"
+
+    # Write to role-references.json
+    if [[ "$reset" == "--reset" ]] || [[ "$reset" == "true" ]]; then
+        # Reset: clear customizations
+        write_role_references "$claude_dir" "$current_role" "$doc_refs" "[]" false
+        echo "✓ Reset role documents to defaults for: $current_role"
+    else
+        # Initialize: keep existing customizations if any
+        local existing_customs
+        existing_customs="$(read_role_references "$claude_dir" "$current_role" false | jq -c '.user_customizations // []' 2>/dev/null)" || existing_customs="[]"
+        write_role_references "$claude_dir" "$current_role" "$doc_refs" "$existing_customs" false
+        echo "✓ Initialized role documents for: $current_role"
+    fi
+
+    echo ""
+    cmd_show_role_context
+}
+
+# Update role documents (+/- syntax)
+cmd_update_role_docs() {
+    local modifications=("$@")
+
+    if [[ ${#modifications[@]} -eq 0 ]]; then
+        echo "Usage: /update-role-docs [+/-]file ..." >&2
+        echo "Examples:" >&2
+        echo "  /update-role-docs +docs/custom.md" >&2
+        echo "  /update-role-docs -/quality-standards.md" >&2
+        echo "  /update-role-docs +new.md -old.md" >&2
+        return 1
+    fi
+
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    local claude_dir
+    claude_dir="$(find_claude_dir)" || {
+        echo "Error: No $claude_dir_name directory found" >&2
+        return 2
+    }
+
+    local current_role
+    current_role="$(get_current_role "$claude_dir")"
+
+    if [[ -z "$current_role" ]]; then
+        echo "Error: No role set. Use /set-role first." >&2
+        return 1
+    fi
+
+    # Read existing customizations from local file
+    local ref_file_local="$claude_dir/role-references.local.json"
+    local existing_customs=()
+
+    if [[ -f "$ref_file_local" ]]; then
+        while IFS= read -r custom; do
+            [[ -z "$custom" ]] && continue
+            existing_customs+=("$custom")
+        done < <(jq -r --arg role "$current_role" '.[$role].user_customizations[]? // empty' "$ref_file_local" 2>/dev/null)
+    fi
+
+    # Apply modifications
+    local additions=()
+    local removals=()
+
+    for mod in "${modifications[@]}"; do
+        if [[ "$mod" =~ ^\+ ]]; then
+            local doc_path="${mod#+}"
+            # Check if already in customizations
+            local already_exists=false
+            for existing in "${existing_customs[@]}"; do
+                if [[ "$existing" == "+$doc_path" ]]; then
+                    already_exists=true
+                    break
+                fi
+            done
+            if [[ "$already_exists" == "false" ]]; then
+                existing_customs+=("$mod")
+                additions+=("$doc_path")
+            fi
+        elif [[ "$mod" =~ ^\- ]]; then
+            local doc_path="${mod#-}"
+            # Check if removal already in customizations
+            local already_exists=false
+            for existing in "${existing_customs[@]}"; do
+                if [[ "$existing" == "-$doc_path" ]]; then
+                    already_exists=true
+                    break
+                fi
+            done
+            if [[ "$already_exists" == "false" ]]; then
+                existing_customs+=("$mod")
+                removals+=("$doc_path")
+            fi
+        else
+            echo "Warning: Invalid modification format: $mod (must start with + or -)" >&2
+        fi
+    done
+
+    # Convert to JSON array
+    local customs_json
+    if command -v jq &> /dev/null; then
+        customs_json="$(printf '%s\n' "${existing_customs[@]}" | jq -R -s -c 'split("\n") | map(select(length > 0))')"
+    else
+        customs_json="["
+        local first=true
+        for custom in "${existing_customs[@]}"; do
+            if [[ "$first" == "true" ]]; then
+                first=false
+            else
+                customs_json+=","
+            fi
+            customs_json+="\"$custom\""
+        done
+        customs_json+="]"
+    fi
+
+    # Write to local file
+    write_role_references "$claude_dir" "$current_role" "[]" "$customs_json" true
+
+    echo "✓ Updated role documents for: $current_role"
+    echo ""
+
+    if [[ ${#additions[@]} -gt 0 ]]; then
+        echo "Added:"
+        for doc in "${additions[@]}"; do
+            echo "  + $doc"
+        done
+        echo ""
+    fi
+
+    if [[ ${#removals[@]} -gt 0 ]]; then
+        echo "Removed:"
+        for doc in "${removals[@]}"; do
+            echo "  - $doc"
+        done
+        echo ""
+    fi
+
+    cmd_show_role_context
+
+    build_context_pack 2>/dev/null || true
+}
@@ -0,0 +1,379 @@
+#!/usr/bin/env bash
+
+# role-manager/roles.sh - Preferences, role guides and document references
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - get_preference / set_preference: Read and write preferences.json (project over global)
+#   - get_current_role / set_user_role: Current role
+#   - get_role_guide_path: Find role guide file
+#   - collect_document_references: Parse documents from role guide
+#   - merge_role_documents: Merge team defaults with user overrides
+
+# =============================================================================
+# Preferences, Role Guides and Document References
+# =============================================================================
+
+# Read preference with scope hierarchy (project overrides global)
+# Args:
+#   $1: preference key (e.g., "user_role")
+# Returns:
+#   Preference value (project > global > empty)
+get_preference() {
+    local key="$1"
+
+    # Try project config first
+    if is_project_context; then
+        local project_config="$(find_claude_dir_upward)/preferences.json"
+        if [[ -f "$project_config" ]]; then
+            local value
+            if command -v jq &> /dev/null; then
+                value=$(jq -r ".$key // empty" "$project_config" 2>/dev/null)
+            else
+                value=$(json_value "$project_config" "$key") || value=""
+            fi
+            if [[ -n "$value" ]]; then
+                echo "$value"
+                return 0
+            fi
+        fi
+    fi
+
+    # Fallback to global config
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    local global_config="$HOME/$claude_dir_name/preferences.json"
+    if [[ -f "$global_config" ]]; then
+        if command -v jq &> /dev/null; then
+            jq -r ".$key // empty" "$global_config" 2>/dev/null || echo ""
+        else
+            json_value "$global_config" "$key" || echo ""
+        fi
+    fi
+}
+
+# Set preference with scope control
+# Args:
+#   $1: key
+#   $2: value
+#   $3: scope (auto|project|global) - default: auto
+set_preference() {
+    local key="$1"
+    local value="$2"
+    local scope="${3:-auto}"
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+
+    local config_dir
+    case "$scope" in
+        global)
+            config_dir="$HOME/$claude_dir_name"
+            ensure_global_config
+            ;;
+        project)
+            config_dir="$(find_claude_dir_upward)"
+            if [[ -z "$config_dir" ]]; then
+                echo "Error: Not in a project context. Cannot use --project scope." >&2
+                return 1
+            fi
+            ;;
+        auto)
+            # Write to project if in project, else global
+            if is_project_context; then
+                config_dir="$(find_claude_dir_upward)"
+            else
+                config_dir="$HOME/$claude_dir_name"
+                ensure_global_config
+            fi
+            ;;
+        *)
+            echo "Error: Invalid scope '$scope'" >&2
+            return 1
+            ;;
+    esac
+
+    mkdir -p "$config_dir"
+    local prefs_file="$config_dir/preferences.json"
+
+    # Locked read-modify-write with atomic rename (see json-store.sh)
+    json_set_strings "$prefs_file" "$key" "$value" || return 1
+
+    echo "✓ Updated $key in: $prefs_file" >&2
+}
+
+# Ensure .claude directory exists
+ensure_claude_dir() {
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    if [[ ! -d "$claude_dir_name" ]]; then
+        mkdir -p "$claude_dir_name"
+        echo "Created $claude_dir_name directory" >&2
+    fi
+}
+
+# Read current role from preferences.json
+get_current_role() {
+    local claude_dir="$1"
+    local prefs_file="$claude_dir/preferences.json"
+
+    if [[ ! -f "$prefs_file" ]]; then
+        echo ""
+        return 1
+    fi
+
+    if command -v jq &> /dev/null; then
+        jq -r '.user_role // empty' "$prefs_file" 2>/dev/null || echo ""
+    else
+        json_value "$prefs_file" user_role || echo ""
+    fi
+}
+
+# Update role in preferences.json
+set_user_role() {
+    local claude_dir="$1"
+    local role="$2"
+    local prefs_file="$claude_dir/preferences.json"
+
+    json_set_strings "$prefs_file" "user_role" "$role" || return 1
+
+    echo "✓ Role set to: $role" >&2
+    echo "✓ Updated: $prefs_file" >&2
+}
+
+# Get role guide path for given role and level
+get_role_guide_path() {
+    local claude_dir="$1"
+    local role="$2"
+    local role_guides_dir
+    role_guides_dir="$(get_role_guides_dir)"
+
+    local role_guide="$claude_dir/$role_guides_dir/${role}-guide.md"
+
+    if [[ -f "$role_guide" ]]; then
+        echo "$role_guide"
+        return 0
+    fi
+
+    # Try without -guide suffix
+    role_guide="$claude_dir/$role_guides_dir/${role}.md"
+    if [[ -f "$role_guide" ]]; then
+        echo "$role_guide"
+        return 0
+    fi
+
+    echo "" >&2
+    return 1
+}
+
+# List available roles for current level
+list_available_roles() {
+    local claude_dir="$1"
+    local role_guides_dirname
+    role_guides_dirname="$(get_role_guides_dir)"
+    local role_guides_dir="$claude_dir/$role_guides_dirname"
+
+    if [[ ! -d "$role_guides_dir" ]]; then
+        echo "No roles defined at this level" >&2
+        return 1
+    fi
+
+    echo "Available roles:" >&2
+    for guide in "$role_guides_dir"/*.md; do
+        if [[ -f "$guide" ]]; then
+            local basename="$(basename "$guide" .md)"
+            # Remove -guide suffix if present
+            basename="${basename%-guide}"
+            echo "  - $basename" >&2
+        fi
+    done
+}
+
+# Usage: collect_document_references role_guide
+# Sets: DOCUMENT_REFERENCES (references listed under "## Document References")
+# Returns: 1 if the guide does not exist
+collect_document_references() {
+    local role_guide="$1"
+    DOCUMENT_REFERENCES=()
+
+    if [[ ! -f "$role_guide" ]]; then
+        return 1
+    fi
+
+    local -n docs=DOCUMENT_REFERENCES
+    local in_section=false
+
+    while IFS= read -r line; do
+        # Check if we're entering the Document References section
+        if [[ "$line" =~ ^##[[:space:]]*Document[[:space:]]*References ]]; then
+            in_section=true
+            continue
+        fi
+
+        # Check if we're leaving the section (next ## heading)
+        if [[ "$line" =~ ^##[[:space:]] ]] && [[ "$in_section" == "true" ]]; then
+            break
+        fi
+
+        # Extract document paths from markdown list items
+        if [[ "$in_section" == "true" ]]; then
+            # Match: - `path.md` or - `path.md#Section Heading`
+            if [[ "$line" =~ ^[[:space:]]*-[[:space:]]*\`([^\`]+\.md(#[^\`]+)?)\` ]]; then
+                local doc_path="${BASH_REMATCH[1]}"
+                docs+=("$doc_path")
+            # Match: - /absolute/path.md[#heading]
+            elif [[ "$line" =~ ^[[:space:]]*-[[:space:]]*(/[^[:space:]]+\.md(#[^[:space:]]+)?) ]]; then
+                local doc_path="${BASH_REMATCH[1]}"
+                docs+=("$doc_path")
+            # Match: - relative/path.md[#heading]
+            elif [[ "$line" =~ ^[[:space:]]*-[[:space:]]*([^[:space:]]+\.md(#[^[:space:]]+)?) ]]; then
+                local doc_path="${BASH_REMATCH[1]}"
+                docs+=("$doc_path")
+            fi
+        fi
+    done < "$role_guide"
+}
+
+# Extract document references from role guide as a JSON array
+extract_document_references() {
+    local role_guide="$1"
+
+    if ! collect_document_references "$role_guide"; then
+        echo "[]"
+        return 1
+    fi
+
+    # Output as JSON array
+    if command -v jq &> /dev/null; then
+        printf '%s\n' "${DOCUMENT_REFERENCES[@]}" | jq -R -s -c 'split("\n") | map(select(length > 0))'
+    else
+        # Fallback without jq
+        local json="" doc
+        for doc in "${DOCUMENT_REFERENCES[@]}"; do
+            json_string "$doc"
+            json+="${json:+,}$JSON_STRING"
+        done
+        echo "[$json]"
+    fi
+}
+
+# Read role-references.json (team defaults or local overrides)
+read_role_references() {
+    local claude_dir="$1"
+    local role="$2"
+    local use_local="${3:-false}"
+
+    local ref_file="$claude_dir/role-references.json"
+    if [[ "$use_local" == "true" ]]; then
+        ref_file="$claude_dir/role-references.local.json"
+    fi
+
+    if [[ ! -f "$ref_file" ]]; then
+        echo "{}"
+        return 1
+    fi
+
+    if command -v jq &> /dev/null; then
+        jq --arg role "$role" '.[$role] // {}' "$ref_file" 2>/dev/null || echo "{}"
+    else
+        echo "{}"
+    fi
+}
+
+# Write role-references.json
+write_role_references() {
+    local claude_dir="$1"
+    local role="$2"
+    local default_docs="$3"
+    local custom_docs="$4"
+    local use_local="${5:-false}"
+
+    local ref_file="$claude_dir/role-references.json"
+    if [[ "$use_local" == "true" ]]; then
+        ref_file="$claude_dir/role-references.local.json"
+    fi
+
+    if command -v jq &> /dev/null; then
+        # Update only this role's entry; other roles written concurrently survive
+        json_update "$ref_file" \
+            '.[$role] = {default_documents: $defaults, user_customizations: $customs}' \
+            --arg role "$role" \
+            --argjson defaults "$default_docs" \
+            --argjson customs "$custom_docs"
+    else
+        # Fallback - simple write
+        with_json_lock "$ref_file" json_write_atomic "$ref_file" <<EOF
+{
+  "$role": {
+    "default_documents": $default_docs,
+    "user_customizations": $custom_docs
+  }
+}
+EOF
+    fi
+}
+
+# Merge team defaults with local overrides
+merge_role_documents() {
+    local claude_dir="$1"
+    local role="$2"
+
+    # Read team defaults
+    local team_defaults
+    team_defaults="$(read_role_references "$claude_dir" "$role" false)"
+
+    # Read local overrides
+    local local_overrides
+    local_overrides="$(read_role_references "$claude_dir" "$role" true)"
+
+    # Extract default documents
+    local default_docs
+    if command -v jq &> /dev/null; then
+        default_docs="$(echo "$team_defaults" | jq -r '.default_documents[]? // empty' 2>/dev/null)"
+    else
+        default_docs=""
+    fi
+
+    # Extract customizations from local
+    local custom_docs
+    if command -v jq &> /dev/null; then
+        custom_docs="$(echo "$local_overrides" | jq -r '.user_customizations[]? // empty' 2>/dev/null)"
+    else
+        custom_docs=""
+    fi
+
+    # Build final list
+    local final_docs=()
+
+    # Add default docs
+    while IFS= read -r doc; do
+        [[ -z "$doc" ]] && continue
+        final_docs+=("$doc")
+    done <<< "$default_docs"
+
+    # Apply customizations
+    while IFS= read -r custom; do
+        [[ -z "$custom" ]] && continue
+
+        if [[ "$custom" =~ ^\+ ]]; then
+            # Add document
+            local doc_to_add="${custom#+}"
+            final_docs+=("$doc_to_add")
+        elif [[ "$custom" =~ ^\- ]]; then
+            # Remove document
+            local doc_to_remove="${custom#-}"
+            local new_docs=()
+            for doc in "${final_docs[@]}"; do
+                if [[ "$doc" != "$doc_to_remove" ]]; then
+                    new_docs+=("$doc")
+                fi
+            done
+            final_docs=("${new_docs[@]}")
+        fi
+    done <<< "$custom_docs"
+
+    # Output final list
+    printf '%s\n' "${final_docs[@]}"
+}
@@ -0,0 +1,375 @@
+#!/usr/bin/env bash
+
+# role-manager/setup-state.sh - Setup-state probe shared by the SessionStart checks
+#
+# Function group of role-manager.sh, sourced the first time one of its
+# functions is called (see "Lazy Loading" there). Not meant to be run
+# directly.
+#
+# Functions:
+#   - probe_setup_state: Probe (or load the cached state of) a config dir
+#   - check_setup_complete / get_missing_setup_items / check_template_updates: Setup checks
+#   - cmd_setup_state: setup-state command
+
+# =============================================================================
+# Template Integration Functions (v1.1.0)
+# =============================================================================
+
+# Setup state probe
+#
+# The SessionStart checks (validate-setup --quiet, sync-template --check-only)
+# need the same facts about each config dir: which files exist, how many role
+# guides there are, which template was applied and what the registry offers.
+# probe_setup_state gathers them in one pass (one find, one jq) and caches
+# the result per config dir (RCM_SETUP_STATE_DIR, default
+# ~/.cache/role-context-manager/setup-state), so both checks - and any number
+# of concurrent hook processes - share one probe:
+#
+#   RCMSETUP 2
+#   I<TAB>1<TAB><size><TAB><mtime><TAB><path>   input present, with its signature
+#   I<TAB>0<TAB>-<TAB>-<TAB><path>              input missing
+#   S<TAB><key><TAB><value>                     probed fact
+#
+# Inputs are the config dir, its role guides dir and subdirs, and the
+# preferences and registry files, so adding a guide or editing preferences
+# invalidates the entry. An entry is fresh while every input has exactly its
+# recorded size and mtime (one stat), so a file restored with an older mtime
+# is noticed too. Inputs are stat'ed before they are read: an edit made
+# during the probe leaves the entry stale rather than wrong. Entries are
+# replaced by atomic rename.
+
+# Facts from the last probe_setup_state (see SETUP_STATE_KEYS)
+declare -gA SETUP_STATE=()
+SETUP_STATE_KEYS=(claude_dir exists role_guides_dir role_guides guide_count
+    organizational_level preferences role_references user_role
+    template_id template_version latest_version auto_update)
+
+# Usage: get_setup_state_path <claude_dir>
+# Sets: SETUP_STATE_FILE
+get_setup_state_path() {
+    cache_key_for_path "$1"
+    SETUP_STATE_FILE="${RCM_SETUP_STATE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/role-context-manager/setup-state}/$CACHE_KEY.state"
+}
+
+# Usage: load_setup_state <state_file>
+# Sets: SETUP_STATE
+# Returns: 0 if the entry exists and none of its inputs changed
+load_setup_state() {
+    local state_file="$1"
+    [[ -f "$state_file" ]] || return 1
+
+    local line tag a b c d
+    local present=() recorded=()
+    SETUP_STATE=()
+    {
+        IFS= read -r line && [[ "$line" == "RCMSETUP 2" ]] || return 1
+        while IFS=$'\t' read -r tag a b c d; do
+            case "$tag" in
+                I)
+                    if [[ "$a" == 1 ]]; then
+                        present+=("$d")
+                        recorded+=("$b:$c")
+                    else
+                        [[ ! -e "$d" ]] || return 1
+                    fi
+                    ;;
+                S) SETUP_STATE[$a]="$b" ;;
+            esac
+        done
+    } < "$state_file"
+
+    file_signatures "${present[@]}" || return 1
+    local i
+    for i in "${!present[@]}"; do
+        [[ "${FILE_SIGNATURES[$i]}" == "${recorded[$i]}" ]] || return 1
+    done
+    [[ -n "${SETUP_STATE[claude_dir]:-}" ]]
+}
+
+# Usage: probe_setup_state <claude_dir>
+# Sets: SETUP_STATE (from the cache when fresh, otherwise probed and stored)
+probe_setup_state() {
+    local claude_dir="$1"
+    [[ "$claude_dir" == /* ]] || claude_dir="$PWD/$claude_dir"
+    get_setup_state_path "$claude_dir"
+    local state_file="$SETUP_STATE_FILE"
+
+    load_setup_state "$state_file" && return 0
+
+    local role_guides_dirname
+    role_guides_dirname="$(get_role_guides_dir)"
+    local role_guides_dir="$claude_dir/$role_guides_dirname"
+    local prefs_file="$claude_dir/preferences.json"
+    local registry_file="${SCRIPT_DIR%/*}/templates/registry.json"
+
+    SETUP_STATE=([claude_dir]="$claude_dir" [exists]=0 [role_guides]=0 [guide_count]=0
+        [role_guides_dir]="$role_guides_dirname" [organizational_level]=0 [preferences]=0
+        [role_references]=0 [user_role]="" [template_id]="" [template_version]=""
+        [latest_version]="" [auto_update]=true)
+    local inputs=() present=() missing=() path
+
+    [[ -d "$claude_dir" ]] && present+=("$claude_dir") || missing+=("$claude_dir")
+    [[ -f "$prefs_file" ]] && present+=("$prefs_file") || missing+=("$prefs_file")
+    [[ -f "$registry_file" ]] && present+=("$registry_file") || missing+=("$registry_file")
+
+    # The role guides dir and its subdirs are listed first and stat'ed with
+    # the other inputs before anything is read
+    local guide_dirs=()
+    if [[ -d "$role_guides_dir" ]]; then
+        mapfile -t guide_dirs < <(find "$role_guides_dir" -type d -print 2>/dev/null)
+        present+=("${guide_dirs[@]}")
+    else
+        missing+=("$role_guides_dir")
+    fi
+    local cacheable=true
+    file_signatures "${present[@]}" || cacheable=false
+    local -A signature=()
+    local i
+    for i in "${!present[@]}"; do
+        signature[${present[$i]}]="${FILE_SIGNATURES[$i]:-}"
+    done
+
+    [[ -d "$claude_dir" ]] && SETUP_STATE[exists]=1
+
+    # One walk for the guide count; a subdir added or removed since the
+    # listing above is not covered by the signatures, so that probe is not cached
+    if [[ ${#guide_dirs[@]} -gt 0 ]]; then
+        SETUP_STATE[role_guides]=1
+        local count=0 walked=()
+        while IFS= read -r path; do
+            if [[ -d "$path" ]]; then
+                walked+=("$path")
+            else
+                count=$((count + 1))
+            fi
+        done < <(find "$role_guides_dir" -type d -print -o -name "*.md" -print 2>/dev/null)
+        SETUP_STATE[guide_count]=$count
+        [[ "${walked[*]}" == "${guide_dirs[*]}" ]] || cacheable=false
+    fi
+
+    [[ -f "$claude_dir/organizational-level.json" ]] && SETUP_STATE[organizational_level]=1
+    [[ -f "$claude_dir/role-references.json" ]] && SETUP_STATE[role_references]=1
+
+    # Preferences and the registry entry for the applied template, read together
+    if [[ -f "$prefs_file" ]]; then
+        SETUP_STATE[preferences]=1
+        local fields=()
+        if command -v jq &> /dev/null; then
+            local files=("$prefs_file")
+            [[ -f "$registry_file" ]] && files+=("$registry_file")
+            mapfile -t fields < <(jq -n -r '
+                input as $p | (try input catch null) as $r
+                | ($p.applied_template.id // "") as $id
+                | ($p.user_role // ""), $id, ($p.applied_template.version // ""),
+                  ($p.auto_update_templates // true | tostring),
+                  ([$r.bundled[]? | select(.id == $id) | .version][0] // "")
+            ' "${files[@]}" 2>/dev/null)
+        else
+            json_read "$prefs_file" user_role applied_template.id applied_template.version auto_update_templates
+            fields=("${JSON_VALUES[user_role]:-}" "${JSON_VALUES[applied_template.id]:-}"
+                "${JSON_VALUES[applied_template.version]:-}" "${JSON_VALUES[auto_update_templates]:-true}" "")
+            if [[ -n "${fields[1]}" ]] && json_read "$registry_file" "bundled[].id" "bundled[].version"; then
+                local ids versions i
+                mapfile -t ids <<< "${JSON_VALUES[bundled[].id]:-}"
+                mapfile -t versions <<< "${JSON_VALUES[bundled[].version]:-}"
+                for i in "${!ids[@]}"; do
+                    [[ "${ids[$i]}" == "${fields[1]}" ]] && { fields[4]="${versions[$i]:-}"; break; }
+                done
+            fi
+        fi
+        SETUP_STATE[user_role]="${fields[0]:-}"
+        SETUP_STATE[template_id]="${fields[1]:-}"
+        SETUP_STATE[template_version]="${fields[2]:-}"
+        SETUP_STATE[auto_update]="${fields[3]:-true}"
+        SETUP_STATE[latest_version]="${fields[4]:-}"
+        [[ "${SETUP_STATE[user_role]}" == "null" ]] && SETUP_STATE[user_role]=""
+    fi
+
+    # The registry only matters for an applied template
+    [[ -n "${SETUP_STATE[template_id]}" ]] || unset 'signature[$registry_file]'
+    for path in "${present[@]}"; do
+        [[ -n "${signature[$path]+set}" ]] || continue
+        inputs+=("1"$'\t'"${signature[$path]%%:*}"$'\t'"${signature[$path]#*:}"$'\t'"$path")
+    done
+    for path in "${missing[@]}"; do
+        [[ "$path" != "$registry_file" || -n "${SETUP_STATE[template_id]}" ]] || continue
+        inputs+=("0"$'\t'"-"$'\t'"-"$'\t'"$path")
+    done
+
+    # Store atomically; an unwritable cache only costs the next probe
+    [[ "$cacheable" == true ]] || return 0
+    mkdir -p "${state_file%/*}" 2>/dev/null || return 0
+    local temp_state
+    temp_state="$(mktemp "$state_file.tmp.XXXXXX" 2>/dev/null)" || return 0
+    {
+        echo "RCMSETUP 2"
+        printf 'I\t%s\n' "${inputs[@]}"
+        local key
+        for key in "${SETUP_STATE_KEYS[@]}"; do
+            printf 'S\t%s\t%s\n' "$key" "${SETUP_STATE[$key]}"
+        done
+    } > "$temp_state" && mv -f "$temp_state" "$state_file" || rm -f "$temp_state"
+    return 0
+}
+
+# Usage: get_template_update_status
+# Returns: up-to-date:<v> | update-available:<v>:<latest> | none (from SETUP_STATE)
+get_template_update_status() {
+    if [[ -z "${SETUP_STATE[template_id]}" || -z "${SETUP_STATE[latest_version]}" ]]; then
+        echo "none"
+    elif [[ "${SETUP_STATE[template_version]}" == "${SETUP_STATE[latest_version]}" ]]; then
+        echo "up-to-date:${SETUP_STATE[template_version]}"
+    else
+        echo "update-available:${SETUP_STATE[template_version]}:${SETUP_STATE[latest_version]}"
+    fi
+}
+
+# Usage: collect_missing_setup_items
+# Sets: MISSING_SETUP_ITEMS (from SETUP_STATE)
+collect_missing_setup_items() {
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    MISSING_SETUP_ITEMS=()
+
+    [[ "${SETUP_STATE[exists]}" == 1 ]] || MISSING_SETUP_ITEMS+=("$claude_dir_name directory")
+    if [[ "${SETUP_STATE[role_guides]}" != 1 ]]; then
+        MISSING_SETUP_ITEMS+=("${SETUP_STATE[role_guides_dir]} directory")
+    elif [[ "${SETUP_STATE[guide_count]}" -eq 0 ]]; then
+        MISSING_SETUP_ITEMS+=("role guide files")
+    fi
+    [[ "${SETUP_STATE[organizational_level]}" == 1 ]] || MISSING_SETUP_ITEMS+=("organizational-level.json (recommended)")
+    [[ "${SETUP_STATE[preferences]}" == 1 ]] || MISSING_SETUP_ITEMS+=("preferences.json (will be created)")
+    [[ "${SETUP_STATE[role_references]}" == 1 ]] || MISSING_SETUP_ITEMS+=("role-references.json (will be created)")
+    return 0
+}
+
+# Check if .claude setup is complete and ready to use
+# (the config dir and at least one role guide; the JSON files are optional)
+check_setup_complete() {
+    local claude_dir="${1:-$(get_claude_dir_name)}"
+    probe_setup_state "$claude_dir"
+    [[ "${SETUP_STATE[exists]}" == 1 && "${SETUP_STATE[guide_count]}" -gt 0 ]]
+}
+
+# Get list of missing setup items
+get_missing_setup_items() {
+    local claude_dir="${1:-$(get_claude_dir_name)}"
+    probe_setup_state "$claude_dir"
+    collect_missing_setup_items
+
+    # Print missing items as JSON array for easy parsing (laid out as jq would)
+    if [[ ${#MISSING_SETUP_ITEMS[@]} -eq 0 ]]; then
+        echo "[]"
+        return 0
+    fi
+    local item items=""
+    for item in "${MISSING_SETUP_ITEMS[@]}"; do
+        json_string "$item"
+        items+="${items:+,$'\n'}  $JSON_STRING"
+    done
+    printf '[\n%s\n]\n' "$items"
+}
+
+# Check if template updates are available
+check_template_updates() {
+    local claude_dir="${1:-$(get_claude_dir_name)}"
+    probe_setup_state "$claude_dir"
+
+    if [[ "$(get_template_update_status)" == update-available:* ]]; then
+        echo "true"
+    else
+        echo "false"
+    fi
+    return 0
+}
+
+# Usage: cmd_setup_state [--global|--project] [--json]
+# Prints the probed state of the global and project config dirs: the shared
+# input of validate-setup --quiet and sync-template --check-only
+cmd_setup_state() {
+    local scope="both"
+    local json=false
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --global) scope="global" ;;
+            --project) scope="project" ;;
+            --json) json=true ;;
+            *)
+                echo "Error: Unknown option: $1" >&2
+                echo "Usage: setup-state [--global|--project] [--json]" >&2
+                return 1
+                ;;
+        esac
+        shift
+    done
+
+    local claude_dir_name
+    claude_dir_name="$(get_claude_dir_name)"
+    local scopes=() dirs=()
+    if [[ "$scope" != "project" ]]; then
+        scopes+=("global")
+        dirs+=("$HOME/$claude_dir_name")
+    fi
+    if [[ "$scope" != "global" ]]; then
+        local project_dir
+        if project_dir="$(find_claude_dir_upward)" && [[ "$project_dir" != "$HOME/$claude_dir_name" ]]; then
+            scopes+=("project")
+            dirs+=("$project_dir")
+        elif [[ "$scope" == "project" ]]; then
+            echo "Error: Not in a project context ($claude_dir_name directory not found)" >&2
+            return 1
+        fi
+    fi
+
+    local i json_out="" item
+    for i in "${!dirs[@]}"; do
+        probe_setup_state "${dirs[$i]}"
+        collect_missing_setup_items
+        local status
+        status="$(get_template_update_status)"
+        local complete=false
+        [[ "${SETUP_STATE[exists]}" == 1 && "${SETUP_STATE[guide_count]}" -gt 0 ]] && complete=true
+
+        if [[ "$json" == true ]]; then
+            local missing_json="" key
+            for item in "${MISSING_SETUP_ITEMS[@]}"; do
+                json_string "$item"
+                missing_json+="${missing_json:+,}$JSON_STRING"
+            done
+            local entry
+            json_string "${scopes[$i]}"; entry="\"scope\":$JSON_STRING"
+            json_string "${dirs[$i]}"; entry+=",\"config_dir\":$JSON_STRING,\"complete\":$complete"
+            entry+=",\"guide_count\":${SETUP_STATE[guide_count]}"
+            for key in user_role template_id template_version latest_version; do
+                json_string "${SETUP_STATE[$key]}"
+                entry+=",\"$key\":$JSON_STRING"
+            done
+            json_string "${status%%:*}"; entry+=",\"template_status\":$JSON_STRING"
+            entry+=",\"auto_update\":$([[ "${SETUP_STATE[auto_update]}" == false ]] && echo false || echo true)"
+            entry+=",\"missing\":[$missing_json]"
+            json_out+="${json_out:+,}{$entry}"
+        else
+            local summary="${scopes[$i]} ${dirs[$i]}: "
+            if [[ "${SETUP_STATE[exists]}" != 1 ]]; then
+                summary+="not set up"
+            elif [[ "$complete" == true ]]; then
+                summary+="complete (${SETUP_STATE[guide_count]} role guides)"
+            else
+                summary+="incomplete"
+            fi
+            case "$status" in
+                up-to-date:*) summary+=", template ${SETUP_STATE[template_id]} v${status#up-to-date:} up to date" ;;
+                update-available:*)
+                    summary+=", template ${SETUP_STATE[template_id]} update available (v${SETUP_STATE[template_version]} → v${SETUP_STATE[latest_version]})" ;;
+            esac
+            echo "$summary"
+            [[ "${SETUP_STATE[exists]}" == 1 ]] || continue
+            for item in "${MISSING_SETUP_ITEMS[@]}"; do
+                echo "  missing: $item"
+            done
+        fi
+    done
+
+    [[ "$json" == true ]] && echo "[$json_out]"
+    return 0
+}
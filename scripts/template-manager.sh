@@ -12,6 +12,9 @@ source "$(dirname "$0")/path-config.sh"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/hierarchy-detector.sh"
 
+# Source locked/atomic JSON update library
+source "$SCRIPT_DIR/json-store.sh"
+
 # Get plugin directory
 PLUGIN_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 TEMPLATES_DIR="$PLUGIN_DIR/templates"
@@ -262,23 +265,13 @@ record_applied_template() {
   local applied_date
   applied_date=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
 
-  # Create or update preferences file
-  if [ ! -f "$prefs_file" ]; then
-    mkdir -p "$(dirname "$prefs_file")"
-    echo '{}' > "$prefs_file"
-  fi
-
-  # Update applied_template object with mode
-  local temp_file
-  temp_file=$(mktemp)
-  jq --arg id "$template_id" \
+  # Create or update applied_template (locked, atomic; keeps other preferences)
+  json_update "$prefs_file" \
+     '.applied_template = {id: $id, version: $ver, applied_date: $date, mode: $mode}' \
+     --arg id "$template_id" \
      --arg ver "$version" \
      --arg date "$applied_date" \
-     --arg mode "$mode" \
-     '.applied_template = {id: $id, version: $ver, applied_date: $date, mode: $mode}' \
-     "$prefs_file" > "$temp_file"
-
-  mv "$temp_file" "$prefs_file"
+     --arg mode "$mode" || return 1
 
   echo "✓ Recorded template: $template_id v$version (mode: $mode)"
   return 0
@@ -526,6 +519,19 @@ apply_template_with_mode() {
     return 1
   fi
 
+  # Compile the variables once for the whole copy
+  local placeholder_dir="" vars_table="" pairs_file=""
+  if [ -n "$TEMPLATE_VARIABLES_FILE" ]; then
+    placeholder_dir="$(mktemp -d)" || return 2
+    vars_table="$placeholder_dir/variables.tsv"
+    pairs_file="$placeholder_dir/pairs"
+    : > "$pairs_file"
+    if ! compile_template_variables "$TEMPLATE_VARIABLES_FILE" "$vars_table"; then
+      rm -rf "$placeholder_dir"
+      return 1
+    fi
+  fi
+
   echo "Mode: $mode"
   echo "Copying content sections: $(echo "$includes" | tr '\n' ' ')"
   echo ""
@@ -552,23 +558,50 @@ apply_template_with_mode() {
 
     # Handle special case for root_docs (files in root)
     if [ "$section" = "root_docs" ]; then
-      # Copy individual files listed in manifest
-      jq -r ".content_structure.root_docs.files[]" "$manifest_path" | while read -r file; do
+      # Copy individual files listed in manifest (Markdown is written by the
+      # substitution pass when there are variables)
+      while read -r file; do
         if [ -f "$template_path/$file" ]; then
-          cp "$template_path/$file" "$target_dir/"
+          if [ -n "$pairs_file" ] && [ "${file%.md}" != "$file" ]; then
+            printf '%s\t%s\n' "$template_path/$file" "$target_dir/${file##*/}" >> "$pairs_file"
+          else
+            cp "$template_path/$file" "$target_dir/"
+          fi
         fi
-      done
+      done < <(jq -r ".content_structure.root_docs.files[]" "$manifest_path")
     elif [ -d "$source_path" ]; then
       # Copy directory
       mkdir -p "$(dirname "$dest_path")"
-      cp -r "$source_path" "$dest_path"
+      if [ -n "$pairs_file" ]; then
+        # Everything but the Markdown, which the substitution pass writes
+        mkdir -p "$dest_path"
+        (cd "$source_path" && tar --exclude='*.md' -cf - .) | (cd "$dest_path" && tar -xf -)
+        find "$source_path" -type f -name '*.md' | while IFS= read -r file; do
+          printf '%s\t%s\n' "$file" "$dest_path${file#"$source_path"}"
+        done >> "$pairs_file"
+      else
+        cp -r "$source_path" "$dest_path"
+      fi
     elif [ -f "$source_path" ]; then
       # Copy file
       mkdir -p "$(dirname "$dest_path")"
-      cp "$source_path" "$dest_path"
+      if [ -n "$pairs_file" ] && [ "${source_path%.md}" != "$source_path" ]; then
+        printf '%s\t%s\n' "$source_path" "$dest_path" >> "$pairs_file"
+      else
+        cp "$source_path" "$dest_path"
+      fi
     fi
   done <<< "$includes"
 
+  # Write the Markdown, personalized, in one streaming pass
+  if [ -n "$pairs_file" ]; then
+    echo ""
+    local substitute_status=0
+    substitute_placeholders "$vars_table" "$pairs_file" "$target_dir" "$TEMPLATE_PLACEHOLDER_REPORT" || substitute_status=$?
+    rm -rf "$placeholder_dir"
+    [ $substitute_status -eq 0 ] || return $substitute_status
+  fi
+
   # Record applied template with mode
   local claude_dir_name
   claude_dir_name="$(get_claude_dir_name)" || claude_dir_name=".claude"
@@ -578,6 +611,698 @@ apply_template_with_mode() {
   return 0
 }
 
+# =============================================================================
+# Placeholder Substitution
+# =============================================================================
+#
+# Template documents use bracketed placeholders such as [Company Name]. With a
+# variables file (apply --vars FILE), apply_template_with_mode does not copy
+# Markdown files: one awk process reads each template file once and writes
+# its destination once. Each bracketed token on a line is looked up in a
+# table compiled from the variables file and replaced when it is defined.
+# Files are read whole, so a missing final newline stays missing.
+#
+# Markdown links ([text](url), [text][ref]) and lowercase tokens such as
+# task-list boxes are left alone. Tokens that start with an uppercase letter
+# and have no value are reported as unresolved.
+#
+# The variables file is a JSON object of placeholder names to values; names
+# may be written with or without the brackets:
+#
+#   {"Company Name": "Acme", "[Product Name]": "Rocket", "Founded": 2024}
+
+# Variables file and optional JSON report for apply/apply-mode (set by main)
+TEMPLATE_VARIABLES_FILE="${TEMPLATE_VARIABLES_FILE:-}"
+TEMPLATE_PLACEHOLDER_REPORT="${TEMPLATE_PLACEHOLDER_REPORT:-}"
+
+# Reads "name<TAB>value" variables (jq @tsv escaping) from VARS, then one
+# "source<TAB>destination" pair per input line, and writes each destination.
+# Prints "S<TAB>replaced<TAB>files" and one "P<TAB>count<TAB>destination<TAB>name"
+# line per unresolved placeholder and file.
+PLACEHOLDER_AWK='
+function unescape(v,    r, i, c) {
+    if (index(v, "\\") == 0) return v
+    r = ""
+    for (i = 1; i <= length(v); i++) {
+        c = substr(v, i, 1)
+        if (c == "\\" && i < length(v)) {
+            c = substr(v, ++i, 1)
+            if (c == "n") c = "\n"
+            else if (c == "t") c = "\t"
+            else if (c == "r") c = "\r"
+        }
+        r = r c
+    }
+    return r
+}
+
+BEGIN {
+    while ((getline line < ENVIRON["PLACEHOLDER_VARS"]) > 0) {
+        tab = index(line, "\t")
+        name = substr(line, 1, tab - 1)
+        sub(/^\[/, "", name)
+        sub(/\]$/, "", name)
+        vars[name] = unescape(substr(line, tab + 1))
+    }
+    close(ENVIRON["PLACEHOLDER_VARS"])
+    FS = "\t"
+}
+
+{
+    src = $1
+    dest = $2
+    changed = 0
+    delete seen
+
+    # Read the whole file as one string (SOH does not occur in Markdown;
+    # records are rejoined if it does), keeping the final newline or its
+    # absence
+    rs = RS
+    RS = "\001"
+    line = ""
+    for (n = 0; (getline part < src) > 0; n++) line = n ? line RS part : part
+    close(src)
+    RS = rs
+
+    out = ""
+    while (match(line, /\[[^][\n]+\]/)) {
+        token = substr(line, RSTART + 1, RLENGTH - 2)
+        before = RSTART > 1 ? substr(line, RSTART - 1, 1) : substr(out, length(out), 1)
+        after = substr(line, RSTART + RLENGTH, 1)
+        link = (before == "]" || after == "(" || after == "[")
+        if (!link && (token in vars)) {
+            out = out substr(line, 1, RSTART - 1) vars[token]
+            replaced++
+            changed = 1
+        } else {
+            out = out substr(line, 1, RSTART + RLENGTH - 1)
+            if (!link && token ~ /^[A-Z]/) seen[token]++
+        }
+        line = substr(line, RSTART + RLENGTH)
+    }
+    printf "%s", out line > dest
+    close(dest)
+    files += changed
+    for (token in seen) printf "P\t%d\t%s\t%s\n", seen[token], dest, token
+}
+
+END { printf "S\t%d\t%d\n", replaced, files }
+'
+
+# Usage: compile_template_variables <variables.json> <output>
+# Writes the "name<TAB>value" table read by PLACEHOLDER_AWK
+# Returns: 0 on success, 1 if the file is missing or not a JSON object of scalars
+compile_template_variables() {
+  local vars_file="$1"
+  local output="$2"
+
+  if [ ! -f "$vars_file" ]; then
+    echo "Error: Variables file not found: $vars_file" >&2
+    return 1
+  fi
+
+  if ! jq -r '
+      if type != "object" then error("not an object") else . end
+      | to_entries[]
+      | if (.value | type) == "object" or (.value | type) == "array"
+        then error("\(.key): value must be a string, number or boolean")
+        else [.key, (.value | tostring)] | @tsv end
+    ' "$vars_file" > "$output" 2>/dev/null; then
+    echo "Error: Variables file must be a JSON object of placeholder names to string values: $vars_file" >&2
+    return 1
+  fi
+}
+
+# Usage: substitute_placeholders <variables table> <pairs file> <target_dir> [report.json]
+# Streams each "source<TAB>destination" pair through the substitution pass,
+# then prints a summary of substitutions and unresolved placeholders.
+# Returns: 0 on success, 2 if the pass fails
+substitute_placeholders() {
+  local vars_table="$1"
+  local pairs_file="$2"
+  local target_dir="$3"
+  local report="${4:-}"
+
+  [ -s "$pairs_file" ] || return 0
+
+  local results
+  if ! results="$(PLACEHOLDER_VARS="$vars_table" LC_ALL=C awk "$PLACEHOLDER_AWK" "$pairs_file")"; then
+    echo "Error: Placeholder substitution failed" >&2
+    return 2
+  fi
+
+  # Group unresolved placeholders by name, most frequent first
+  local unresolved
+  unresolved="$(printf '%s\n' "$results" | jq -R -s --arg root "${target_dir%/}/" '
+    split("\n") | map(select(startswith("P\t")) | split("\t")
+      | {count: (.[1] | tonumber), file: (.[2] | ltrimstr($root)), placeholder: (.[3:] | join("\t"))})
+    | group_by(.placeholder)
+    | map({placeholder: .[0].placeholder, count: (map(.count) | add), files: (map(.file) | sort)})
+    | sort_by(-.count, .placeholder)')" || unresolved="[]"
+
+  local summary
+  summary="$(printf '%s\n' "$results" | grep '^S	' | tail -1)"
+  local replaced files
+  IFS=$'\t' read -r _ replaced files <<< "$summary"
+  echo "Placeholders: ${replaced:-0} substituted in ${files:-0} files"
+
+  local distinct
+  distinct="$(jq 'length' <<< "$unresolved")"
+  if [ "$distinct" -gt 0 ]; then
+    echo -e "${YELLOW}Unresolved placeholders: $distinct distinct, $(jq 'map(.count) | add' <<< "$unresolved") occurrences${NC}"
+    jq -r '.[:20][] | "  [\(.placeholder)]  \(.count) in \(.files | length) file\(if (.files | length) == 1 then "" else "s" end)"' <<< "$unresolved"
+    if [ "$distinct" -gt 20 ] && [ -z "$report" ]; then
+      echo "  ... $((distinct - 20)) more (full list: --placeholder-report FILE)"
+    fi
+  fi
+
+  if [ -n "$report" ]; then
+    jq -n --argjson unresolved "$unresolved" --arg vars "$TEMPLATE_VARIABLES_FILE" \
+      --argjson replaced "${replaced:-0}" --argjson files "${files:-0}" \
+      '{variables_file: $vars, substituted: $replaced, files_changed: $files, unresolved: $unresolved}' > "$report" \
+      || { echo "Error: Cannot write placeholder report: $report" >&2; return 2; }
+    echo "Placeholder report: $report"
+  fi
+}
+
+# =============================================================================
+# Batch Provisioning
+# =============================================================================
+#
+# provision applies templates to many repositories in one run. The spec lists
+# one target per line (blank lines and # comments are ignored):
+#
+#   <repo-or-glob> <template-id> [mode] [level] [role]
+#
+# mode defaults to standard; use - to leave level or role unset. The registry
+# and each template manifest are parsed once for the whole batch, every copy
+# is planned before anything is written, and repositories are provisioned in
+# parallel. Each repository gets a backup of everything the run overwrites
+# (<config dir>/.backups/<timestamp>_provision) and is rolled back from it if
+# any step fails. Levels are written last, parents before children, so nested
+# targets in the same batch validate against each other.
+
+# Registry, parsed once by load_provision_registry: id -> path / version / levels
+declare -A PROVISION_TEMPLATE_PATH=()
+declare -A PROVISION_TEMPLATE_VERSION=()
+declare -A PROVISION_TEMPLATE_LEVELS=()
+
+# Compiled manifests: "<id>|<mode>" -> lines of "<kind><TAB><relative path>"
+declare -A PROVISION_MODE_OPS=()
+
+# Usage: load_provision_registry
+# Returns: 0 on success, 1 if the registry cannot be read
+load_provision_registry() {
+  local id path version levels
+  while IFS=$'\t' read -r id path version levels; do
+    PROVISION_TEMPLATE_PATH[$id]="$PLUGIN_DIR/$path"
+    PROVISION_TEMPLATE_VERSION[$id]="$version"
+    PROVISION_TEMPLATE_LEVELS[$id]="$levels"
+  done < <(jq -r '.bundled[] | [.id, .path, .version, ((.org_levels // []) | join(" ") | if . == "" then "-" else . end)] | @tsv' "$REGISTRY_FILE" 2>/dev/null)
+
+  if [ ${#PROVISION_TEMPLATE_PATH[@]} -eq 0 ]; then
+    echo "Error: No templates found in registry: $REGISTRY_FILE" >&2
+    return 1
+  fi
+  return 0
+}
+
+# Usage: compile_template_modes <template-id>
+# Fills PROVISION_MODE_OPS for every application mode of the template with one
+# jq call. Kinds: path (section directory or file), file (root doc copied to
+# the repository root) and missing (section not in content_structure).
+compile_template_modes() {
+  local template_id="$1"
+  local manifest="${PROVISION_TEMPLATE_PATH[$template_id]}/manifest.json"
+
+  local mode kind rel
+  while IFS=$'\t' read -r mode kind rel; do
+    PROVISION_MODE_OPS["$template_id|$mode"]+="$kind"$'\t'"$rel"$'\n'
+  done < <(jq -r '
+    . as $m | ($m.application_modes // {}) | to_entries[] | .key as $mode |
+    .value.includes[] as $section |
+    ($m.content_structure[$section] // null) as $c |
+    if $c == null then [$mode, "missing", $section]
+    elif $section == "root_docs" then ($c.files // [])[] | [$mode, "file", .]
+    else [$mode, "path", $c.path] end | @tsv' "$manifest" 2>/dev/null)
+}
+
+# Usage: plan_provision_repo <plan_file> <repo> <template-id> <mode> <level> <role> <stamp>
+# Writes the repository's plan: header lines, then one copy line per operation.
+# Returns: 0 if planned, 1 with a message on stderr if the target is invalid
+plan_provision_repo() {
+  local plan_file="$1" repo="$2" template_id="$3" mode="$4" level="$5" role="$6" stamp="$7"
+  local claude_dir_name
+  claude_dir_name="$(get_claude_dir_name)" || claude_dir_name=".claude"
+
+  if [ -z "${PROVISION_TEMPLATE_PATH[$template_id]:-}" ]; then
+    echo "template '$template_id' not found in registry" >&2
+    return 1
+  fi
+  local template_path="${PROVISION_TEMPLATE_PATH[$template_id]}"
+  local ops="${PROVISION_MODE_OPS["$template_id|$mode"]:-}"
+  if [ -z "$ops" ]; then
+    echo "application mode '$mode' not found in $template_id" >&2
+    return 1
+  fi
+
+  if [ "$level" != "-" ]; then
+    if [[ ! "$level" =~ ^(company|system|product|project)$ ]]; then
+      echo "invalid level '$level'" >&2
+      return 1
+    fi
+    local levels=" ${PROVISION_TEMPLATE_LEVELS[$template_id]} "
+    if [ "$levels" != " - " ] && [[ "$levels" != *" $level "* ]]; then
+      echo "$template_id does not support level '$level'" >&2
+      return 1
+    fi
+  fi
+
+  if [ "$role" != "-" ]; then
+    local guides="$template_path/.claude/$(get_role_guides_dir)"
+    if [ ! -f "$guides/$role-guide.md" ] && [ ! -f "$guides/$role.md" ]; then
+      echo "role '$role' has no guide in $template_id" >&2
+      return 1
+    fi
+  fi
+
+  {
+    printf 'repo\t%s\n' "$repo"
+    printf 'template\t%s\t%s\t%s\n' "$template_id" "${PROVISION_TEMPLATE_VERSION[$template_id]}" "$mode"
+    printf 'config\t%s\n' "$repo/$claude_dir_name"
+    printf 'backup\t%s\n' "$repo/$claude_dir_name/.backups/${stamp}_provision"
+    printf 'level\t%s\n' "$level"
+    printf 'role\t%s\n' "$role"
+
+    local kind rel
+    while IFS=$'\t' read -r kind rel; do
+      [ -n "$kind" ] || continue
+      case "$kind" in
+        missing)
+          echo "Warning: Section '$rel' not found in $template_id manifest, skipping" >&2
+          ;;
+        file)
+          [ -f "$template_path/$rel" ] && printf 'copy\tfile\t%s\t%s\n' "$template_path/$rel" "$repo/${rel##*/}"
+          ;;
+        path)
+          local dest_rel="$rel"
+          # The template's .claude tree lands in the configured directory
+          [ "$rel" = ".claude" ] && dest_rel="$claude_dir_name"
+          [[ "$rel" == .claude/* ]] && dest_rel="$claude_dir_name/${rel#.claude/}"
+          if [ -d "$template_path/$rel" ]; then
+            printf 'copy\tdir\t%s\t%s\n' "$template_path/$rel" "$repo/$dest_rel"
+          elif [ -f "$template_path/$rel" ]; then
+            printf 'copy\tfile\t%s\t%s\n' "$template_path/$rel" "$repo/$dest_rel"
+          else
+            echo "Warning: Source path does not exist: $template_path/$rel, skipping" >&2
+          fi
+          ;;
+      esac
+    done <<< "$ops"
+  } > "$plan_file"
+}
+
+# Usage: read_provision_plan <plan_file>
+# Sets: PLAN_REPO, PLAN_TEMPLATE, PLAN_VERSION, PLAN_MODE, PLAN_CONFIG,
+#       PLAN_BACKUP, PLAN_LEVEL, PLAN_ROLE and PLAN_COPIES ("kind<TAB>src<TAB>dest")
+read_provision_plan() {
+  local plan_file="$1"
+  PLAN_COPIES=()
+  local tag a b c
+  while IFS=$'\t' read -r tag a b c; do
+    case "$tag" in
+      repo) PLAN_REPO="$a" ;;
+      template) PLAN_TEMPLATE="$a"; PLAN_VERSION="$b"; PLAN_MODE="$c" ;;
+      config) PLAN_CONFIG="$a" ;;
+      backup) PLAN_BACKUP="$a" ;;
+      level) PLAN_LEVEL="$a" ;;
+      role) PLAN_ROLE="$a" ;;
+      copy) PLAN_COPIES+=("$a"$'\t'"$b"$'\t'"$c") ;;
+    esac
+  done < "$plan_file"
+}
+
+# Usage: backup_provision_targets
+# Copies every plan destination that already exists (and the config dir,
+# whose preferences are updated) into PLAN_BACKUP, keeping repo-relative
+# paths, and records destinations that did not exist.
+# Sets: PLAN_BACKED_UP and PLAN_CREATED (repo-relative paths)
+backup_provision_targets() {
+  PLAN_BACKED_UP=()
+  PLAN_CREATED=()
+  local targets=("$PLAN_CONFIG")
+  local entry
+  for entry in "${PLAN_COPIES[@]}"; do
+    targets+=("${entry##*$'\t'}")
+  done
+
+  declare -A seen=()
+  local dest rel
+  for dest in "${targets[@]}"; do
+    rel="${dest#"$PLAN_REPO"/}"
+    [ -z "${seen[$rel]:-}" ] || continue
+    seen[$rel]=1
+
+    if [ ! -e "$dest" ]; then
+      PLAN_CREATED+=("$rel")
+      continue
+    fi
+    # Already covered by a backed-up ancestor
+    local covered=false prior
+    for prior in "${PLAN_BACKED_UP[@]}"; do
+      [[ "$rel" == "$prior"/* ]] && covered=true
+    done
+    [ "$covered" = true ] && continue
+
+    mkdir -p "$PLAN_BACKUP/$(dirname "$rel")" || return 1
+    if [ "$dest" = "$PLAN_CONFIG" ]; then
+      mkdir -p "$PLAN_BACKUP/$rel" || return 1
+      find "$dest" -mindepth 1 -maxdepth 1 ! -name '.backups' -exec cp -R {} "$PLAN_BACKUP/$rel/" \; || return 1
+    else
+      cp -R "$dest" "$PLAN_BACKUP/$rel" || return 1
+    fi
+    PLAN_BACKED_UP+=("$rel")
+  done
+
+  [ ${#PLAN_BACKED_UP[@]} -gt 0 ] || return 0
+
+  local previous="unknown" previous_version="unknown"
+  if [ -f "$PLAN_CONFIG/preferences.json" ]; then
+    IFS=$'\t' read -r previous previous_version < <(jq -r \
+      '[.applied_template.id // "unknown", .applied_template.version // "unknown"] | @tsv' \
+      "$PLAN_CONFIG/preferences.json" 2>/dev/null) || true
+  fi
+  jq -n --arg date "$PROVISION_DATE" --arg id "${previous:-unknown}" --arg ver "${previous_version:-unknown}" \
+    --args '{backup_date: $date, reason: "batch-provision",
+             template_info: {id: $id, version: $ver}, paths: $ARGS.positional}' \
+    "${PLAN_BACKED_UP[@]}" > "$PLAN_BACKUP/backup-manifest.json"
+}
+
+# Usage: rollback_provision_targets
+# Removes what the run created and restores backed-up paths (uses the PLAN_*
+# state left by read_provision_plan and backup_provision_targets)
+# The backup lives in the config dir, so its .backups is always kept.
+rollback_provision_targets() {
+  local rel
+  for rel in "${PLAN_BACKED_UP[@]}" "${PLAN_CREATED[@]}"; do
+    if [ "$PLAN_REPO/$rel" = "$PLAN_CONFIG" ]; then
+      find "$PLAN_CONFIG" -mindepth 1 -maxdepth 1 ! -name '.backups' -exec rm -rf {} +
+    else
+      rm -rf "${PLAN_REPO:?}/$rel"
+    fi
+  done
+  for rel in "${PLAN_BACKED_UP[@]}"; do
+    if [ "$PLAN_REPO/$rel" = "$PLAN_CONFIG" ]; then
+      cp -R "$PLAN_BACKUP/$rel/." "$PLAN_CONFIG/"
+    else
+      cp -R "$PLAN_BACKUP/$rel" "$PLAN_REPO/$rel"
+    fi
+  done
+  # A config dir that only holds the (empty) backup tree did not exist before
+  rmdir "$PLAN_BACKUP" "$PLAN_CONFIG/.backups" "$PLAN_CONFIG" 2>/dev/null || true
+}
+
+# Usage: load_provision_state <plan_file>
+# Sets: PLAN_BACKED_UP and PLAN_CREATED as recorded by run_provision_plan
+load_provision_state() {
+  local plan_file="$1"
+  PLAN_BACKED_UP=()
+  PLAN_CREATED=()
+  local tag rel
+  while IFS=$'\t' read -r tag rel; do
+    [ -n "$rel" ] || continue
+    case "$tag" in
+      backed) PLAN_BACKED_UP+=("$rel") ;;
+      created) PLAN_CREATED+=("$rel") ;;
+    esac
+  done < "$plan_file.state"
+}
+
+# Usage: run_provision_plan <plan_file>
+# Backs up, copies and records the template (and role) for one repository.
+# Writes <plan_file>.result: status<TAB>files copied<TAB>backup dir<TAB>message
+run_provision_plan() {
+  local plan_file="$1"
+  read_provision_plan "$plan_file"
+
+  local status="ok" message="" copied=0 backup="-"
+  if ! backup_provision_targets; then
+    status="failed"
+    message="backup failed"
+  else
+    [ ${#PLAN_BACKED_UP[@]} -gt 0 ] && backup="$PLAN_BACKUP"
+    # Kept for a rollback in the level phase
+    {
+      printf 'backed\t%s\n' "${PLAN_BACKED_UP[@]}"
+      printf 'created\t%s\n' "${PLAN_CREATED[@]}"
+    } > "$plan_file.state"
+
+    local entry kind src dest
+    for entry in "${PLAN_COPIES[@]}"; do
+      IFS=$'\t' read -r kind src dest <<< "$entry"
+      if [ "$kind" = "dir" ]; then
+        mkdir -p "$dest" && cp -R "$src/." "$dest/" || { status="failed"; message="copy failed: $dest"; break; }
+      else
+        mkdir -p "$(dirname "$dest")" && cp "$src" "$dest" || { status="failed"; message="copy failed: $dest"; break; }
+      fi
+      copied=$((copied + 1))
+    done
+
+    if [ "$status" = "ok" ]; then
+      # applied_template and user_role in one locked update
+      local role=""
+      [ "$PLAN_ROLE" = "-" ] || role="$PLAN_ROLE"
+      mkdir -p "$PLAN_CONFIG"
+      if ! json_update "$PLAN_CONFIG/preferences.json" \
+          '.applied_template = {id: $id, version: $ver, applied_date: $date, mode: $mode}
+           | if $role == "" then . else .user_role = $role end' \
+          --arg id "$PLAN_TEMPLATE" --arg ver "$PLAN_VERSION" --arg date "$PROVISION_DATE" \
+          --arg mode "$PLAN_MODE" --arg role "$role" 2>/dev/null; then
+        status="failed"
+        message="could not update preferences.json"
+      fi
+    fi
+
+    if [ "$status" != "ok" ]; then
+      rollback_provision_targets
+      status="rolled-back"
+    fi
+  fi
+
+  printf '%s\t%s\t%s\t%s\n' "$status" "$copied" "$backup" "${message:--}" > "$plan_file.result"
+}
+
+# Usage: provision_repos <spec-file|-> [--jobs N] [--report FILE] [--dry-run]
+# Returns: 0 if every repository was provisioned, 1 otherwise, 2 on bad input
+provision_repos() {
+  local spec="" jobs="" report="" dry_run=false
+  while [ $# -gt 0 ]; do
+    case "$1" in
+      --jobs) jobs="${2:-}"; shift 2 ;;
+      --report) report="${2:-}"; shift 2 ;;
+      --dry-run) dry_run=true; shift ;;
+      *) spec="$1"; shift ;;
+    esac
+  done
+
+  if [ -z "$spec" ]; then
+    echo "Error: Spec file required" >&2
+    echo "Usage: $0 provision <spec-file|-> [--jobs N] [--report FILE] [--dry-run]" >&2
+    return 2
+  fi
+  if [ "$spec" != "-" ] && [ ! -f "$spec" ]; then
+    echo "Error: Spec file not found: $spec" >&2
+    return 2
+  fi
+  if [ -z "$jobs" ]; then
+    jobs="$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)"
+  fi
+  if [[ ! "$jobs" =~ ^[1-9][0-9]*$ ]]; then
+    echo "Error: --jobs must be a positive integer" >&2
+    return 2
+  fi
+  if ! command -v jq &>/dev/null; then
+    echo "Error: jq is required but not installed" >&2
+    return 2
+  fi
+
+  load_provision_registry || return 2
+  PROVISION_DATE="$(date -u +"%Y-%m-%dT%H:%M:%SZ")"
+  local stamp
+  stamp="$(date +%Y%m%d_%H%M%S)"
+
+  # Expand targets; later lines override earlier ones for the same repository
+  local -a repos=()
+  declare -A repo_spec=()
+  declare -A compiled=()
+  local target template_id mode level role
+  local spec_lines
+  if [ "$spec" = "-" ]; then
+    spec_lines="$(cat)"
+  else
+    spec_lines="$(< "$spec")"
+  fi
+  while read -r target template_id mode level role _; do
+    [ -n "$target" ] && [[ "$target" != \#* ]] || continue
+    if [ -z "$template_id" ]; then
+      echo "Error: No template for $target" >&2
+      return 2
+    fi
+    mode="${mode:-standard}"
+    level="${level:--}"
+    role="${role:--}"
+
+    if [ -z "${compiled[$template_id]:-}" ] && [ -n "${PROVISION_TEMPLATE_PATH[$template_id]:-}" ]; then
+      if ! validate_template "${PROVISION_TEMPLATE_PATH[$template_id]}" >/dev/null; then
+        echo "Error: Template validation failed: $template_id" >&2
+        return 2
+      fi
+      compile_template_modes "$template_id"
+      compiled[$template_id]=1
+    fi
+
+    local matches=()
+    if [[ "$target" == *[*?[]* ]]; then
+      mapfile -t matches < <(compgen -G "$target" || true)
+    else
+      matches=("$target")
+    fi
+    local match
+    for match in "${matches[@]}"; do
+      [ -d "$match" ] || { echo "Warning: Not a directory, skipping: $match" >&2; continue; }
+      match="$(cd "$match" && pwd)"
+      [ -n "${repo_spec[$match]:-}" ] || repos+=("$match")
+      repo_spec[$match]="$template_id"$'\t'"$mode"$'\t'"$level"$'\t'"$role"
+    done
+  done <<< "$spec_lines"
+
+  if [ ${#repos[@]} -eq 0 ]; then
+    echo "Error: No target repositories matched" >&2
+    return 2
+  fi
+
+  # Plan every repository before touching any of them
+  local work_dir
+  work_dir="$(mktemp -d)" || return 2
+  local -a planned=()
+  declare -A plan_error=()
+  local repo i=0
+  for repo in "${repos[@]}"; do
+    IFS=$'\t' read -r template_id mode level role <<< "${repo_spec[$repo]}"
+    local error=""
+    if ! error="$(plan_provision_repo "$work_dir/$i.plan" "$repo" "$template_id" "$mode" "$level" "$role" "$stamp" 2>&1 >/dev/null)" \
+        || [ ! -s "$work_dir/$i.plan" ]; then
+      plan_error[$repo]="${error:-planning failed}"
+    else
+      [ -n "$error" ] && echo "$error" >&2
+      planned+=("$i")
+    fi
+    i=$((i + 1))
+  done
+
+  if [ "$dry_run" = true ]; then
+    for i in "${!repos[@]}"; do
+      repo="${repos[$i]}"
+      if [ -n "${plan_error[$repo]:-}" ]; then
+        echo -e "${RED}✗${NC} $repo: ${plan_error[$repo]}"
+        continue
+      fi
+      read_provision_plan "$work_dir/$i.plan"
+      echo "$repo: $PLAN_TEMPLATE v$PLAN_VERSION ($PLAN_MODE), level ${PLAN_LEVEL}, role ${PLAN_ROLE}"
+      local entry
+      for entry in "${PLAN_COPIES[@]}"; do
+        IFS=$'\t' read -r _ src dest <<< "$entry"
+        echo "  ${src#"$PLUGIN_DIR"/} -> ${dest#"$repo"/}"
+      done
+    done
+    rm -rf "$work_dir"
+    [ ${#plan_error[@]} -eq 0 ] && return 0
+    return 1
+  fi
+
+  # Copy phase: bounded pool of background workers
+  local running=0
+  for i in "${planned[@]}"; do
+    if [ "$running" -ge "$jobs" ]; then
+      wait -n 2>/dev/null || true
+      running=$((running - 1))
+    fi
+    run_provision_plan "$work_dir/$i.plan" &
+    running=$((running + 1))
+  done
+  wait
+
+  # Level phase: shallowest repositories first, so parents exist for children
+  local -a by_depth=()
+  for i in "${planned[@]}"; do
+    local depth="${repos[$i]//[^\/]/}"
+    by_depth+=("${#depth}"$'\t'"$i")
+  done
+  while IFS=$'\t' read -r _ i; do
+    [ -n "$i" ] || continue
+    read_provision_plan "$work_dir/$i.plan"
+    [ "$PLAN_LEVEL" != "-" ] || continue
+    local result
+    result="$(cat "$work_dir/$i.plan.result" 2>/dev/null)" || result=""
+    [ "${result%%$'\t'*}" = "ok" ] || continue
+
+    local level_error
+    if ! level_error="$(save_level_with_hierarchy "$PLAN_CONFIG" "$PLAN_LEVEL" 2>&1 >/dev/null)"; then
+      # Undo the copy phase for this repository
+      local copied backup
+      IFS=$'\t' read -r _ copied backup _ <<< "$result"
+      load_provision_state "$work_dir/$i.plan"
+      rollback_provision_targets
+      printf 'rolled-back\t%s\t%s\t%s\n' "$copied" "$backup" "${level_error//$'\n'/ }" > "$work_dir/$i.plan.result"
+    fi
+  done < <(printf '%s\n' "${by_depth[@]}" | sort -n)
+
+  # Summary report
+  local -a rows=()
+  local ok=0 failed=0
+  for i in "${!repos[@]}"; do
+    repo="${repos[$i]}"
+    IFS=$'\t' read -r template_id mode level role <<< "${repo_spec[$repo]}"
+    local status copied backup message
+    if [ -n "${plan_error[$repo]:-}" ]; then
+      status="invalid"; copied=0; backup="-"; message="${plan_error[$repo]//$'\n'/ }"
+    else
+      IFS=$'\t' read -r status copied backup message < "$work_dir/$i.plan.result" \
+        || { status="failed"; copied=0; backup="-"; message="worker did not finish"; }
+    fi
+    if [ "$status" = "ok" ]; then
+      ok=$((ok + 1))
+      echo -e "${GREEN}✓${NC} $repo: $template_id ($mode, $copied copies)"
+    else
+      failed=$((failed + 1))
+      echo -e "${RED}✗${NC} $repo: $status - $message"
+    fi
+    rows+=("$repo"$'\t'"$template_id"$'\t'"$mode"$'\t'"$level"$'\t'"$role"$'\t'"$status"$'\t'"$copied"$'\t'"$backup"$'\t'"$message")
+  done
+  rm -rf "$work_dir"
+
+  echo ""
+  echo "Provisioned $ok of ${#repos[@]} repositories ($failed failed)"
+
+  if [ -n "$report" ]; then
+    printf '%s\n' "${rows[@]}" | jq -R -s --arg date "$PROVISION_DATE" --argjson jobs "$jobs" '
+      split("\n") | map(select(length > 0) | split("\t") | {
+        repo: .[0], template: .[1], mode: .[2],
+        level: (if .[3] == "-" then null else .[3] end),
+        role: (if .[4] == "-" then null else .[4] end),
+        status: .[5], copied: (.[6] | tonumber),
+        backup: (if .[7] == "-" then null else .[7] end),
+        message: (if .[8] == "-" then null else .[8] end)
+      }) | {date: $date, jobs: $jobs, total: length,
+            succeeded: map(select(.status == "ok")) | length,
+            failed: map(select(.status != "ok")) | length, repos: .}' > "$report" \
+      || echo "Warning: Could not write report: $report" >&2
+  fi
+
+  [ "$failed" -eq 0 ] && return 0
+  return 1
+}
+
 # =============================================================================
 # Main CLI Interface
 # =============================================================================
@@ -596,11 +1321,15 @@ Commands:
   validate <template-id>            Validate template structure
   apply <template-id> [mode]        Apply template (modes: minimal, standard, complete)
   apply-mode <id> <mode> [dir]      Apply template with specific mode
+                                    (--vars FILE fills [Placeholder] values,
+                                    --placeholder-report FILE lists unresolved)
   get-content-reference <id> <type> Get path to template content (for agents)
   size <template-id>                Show template size and file count
   check-version                     Check for template updates
   backup [reason]                   Create backup of .claude directory
   list-backups                      List available backups
+  provision <spec|-> [options]      Apply templates to many repositories
+                                    (--jobs N, --report FILE, --dry-run)
 
 Examples:
   $0 list
@@ -608,10 +1337,12 @@ Examples:
   $0 contents software-org
   $0 apply software-org standard
   $0 apply-mode software-org complete /path/to/project
+  $0 apply startup-org complete --vars company.json
   $0 get-content-reference software-org document_templates
   $0 size software-org
   $0 check-version
   $0 backup "before-manual-edit"
+  $0 provision repos.txt --jobs 8 --report provision-report.json
 
 EOF
 }
@@ -650,23 +1381,49 @@ main() {
       path=$(get_template_path "$2")
       validate_template "$path"
       ;;
-    apply)
-      if [ $# -lt 2 ]; then
-        echo "Error: Template ID required" >&2
-        echo "Usage: $0 apply <template-id> [mode]" >&2
+    apply|apply-mode)
+      shift
+      local -a args=()
+      while [ $# -gt 0 ]; do
+        case "$1" in
+          --vars|--placeholder-report)
+            if [ $# -lt 2 ]; then
+              echo "Error: $1 requires a file" >&2
+              exit 1
+            fi
+            if [ "$1" = "--vars" ]; then
+              TEMPLATE_VARIABLES_FILE="$2"
+            else
+              TEMPLATE_PLACEHOLDER_REPORT="$2"
+            fi
+            shift 2
+            ;;
+          *)
+            args+=("$1")
+            shift
+            ;;
+        esac
+      done
+      if [ -n "$TEMPLATE_PLACEHOLDER_REPORT" ] && [ -z "$TEMPLATE_VARIABLES_FILE" ]; then
+        echo "Error: --placeholder-report requires --vars" >&2
         exit 1
       fi
-      local mode="${3:-standard}"
-      apply_template_with_mode "$2" "$mode"
-      ;;
-    apply-mode)
-      if [ $# -lt 3 ]; then
-        echo "Error: Template ID and mode required" >&2
-        echo "Usage: $0 apply-mode <template-id> <mode> [target-dir]" >&2
-        exit 1
+
+      if [ "$command" = "apply" ]; then
+        if [ ${#args[@]} -lt 1 ]; then
+          echo "Error: Template ID required" >&2
+          echo "Usage: $0 apply <template-id> [mode] [--vars FILE]" >&2
+          exit 1
+        fi
+        apply_template_with_mode "${args[0]}" "${args[1]:-standard}"
+      else
+        if [ ${#args[@]} -lt 2 ]; then
+          echo "Error: Template ID and mode required" >&2
+          echo "Usage: $0 apply-mode <template-id> <mode> [target-dir] [--vars FILE]" >&2
+          exit 1
+        fi
+        apply_template_with_mode "${args[0]}" "${args[1]}" "${args[2]:-.}"
       fi
-      local target_dir="${4:-.}"
-      apply_template_with_mode "$2" "$3" "$target_dir"
       ;;
     get-content-reference)
       if [ $# -lt 3 ]; then
@@ -698,6 +1455,10 @@ main() {
     list-backups)
       list_backups
       ;;
+    provision)
+      shift
+      provision_repos "$@"
+      ;;
     -h|--help|help)
       show_usage
       ;;
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Aggregate an RCM_TRACE file into per-function timings and fork counts.
+
+The trace is written by scripts/trace.sh (enabled with RCM_TRACE=<file>) as one
+JSON object per line. This report pairs enter/exit events per process, folds
+them by call stack and prints inclusive/exclusive time, call counts and the
+external commands each function spawned. With --folded it emits
+flame-graph-compatible folded stacks instead (e.g. for flamegraph.pl or
+speedscope).
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+
+def load_events(path):
+    """Read trace events, skipping blank or truncated lines."""
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A killed process can leave a partial last line
+                continue
+    events.sort(key=lambda e: e.get('ts', 0))
+    return events
+
+
+def build_stacks(events):
+    """Return {stack: total inclusive microseconds} and {stack: call count}.
+
+    Function frames are matched per pid: an exit closes the innermost open
+    frame with the same name and depth. Frames still open when their process
+    stops logging are closed at its "end" event, or at the last timestamp
+    logged by that process (subshells do not run EXIT traps). External
+    commands are leaf frames named "exec:<cmd>".
+    """
+    inclusive = defaultdict(int)
+    calls = defaultdict(int)
+    open_frames = defaultdict(list)  # pid -> [(fn, depth, stack, ts)]
+    last_ts = {}
+    end_ts = {}
+
+    for ev in events:
+        pid = ev.get('pid')
+        ts = ev.get('ts', 0)
+        last_ts[pid] = ts
+        kind = ev.get('ev')
+
+        if kind == 'end':
+            end_ts[pid] = ts
+        elif kind == 'enter':
+            open_frames[pid].append((ev['fn'], ev.get('depth'), ev['stack'], ts))
+        elif kind == 'exit':
+            frames = open_frames[pid]
+            for i in range(len(frames) - 1, -1, -1):
+                fn, depth, stack, start = frames[i]
+                if fn == ev['fn'] and (depth is None or depth == ev.get('depth')):
+                    # Anything opened after the match never logged its exit
+                    for _, _, lost_stack, lost_start in frames[i + 1:]:
+                        inclusive[lost_stack] += ts - lost_start
+                        calls[lost_stack] += 1
+                    del frames[i:]
+                    inclusive[stack] += ts - start
+                    calls[stack] += 1
+                    break
+        elif kind == 'exec':
+            stack = '{};exec:{}'.format(ev['stack'], ev['cmd'])
+            inclusive[stack] += ev.get('dur', 0)
+            calls[stack] += 1
+
+    for pid, frames in open_frames.items():
+        for _, _, stack, start in frames:
+            stop = end_ts.get(pid, last_ts.get(pid, start))
+            inclusive[stack] += max(stop - start, 0)
+            calls[stack] += 1
+
+    return inclusive, calls
+
+
+def exclusive_times(inclusive):
+    """Subtract each stack's direct children from its inclusive time."""
+    exclusive = dict(inclusive)
+    for stack, total in inclusive.items():
+        parent, sep, _ = stack.rpartition(';')
+        if sep and parent in exclusive:
+            exclusive[parent] -= total
+    return {stack: max(value, 0) for stack, value in exclusive.items()}
+
+
+def summarize(inclusive, calls, exclusive):
+    """Aggregate stack-level numbers into per-function rows."""
+    rows = defaultdict(lambda: {'calls': 0, 'inclusive_us': 0, 'exclusive_us': 0,
+                                'forks': 0, 'fork_breakdown': defaultdict(int)})
+
+    for stack, total in inclusive.items():
+        frames = stack.split(';')
+        leaf = frames[-1]
+
+        if leaf.startswith('exec:'):
+            cmd = leaf[len('exec:'):]
+            # Attribute the fork to the calling function and to the command row
+            caller = frames[-2] if len(frames) > 1 else frames[0]
+            rows[caller]['forks'] += calls[stack]
+            rows[caller]['fork_breakdown'][cmd] += calls[stack]
+            rows[leaf]['calls'] += calls[stack]
+            rows[leaf]['inclusive_us'] += total
+            rows[leaf]['exclusive_us'] += total
+            continue
+
+        row = rows[leaf]
+        row['calls'] += calls[stack]
+        row['exclusive_us'] += exclusive.get(stack, 0)
+        # Recursive frames are already counted by the outermost occurrence
+        if leaf not in frames[:-1]:
+            row['inclusive_us'] += total
+
+    result = []
+    for name, row in rows.items():
+        row['name'] = name
+        row['fork_breakdown'] = dict(row['fork_breakdown'])
+        result.append(row)
+    result.sort(key=lambda r: r['inclusive_us'], reverse=True)
+    return result
+
+
+def format_table(rows, limit):
+    """Render per-function rows as a fixed-width text table."""
+    lines = []
+    header = '{:<48} {:>7} {:>12} {:>12} {:>7}  {}'.format(
+        'FUNCTION', 'CALLS', 'INCL (ms)', 'EXCL (ms)', 'FORKS', 'SPAWNED')
+    lines.append(header)
+    lines.append('-' * len(header))
+    for row in rows[:limit] if limit else rows:
+        spawned = ', '.join('{}×{}'.format(cmd, count)
+                            for cmd, count in sorted(row['fork_breakdown'].items(),
+                                                     key=lambda item: -item[1]))
+        lines.append('{:<48} {:>7} {:>12.2f} {:>12.2f} {:>7}  {}'.format(
+            row['name'][:48], row['calls'], row['inclusive_us'] / 1000.0,
+            row['exclusive_us'] / 1000.0, row['forks'], spawned))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Parse arguments and print the requested report."""
+    parser = argparse.ArgumentParser(
+        description='Summarize an RCM_TRACE JSON-lines trace file.')
+    parser.add_argument('trace_file', help='Trace file written with RCM_TRACE=<file>')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--folded', action='store_true',
+                        help='Emit folded stacks (exclusive microseconds) for flame graphs')
+    output.add_argument('--json', action='store_true',
+                        help='Emit the per-function summary as JSON')
+    parser.add_argument('--top', type=int, default=0,
+                        help='Only show the N most expensive functions (table mode)')
+    args = parser.parse_args(argv)
+
+    try:
+        events = load_events(args.trace_file)
+    except OSError as e:
+        print(f"Error: Cannot read trace file: {e}", file=sys.stderr)
+        return 2
+
+    inclusive, calls = build_stacks(events)
+    exclusive = exclusive_times(inclusive)
+
+    if args.folded:
+        for stack in sorted(exclusive):
+            if exclusive[stack] > 0:
+                print(f"{stack} {exclusive[stack]}")
+        return 0
+
+    rows = summarize(inclusive, calls, exclusive)
+    total_forks = sum(1 for ev in events if ev.get('ev') == 'exec')
+
+    if args.json:
+        json.dump({
+            'events': len(events),
+            'pids': len({ev.get('pid') for ev in events}),
+            'forks': total_forks,
+            'functions': rows,
+        }, sys.stdout, indent=2)
+        print()
+        return 0
+
+    if events:
+        wall_ms = (events[-1]['ts'] - events[0]['ts']) / 1000.0
+    else:
+        wall_ms = 0.0
+    print(f"Trace: {args.trace_file}")
+    print(f"  Events: {len(events)}  Processes: {len({ev.get('pid') for ev in events})}  "
+          f"Traced forks: {total_forks}  Wall: {wall_ms:.2f} ms")
+    print()
+    print(format_table(rows, args.top))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
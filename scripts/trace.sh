@@ -0,0 +1,230 @@
+#!/usr/bin/env bash
+
+# trace.sh - Structured function and fork tracing for role-context-manager scripts
+#
+# Sourced automatically by path-config.sh when RCM_TRACE is set. Every shell
+# function entry/exit and every traced external command is appended to the
+# trace file as one JSON object per line:
+#
+#   {"ts":1700000000123456,"pid":4242,"ev":"enter","fn":"get_preference","stack":"role-manager.sh;main;cmd_load_role_context;get_preference"}
+#   {"ts":1700000000124001,"pid":4243,"ev":"exec","cmd":"jq","dur":812,"rc":0,"stack":"..."}
+#
+# A final {"ev":"end"} event is written when the traced process exits. EXIT
+# traps the traced script sets (before or after tracing starts) still run:
+# they are chained ahead of the end event.
+# Timestamps and durations are in microseconds. Aggregate the file with
+# scripts/trace-report.py.
+#
+# Functions:
+#   - rcm_trace_enable: Install the DEBUG/RETURN traps and command wrappers
+#   - rcm_trace_event: Append a raw event to the trace file
+#
+# Environment Variables:
+#   RCM_TRACE: Path of the JSON-lines trace file (tracing is off when unset)
+#   RCM_TRACE_COMMANDS: Space-separated external commands to record
+#                       (default: "jq git find cat dirname basename grep sed")
+
+# Only initialize once per process, even though path-config.sh is sourced
+# repeatedly by the helper scripts
+if [[ -n "${RCM_TRACE_ACTIVE:-}" && "${RCM_TRACE_ACTIVE}" == "$$" ]]; then
+    return 0 2>/dev/null || exit 0
+fi
+
+RCM_TRACE_FILE="${RCM_TRACE:-}"
+RCM_TRACE_DEPTH=0
+RCM_TRACE_ROOT="${BASH_SOURCE[${#BASH_SOURCE[@]}-1]##*/}"
+declare -gA RCM_TRACE_WRAPPED=()
+
+# =============================================================================
+# Event Emission
+# =============================================================================
+
+# Usage: _rcm_trace_stack skip
+# Sets RCM_TRACE_STACK to the ';'-joined call stack (outermost first),
+# skipping the innermost <skip> frames and the implicit top-level "main"
+_rcm_trace_stack() {
+    local skip="$1"
+    local i
+    local stack="$RCM_TRACE_ROOT"
+    local last=$(( ${#FUNCNAME[@]} - 1 ))
+
+    # The bottom frame is the script's top level, not a real function
+    if [[ "${FUNCNAME[$last]:-}" == "main" ]]; then
+        last=$((last - 1))
+    fi
+
+    for (( i = last; i > skip; i-- )); do
+        if [[ "${FUNCNAME[$i]}" == "source" ]]; then
+            stack+=";source:${BASH_SOURCE[$i]##*/}"
+        else
+            stack+=";${FUNCNAME[$i]}"
+        fi
+    done
+    RCM_TRACE_STACK="$stack"
+}
+
+# Usage: rcm_trace_event json_fields
+# Appends {"ts":...,"pid":...,<json_fields>} to the trace file
+rcm_trace_event() {
+    printf '{"ts":%s,"pid":%s,%s}\n' "${EPOCHREALTIME//[.,]/}" "$BASHPID" "$1" >> "$RCM_TRACE_FILE"
+    return 0
+}
+
+# =============================================================================
+# Trap Handlers
+# =============================================================================
+#
+# The handlers are inline trap strings rather than functions: with functrace
+# enabled a handler function would itself trigger the DEBUG/RETURN traps and
+# corrupt the depth bookkeeping. They only use builtins, so tracing adds no
+# forks of its own.
+
+# DEBUG: a call stack deeper than the last recorded depth means a function
+# (or sourced file) was just entered
+_RCM_TRACE_ON_DEBUG='
+_rcm_trace_n=0
+if [[ -n "${FUNCNAME[0]+x}" ]]; then _rcm_trace_n=${#FUNCNAME[@]}; fi
+if (( _rcm_trace_n > RCM_TRACE_DEPTH && _rcm_trace_n > 0 )); then
+    RCM_TRACE_DEPTH=$_rcm_trace_n
+    _rcm_trace_fn="${FUNCNAME[0]}"
+    if [[ -z "${RCM_TRACE_WRAPPED[$_rcm_trace_fn]:-}" && "$_rcm_trace_fn" != *rcm_trace_* && "$_rcm_trace_fn" != trap ]]; then
+        _rcm_trace_last=$(( _rcm_trace_n - 1 ))
+        if [[ "${FUNCNAME[$_rcm_trace_last]}" == "main" ]]; then
+            _rcm_trace_last=$(( _rcm_trace_last - 1 ))
+        fi
+        _rcm_trace_stack="$RCM_TRACE_ROOT"
+        for (( _rcm_trace_i = _rcm_trace_last; _rcm_trace_i >= 0; _rcm_trace_i-- )); do
+            if [[ "${FUNCNAME[$_rcm_trace_i]}" == "source" ]]; then
+                _rcm_trace_stack+=";source:${BASH_SOURCE[$_rcm_trace_i]##*/}"
+            else
+                _rcm_trace_stack+=";${FUNCNAME[$_rcm_trace_i]}"
+            fi
+        done
+        printf "{\"ts\":%s,\"pid\":%s,\"ev\":\"enter\",\"fn\":\"%s\",\"depth\":%s,\"stack\":\"%s\"}\n" \
+            "${EPOCHREALTIME//[.,]/}" "$BASHPID" "${_rcm_trace_stack##*;}" "$_rcm_trace_n" "$_rcm_trace_stack" >> "$RCM_TRACE_FILE"
+    fi
+fi'
+
+# RETURN: FUNCNAME[0] is the function (or "source") that is returning
+_RCM_TRACE_ON_RETURN='
+_rcm_trace_n=0
+if [[ -n "${FUNCNAME[0]+x}" ]]; then _rcm_trace_n=${#FUNCNAME[@]}; fi
+_rcm_trace_fn="${FUNCNAME[0]:-}"
+if [[ -n "$_rcm_trace_fn" && -z "${RCM_TRACE_WRAPPED[$_rcm_trace_fn]:-}" && "$_rcm_trace_fn" != *rcm_trace_* && "$_rcm_trace_fn" != trap ]]; then
+    if [[ "$_rcm_trace_fn" == "source" ]]; then
+        _rcm_trace_fn="source:${BASH_SOURCE[0]##*/}"
+    fi
+    if [[ $_rcm_trace_n -gt 1 || "$_rcm_trace_fn" != "main" ]]; then
+        printf "{\"ts\":%s,\"pid\":%s,\"ev\":\"exit\",\"fn\":\"%s\",\"depth\":%s}\n" \
+            "${EPOCHREALTIME//[.,]/}" "$BASHPID" "$_rcm_trace_fn" "$_rcm_trace_n" >> "$RCM_TRACE_FILE"
+    fi
+fi
+if (( _rcm_trace_n > 0 )); then RCM_TRACE_DEPTH=$(( _rcm_trace_n - 1 )); fi'
+
+# EXIT: marks the end of the main process so frames left open by 'exit' can
+# be closed at the right time. _rcm_trace_rc is the status captured before
+# the traced script's own handler ran.
+_RCM_TRACE_ON_EXIT='rcm_trace_event "\"ev\":\"end\",\"rc\":$_rcm_trace_rc"'
+
+# Usage: _rcm_trace_set_exit_trap handler
+# Installs <handler> (may be empty) as the EXIT trap, followed by the end event
+_rcm_trace_set_exit_trap() {
+    builtin trap "_rcm_trace_rc=\$?
+${1:+$1
+}$_RCM_TRACE_ON_EXIT" EXIT
+}
+
+# Usage: trap [args...]
+# Stands in for the builtin while tracing, so a traced script that sets an
+# EXIT trap chains its handler ahead of the end event instead of replacing it
+trap() {
+    local action sig
+    local -a others=()
+    [[ "${1:-}" != "--" ]] || shift
+    if [[ $# -lt 2 || "$1" == -[lpP] ]]; then
+        builtin trap "$@"
+        return
+    fi
+    action="$1"
+    shift
+    for sig in "$@"; do
+        case "$sig" in
+            EXIT|SIGEXIT|0)
+                if [[ "$action" == "-" ]]; then
+                    _rcm_trace_set_exit_trap ""
+                else
+                    _rcm_trace_set_exit_trap "$action"
+                fi
+                ;;
+            *)
+                others+=("$sig")
+                ;;
+        esac
+    done
+    [[ ${#others[@]} -eq 0 ]] || builtin trap -- "$action" "${others[@]}"
+}
+
+# Usage: _rcm_trace_exec command [args...]
+# Runs an external command and records its wall time
+_rcm_trace_exec() {
+    local cmd="$1"
+    shift
+    local start end rc=0
+    _rcm_trace_stack 2
+    local stack="$RCM_TRACE_STACK"
+    start="${EPOCHREALTIME//[.,]/}"
+    command "$cmd" "$@" || rc=$?
+    end="${EPOCHREALTIME//[.,]/}"
+    printf '{"ts":%s,"pid":%s,"ev":"exec","cmd":"%s","dur":%s,"rc":%s,"stack":"%s"}\n' \
+        "$start" "$BASHPID" "$cmd" "$((end - start))" "$rc" "$stack" >> "$RCM_TRACE_FILE"
+    return $rc
+}
+
+# =============================================================================
+# Activation
+# =============================================================================
+
+# Usage: rcm_trace_enable
+# Returns: 0 on success, 1 if the trace file cannot be written
+rcm_trace_enable() {
+    if [[ -z "$RCM_TRACE_FILE" ]]; then
+        return 1
+    fi
+
+    if ! : >> "$RCM_TRACE_FILE" 2>/dev/null; then
+        echo "Warning: Cannot write trace file: $RCM_TRACE_FILE (tracing disabled)" >&2
+        return 1
+    fi
+
+    # Wrap external commands that exist so 'command -v' keeps reporting
+    # missing tools (e.g. jq-less hosts) correctly
+    local cmd
+    for cmd in ${RCM_TRACE_COMMANDS:-jq git find cat dirname basename grep sed}; do
+        if [[ -n "$(type -P "$cmd" 2>/dev/null)" ]]; then
+            RCM_TRACE_WRAPPED[$cmd]=1
+            eval "$cmd() { _rcm_trace_exec $cmd \"\$@\"; }"
+        fi
+    done
+
+    # Frames above this point (the source chain) are already on the stack
+    RCM_TRACE_DEPTH=$(( ${#FUNCNAME[@]} - 1 ))
+
+    set -o functrace
+    trap "$_RCM_TRACE_ON_DEBUG" DEBUG
+    trap "$_RCM_TRACE_ON_RETURN" RETURN
+    # Keep an EXIT trap the script installed before sourcing us
+    local existing
+    existing="$(builtin trap -p EXIT)"
+    if [[ -n "$existing" ]]; then
+        eval "set -- $existing"
+        _rcm_trace_set_exit_trap "$3"
+    else
+        _rcm_trace_set_exit_trap ""
+    fi
+
+    RCM_TRACE_ACTIVE="$$"
+    export RCM_TRACE_ACTIVE
+    return 0
+}
+
+rcm_trace_enable || true
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Validate every paths.json manifest under a directory tree.
+
+The paths.json schema (schemas/paths-v1.schema.json) is compiled once into
+validator functions with pre-compiled patterns. The tree is walked once;
+configuration directories are checked for a manifest but never descended
+into, and neither are VCS or dependency directories. The claude_dir_name from
+the root manifest (and from any nested manifest, for its subtree) tells the
+walk which directories are configuration directories. Manifests are
+validated in parallel worker processes.
+
+The report is one JSON document with, per directory containing a manifest,
+the schema errors and the effective claude_dir_name / role_guides_dir that
+path-config.sh would resolve there (environment overrides, then the
+manifest find_paths_manifest picks: RCM_PATHS_MANIFEST, the nearest
+.claude/paths.json at or above the directory, even above the audited root,
+or ~/.claude/paths.json; then defaults).
+
+Exit codes: 0 all manifests valid, 1 validation errors, 2 usage or schema error.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(SCRIPT_DIR), 'schemas', 'paths-v1.schema.json')
+MANIFEST_NAME = 'paths.json'
+LOOKUP_DIR = '.claude'  # find_paths_manifest only looks in .claude/
+DEFAULTS = {'claude_dir_name': '.claude', 'role_guides_dir': 'role-guides'}
+ENV_OVERRIDES = {'claude_dir_name': 'RCM_CLAUDE_DIR_NAME', 'role_guides_dir': 'RCM_ROLE_GUIDES_DIR'}
+PRUNE_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+# Marks a manifest find_manifest looked for outside the root and did not find
+_ABSENT = object()
+
+# Below this many manifests a process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+# Keywords that only annotate the schema
+ANNOTATIONS = {'$schema', '$id', '$comment', 'title', 'description', 'default',
+               'examples', 'definitions'}
+
+TYPES = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'null': lambda v: v is None,
+}
+
+
+class SchemaError(Exception):
+    """The schema uses a construct this validator does not implement."""
+
+
+# =============================================================================
+# Schema Compilation
+# =============================================================================
+
+def compile_schema(schema, where='#'):
+    """Compile a (draft-07 subset) schema into a validate(value, pointer) function.
+
+    The returned function yields (pointer, message) pairs. Unknown keywords
+    raise SchemaError instead of being silently ignored, so a schema change
+    that needs new validator support fails loudly.
+    """
+    checks = []
+
+    for keyword, arg in schema.items():
+        if keyword in ANNOTATIONS:
+            continue
+        if keyword == 'type':
+            names = arg if isinstance(arg, list) else [arg]
+            tests = [TYPES[name] for name in names]
+            expected = ' or '.join(names)
+            checks.append(_type_check(tests, expected))
+        elif keyword == 'pattern':
+            checks.append(_pattern_check(re.compile(arg), arg))
+        elif keyword == 'minLength':
+            checks.append(_string_check(lambda v, n=arg: len(v) >= n,
+                                        f'must be at least {arg} characters'))
+        elif keyword == 'maxLength':
+            checks.append(_string_check(lambda v, n=arg: len(v) <= n,
+                                        f'must be at most {arg} characters'))
+        elif keyword == 'maxItems':
+            checks.append(_array_check(lambda v, n=arg: len(v) <= n,
+                                       f'must have at most {arg} items'))
+        elif keyword == 'uniqueItems':
+            if arg:
+                checks.append(_array_check(_unique, 'items must be unique'))
+        elif keyword == 'items':
+            checks.append(_items_check(compile_schema(arg, f'{where}/items')))
+        elif keyword == 'properties':
+            props = {name: compile_schema(sub, f'{where}/properties/{name}')
+                     for name, sub in arg.items()}
+            checks.append(_properties_check(props))
+        elif keyword == 'additionalProperties':
+            if arg is False:
+                allowed = set(schema.get('properties', {}))
+                checks.append(_additional_check(allowed))
+            elif arg is not True:
+                raise SchemaError(f'{where}: only boolean additionalProperties is supported')
+        elif keyword == 'anyOf':
+            branches = [(compile_schema(sub, f'{where}/anyOf/{i}'), sub.get('description'))
+                        for i, sub in enumerate(arg)]
+            checks.append(_any_of_check(branches))
+        elif keyword == 'not':
+            checks.append(_not_check(compile_schema(arg, f'{where}/not'), arg))
+        else:
+            raise SchemaError(f'{where}: unsupported keyword {keyword!r}')
+
+    def validate(value, pointer=''):
+        for check in checks:
+            yield from check(value, pointer)
+
+    return validate
+
+
+def _type_check(tests, expected):
+    def check(value, pointer):
+        if not any(test(value) for test in tests):
+            yield pointer, f'must be of type {expected}'
+    return check
+
+
+def _pattern_check(regex, source):
+    def check(value, pointer):
+        if isinstance(value, str) and not regex.search(value):
+            yield pointer, f'does not match pattern {source}'
+    return check
+
+
+def _string_check(predicate, message):
+    def check(value, pointer):
+        if isinstance(value, str) and not predicate(value):
+            yield pointer, message
+    return check
+
+
+def _array_check(predicate, message):
+    def check(value, pointer):
+        if isinstance(value, list) and not predicate(value):
+            yield pointer, message
+    return check
+
+
+def _unique(items):
+    seen = [json.dumps(item, sort_keys=True) for item in items]
+    return len(seen) == len(set(seen))
+
+
+def _items_check(validate_item):
+    def check(value, pointer):
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                yield from validate_item(item, f'{pointer}/{index}')
+    return check
+
+
+def _properties_check(props):
+    def check(value, pointer):
+        if isinstance(value, dict):
+            for name, validate_prop in props.items():
+                if name in value:
+                    yield from validate_prop(value[name], f'{pointer}/{name}')
+    return check
+
+
+def _additional_check(allowed):
+    def check(value, pointer):
+        if isinstance(value, dict):
+            for name in value:
+                if name not in allowed:
+                    yield f'{pointer}/{name}', 'is not an allowed property'
+    return check
+
+
+def _first_match(branches, value):
+    """Return (matched, description) for the first anyOf branch that accepts value."""
+    for validate_branch, description in branches:
+        if next(validate_branch(value), None) is None:
+            return True, description
+    return False, None
+
+
+def _any_of_check(branches):
+    def check(value, pointer):
+        if not _first_match(branches, value)[0]:
+            yield pointer, 'does not match any allowed form'
+    return check
+
+
+def _not_check(validate_sub, sub_schema):
+    branches = None
+    if set(sub_schema) - ANNOTATIONS == {'anyOf'}:
+        branches = [(compile_schema(sub), sub.get('description'))
+                    for sub in sub_schema['anyOf']]
+
+    def check(value, pointer):
+        if next(validate_sub(value), None) is not None:
+            return
+        description = sub_schema.get('description')
+        if branches:
+            description = _first_match(branches, value)[1] or description
+        yield pointer, description or 'matches a disallowed form'
+    return check
+
+
+# =============================================================================
+# Discovery
+# =============================================================================
+
+def read_json(path):
+    """Parse a JSON file, returning (data, error)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f'cannot read: {e}'
+    except json.JSONDecodeError as e:
+        return None, f'invalid JSON: {e.msg} (line {e.lineno}, column {e.colno})'
+
+
+def config_dir_names(manifest_path, inherited):
+    """Configuration directory names in effect below a manifest's directory."""
+    names = set(inherited)
+    data, _ = read_json(manifest_path)
+    if isinstance(data, dict):
+        name = data.get('claude_dir_name')
+        if isinstance(name, str) and name and '/' not in name and name not in ('.', '..'):
+            names.add(name)
+    return frozenset(names)
+
+
+def discover_manifests(root, claude_dir_name=None):
+    """Walk <root> once and return (manifest paths, directories scanned).
+
+    Only entries named like a configuration directory are probed for
+    paths.json; they, and PRUNE_DIRS, are never descended into.
+    """
+    names = {LOOKUP_DIR}
+    if claude_dir_name:
+        names.add(claude_dir_name)
+    root_manifest = os.path.join(root, LOOKUP_DIR, MANIFEST_NAME)
+    if os.path.isfile(root_manifest):
+        names = set(config_dir_names(root_manifest, names))
+
+    manifests = []
+    scanned = 0
+    stack = [(root, frozenset(names))]
+    while stack:
+        directory, names = stack.pop()
+        scanned += 1
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+
+        found = []
+        subdirs = []
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            if entry.name in names:
+                manifest = os.path.join(entry.path, MANIFEST_NAME)
+                if os.path.isfile(manifest):
+                    found.append(manifest)
+            elif entry.name not in PRUNE_DIRS:
+                subdirs.append(entry.path)
+
+        child_names = names
+        for manifest in found:
+            child_names = config_dir_names(manifest, child_names)
+        manifests.extend(found)
+        stack.extend((subdir, child_names) for subdir in subdirs)
+
+    manifests.sort()
+    return manifests, scanned
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+_VALIDATOR = None
+
+
+def init_worker(schema_path):
+    """Compile the schema once per process."""
+    global _VALIDATOR
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        _VALIDATOR = compile_schema(json.load(f))
+
+
+def validate_manifest(path):
+    """Validate one manifest; returns (path, data, errors)."""
+    data, error = read_json(path)
+    if error:
+        return path, None, [{'path': '', 'message': error}]
+    errors = [{'path': pointer, 'message': message} for pointer, message in _VALIDATOR(data)]
+    return path, data, errors
+
+
+def validate_all(manifests, schema_path, jobs):
+    """Validate manifests, in a process pool when there are enough of them."""
+    if jobs <= 1 or len(manifests) < PARALLEL_THRESHOLD:
+        init_worker(schema_path)
+        return [validate_manifest(path) for path in manifests]
+
+    chunksize = max(1, len(manifests) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                             initargs=(schema_path,)) as pool:
+        return list(pool.map(validate_manifest, manifests, chunksize=chunksize))
+
+
+def manifest_value(data, key):
+    """Value the shell reader (jq -r '.key // empty') would return, or None."""
+    if not isinstance(data, dict):
+        return None
+    value = data.get(key)
+    if value is None or value is False:
+        return None
+    if isinstance(value, str):
+        return value or None
+    return json.dumps(value)
+
+
+def find_manifest(directory, root, parsed, outside, env):
+    """Manifest find_paths_manifest picks for <directory>, as (path, data) or (None, None).
+
+    Manifests under <root> come from <parsed>; those above it, or under
+    $HOME, are read once and kept in <outside>.
+    """
+    override = env.get('RCM_PATHS_MANIFEST')
+    if override and os.path.isfile(override):
+        return override, read_json(override)[0]
+
+    candidates = []
+    current = directory
+    while current != os.sep:
+        candidates.append(os.path.join(current, LOOKUP_DIR, MANIFEST_NAME))
+        current = os.path.dirname(current)
+    if env.get('HOME'):
+        candidates.append(os.path.join(env['HOME'], LOOKUP_DIR, MANIFEST_NAME))
+
+    prefix = root.rstrip(os.sep) + os.sep
+    for candidate in candidates:
+        if candidate in parsed:
+            return candidate, parsed[candidate]
+        if candidate.startswith(prefix):
+            continue
+        if candidate not in outside:
+            outside[candidate] = read_json(candidate)[0] if os.path.isfile(candidate) else _ABSENT
+        if outside[candidate] is not _ABSENT:
+            return candidate, outside[candidate]
+    return None, None
+
+
+def effective_values(directory, root, parsed, outside, env):
+    """Resolve claude_dir_name / role_guides_dir for <directory> like load_path_config."""
+    source_manifest, data = find_manifest(directory, root, parsed, outside, env)
+
+    values = {}
+    sources = {}
+    for key, default in DEFAULTS.items():
+        value = env.get(ENV_OVERRIDES[key]) or None
+        source = 'env'
+        if value is None:
+            value = manifest_value(data, key)
+            source = 'manifest'
+        if value is None:
+            value, source = default, 'default'
+        values[key] = value
+        sources[key] = source
+
+    if source_manifest and source_manifest.startswith(root.rstrip(os.sep) + os.sep):
+        source_manifest = os.path.relpath(source_manifest, root)
+    values['manifest'] = source_manifest
+    values['source'] = sources
+    return values
+
+
+def build_report(root, schema_path, claude_dir_name, jobs, env):
+    """Discover, validate and resolve every manifest under <root>."""
+    manifests, scanned = discover_manifests(root, claude_dir_name)
+    results = validate_all(manifests, schema_path, jobs)
+    parsed = {path: data for path, data, _ in results}
+    outside = {}
+
+    directories = []
+    invalid = 0
+    for path, data, errors in results:
+        config_dir = os.path.dirname(path)
+        directory = os.path.dirname(config_dir)
+        warnings = []
+        if os.path.basename(config_dir) != LOOKUP_DIR:
+            warnings.append(f'{os.path.basename(config_dir)}/{MANIFEST_NAME} is not read by '
+                            f'path-config.sh, which only looks up {LOOKUP_DIR}/{MANIFEST_NAME}')
+        if errors:
+            invalid += 1
+        directories.append({
+            'directory': os.path.relpath(directory, root),
+            'manifest': os.path.relpath(path, root),
+            'valid': not errors,
+            'errors': errors,
+            'warnings': warnings,
+            'effective': effective_values(directory, root, parsed, outside, env),
+        })
+
+    return {
+        'root': root,
+        'schema': schema_path,
+        'summary': {
+            'directories_scanned': scanned,
+            'manifests': len(results),
+            'valid': len(results) - invalid,
+            'invalid': invalid,
+        },
+        'directories': directories,
+    }
+
+
+def main(argv=None):
+    """Validate manifests from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Validate every paths.json under a directory tree against the schema.')
+    parser.add_argument('root', nargs='?', default='.', help='Directory to audit (default: .)')
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA,
+                        help='Schema file (default: schemas/paths-v1.schema.json)')
+    parser.add_argument('--claude-dir-name',
+                        help='Extra configuration directory name to probe '
+                             '(default: from the root manifest and RCM_CLAUDE_DIR_NAME)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Validation worker processes (default: CPU count)')
+    parser.add_argument('--output', help='Write the report to this file instead of stdout')
+    parser.add_argument('--invalid-only', action='store_true',
+                        help='Only list directories with errors or warnings')
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    if not os.path.isdir(root):
+        print(f'Error: Not a directory: {args.root}', file=sys.stderr)
+        return 2
+
+    try:
+        with open(args.schema, 'r', encoding='utf-8') as f:
+            compile_schema(json.load(f))
+    except (OSError, json.JSONDecodeError, SchemaError) as e:
+        print(f'Error: Cannot load schema {args.schema}: {e}', file=sys.stderr)
+        return 2
+
+    env = {name: os.environ.get(name, '')
+           for name in list(ENV_OVERRIDES.values()) + ['RCM_PATHS_MANIFEST', 'HOME']}
+    claude_dir_name = args.claude_dir_name or env['RCM_CLAUDE_DIR_NAME'] or None
+    report = build_report(root, os.path.abspath(args.schema), claude_dir_name,
+                          max(1, args.jobs), env)
+    if args.invalid_only:
+        report['directories'] = [d for d in report['directories']
+                                 if d['errors'] or d['warnings']]
+
+    output = json.dumps(report, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+    summary = report['summary']
+    print(f"Validated {summary['manifests']} manifest(s) in {summary['directories_scanned']} "
+          f"directories: {summary['invalid']} invalid", file=sys.stderr)
+    return 1 if summary['invalid'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
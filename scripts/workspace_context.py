@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Load role contexts for many workspaces concurrently.
+
+Resolves the same context `role-manager.sh load-role-context` would load in
+each workspace root (effective config dir, user_role, role guide and the
+documents it references) without a shell per workspace: path-config.sh
+resolves the path configuration of every workspace in one call, and the rest
+is done here. All filesystem access goes through one bounded thread pool
+shared by every workspace, and each file is read at most once per call, so
+documents shared through the global config dir are not re-read per workspace.
+A fresh packed context store (see context_pack.py) is used instead of reading
+the role guide and documents individually.
+
+Usage (API):
+    import asyncio
+    from workspace_context import load_contexts
+
+    for ctx in asyncio.run(load_contexts(['/src/api', '/src/web'])):
+        print(ctx.workspace, ctx.role, len(ctx.documents), ctx.bytes)
+
+    config_dir, project_root, global_dir, role, guide = resolve_workspace_config('.')
+
+Usage (CLI):
+    python3 scripts/workspace_context.py [--max-reads N] [--json] [--content] DIR...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from context_pack import PackError, read_pack  # noqa: E402
+from heading_index import read_section  # noqa: E402
+
+DEFAULT_MAX_READS = 16
+
+PATH_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'path-config.sh')
+_RESOLVE_PATHS = '''source "$1"
+shift
+for dir in "$@"; do
+    clear_path_config_cache
+    load_path_config "$dir"
+    printf '%s\\0%s\\0' "${PATH_CONFIG_CACHE[claude_dir_name]}" \\
+        "${PATH_CONFIG_CACHE[role_guides_dir]}"
+done'''
+
+SECTION_START = re.compile(r'^##\s*Document\s*References')
+SECTION_END = re.compile(r'^##\s')
+REF_PATTERNS = (re.compile(r'^\s*-\s*`([^`]+\.md(?:#[^`]+)?)`'),
+                re.compile(r'^\s*-\s*(/\S+\.md(?:#\S+)?)'),
+                re.compile(r'^\s*-\s*(\S+\.md(?:#\S+)?)'))
+
+Document = namedtuple('Document', 'ref path size content')
+WorkspaceContext = namedtuple(
+    'WorkspaceContext',
+    'workspace config_dir role role_guide documents missing bytes source timings error')
+WorkspaceContext.__doc__ = """Context for one workspace.
+
+documents holds the referenced documents load-role-context would inject
+(existing and non-empty), in reference order; missing the references that did
+not resolve. bytes counts the role guide and documents. source is 'pack' or
+'files'; timings maps phase -> milliseconds. role is None when no role is set,
+and error is set when loading failed.
+"""
+
+
+class ReadPool:
+    """Bounded thread pool for blocking filesystem calls, with memoized reads."""
+
+    def __init__(self, max_reads=DEFAULT_MAX_READS):
+        self._executor = ThreadPoolExecutor(max_workers=max_reads,
+                                            thread_name_prefix='rcm-read')
+        self._reads = {}
+
+    async def call(self, fn, *args):
+        """Run fn(*args) on the pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def read(self, path):
+        """Bytes of <path>, or None if unreadable; concurrent callers share one read."""
+        future = self._reads.get(path)
+        if future is None:
+            future = asyncio.ensure_future(self.call(_read_bytes, path))
+            self._reads[path] = future
+        return await future
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_section_bytes(path, heading, env):
+    try:
+        return read_section(path, heading, env)
+    except (OSError, ValueError):
+        return None
+
+
+def _json_string(path, key):
+    """String value of a top-level key, or None (like `jq -r '.key // empty'`)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            value = json.load(f).get(key)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return value if isinstance(value, str) and value else None
+
+
+def _find_upward(start, name):
+    """First <dir>/<name> that exists, walking up from <start> (root excluded)."""
+    current = start
+    while current and current != '/':
+        candidate = os.path.join(current, name)
+        if os.path.lexists(candidate):
+            return candidate
+        current = os.path.dirname(current)
+    return None
+
+
+def resolve_path_configs(workspaces, env):
+    """claude_dir_name and role_guides_dir per workspace, resolved by path-config.sh.
+
+    One shell resolves every workspace, so the lookup order (environment,
+    nearest paths.json, global paths.json, defaults) is path-config.sh's own.
+    """
+    try:
+        result = subprocess.run(['bash', '-c', _RESOLVE_PATHS, 'bash', PATH_CONFIG, *workspaces],
+                                env=env, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise OSError(f'{PATH_CONFIG}: {os.fsdecode(e.stderr).strip() or f"exit {e.returncode}"}')
+    fields = [os.fsdecode(field) for field in result.stdout.split(b'\0')[:-1]]
+    if len(fields) != 2 * len(workspaces):
+        raise OSError(f'{PATH_CONFIG}: unexpected output')
+    return {workspace: (fields[2 * i], fields[2 * i + 1])
+            for i, workspace in enumerate(workspaces)}
+
+
+def _resolve_config(workspace, claude_dir_name, role_guides_dir, home):
+    """Effective config dir, project root, role and role guide, as role-manager.sh does."""
+    project_dir = None
+    current = workspace
+    while current and current != '/':
+        if os.path.isdir(os.path.join(current, claude_dir_name)):
+            project_dir = os.path.join(current, claude_dir_name)
+            break
+        current = os.path.dirname(current)
+
+    global_dir = os.path.join(home, claude_dir_name)
+    config_dir = project_dir or global_dir
+    project_root = (os.path.dirname(project_dir) or '/') if project_dir else None
+
+    role = None
+    if project_dir:
+        role = _json_string(os.path.join(project_dir, 'preferences.json'), 'user_role')
+    if not role:
+        role = _json_string(os.path.join(global_dir, 'preferences.json'), 'user_role')
+    if role == 'null':
+        role = None
+
+    guide = None
+    if role:
+        for name in (f'{role}-guide.md', f'{role}.md'):
+            candidate = os.path.join(config_dir, role_guides_dir, name)
+            if os.path.isfile(candidate):
+                guide = candidate
+                break
+
+    return config_dir, project_root, global_dir, role, guide
+
+
+def resolve_workspace_config(workspace, env=None):
+    """(config_dir, project_root, global_dir, role, role_guide) of one workspace.
+
+    Resolved as role-manager.sh does; role and role_guide are None when unset.
+    """
+    env = os.environ if env is None else env
+    home = env.get('HOME') or os.path.expanduser('~')
+    workspace = os.path.abspath(workspace)
+    claude_dir_name, role_guides_dir = resolve_path_configs([workspace], env)[workspace]
+    return _resolve_config(workspace, claude_dir_name, role_guides_dir, home)
+
+
+def extract_document_references(text):
+    """Document references listed under '## Document References', in order."""
+    refs = []
+    in_section = False
+    for line in text.splitlines():
+        if SECTION_START.match(line):
+            in_section = True
+            continue
+        if in_section and SECTION_END.match(line):
+            break
+        if in_section:
+            for pattern in REF_PATTERNS:
+                match = pattern.match(line)
+                if match:
+                    refs.append(match.group(1))
+                    break
+    return refs
+
+
+def _resolve_refs(workspace, project_root, global_dir, refs):
+    """Resolved path (or None) per reference, in the loader's lookup order."""
+    git_root = None
+    resolved = []
+    for ref in refs:
+        ref = ref.split('#', 1)[0]
+        if ref.startswith('/'):
+            if git_root is None:
+                git_dir = _find_upward(workspace, '.git')
+                git_root = os.path.dirname(git_dir) if git_dir else workspace
+            candidates = [git_root + ref]
+        else:
+            candidates = [os.path.join(workspace, ref)]
+            if project_root:
+                candidates.append(os.path.join(project_root, ref))
+            candidates.append(os.path.join(global_dir, ref))
+        resolved.append(next((c for c in candidates if os.path.isfile(c)), None))
+    return resolved
+
+
+def pack_path(workspace, role, env, home):
+    """Pack file role-manager.sh keeps for <workspace>, or None if its key is hashed."""
+    key = workspace.replace('%', '%25').replace('/', '%2F')
+    if len(key) > 200:
+        return None
+    cache = env.get('RCM_PACK_CACHE_DIR') or os.path.join(
+        env.get('XDG_CACHE_HOME') or os.path.join(home, '.cache'),
+        'role-context-manager', 'packs')
+    return os.path.join(cache, f'{key}--{role}.pack')
+
+
+def _read_fresh_pack(path, workspace, config_dir, role):
+    """Guide text and documents from a fresh pack, or None."""
+    try:
+        with read_pack(path) as pack:
+            if not pack.is_fresh(workspace, config_dir, role) or pack.guide is None:
+                return None
+            documents = [Document(e.ref, e.path, e.length, bytes(pack.content(e)))
+                         for e in pack.documents]
+            return bytes(pack.content(pack.guide)), documents
+    except (OSError, ValueError, PackError):
+        return None
+
+
+async def load_context(workspace, pool, env=None, path_configs=None):
+    """Load the role context for one workspace root using a shared ReadPool.
+
+    path_configs is an awaitable of resolve_path_configs() results covering
+    the workspace (shared by load_contexts); by default it is resolved alone.
+    """
+    env = os.environ if env is None else env
+    home = env.get('HOME') or os.path.expanduser('~')
+    workspace = os.path.abspath(workspace)
+    timings = {}
+    started = time.perf_counter()
+
+    def lap(phase, since):
+        now = time.perf_counter()
+        timings[phase] = round((now - since) * 1000, 3)
+        return now
+
+    try:
+        if not await pool.call(os.path.isdir, workspace):
+            raise FileNotFoundError(f'{workspace}: not a directory')
+        if path_configs is None:
+            path_configs = pool.call(resolve_path_configs, [workspace], env)
+        claude_dir_name, role_guides_dir = (await path_configs)[workspace]
+        config_dir, project_root, global_dir, role, guide = await pool.call(
+            _resolve_config, workspace, claude_dir_name, role_guides_dir, home)
+        mark = lap('config', started)
+        if not role or not guide:
+            timings['total'] = timings['config']
+            return WorkspaceContext(workspace, config_dir, role, guide, [], [], 0,
+                                    'files', timings, None if not role else 'role guide not found')
+
+        packed = None
+        path = pack_path(workspace, role, env, home)
+        if path:
+            packed = await pool.call(_read_fresh_pack, path, workspace, config_dir, role)
+        if packed:
+            guide_text, documents = packed
+            guide_size = len(guide_text)
+            found = {d.ref for d in documents}
+            documents = [d for d in documents if d.content.rstrip(b'\n')]
+            refs = extract_document_references(guide_text.decode('utf-8', 'replace'))
+            missing = [ref for ref in refs if ref not in found]
+            mark = lap('read', mark)
+            source = 'pack'
+        else:
+            guide_text = await pool.read(guide)
+            if guide_text is None:
+                raise OSError(f'{guide}: unreadable')
+            guide_size = len(guide_text)
+            refs = extract_document_references(guide_text.decode('utf-8', 'replace'))
+            resolved = await pool.call(_resolve_refs, workspace, project_root, global_dir, refs)
+            mark = lap('resolve', mark)
+
+            # Section references (path.md#heading) read only their section
+            contents = await asyncio.gather(*(
+                pool.call(_read_section_bytes, p, ref.split('#', 1)[1], env) if '#' in ref else pool.read(p)
+                for ref, p in zip(refs, resolved) if p))
+            documents, missing = [], []
+            contents = iter(contents)
+            for ref, resolved_path in zip(refs, resolved):
+                content = next(contents) if resolved_path else None
+                if content is None:
+                    missing.append(ref)
+                else:
+                    documents.append(Document(ref, resolved_path, len(content), content))
+            documents = [d for d in documents if d.content.rstrip(b'\n')]
+            mark = lap('read', mark)
+            source = 'files'
+
+        total_bytes = guide_size + sum(d.size for d in documents)
+        timings['total'] = round((time.perf_counter() - started) * 1000, 3)
+        return WorkspaceContext(workspace, config_dir, role, guide, documents, missing,
+                                total_bytes, source, timings, None)
+    except OSError as e:
+        timings['total'] = round((time.perf_counter() - started) * 1000, 3)
+        return WorkspaceContext(workspace, None, None, None, [], [], 0, 'files',
+                                timings, str(e))
+
+
+async def load_contexts(workspaces, max_reads=DEFAULT_MAX_READS, env=None):
+    """Load role contexts for every workspace concurrently, in input order."""
+    env = os.environ if env is None else env
+    workspaces = [os.path.abspath(w) for w in workspaces]
+    pool = ReadPool(max_reads)
+    try:
+        path_configs = asyncio.ensure_future(
+            pool.call(resolve_path_configs, list(dict.fromkeys(workspaces)), env))
+        return await asyncio.gather(*(load_context(w, pool, env, path_configs)
+                                      for w in workspaces))
+    finally:
+        pool.close()
+
+
+def to_json(ctx, include_content=False):
+    """JSON-serializable form of a WorkspaceContext."""
+    result = ctx._asdict()
+    result['documents'] = []
+    for doc in ctx.documents:
+        entry = {'ref': doc.ref, 'path': doc.path, 'size': doc.size}
+        if include_content:
+            entry['content'] = doc.content.decode('utf-8', 'replace')
+        result['documents'].append(entry)
+    return result
+
+
+def main(argv=None):
+    """Load contexts for the workspaces given on the command line."""
+    parser = argparse.ArgumentParser(description='Load role contexts for many workspaces concurrently.')
+    parser.add_argument('workspaces', nargs='+', metavar='DIR', help='Workspace root')
+    parser.add_argument('--max-reads', type=int, default=DEFAULT_MAX_READS,
+                        help=f'Concurrent filesystem operations (default: {DEFAULT_MAX_READS})')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--content', action='store_true', help='Include document contents (--json)')
+    args = parser.parse_args(argv)
+
+    if args.max_reads < 1:
+        parser.error('--max-reads must be at least 1')
+
+    results = asyncio.run(load_contexts(args.workspaces, args.max_reads))
+
+    if args.json:
+        print(json.dumps([to_json(ctx, args.content) for ctx in results], indent=2))
+    else:
+        for ctx in results:
+            if ctx.error:
+                print(f'✗ {ctx.workspace}: {ctx.error}')
+            elif not ctx.role:
+                print(f'- {ctx.workspace}: no role set')
+            else:
+                print(f'✓ {ctx.workspace}: {ctx.role} ({len(ctx.documents)} documents, '
+                      f'{ctx.bytes} bytes, {ctx.timings["total"]:.1f} ms, {ctx.source})')
+                for ref in ctx.missing:
+                    print(f'    missing: {ref}')
+
+    return 1 if any(ctx.error for ctx in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env bash
+
+# test-batch-provision.sh - Test suite for template-manager.sh provision
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-batch-provision-$$"
+PLUGIN="$TEST_TMP/plugin"
+TEMPLATE_MANAGER="$PLUGIN/scripts/template-manager.sh"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v jq &>/dev/null; then
+    echo "jq not found; skipping"
+    exit 0
+fi
+
+# A plugin install with a small template, so tests do not depend on bundled content
+setup_plugin() {
+    local template="$PLUGIN/templates/core/mini"
+    mkdir -p "$PLUGIN/scripts" "$template/.claude/role-guides" "$template/docs/templates" "$TEST_TMP/home"
+    cp "$PROJECT_ROOT"/scripts/*.sh "$PLUGIN/scripts/"
+    cat > "$PLUGIN/templates/registry.json" <<'JSON'
+{"bundled": [{"id": "mini", "name": "Mini", "version": "1.2.0", "path": "templates/core/mini",
+              "org_levels": ["company", "product", "project"]}]}
+JSON
+    cat > "$template/manifest.json" <<'JSON'
+{
+  "id": "mini", "name": "Mini", "version": "1.2.0", "description": "Test template",
+  "content_structure": {
+    "claude_config": {"path": ".claude"},
+    "root_docs": {"path": ".", "files": ["README.md", "STANDARDS.md"]},
+    "document_templates": {"path": "docs/templates"}
+  },
+  "application_modes": {
+    "minimal": {"includes": ["claude_config"]},
+    "standard": {"includes": ["claude_config", "root_docs"]},
+    "complete": {"includes": ["claude_config", "root_docs", "document_templates"]}
+  }
+}
+JSON
+    echo "# Software Engineer" > "$template/.claude/role-guides/software-engineer-guide.md"
+    echo "# Template README" > "$template/README.md"
+    echo "# Standards" > "$template/STANDARDS.md"
+    echo "# PRD" > "$template/docs/templates/prd.md"
+}
+
+# Usage: provision [args...]
+provision() {
+    HOME="$TEST_TMP/home" bash "$TEMPLATE_MANAGER" provision "$@"
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Batch Provisioning - Test Suite                     ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+setup_plugin
+REPOS="$TEST_TMP/repos"
+mkdir -p "$REPOS/api" "$REPOS/web/.claude" "$REPOS/data" "$REPOS/api/service"
+echo '{"theme": "dark"}' > "$REPOS/web/.claude/preferences.json"
+echo "Existing README" > "$REPOS/web/README.md"
+
+cat > "$TEST_TMP/spec.txt" <<SPEC
+# All repositories get the standard project setup
+$REPOS/* mini standard project software-engineer
+$REPOS/api mini complete company
+$REPOS/api/service mini minimal product -
+$REPOS/data mini bogus
+SPEC
+
+# Test 1: Script validation
+test_section "Script Validation"
+bash -n "$TEMPLATE_MANAGER" 2>/dev/null && test_pass "template-manager.sh syntax valid" || test_fail "template-manager.sh syntax error"
+
+# Test 2: Planning
+test_section "Planning"
+OUTPUT=$(provision "$TEST_TMP/spec.txt" --dry-run 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 1 && "$OUTPUT" == *"$REPOS/api: mini v1.2.0 (complete), level company"*"docs/templates -> docs/templates"* \
+      && "$OUTPUT" == *"$REPOS/data: application mode 'bogus' not found"* ]]; then
+    test_pass "--dry-run prints every planned copy and invalid targets"
+else
+    test_fail "Unexpected dry run (exit $EXIT_CODE): $OUTPUT"
+fi
+if [[ ! -e "$REPOS/api/.claude" && "$(cat "$REPOS/web/README.md")" == "Existing README" ]]; then
+    test_pass "--dry-run changes nothing"
+else
+    test_fail "--dry-run modified a repository"
+fi
+
+# Test 3: Provisioning
+test_section "Provisioning"
+OUTPUT=$(provision "$TEST_TMP/spec.txt" --jobs 2 --report "$TEST_TMP/report.json" 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 1 ]] && jq -e '.total == 4 and .succeeded == 3 and .failed == 1
+        and (.repos[] | select(.status == "invalid") | .repo | endswith("/data"))' "$TEST_TMP/report.json" >/dev/null 2>&1; then
+    test_pass "An invalid target fails alone and the report counts every repository"
+else
+    test_fail "Unexpected result (exit $EXIT_CODE): $OUTPUT"
+fi
+
+if [[ -f "$REPOS/api/docs/templates/prd.md" && -f "$REPOS/api/README.md" && -f "$REPOS/api/service/.claude/role-guides/software-engineer-guide.md" \
+      && ! -e "$REPOS/api/service/README.md" ]]; then
+    test_pass "Later spec lines override the glob's mode per repository"
+else
+    test_fail "Copied content does not match the per-repository modes"
+fi
+
+if jq -e '.applied_template.id == "mini" and .applied_template.mode == "standard" and .user_role == "software-engineer" and .theme == "dark"' \
+        "$REPOS/web/.claude/preferences.json" >/dev/null 2>&1; then
+    test_pass "Template and role are recorded, existing preferences kept"
+else
+    test_fail "preferences.json: $(cat "$REPOS/web/.claude/preferences.json" 2>/dev/null)"
+fi
+
+BACKUP=$(jq -r '.repos[] | select(.repo | endswith("/web")) | .backup' "$TEST_TMP/report.json" 2>/dev/null)
+if [[ "$(cat "$BACKUP/README.md" 2>/dev/null)" == "Existing README" ]] \
+        && jq -e '.reason == "batch-provision" and (.paths | index("README.md"))' "$BACKUP/backup-manifest.json" >/dev/null 2>&1; then
+    test_pass "Overwritten files are backed up per repository"
+else
+    test_fail "Backup missing or incomplete: $BACKUP"
+fi
+
+if jq -e '.level == "product" and .parent_level == "company"' "$REPOS/api/service/.claude/organizational-level.json" >/dev/null 2>&1; then
+    test_pass "Nested targets get levels after their parents"
+else
+    test_fail "organizational-level.json: $(cat "$REPOS/api/service/.claude/organizational-level.json" 2>/dev/null)"
+fi
+
+# Test 4: Rollback
+test_section "Rollback"
+mkdir -p "$TEST_TMP/org/team/.claude"
+echo '{"user_role": "old"}' > "$TEST_TMP/org/team/.claude/preferences.json"
+echo "Team README" > "$TEST_TMP/org/team/README.md"
+printf '%s mini standard project\n%s mini standard company software-engineer\n' \
+    "$TEST_TMP/org" "$TEST_TMP/org/team" | provision - > "$TEST_TMP/out.txt" 2>&1
+if grep -q "team: rolled-back" "$TEST_TMP/out.txt" && [[ "$(cat "$TEST_TMP/org/team/README.md")" == "Team README" \
+        && ! -e "$TEST_TMP/org/team/STANDARDS.md" && ! -e "$TEST_TMP/org/team/.claude/role-guides" ]] \
+        && jq -e '.user_role == "old" and (has("applied_template") | not)' "$TEST_TMP/org/team/.claude/preferences.json" >/dev/null 2>&1; then
+    test_pass "A failed level check restores the repository from its backup"
+else
+    test_fail "Repository not restored: $(cat "$TEST_TMP/out.txt")"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
@@ -0,0 +1,124 @@
+#!/usr/bin/env bash
+
+# test-benchmarks.sh - Smoke test for the synthetic org generator and SessionStart benchmark
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+GENERATOR="$PROJECT_ROOT/benchmarks/synthetic_org.py"
+BENCH="$PROJECT_ROOT/benchmarks/session-start-bench.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-benchmarks-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  SessionStart Benchmark - Smoke Test                 ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Script validation
+test_section "Script Validation"
+python3 -m py_compile "$GENERATOR" 2>/dev/null && test_pass "synthetic_org.py compiles" || test_fail "synthetic_org.py does not compile"
+python3 -m py_compile "$BENCH" 2>/dev/null && test_pass "session-start-bench.py compiles" || test_fail "session-start-bench.py does not compile"
+
+# Test 2: Synthetic organization
+test_section "Synthetic Organization"
+mkdir -p "$TEST_TMP"
+python3 "$GENERATOR" "$TEST_TMP/org" --depth 4 --fanout 2 --dirs-per-project 5 \
+    --role-guides 5 --documents 20 --refs-per-guide 6 --doc-size 256 \
+    --claude-dir-name .myorg --role-guides-dir guides >/dev/null 2>&1
+
+WORKSPACE=$(jq -r '.workspace' "$TEST_TMP/org/synthetic-org.json" 2>/dev/null)
+if [[ -f "$WORKSPACE/.myorg/guides/bench-engineer-guide.md" ]]; then
+    test_pass "Role guide generated under custom directory names"
+else
+    test_fail "Benchmark role guide missing (workspace: $WORKSPACE)"
+fi
+
+if [[ "$(jq -r '.level' "$WORKSPACE/.myorg/organizational-level.json" 2>/dev/null)" == "project" ]] &&
+   [[ "$(jq -r '.level' "$TEST_TMP/org/.myorg/organizational-level.json" 2>/dev/null)" == "company" ]]; then
+    test_pass "Hierarchy levels written from company down to project"
+else
+    test_fail "Unexpected organizational levels"
+fi
+
+if [[ "$(jq -r '.claude_dir_name' "$TEST_TMP/org/.claude/paths.json" 2>/dev/null)" == ".myorg" ]]; then
+    test_pass "paths.json records custom directory names"
+else
+    test_fail "paths.json missing or wrong"
+fi
+
+# Test 3: Benchmark run
+test_section "Benchmark Run"
+python3 "$BENCH" run --org "$TEST_TMP/org" --iterations 1 --warmup 0 \
+    -o "$TEST_TMP/results.json" >/dev/null 2>&1
+
+if jq -e '.schema == 1 and (.workloads | length) == 6' "$TEST_TMP/results.json" >/dev/null 2>&1; then
+    test_pass "Results JSON covers all workloads"
+else
+    test_fail "Results JSON missing or incomplete"
+fi
+
+if jq -e '[.workloads[] | .latency_ms.p50 > 0 and .latency_ms.p99 >= .latency_ms.p50] | all' "$TEST_TMP/results.json" >/dev/null 2>&1; then
+    test_pass "Latency percentiles recorded"
+else
+    test_fail "Latency percentiles missing or inconsistent"
+fi
+
+if jq -e '[.workloads[] | .exit_codes == {"0": 1}] | all' "$TEST_TMP/results.json" >/dev/null 2>&1; then
+    test_pass "All workloads exit successfully"
+else
+    test_fail "Workload failures: $(jq -c '.workloads | map_values(.exit_codes)' "$TEST_TMP/results.json" 2>/dev/null)"
+fi
+
+if jq -e '.workloads["load-role-context-normal"].traced_execs.by_command.jq > 0' "$TEST_TMP/results.json" >/dev/null 2>&1; then
+    test_pass "Traced jq forks counted"
+else
+    test_fail "No traced fork counts"
+fi
+
+# Test 4: Comparison
+test_section "Comparison"
+if python3 "$BENCH" compare "$TEST_TMP/results.json" "$TEST_TMP/results.json" >/dev/null 2>&1; then
+    test_pass "Identical results compare clean"
+else
+    test_fail "Identical results reported a regression"
+fi
+
+jq '.workloads["show-role-context"].latency_ms.p50 *= 2' "$TEST_TMP/results.json" > "$TEST_TMP/slower.json"
+if ! python3 "$BENCH" compare "$TEST_TMP/results.json" "$TEST_TMP/slower.json" >/dev/null 2>&1; then
+    test_pass "Doubled p50 flagged as regression"
+else
+    test_fail "Regression not detected"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
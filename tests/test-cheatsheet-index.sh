@@ -0,0 +1,142 @@
+#!/usr/bin/env bash
+
+# test-cheatsheet-index.sh - Test suite for the cheatsheet search index (cheatsheet_index.py)
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+INDEXER="$PROJECT_ROOT/scripts/cheatsheet_index.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-cheatsheet-index-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v python3 &>/dev/null; then
+    echo "python3 not found; skipping"
+    exit 0
+fi
+
+# Usage: top_hit <question> (title of the best match in the test index)
+top_hit() {
+    python3 "$INDEXER" query --index "$TEST_TMP/index.json" --json --limit 1 -- "$1" 2>/dev/null \
+        | python3 -c 'import json,sys; r=json.load(sys.stdin); print(r[0]["title"] if r else "")'
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Cheatsheet Search Index - Test Suite                ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP"
+cp "$PROJECT_ROOT/CHEATSHEET.md" "$TEST_TMP/CHEATSHEET.md"
+
+# Test 1: Building
+test_section "Building"
+OUTPUT=$(python3 "$INDEXER" build --markdown "$TEST_TMP/CHEATSHEET.md" --index "$TEST_TMP/index.json" 2>&1)
+if [[ $? -eq 0 && "$OUTPUT" == *"Index written"* ]] && python3 -c '
+import json, sys
+index = json.load(open(sys.argv[1]))
+kinds = {e["kind"] for e in index["entries"]}
+assert {"command", "agent", "pattern", "section"} <= kinds, kinds
+assert len(index["postings"]) == len(index["terms"]) and index["prefixes"] and index["trigrams"]
+' "$TEST_TMP/index.json" 2>/dev/null; then
+    test_pass "Index holds commands, agents, patterns and sections with term, prefix and trigram tables"
+else
+    test_fail "Unexpected index: $OUTPUT"
+fi
+
+touch -d '2000-01-01' "$TEST_TMP/index.json"
+OUTPUT=$(python3 "$INDEXER" build --markdown "$TEST_TMP/CHEATSHEET.md" --index "$TEST_TMP/index.json" 2>&1)
+if [[ "$OUTPUT" == *"up to date"* && "$(date -r "$TEST_TMP/index.json" +%Y)" == "2000" ]]; then
+    test_pass "Unchanged cheatsheet content leaves the index untouched"
+else
+    test_fail "Index rewritten for unchanged content: $OUTPUT"
+fi
+
+printf '\n#### `/brand-new-command [--frobnicate]`\n\n**Purpose:** Frobnicate the widgets\n' >> "$TEST_TMP/CHEATSHEET.md"
+OUTPUT=$(python3 "$INDEXER" build --markdown "$TEST_TMP/CHEATSHEET.md" --index "$TEST_TMP/index.json" 2>&1)
+if [[ "$OUTPUT" == *"Index written"* && "$(top_hit "frobnicate widgets")" == "/brand-new-command [--frobnicate]" ]]; then
+    test_pass "Changed content rebuilds the index"
+else
+    test_fail "Index not rebuilt: $OUTPUT"
+fi
+
+if (cd "$PROJECT_ROOT/scripts" && python3 -c '
+import sys
+import cheatsheet_index as ci
+with open(ci.DEFAULT_MARKDOWN, encoding="utf-8") as f:
+    sys.exit(ci.load_index()["source_sha256"] != ci.sha256(f.read()))
+') 2>/dev/null; then
+    test_pass "CHEATSHEET.index.json matches CHEATSHEET.md"
+else
+    test_fail "CHEATSHEET.index.json is stale (run: python3 scripts/cheatsheet_index.py build)"
+fi
+
+# Test 2: Lookups
+test_section "Lookups"
+for pair in "how do I change role scope|/set-role [role-name] [--global|--project]" \
+            "valdate setup|/validate-setup [flags] [--global|--project]" \
+            "--check-only|/sync-template [flags] [--global|--project]" \
+            "load documents quietly|/load-role-context" \
+            "hybrid pattern|Pattern 3: Hybrid (Recommended)"; do
+    QUESTION="${pair%%|*}"
+    EXPECTED="${pair#*|}"
+    HIT=$(top_hit "$QUESTION")
+    [[ "$HIT" == "$EXPECTED" ]] && test_pass "\"$QUESTION\" -> $HIT" || test_fail "\"$QUESTION\" -> '$HIT', expected '$EXPECTED'"
+done
+
+OUTPUT=$(cd "$PROJECT_ROOT/scripts" && python3 -c '
+import sys, time
+import cheatsheet_index as ci
+index = ci.load_index(sys.argv[1])
+start = time.perf_counter()
+for _ in range(20):
+    ci.search(index, "how do I change role scope")
+print(int((time.perf_counter() - start) / 20 * 1000))
+' "$TEST_TMP/index.json" 2>&1)
+[[ "$OUTPUT" =~ ^[0-9]+$ && $OUTPUT -lt 50 ]] && test_pass "A lookup takes ${OUTPUT}ms" || test_fail "Lookup too slow or failed: $OUTPUT"
+
+OUTPUT=$(python3 "$INDEXER" query --index "$TEST_TMP/index.json" --limit 1 set role 2>&1)
+if [[ "$OUTPUT" == *"Flags: --global --project --scope"* && "$OUTPUT" == *"CHEATSHEET.md#set-role-role-name---global--project"* ]]; then
+    test_pass "Text results show the summary, flags and cheatsheet anchor"
+else
+    test_fail "Unexpected text output: $OUTPUT"
+fi
+
+# Test 3: Errors
+test_section "Errors"
+OUTPUT=$(python3 "$INDEXER" query --index "$TEST_TMP/absent.json" anything 2>&1)
+[[ $? -eq 2 && "$OUTPUT" == *"cheatsheet_index.py build"* ]] && test_pass "A missing index exits 2 with a hint" || test_fail "Unexpected: $OUTPUT"
+
+python3 "$INDEXER" query --index "$TEST_TMP/index.json" qqqqzzzz > /dev/null 2>&1
+[[ $? -eq 1 ]] && test_pass "No matches exits 1" || test_fail "Expected exit 1 for no matches"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
@@ -0,0 +1,142 @@
+#!/usr/bin/env bash
+
+# test-cheatsheet-render.sh - Test suite for the parallel cheatsheet render's section split and PDF merge
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+GENERATOR="$PROJECT_ROOT/scripts/generate-cheatsheet.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-cheatsheet-render-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v python3 &>/dev/null; then
+    echo "python3 not found; skipping"
+    exit 0
+fi
+
+# Usage: with_generator [args...] <<'PY' (runs the Python code on stdin with
+# the generator imported as "g"; nothing is rendered)
+with_generator() {
+    (cd "$PROJECT_ROOT/scripts" && python3 -c "import importlib.util, sys
+spec = importlib.util.spec_from_file_location('generate_cheatsheet', 'generate-cheatsheet.py')
+g = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(g)
+$(cat)" "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Cheatsheet Parallel Render - Test Suite             ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP"
+
+# Test 1: Section splitting
+test_section "Section Splitting"
+OUTPUT=$(with_generator 2>&1 <<'PY'
+import re
+html = g.generate_html()
+chunks = g.split_sections(html)
+assert len(chunks) == len(g.PHASE_SECTIONS), len(chunks)
+head = html.partition("<body>")[0]
+bodies = []
+for chunk in chunks:
+    assert chunk.startswith(head) and chunk.rstrip().endswith("</html>"), "chunk is not a whole document"
+    bodies.append(chunk.partition("<body>")[2].rpartition("</body>")[0])
+assert "".join(bodies) == html.partition("<body>")[2].rpartition("</body>")[0], "content lost or reordered"
+assert '<h1 id="setup">' in bodies[0]
+for name, body in zip(g.PHASE_SECTIONS[1:], bodies[1:]):
+    assert body.lstrip().startswith(f'<h1 id="{name}">'), name
+phases = lambda text: re.findall(r"phase-section phase-(\w+)", text)
+assert [p for body in bodies for p in phases(body)] == phases(html)
+for index, body in enumerate(bodies):
+    assert set(phases(body)) <= {g.PHASE_SECTIONS[index]}, (index, phases(body))
+print(len(chunks), len(phases(html)))
+PY
+)
+if [[ "$OUTPUT" =~ ^[0-9]+\ [0-9]+$ ]]; then
+    test_pass "One document per phase h1 (${OUTPUT% *}), phase-section blocks kept in order (${OUTPUT#* })"
+else
+    test_fail "Unexpected split: $OUTPUT"
+fi
+
+# Test 2: Merging
+test_section "Merging"
+if ! python3 -c 'import pypdf' &>/dev/null; then
+    echo -e "${YELLOW}⚠${NC} pypdf not available - skipping merge tests"
+else
+    OUTPUT=$(with_generator "$TEST_TMP/merged.pdf" 2>&1 <<'PY'
+import io, sys
+from pypdf import PdfReader, PdfWriter
+
+def pdf(*widths):
+    writer = PdfWriter()
+    for width in widths:
+        writer.add_blank_page(width=width, height=800)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+stamped = []
+def page_numbers(count):
+    stamped.append(count)
+    return pdf(*[600] * count)
+
+# Sections arrive in completion order; section 0 links to an anchor in section 2
+results = [
+    {"index": 2, "pdf": pdf(300), "anchors": {"hooks": (0, 10, 20)}, "links": []},
+    {"index": 0, "pdf": pdf(100, 101), "anchors": {"top": (0, 0, 0)},
+     "links": [(1, "hooks", (10, 10, 50, 12))]},
+    {"index": 1, "pdf": pdf(200), "anchors": {}, "links": [(0, "missing", (0, 0, 1, 1))]},
+]
+pages = g.merge_sections(results, sys.argv[1], page_numbers=page_numbers)
+reader = PdfReader(sys.argv[1])
+widths = [round(float(page.mediabox.width)) for page in reader.pages]
+assert pages == 4 and stamped == [4], (pages, stamped)
+assert widths == [100, 101, 200, 300], widths
+annots = reader.pages[1].get("/Annots") or []
+assert len(annots) == 1, annots
+dest = annots[0].get_object()["/Dest"]
+assert dest[0].get_object() == reader.pages[3].get_object(), "link does not point at the merged page"
+print("ok")
+PY
+)
+    if [[ "$OUTPUT" == *"No anchor #missing"*"ok" ]]; then
+        test_pass "Sections are merged in document order with links resolved across sections"
+    else
+        test_fail "Unexpected merge: $OUTPUT"
+    fi
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
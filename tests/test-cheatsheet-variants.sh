@@ -0,0 +1,169 @@
+#!/usr/bin/env bash
+
+# test-cheatsheet-variants.sh - Test suite for multi-variant cheatsheet rendering (generate-cheatsheet.py --variants)
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+GENERATOR="$PROJECT_ROOT/scripts/generate-cheatsheet.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-cheatsheet-variants-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: with_generator [args...] <<'PY' (runs the Python code on stdin with
+# the generator imported as "g"; nothing is rendered)
+with_generator() {
+    (cd "$PROJECT_ROOT/scripts" && python3 -c "import importlib.util, sys
+spec = importlib.util.spec_from_file_location('generate_cheatsheet', 'generate-cheatsheet.py')
+g = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(g)
+$(cat)" "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Cheatsheet Variants - Test Suite                    ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Script validation
+test_section "Script Validation"
+python3 -m py_compile "$GENERATOR" 2>/dev/null && test_pass "generate-cheatsheet.py compiles" || test_fail "generate-cheatsheet.py does not compile"
+
+mkdir -p "$TEST_TMP"
+
+# Test 2: Variant definitions (no rendering)
+test_section "Variant Definitions"
+cat > "$TEST_TMP/sizes.json" <<'JSON'
+{"a": {"size": "Letter"}, "b": {"size": "A5 landscape", "media": "screen"},
+ "c": {"size": "210mm 297mm"}, "d": {"size": "8.5in"}, "e": {}}
+JSON
+OUTPUT=$(with_generator "$TEST_TMP/sizes.json" 2>&1 <<'PY'
+variants = g.load_variants(["a4-print", "letter-screen"], sys.argv[1])
+print(" | ".join(f"{v['name']}:{v['size']}:{v['media']}" for v in variants))
+PY
+)
+EXPECTED="a4-print:A4:print | letter-screen:Letter:screen | a:Letter:print | b:A5 landscape:screen | c:210mm 297mm:print | d:8.5in:print | e:A4:print"
+[[ "$OUTPUT" == "$EXPECTED" ]] && test_pass "Built-in and file variants, with named and length page sizes" || test_fail "Unexpected: $OUTPUT"
+
+REJECTED=0
+for size in '"A4;}"' '"A4; } body { display: none"' '"12"' '"A4 sideways"' '"10mm 10mm 10mm"' '42' '["A4"]'; do
+    echo "{\"bad\": {\"size\": $size}}" > "$TEST_TMP/bad-size.json"
+    OUTPUT=$(with_generator "$TEST_TMP/bad-size.json" 2>&1 <<'PY'
+try:
+    g.load_variants([], sys.argv[1])
+except ValueError as e:
+    print(e)
+PY
+)
+    [[ "$OUTPUT" == "variant 'bad': size must be"* ]] && REJECTED=$((REJECTED + 1)) || echo "  accepted: $size -> $OUTPUT"
+done
+[[ $REJECTED -eq 7 ]] && test_pass "Sizes that are not a page size never reach the stylesheet" || test_fail "Only $REJECTED/7 bad sizes rejected"
+
+OUTPUT=$(python3 "$GENERATOR" --variants-file "$TEST_TMP/bad-size.json" --variants-dir "$TEST_TMP/bad" 2>&1)
+[[ $? -eq 1 && "$OUTPUT" == *"size must be"* && ! -e "$TEST_TMP/bad" ]] && test_pass "A bad size exits 1 before rendering" || test_fail "Unexpected: $OUTPUT"
+
+OUTPUT=$(with_generator 2>&1 <<'PY'
+import re
+html = g.generate_html(embed_css=False)
+names = lambda text: g.COMMAND_NAME.findall(text)
+subset = g.filter_commands(html, ["/init-org-template", "set-role"])
+assert sorted(names(subset)) == ["/init-org-template", "/set-role"], names(subset)
+assert subset.count("<div") == subset.count("</div>"), "unbalanced divs"
+phases = lambda text: re.findall(r'<div class="phase-section[ "]', text)
+assert 0 < len(phases(subset)) < len(phases(html)), "empty phases kept"
+try:
+    g.filter_commands(html, ["/no-such-command"])
+    print("accepted")
+except ValueError as e:
+    print(e)
+PY
+)
+[[ "$OUTPUT" == "unknown command(s): /no-such-command" ]] && test_pass "Command subsets keep only the listed blocks and drop emptied phases" || test_fail "Unexpected: $OUTPUT"
+
+if ! python3 -c 'import weasyprint' &>/dev/null; then
+    OUTPUT=$(python3 "$GENERATOR" --variants a4-print --variants-dir "$TEST_TMP/none" 2>&1)
+    [[ $? -eq 2 && "$OUTPUT" == *"needs WeasyPrint"* ]] && test_pass "Rendering without WeasyPrint exits 2" || test_fail "Unexpected: $OUTPUT"
+    echo -e "${YELLOW}⚠${NC} WeasyPrint not available - skipping rendering tests"
+else
+    # Test 3: Built-in variants
+    test_section "Built-in Variants"
+    OUTPUT=$(python3 "$GENERATOR" --variants a4-print letter-screen --variants-dir "$TEST_TMP/out" 2>&1)
+    if [[ $? -eq 0 && -s "$TEST_TMP/out/CHEATSHEET-a4-print.pdf" && -s "$TEST_TMP/out/CHEATSHEET-letter-screen.pdf" ]]; then
+        test_pass "Each variant is written to CHEATSHEET-<variant>.pdf"
+    else
+        test_fail "Variants not written: $OUTPUT"
+    fi
+
+    if [[ $(grep -c "Shared setup" <<< "$OUTPUT") -eq 1 && "$OUTPUT" == *"a4-print: "*"(layout "*"letter-screen: "*"(layout "* && "$OUTPUT" == *"Total: "* ]]; then
+        test_pass "Setup is reported once and every variant is timed"
+    else
+        test_fail "Unexpected report: $OUTPUT"
+    fi
+
+    if python3 -c 'import pypdf' &>/dev/null; then
+        SIZES=$(python3 -c '
+import sys
+from pypdf import PdfReader
+for path in sys.argv[1:]:
+    box = PdfReader(path).pages[0].mediabox
+    print(round(float(box.width)), round(float(box.height)))
+    ' "$TEST_TMP/out/CHEATSHEET-a4-print.pdf" "$TEST_TMP/out/CHEATSHEET-letter-screen.pdf" 2>&1)
+        [[ "$SIZES" == $'595 842\n612 792' ]] && test_pass "A4 and Letter page sizes" || test_fail "Unexpected page sizes: $SIZES"
+    fi
+
+    # Test 4: Variants file
+    test_section "Variants File"
+    echo '{"startup": {"size": "Letter", "commands": ["/init-org-template", "set-role"]}}' > "$TEST_TMP/variants.json"
+    OUTPUT=$(python3 "$GENERATOR" --variants-file "$TEST_TMP/variants.json" --variants-dir "$TEST_TMP/subset" 2>&1)
+    EXIT_CODE=$?
+    FULL=$(stat -c %s "$TEST_TMP/out/CHEATSHEET-a4-print.pdf")
+    SUBSET=$(stat -c %s "$TEST_TMP/subset/CHEATSHEET-startup.pdf" 2>/dev/null || echo 0)
+    if [[ $EXIT_CODE -eq 0 && $SUBSET -gt 0 && $SUBSET -lt $FULL && $(ls "$TEST_TMP/subset" | wc -l) -eq 1 ]]; then
+        test_pass "A command subset renders only the file's variants, smaller than the full cheatsheet"
+    else
+        test_fail "Subset not rendered ($SUBSET vs $FULL bytes): $OUTPUT"
+    fi
+
+    echo '{"broken": {"commands": ["/no-such-command"]}}' > "$TEST_TMP/bad.json"
+    OUTPUT=$(python3 "$GENERATOR" --variants a4-print --variants-file "$TEST_TMP/bad.json" --variants-dir "$TEST_TMP/bad" 2>&1)
+    if [[ $? -eq 1 && "$OUTPUT" == *"unknown command(s): /no-such-command"* && -z "$(ls "$TEST_TMP/bad" 2>/dev/null)" ]]; then
+        test_pass "An unknown command fails before any variant is rendered"
+    else
+        test_fail "Unexpected result: $OUTPUT"
+    fi
+
+    OUTPUT=$(python3 "$GENERATOR" --variants a5-print --variants-dir "$TEST_TMP/bad" 2>&1)
+    [[ $? -eq 1 && "$OUTPUT" == *"unknown variant 'a5-print'"* ]] && test_pass "An unknown variant name exits 1" || test_fail "Unexpected: $OUTPUT"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
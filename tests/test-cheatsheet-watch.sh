@@ -0,0 +1,154 @@
+#!/usr/bin/env bash
+
+# test-cheatsheet-watch.sh - Test suite for generate-cheatsheet.py --watch change detection and exit status
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+GENERATOR="$PROJECT_ROOT/scripts/generate-cheatsheet.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-cheatsheet-watch-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v python3 &>/dev/null; then
+    echo "python3 not found; skipping"
+    exit 0
+fi
+
+# Usage: with_generator [args...] <<'PY' (runs the Python code on stdin with
+# the generator imported as "g"; nothing is rendered)
+with_generator() {
+    (cd "$PROJECT_ROOT/scripts" && python3 -c "import importlib.util, sys
+spec = importlib.util.spec_from_file_location('generate_cheatsheet', 'generate-cheatsheet.py')
+g = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(g)
+$(cat)" "$@")
+}
+
+# Python shared by the watcher tests: edit(path, text, delay) writes a file
+# from a background thread after <delay> seconds
+WATCH_HELPERS='
+import os, threading, time
+def edit(path, text, delay=0):
+    def run():
+        time.sleep(delay)
+        with open(path, "w") as f:
+            f.write(text)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+'
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Cheatsheet Watch Mode - Test Suite                  ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP"
+echo "one" > "$TEST_TMP/a.md"
+echo "one" > "$TEST_TMP/b.md"
+
+# Test 1: Polling watcher
+test_section "Polling Watcher"
+OUTPUT=$(with_generator "$TEST_TMP/a.md" "$TEST_TMP/b.md" 2>&1 <<PY
+$WATCH_HELPERS
+a, b = sys.argv[1:3]
+g.WATCH_POLL_INTERVAL = 0.05
+watcher = g.PollingWatcher([a, b, a + ".absent"])
+assert watcher.wait(0.2) == set(), "change reported without an edit"
+
+# Same size, new content: detected by mtime
+edit(a, "two\n", 0.1).join()
+assert watcher.wait(1) == {a}
+
+# A burst of edits is collected into one change set
+started = time.monotonic()
+edit(b, "three\n", 0.05)
+edit(a, "four\n", 0.2)
+first = watcher.wait(None)
+changed = g.debounce(watcher, first, quiet=0.3)
+elapsed = time.monotonic() - started
+assert changed == {a, b}, changed
+assert elapsed >= 0.5, elapsed
+assert watcher.wait(0.1) == set(), "the burst was reported twice"
+
+# Creating a watched file counts as a change
+edit(a + ".absent", "new\n").join()
+assert watcher.wait(1) == {a + ".absent"}
+print("ok")
+PY
+)
+[[ "$OUTPUT" == "ok" ]] && test_pass "Edits are detected and a burst is debounced into one change set" || test_fail "Unexpected: $OUTPUT"
+
+# Test 2: inotify watcher
+test_section "inotify Watcher"
+OUTPUT=$(with_generator "$TEST_TMP/a.md" "$TEST_TMP/b.md" 2>&1 <<PY
+$WATCH_HELPERS
+a, b = sys.argv[1:3]
+try:
+    watcher = g.InotifyWatcher([a, b])
+except (OSError, AttributeError):
+    print("unsupported")
+    sys.exit(0)
+assert watcher.wait(0.1) == set()
+edit(b, "five\n", 0.05)
+changed = g.debounce(watcher, watcher.wait(1), quiet=0.2)
+assert changed == {b}, changed
+
+# Editors that save by rename are seen through the parent directory
+with open(a + ".tmp", "w") as f:
+    f.write("six\n")
+os.replace(a + ".tmp", a)
+assert watcher.wait(1) == {a}
+watcher.close()
+print("ok")
+PY
+)
+if [[ "$OUTPUT" == "unsupported" ]]; then
+    echo -e "${YELLOW}⚠${NC} inotify not available - skipping"
+else
+    [[ "$OUTPUT" == "ok" ]] && test_pass "Writes and rename-saves are reported for watched files only" || test_fail "Unexpected: $OUTPUT"
+fi
+
+# Test 3: Exit status
+test_section "Exit Status"
+if ! python3 -c 'import weasyprint' &>/dev/null; then
+    OUTPUT=$(python3 "$GENERATOR" --pdf-only --pdf-path "$TEST_TMP/out.pdf" 2>&1)
+    [[ $? -eq 2 && "$OUTPUT" == *"Error: Rendering the PDF needs WeasyPrint"* ]] \
+        && test_pass "A render that cannot run exits non-zero" || test_fail "Unexpected: $OUTPUT"
+else
+    python3 "$GENERATOR" --pdf-only --pdf-path "$TEST_TMP/out.pdf" > /dev/null 2>&1
+    [[ $? -eq 0 && -s "$TEST_TMP/out.pdf" ]] && test_pass "A successful render exits 0" || test_fail "Render failed"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
@@ -0,0 +1,169 @@
+#!/usr/bin/env bash
+
+# test-configure-paths-migration.sh - Test suite for configure-paths.sh --migrate
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+CONFIGURE_PATHS="$PROJECT_ROOT/commands/configure-paths.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-configure-paths-migration-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: make_tree
+# Creates $TEST_TMP/tree with nested config dirs, pruned copies and a conflict
+make_tree() {
+    local tree="$TEST_TMP/tree"
+    rm -rf "$tree"
+    mkdir -p "$tree/.claude/role-guides" "$tree/a/.claude" "$tree/b/c/.claude" \
+        "$tree/node_modules/pkg/.claude" "$tree/.git/.claude" "$tree/d/.claude" "$tree/d/.myorg"
+    echo '{"claude_dir_name": ".claude", "role_guides_dir": "role-guides"}' > "$tree/.claude/paths.json"
+    echo '{"claude_dir_name": ".claude", "role_guides_dir": "guides"}' > "$tree/a/.claude/paths.json"
+    echo '{"claude_dir_name": ".other", "role_guides_dir": "role-guides"}' > "$tree/b/paths.json"
+}
+
+# Usage: migrate [args...] (run in the test tree, confirming the prompt)
+migrate() {
+    (cd "$TEST_TMP/tree" && echo y | HOME="$TEST_TMP/home" bash "$CONFIGURE_PATHS" "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Configure Paths Migration - Test Suite              ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP/home" "$TEST_TMP/bin"
+
+# Test 1: Planning
+test_section "Planning"
+make_tree
+OUTPUT=$(migrate --dry-run --migrate .claude .myorg 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 0 && "$OUTPUT" == *"Directories to rename: 3"* && "$OUTPUT" == *"Conflicts (skipped):   1"* \
+      && "$OUTPUT" == *"Manifests to update:   2"* ]]; then
+    test_pass "--dry-run prints rename, conflict and manifest counts"
+else
+    test_fail "Unexpected plan (exit $EXIT_CODE): $OUTPUT"
+fi
+if [[ -d "$TEST_TMP/tree/.claude" && -d "$TEST_TMP/tree/a/.claude" && ! -e "$TEST_TMP/tree/.myorg" ]]; then
+    test_pass "--dry-run changes nothing"
+else
+    test_fail "--dry-run renamed directories"
+fi
+
+# Test 2: Migration
+test_section "Migration"
+OUTPUT=$(migrate --migrate .claude .myorg --batch-size=1 --jobs=2 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 0 && -d "$TEST_TMP/tree/.myorg/role-guides" && -d "$TEST_TMP/tree/a/.myorg" \
+      && -d "$TEST_TMP/tree/b/c/.myorg" && "$OUTPUT" == *"Renamed 3/3 directories"* ]]; then
+    test_pass "Every matching directory is renamed in batches"
+else
+    test_fail "Migration incomplete (exit $EXIT_CODE): $OUTPUT"
+fi
+if [[ -d "$TEST_TMP/tree/node_modules/pkg/.claude" && -d "$TEST_TMP/tree/.git/.claude" ]]; then
+    test_pass "node_modules and .git are not walked"
+else
+    test_fail "A pruned directory was renamed"
+fi
+if [[ -d "$TEST_TMP/tree/d/.claude" && -d "$TEST_TMP/tree/d/.myorg" ]]; then
+    test_pass "Conflicting targets are skipped"
+else
+    test_fail "Conflict was not skipped"
+fi
+if grep -q '"claude_dir_name": ".myorg"' "$TEST_TMP/tree/.myorg/paths.json" \
+      && grep -q '"claude_dir_name": ".myorg"' "$TEST_TMP/tree/a/.myorg/paths.json" \
+      && grep -q '"role_guides_dir": "guides"' "$TEST_TMP/tree/a/.myorg/paths.json" \
+      && grep -q '"claude_dir_name": ".other"' "$TEST_TMP/tree/b/paths.json"; then
+    test_pass "Nested paths.json files follow the rename, unrelated ones are kept"
+else
+    test_fail "Manifests: $(cat "$TEST_TMP/tree/.myorg/paths.json" "$TEST_TMP/tree/a/.myorg/paths.json" 2>&1)"
+fi
+
+# Test 3: Rollback
+test_section "Rollback"
+make_tree
+cat > "$TEST_TMP/bin/mv" <<'SHIM'
+#!/bin/sh
+case "$*" in *b/c/.claude*) exit 1;; esac
+exec /bin/mv "$@"
+SHIM
+chmod +x "$TEST_TMP/bin/mv"
+OUTPUT=$(PATH="$TEST_TMP/bin:$PATH" migrate --migrate .claude .myorg --batch-size=1 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 2 && -d "$TEST_TMP/tree/.claude" && -d "$TEST_TMP/tree/a/.claude" && -d "$TEST_TMP/tree/b/c/.claude" \
+      && ! -e "$TEST_TMP/tree/.myorg" && ! -e "$TEST_TMP/tree/a/.myorg" ]] \
+      && grep -q '"claude_dir_name": ".claude"' "$TEST_TMP/tree/a/.claude/paths.json"; then
+    test_pass "A failed rename rolls back every directory and manifest"
+else
+    test_fail "Not rolled back (exit $EXIT_CODE): $OUTPUT"
+fi
+
+# Test 4: Role guides directory
+test_section "Role Guides Directory"
+make_tree
+OUTPUT=$(migrate --migrate role-guides guides 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 0 && -d "$TEST_TMP/tree/.claude/guides" && ! -e "$TEST_TMP/tree/guides" ]] \
+      && grep -q '"role_guides_dir": "guides"' "$TEST_TMP/tree/.claude/paths.json" \
+      && grep -q '"claude_dir_name": ".claude"' "$TEST_TMP/tree/.claude/paths.json"; then
+    test_pass "Renaming role guides updates role_guides_dir in the config manifest"
+else
+    test_fail "Unexpected role guides migration (exit $EXIT_CODE): $OUTPUT"
+fi
+
+# Test 5: Malformed manifests
+test_section "Malformed Manifests"
+rm -rf "$TEST_TMP/tree"
+for p in p1 p2 p3 p4; do
+    mkdir -p "$TEST_TMP/tree/$p/.claude"
+    echo '{"claude_dir_name": ".claude"}' > "$TEST_TMP/tree/$p/.claude/paths.json"
+done
+echo '{bad' > "$TEST_TMP/tree/p2/.claude/paths.json"
+echo '[' > "$TEST_TMP/tree/p4/.claude/paths.json"
+OUTPUT=$(migrate --dry-run --migrate .claude .myorg 2>&1)
+if [[ "$OUTPUT" == *"Manifests to update:   2"* && "$OUTPUT" == *"p2/.claude/paths.json (invalid JSON)"* \
+      && "$OUTPUT" == *"p4/.claude/paths.json (invalid JSON)"* && "$OUTPUT" == *"p3/.myorg/paths.json"* ]]; then
+    test_pass "Manifests after a malformed one are still read"
+else
+    test_fail "Unexpected plan: $OUTPUT"
+fi
+OUTPUT=$(migrate --migrate .claude .myorg 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 1 && "$OUTPUT" == *"2 manifest(s) are not valid JSON"* && "$OUTPUT" != *"Migration complete"* \
+      && -d "$TEST_TMP/tree/p1/.claude" && -d "$TEST_TMP/tree/p3/.claude" && ! -e "$TEST_TMP/tree/p1/.myorg" ]]; then
+    test_pass "A malformed manifest aborts the migration before anything is renamed"
+else
+    test_fail "Migration not aborted (exit $EXIT_CODE): $OUTPUT"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
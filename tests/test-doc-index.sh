@@ -0,0 +1,233 @@
+#!/usr/bin/env bash
+
+# test-doc-index.sh - Test suite for the incremental document index (doc_index.py)
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+INDEXER="$PROJECT_ROOT/scripts/doc_index.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-doc-index-$$"
+DOCS="$TEST_TMP/docs"
+INDEX="$TEST_TMP/index"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v python3 &>/dev/null; then
+    echo "python3 not found; skipping"
+    exit 0
+fi
+
+# Usage: update_index [args...]
+update_index() {
+    python3 "$INDEXER" update --index "$INDEX" --root "$DOCS" "$@"
+}
+
+# Usage: query_paths <terms...> (matching file names, best first)
+query_paths() {
+    python3 "$INDEXER" query --index "$INDEX" --json "$@" 2>/dev/null \
+        | python3 -c 'import json,os,sys; print(" ".join(os.path.basename(h["path"]) for h in json.load(sys.stdin)))'
+}
+
+# Usage: index_stat <key>
+index_stat() {
+    python3 "$INDEXER" stats --index "$INDEX" --json | python3 -c 'import json,sys; print(json.load(sys.stdin)[sys.argv[1]])' "$1"
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Document Index - Test Suite                         ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$DOCS/role-guides" "$DOCS/standards" "$DOCS/node_modules/pkg"
+cat > "$DOCS/role-guides/devops-engineer-guide.md" <<'MD'
+# DevOps Engineer
+
+Own the deployment pipeline and the incident runbooks.
+Every deployment is reviewed against the security standards.
+MD
+cat > "$DOCS/standards/security-standards.md" <<'MD'
+# Security Standards
+
+Secrets are rotated quarterly. Dependencies are scanned before deployment.
+MD
+cat > "$DOCS/standards/code-review.md" <<'MD'
+# Code Review
+
+Two approvals are required. Reviewers check tests and documentation.
+MD
+echo '{"deployment": "should not be indexed"}' > "$DOCS/node_modules/pkg/package.json"
+echo "binary deployment" > "$DOCS/standards/diagram.png"
+
+# Test 1: Building
+test_section "Building"
+OUTPUT=$(update_index 2>&1)
+if [[ $? -eq 0 && "$OUTPUT" == *"✓ Index updated: 3 added, 0 changed, 0 removed, 0 unchanged (3 documents, 1 segments"* ]]; then
+    test_pass "Documents are indexed; other file types and dependency dirs are skipped"
+else
+    test_fail "Unexpected build: $OUTPUT"
+fi
+
+OUTPUT=$(update_index 2>&1)
+[[ "$OUTPUT" == *"Index up to date: 0 added, 0 changed, 0 removed, 3 unchanged"* ]] \
+    && test_pass "A second update reads nothing" || test_fail "Unexpected update: $OUTPUT"
+
+touch -d '2001-01-01' "$DOCS/standards/code-review.md"
+OUTPUT=$(update_index 2>&1)
+[[ "$OUTPUT" == *"0 changed"*"3 unchanged"* && "$(index_stat segments)" == "1" ]] \
+    && test_pass "Touching a file without changing it adds no segment" || test_fail "Unexpected update: $OUTPUT"
+
+# Test 2: Incremental updates
+test_section "Incremental Updates"
+echo "Rollback steps for a failed deployment." >> "$DOCS/standards/code-review.md"
+rm "$DOCS/standards/security-standards.md"
+printf '# Incident Response\n\nPage the on-call engineer, then open an incident channel.\n' > "$DOCS/standards/incident-response.md"
+OUTPUT=$(update_index 2>&1)
+if [[ "$OUTPUT" == *"1 added, 1 changed, 1 removed, 1 unchanged (3 documents, "* ]]; then
+    test_pass "Added, changed and removed files are picked up"
+else
+    test_fail "Unexpected update: $OUTPUT"
+fi
+
+HITS=$(query_paths secrets)
+[[ -z "$HITS" ]] && test_pass "Removed documents no longer match" || test_fail "Removed document matched: $HITS"
+
+for i in $(seq 1 10); do
+    echo "Retrospective notes $i: deployment went fine." > "$DOCS/standards/retro-$i.md"
+    update_index > /dev/null 2>&1
+done
+SEGMENTS=$(index_stat segments)
+DOCUMENTS=$(index_stat documents)
+if [[ $SEGMENTS -le 8 && $DOCUMENTS -eq 13 && $(ls "$INDEX"/seg-*.bin | wc -l) -eq $SEGMENTS \
+      && "$(query_paths approvals)" == "code-review.md" && "$(query_paths retrospective 7)" == "retro-7.md "* ]]; then
+    test_pass "Segments are merged ($SEGMENTS segments, $DOCUMENTS documents, no leftover files)"
+else
+    test_fail "Segments not merged: $SEGMENTS segments, $DOCUMENTS documents"
+fi
+
+OUTPUT=$(update_index --full 2>&1)
+[[ "$OUTPUT" == *"13 added"*"(13 documents, 1 segments"* ]] && test_pass "--full rebuilds one segment" || test_fail "Unexpected rebuild: $OUTPUT"
+
+# Test 3: Queries
+test_section "Queries"
+HITS=$(query_paths deployment pipeline --limit 3)
+[[ "$HITS" == "devops-engineer-guide.md "* ]] && test_pass "Documents matching more terms rank first" || test_fail "Ranking: $HITS"
+
+HITS=$(query_paths "incid*")
+[[ "$HITS" == *"incident-response.md"* && "$HITS" == *"devops-engineer-guide.md"* ]] \
+    && test_pass "A trailing * matches by prefix" || test_fail "Prefix: $HITS"
+
+OUTPUT=$(python3 "$INDEXER" query --index "$INDEX" --json rollback 2>&1)
+if python3 -c '
+import json, sys
+hit, = json.loads(sys.argv[1])
+with open(hit["path"], "rb") as f:
+    data = f.read()
+assert hit["line"] == 4 and hit["matched"] == 1, hit
+assert all(data[o:o + 8].lower() == b"rollback" for o in hit["offsets"]), hit["offsets"]
+' "$OUTPUT" 2>/dev/null; then
+    test_pass "Offsets point at the matched term and the line is reported"
+else
+    test_fail "Unexpected hit: $OUTPUT"
+fi
+
+echo "Rollback is now automatic." > "$DOCS/standards/code-review.md"
+OUTPUT=$(python3 "$INDEXER" query --index "$INDEX" rollback 2>&1)
+[[ "$OUTPUT" == *"code-review.md  (changed since indexed)"* ]] \
+    && test_pass "Hits in files changed since indexing are flagged" || test_fail "Unexpected output: $OUTPUT"
+
+# Test 4: Errors
+test_section "Errors"
+OUTPUT=$(python3 "$INDEXER" query --index "$TEST_TMP/absent" anything 2>&1)
+[[ $? -eq 2 && "$OUTPUT" == *"doc_index.py update"* ]] && test_pass "A missing index exits 2 with a hint" || test_fail "Unexpected: $OUTPUT"
+
+python3 "$INDEXER" query --index "$INDEX" qqqqzzzz > /dev/null 2>&1
+[[ $? -eq 1 ]] && test_pass "No matches exits 1" || test_fail "Expected exit 1 for no matches"
+
+# Test 5: Default roots (the config dir role-manager.sh would use)
+test_section "Default Roots"
+PROJECT="$TEST_TMP/project"
+mkdir -p "$PROJECT/.claude/role-guides" "$PROJECT/src"
+echo "Quarterly zebracorn review checklist." > "$PROJECT/.claude/role-guides/qa-engineer-guide.md"
+OUTPUT=$(cd "$PROJECT/src" && HOME="$TEST_TMP/home" RCM_DOC_INDEX_DIR="$TEST_TMP/default-index" \
+    python3 "$INDEXER" update 2>&1)
+if [[ $? -eq 0 && "$OUTPUT" == *"✓ Index updated"* ]]; then
+    test_pass "update without --root indexes the workspace's config dir"
+else
+    test_fail "Bare update failed: $OUTPUT"
+fi
+OUTPUT=$(cd "$PROJECT/src" && HOME="$TEST_TMP/home" RCM_DOC_INDEX_DIR="$TEST_TMP/default-index" \
+    python3 "$INDEXER" query --json zebracorn 2>&1)
+[[ "$OUTPUT" == *"qa-engineer-guide.md"* ]] && test_pass "The default index is found from a subdirectory" || test_fail "Default index query: $OUTPUT"
+
+ORG="$TEST_TMP/org"
+mkdir -p "$ORG/.claude" "$ORG/.myorg" "$TEST_TMP/home/.claude" "$TEST_TMP/loose"
+echo '{"claude_dir_name": ".myorg"}' > "$ORG/.claude/paths.json"
+OUTPUT=$(cd "$PROJECT_ROOT/scripts" && HOME="$TEST_TMP/home" python3 -c '
+import os, sys
+import doc_index
+for workspace in sys.argv[1:]:
+    owner, roots = doc_index.default_roots(workspace)
+    print(owner, [r for r in roots if r != doc_index.TEMPLATES_ROOT])
+' "$ORG" "$TEST_TMP/loose" 2>&1)
+EXPECTED="$ORG ['$ORG/.myorg']
+$TEST_TMP/loose ['$TEST_TMP/home/.claude']"
+[[ "$OUTPUT" == "$EXPECTED" ]] && test_pass "Default roots follow paths.json and fall back to the global config dir" || test_fail "Default roots: $OUTPUT"
+
+# Test 6: Lookup speed on a larger corpus
+test_section "Performance"
+python3 - "$TEST_TMP/corpus" <<'PY'
+import os, random, sys
+random.seed(7)
+words = [f'w{n}' for n in range(20000)]
+weights = [1 / (n + 1) for n in range(len(words))]
+for d in range(5000):
+    folder = os.path.join(sys.argv[1], f'd{d % 50}')
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f'doc{d}.md'), 'w') as f:
+        f.write(' '.join(random.choices(words, weights, k=random.randint(50, 400))))
+PY
+python3 "$INDEXER" update --index "$TEST_TMP/corpus-index" --root "$TEST_TMP/corpus" > /dev/null 2>&1
+OUTPUT=$(cd "$PROJECT_ROOT/scripts" && python3 -c '
+import sys, time
+import doc_index
+queries = ["w300 w301", "w1000 w2000", "w3 w500 w7000", "w42", "w25*"]
+with doc_index.DocIndex(sys.argv[1]) as index:
+    assert all(index.search(q) for q in queries)
+    start = time.perf_counter()
+    for _ in range(10):
+        for q in queries:
+            index.search(q)
+print(int((time.perf_counter() - start) / 50 * 1000))
+' "$TEST_TMP/corpus-index" 2>&1)
+[[ "$OUTPUT" =~ ^[0-9]+$ && $OUTPUT -lt 10 ]] && test_pass "A lookup over 5000 documents takes ${OUTPUT}ms" || test_fail "Lookup too slow or failed: $OUTPUT"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
@@ -0,0 +1,113 @@
+#!/usr/bin/env bash
+
+# test-document-resolver.sh - Test suite for memoized document path resolution
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-document-resolver-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Repo with a project .claude dir at the root, a subdirectory to run from,
+# and a global config dir in an isolated HOME
+mkdir -p "$TEST_TMP/home/.claude/shared" "$TEST_TMP/repo/.claude" "$TEST_TMP/repo/docs" "$TEST_TMP/repo/sub/docs"
+git -C "$TEST_TMP/repo" init -q 2>/dev/null
+echo "root" > "$TEST_TMP/repo/docs/root.md"
+echo "local" > "$TEST_TMP/repo/sub/docs/local.md"
+echo "both-root" > "$TEST_TMP/repo/docs/both.md"
+echo "both-local" > "$TEST_TMP/repo/sub/docs/both.md"
+echo "global" > "$TEST_TMP/home/.claude/shared/global.md"
+
+# Usage: in_repo <script> (runs a snippet with role-manager.sh sourced, from repo/sub)
+in_repo() {
+    (cd "$TEST_TMP/repo/sub" && HOME="$TEST_TMP/home" bash -c 'source "$1"; eval "$2"' _ "$ROLE_MANAGER" "$1")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Document Path Resolver - Test Suite                 ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Resolution order
+test_section "Resolution Order"
+RESULT=$(in_repo 'resolve_document_path docs/local.md')
+[[ "$RESULT" == "$TEST_TMP/repo/sub/docs/local.md" ]] && test_pass "Current directory first" || test_fail "Current directory: $RESULT"
+
+RESULT=$(in_repo 'resolve_document_path docs/root.md')
+[[ "$RESULT" == "$TEST_TMP/repo/docs/root.md" ]] && test_pass "Project root second" || test_fail "Project root: $RESULT"
+
+RESULT=$(in_repo 'resolve_document_path docs/both.md')
+[[ "$RESULT" == "$TEST_TMP/repo/sub/docs/both.md" ]] && test_pass "Current directory wins over project root" || test_fail "Precedence: $RESULT"
+
+RESULT=$(in_repo 'resolve_document_path shared/global.md')
+[[ "$RESULT" == "$TEST_TMP/home/.claude/shared/global.md" ]] && test_pass "Global config dir last" || test_fail "Global dir: $RESULT"
+
+RESULT=$(in_repo 'resolve_document_path /docs/root.md')
+[[ "$RESULT" == "$TEST_TMP/repo/docs/root.md" ]] && test_pass "Absolute reference resolved from git top-level" || test_fail "Absolute: $RESULT"
+
+RESULT=$(in_repo 'rc=0; resolve_document_path docs/missing.md || rc=$?; echo "rc=$rc"')
+[[ "$RESULT" == $'docs/missing.md\nrc=1' ]] && test_pass "Missing relative reference reported as-is with status 1" || test_fail "Missing: $RESULT"
+
+RESULT=$(in_repo 'rc=0; resolve_document_path /docs/missing.md || rc=$?; echo "rc=$rc"')
+[[ "$RESULT" == "$TEST_TMP/repo/docs/missing.md"$'\nrc=1' ]] && test_pass "Missing absolute reference reports the would-be path" || test_fail "Missing absolute: $RESULT"
+
+# Test 2: Batch resolution
+test_section "Batch Resolution"
+RESULT=$(in_repo 'rc=0; resolve_document_paths docs/local.md docs/missing.md /docs/root.md || rc=$?; echo "rc=$rc ${RESOLVED_DOC_FOUND[*]} ${#RESOLVED_DOC_PATHS[@]}"')
+[[ "$RESULT" == "rc=1 1 0 1 3" ]] && test_pass "Batch fills parallel path/found arrays" || test_fail "Batch: $RESULT"
+
+# Test 3: Memoization
+test_section "Memoization"
+if command -v jq &>/dev/null; then
+    (cd "$TEST_TMP/repo/sub" && HOME="$TEST_TMP/home" RCM_TRACE="$TEST_TMP/trace.jsonl" bash -c '
+        source "$1"
+        refs=()
+        for i in $(seq 1 50); do refs+=("/docs/root.md" "/docs/gone-$i.md" "docs/local.md"); done
+        resolve_document_paths "${refs[@]}" || true' _ "$ROLE_MANAGER") >/dev/null 2>&1
+    GIT_CALLS=$(jq -s '[.[] | select(.ev == "exec" and .cmd == "git")] | length' "$TEST_TMP/trace.jsonl" 2>/dev/null)
+    if [[ "$GIT_CALLS" == "1" ]]; then
+        test_pass "git top-level computed once for 100 absolute references"
+    else
+        test_fail "git ran $GIT_CALLS times"
+    fi
+fi
+
+RESULT=$(in_repo 'resolve_document_ref docs/later.md || true; echo "later" > docs/later.md; rc=0; resolve_document_ref docs/later.md || rc=$?; echo "rc=$rc"')
+[[ "$RESULT" == "rc=1" ]] && test_pass "Misses are negative-cached within an invocation" || test_fail "Negative cache: $RESULT"
+rm -f "$TEST_TMP/repo/sub/docs/later.md"
+
+RESULT=$(in_repo 'resolve_document_ref docs/root.md; cd ..; resolve_document_ref docs/both.md; echo "$DOC_RESOLVED"')
+[[ "$RESULT" == "$TEST_TMP/repo/docs/both.md" ]] && test_pass "Changing directory re-initializes the resolver" || test_fail "Re-init: $RESULT"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
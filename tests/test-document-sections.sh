@@ -0,0 +1,185 @@
+#!/usr/bin/env bash
+
+# test-document-sections.sh - Test suite for path.md#heading document references
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+HEADING_INDEX="$PROJECT_ROOT/scripts/heading_index.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-document-sections-$$"
+WS="$TEST_TMP/ws"
+INDEX_DIR="$TEST_TMP/headings"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: rm_run <command> [args...] (role-manager.sh in the workspace, isolated caches)
+rm_run() {
+    (cd "$WS" && HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/packs" RCM_HEADING_INDEX_DIR="$INDEX_DIR" \
+        bash "$ROLE_MANAGER" "$@")
+}
+
+# Usage: rm_eval <code> (role-manager.sh functions sourced in the workspace)
+rm_eval() {
+    (cd "$WS" && HOME="$TEST_TMP/home" RCM_HEADING_INDEX_DIR="$INDEX_DIR" \
+        bash -c 'source "$1"; eval "$2"' _ "$ROLE_MANAGER" "$1")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Document Sections - Test Suite                      ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$WS/.claude/role-guides" "$WS/docs" "$TEST_TMP/home"
+cat > "$WS/docs/standards.md" <<'DOC'
+# Engineering Standards
+
+Intro text.
+
+## Code Review
+
+Review rules.
+
+```
+## Not a heading
+```
+
+### Review Checklist
+
+- item
+
+## Testing ##
+
+Test rules.
+DOC
+echo '{"user_role": "software-engineer"}' > "$WS/.claude/preferences.json"
+cat > "$WS/.claude/role-guides/software-engineer-guide.md" <<'GUIDE'
+# Software Engineer
+
+## Document References
+
+- docs/standards.md#code-review
+- `docs/standards.md#Testing`
+- docs/standards.md#deployment
+
+## Responsibilities
+GUIDE
+
+# Test 1: Reference parsing
+test_section "Reference Parsing"
+REFS=$(rm_eval 'extract_document_references .claude/role-guides/software-engineer-guide.md' 2>&1)
+if [[ "$REFS" == '["docs/standards.md#code-review","docs/standards.md#Testing","docs/standards.md#deployment"]' ]]; then
+    test_pass "Section references keep their heading"
+else
+    test_fail "Unexpected references: $REFS"
+fi
+
+# Test 2: Heading index
+test_section "Heading Index"
+OUTPUT=$(rm_eval 'find_document_section docs/standards.md "Review Checklist" && echo "$SECTION_START $SECTION_LENGTH"; find_document_section docs/standards.md missing || echo "rc=$?"' 2>&1)
+if [[ "$OUTPUT" == "95 30"$'\n'"rc=1" ]]; then
+    test_pass "Sections are located by anchor; unknown headings return 1"
+else
+    test_fail "Unexpected lookup: $OUTPUT"
+fi
+
+INDEX_FILE=$(ls "$INDEX_DIR"/*.idx 2>/dev/null | head -1)
+SIGNATURE=$(stat -c '%s:%.9Y' "$WS/docs/standards.md" 2>/dev/null || stat -f '%z:%.9Fm' "$WS/docs/standards.md")
+if [[ -n "$INDEX_FILE" && "$(sed -n 2p "$INDEX_FILE")" == "S"$'\t'"${SIGNATURE%%:*}"$'\t'"${SIGNATURE#*:}" ]] && ! grep -q "not-a-heading" "$INDEX_FILE"; then
+    test_pass "The index carries the document's size and mtime and skips fenced code"
+else
+    test_fail "Index missing or wrong: $(cat "$INDEX_FILE" 2>&1)"
+fi
+
+# A stale-looking index that still matches the signature is trusted: lookups do not rescan
+sed -i 's/code-review/code-review-cached/' "$INDEX_FILE"
+OUTPUT=$(rm_eval 'find_document_section docs/standards.md code-review-cached && echo found' 2>&1)
+[[ "$OUTPUT" == "found" ]] && test_pass "Lookups read the index instead of the document" || test_fail "Index not used: $OUTPUT"
+
+sleep 0.01
+echo "" >> "$WS/docs/standards.md"
+OUTPUT=$(rm_eval 'find_document_section docs/standards.md code-review && echo found' 2>&1)
+[[ "$OUTPUT" == "found" ]] && test_pass "A changed mtime rebuilds the index" || test_fail "Stale index used: $OUTPUT"
+
+touch -r "$WS/docs/standards.md" "$TEST_TMP/mtime"
+printf '\n## Same Tick\n' >> "$WS/docs/standards.md"
+touch -r "$TEST_TMP/mtime" "$WS/docs/standards.md"
+OUTPUT=$(rm_eval 'find_document_section docs/standards.md same-tick && echo found' 2>&1)
+[[ "$OUTPUT" == "found" ]] && test_pass "A changed size under the same mtime rebuilds the index" || test_fail "Stale index used: $OUTPUT"
+
+# An edit landing during a scan (here, when the scan checks the last byte)
+# leaves the index stale, not wrong
+sleep 0.01
+touch "$WS/docs/standards.md"
+OUTPUT=$(rm_eval 'tail() { printf "\n## Late Edit\n" >> docs/standards.md; command tail "$@"; }
+    find_document_section docs/standards.md code-review; unset -f tail
+    find_document_section docs/standards.md late-edit && echo found' 2>&1)
+[[ "$OUTPUT" == "found" ]] && test_pass "An edit during a scan is caught by the next lookup" || test_fail "Index kept under the new signature: $OUTPUT"
+
+if command -v python3 &>/dev/null; then
+    cp "$INDEX_FILE" "$TEST_TMP/bash.idx"
+    rm -f "$INDEX_FILE"
+    RCM_HEADING_INDEX_DIR="$INDEX_DIR" python3 "$HEADING_INDEX" "$WS/docs/standards.md" > /dev/null
+    if cmp -s "$TEST_TMP/bash.idx" "$INDEX_FILE"; then
+        test_pass "heading_index.py writes the same index"
+    else
+        test_fail "Index differs: $(diff "$TEST_TMP/bash.idx" "$INDEX_FILE")"
+    fi
+fi
+
+# Test 3: Loading
+test_section "Loading"
+OUTPUT=$(rm_run load-role-context 2>&1)
+if [[ "$OUTPUT" == *"### Document: docs/standards.md#code-review"$'\n'"---"$'\n'"## Code Review"*"- item"$'\n'"---"* \
+      && "$OUTPUT" == *"## Testing ##"$'\n\n'"Test rules."* && "$OUTPUT" != *"Intro text."* \
+      && "$OUTPUT" != *"### Document: docs/standards.md#deployment"* ]]; then
+    test_pass "Only the referenced sections are loaded; missing headings are skipped"
+else
+    test_fail "Unexpected context: $OUTPUT"
+fi
+
+OUTPUT=$(rm_run load-role-context --quiet 2>&1)
+[[ "$OUTPUT" == *"(2 documents)"* ]] && test_pass "Quiet mode counts sections" || test_fail "Unexpected count: $OUTPUT"
+
+PACK=$(ls "$TEST_TMP/packs"/*.pack 2>/dev/null | head -1)
+if grep -q $'\tnosection\tdocs/standards.md#deployment\t' "$PACK" 2>/dev/null; then
+    test_pass "The pack records a missing heading against its document"
+else
+    test_fail "Pack index: $(grep -a '^[EM]' "$PACK" 2>&1)"
+fi
+
+sleep 0.01
+printf '\n## Deployment\n\nDeploy rules.\n' >> "$WS/docs/standards.md"
+OUTPUT=$(rm_run load-role-context 2>&1)
+[[ "$OUTPUT" == *"Deploy rules."* ]] && test_pass "Adding the heading invalidates the pack" || test_fail "Stale pack served: $OUTPUT"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
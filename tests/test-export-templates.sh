@@ -0,0 +1,140 @@
+#!/usr/bin/env bash
+
+# test-export-templates.sh - Test suite for batch template export (export-templates.py)
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+EXPORTER="$PROJECT_ROOT/scripts/export-templates.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-export-templates-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Template Export - Test Suite                        ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Script validation
+test_section "Script Validation"
+python3 -m py_compile "$EXPORTER" 2>/dev/null && test_pass "export-templates.py compiles" || test_fail "export-templates.py does not compile"
+# Test 2: HTML export (no WeasyPrint needed)
+test_section "HTML Export"
+mkdir -p "$TEST_TMP/src/guides" "$TEST_TMP/src/.claude/role-guides"
+cat > "$TEST_TMP/src/README.md" <<'MD'
+# Example Org
+
+See the [engineer guide](guides/engineer.md#duties) and `docs/`.
+
+| Level | Owner |
+|-------|-------|
+| company | CTO |
+
+- [x] Done item
+- [ ] Open item
+    - Nested item
+MD
+printf '# Engineer\n\n## Duties\n\n1. Ship\n2. Review\n' > "$TEST_TMP/src/guides/engineer.md"
+printf '# QA Engineer Guide\n\nTest things.\n' > "$TEST_TMP/src/.claude/role-guides/qa-engineer-guide.md"
+
+python3 "$EXPORTER" "$TEST_TMP/src" -o "$TEST_TMP/out" --format html --jobs 2 > "$TEST_TMP/first.log" 2>&1
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 0 && -f "$TEST_TMP/out/README.html" && -f "$TEST_TMP/out/guides/engineer.html" \
+      && -f "$TEST_TMP/out/.claude/role-guides/qa-engineer-guide.html" && -z "$(find "$TEST_TMP/out" -name '*.pdf')" ]]; then
+    test_pass "HTML written for every Markdown file (including role guides), and no PDF"
+else
+    test_fail "HTML export failed (exit $EXIT_CODE): $(cat "$TEST_TMP/first.log")"
+fi
+
+if grep -q '<table>' "$TEST_TMP/out/README.html" && grep -q 'href="guides/engineer.html#duties"' "$TEST_TMP/out/README.html" \
+      && grep -q '<li>☑ Done item' "$TEST_TMP/out/README.html"; then
+    test_pass "HTML has tables, task lists and links rewritten to exported files"
+else
+    test_fail "HTML conversion incomplete"
+fi
+
+if grep -q 'Page " counter(page)' "$TEST_TMP/out/style.css"; then
+    test_pass "Shared stylesheet comes from generate_css()"
+else
+    test_fail "style.css missing cheatsheet styles"
+fi
+
+if grep -q 'qa-engineer-guide.html' "$TEST_TMP/out/index.html"; then
+    test_pass "Index document links every export"
+else
+    test_fail "Index document missing entries"
+fi
+
+# Test 3: Incremental export
+test_section "Incremental Export"
+python3 "$EXPORTER" "$TEST_TMP/src" -o "$TEST_TMP/out" --format html > "$TEST_TMP/second.log" 2>&1
+if grep -q 'Exported 0 file(s), skipped 3 unchanged' "$TEST_TMP/second.log"; then
+    test_pass "Unchanged files skipped by content hash"
+else
+    test_fail "Unchanged files re-exported: $(tail -3 "$TEST_TMP/second.log")"
+fi
+
+cp -r "$TEST_TMP/src" "$TEST_TMP/src-pdf"
+echo "- Learn" >> "$TEST_TMP/src/guides/engineer.md"
+rm "$TEST_TMP/src/.claude/role-guides/qa-engineer-guide.md"
+python3 "$EXPORTER" "$TEST_TMP/src" -o "$TEST_TMP/out" --format html > "$TEST_TMP/third.log" 2>&1
+if grep -q 'Exported 1 file(s), skipped 1 unchanged' "$TEST_TMP/third.log"; then
+    test_pass "Only the edited file re-exported"
+else
+    test_fail "Unexpected incremental result: $(tail -3 "$TEST_TMP/third.log")"
+fi
+
+if [[ ! -f "$TEST_TMP/out/.claude/role-guides/qa-engineer-guide.html" ]] && ! grep -q 'qa-engineer-guide' "$TEST_TMP/out/index.html"; then
+    test_pass "Outputs of deleted sources removed"
+else
+    test_fail "Stale outputs left behind"
+fi
+
+# Test 4: PDF export
+test_section "PDF Export"
+if ! python3 -c 'import weasyprint' &>/dev/null; then
+    OUTPUT=$(python3 "$EXPORTER" "$TEST_TMP/src-pdf" -o "$TEST_TMP/out-pdf" 2>&1)
+    [[ $? -eq 2 && "$OUTPUT" == *"PDF export needs WeasyPrint"*"--format html"* ]] \
+        && test_pass "Without WeasyPrint a PDF export exits 2 with a hint" || test_fail "Unexpected: $OUTPUT"
+    echo -e "${YELLOW}⚠${NC} WeasyPrint not available - skipping PDF rendering tests"
+else
+    python3 "$EXPORTER" "$TEST_TMP/src-pdf" -o "$TEST_TMP/out-pdf" --jobs 2 > "$TEST_TMP/pdf.log" 2>&1
+    if [[ -f "$TEST_TMP/out-pdf/README.pdf" && -f "$TEST_TMP/out-pdf/guides/engineer.pdf" \
+          && -f "$TEST_TMP/out-pdf/.claude/role-guides/qa-engineer-guide.pdf" && -f "$TEST_TMP/out-pdf/index.pdf" ]]; then
+        test_pass "PDF written for every Markdown file and the index"
+    else
+        test_fail "Missing PDF output: $(cat "$TEST_TMP/pdf.log")"
+    fi
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
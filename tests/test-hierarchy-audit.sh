@@ -0,0 +1,154 @@
+#!/usr/bin/env bash
+
+# test-hierarchy-audit.sh - Test suite for the whole-tree hierarchy audit
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+HIERARCHY_DETECTOR="$PROJECT_ROOT/scripts/hierarchy-detector.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-hierarchy-audit-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: make_level <dir> <json>
+make_level() {
+    mkdir -p "$1/.claude"
+    echo "$2" > "$1/.claude/organizational-level.json"
+}
+
+# Usage: audit [args...] (runs from the fixture root with an isolated HOME)
+audit() {
+    (cd "$ORG" && HOME="$TEST_TMP/home" bash "$HIERARCHY_DETECTOR" audit "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Hierarchy Audit - Test Suite                        ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+ORG="$TEST_TMP/org"
+mkdir -p "$TEST_TMP/home"
+make_level "$ORG" '{"level": "company"}'
+make_level "$ORG/platform" '{"level": "system", "parent_level": "company"}'
+make_level "$ORG/platform/api" '{"level": "product", "parent_level": "system"}'
+make_level "$ORG/platform/api/service" '{"level": "project", "parent_level": "product"}'
+make_level "$ORG/platform/api/src/deep/worker" '{"level": "project", "parent_level": "product"}'
+make_level "$ORG/app" '{"level": "project", "parent_level": "company"}'
+make_level "$ORG/app/node_modules/dep" '{"level": "company"}'
+
+# Test 1: Valid tree
+test_section "Valid Tree"
+OUTPUT=$(audit 2>&1)
+RC=$?
+[[ $RC -eq 0 ]] && test_pass "Exit code 0 for a valid tree" || test_fail "Exit code $RC"
+[[ "$OUTPUT" == *"6 directories, 0 violation(s)"* ]] && test_pass "Finds every config dir in one walk" || test_fail "Summary: $(echo "$OUTPUT" | tail -1)"
+[[ "$OUTPUT" != *node_modules* ]] && test_pass "Prunes node_modules" || test_fail "node_modules was audited"
+if echo "$OUTPUT" | grep -q "^        ✓ platform/api/src/deep/worker \[project\]"; then
+    test_pass "Nearest ancestor config dir is the parent, skipping plain directories"
+else
+    test_fail "Tree layout: $OUTPUT"
+fi
+
+# Test 2: Violations
+test_section "Violations"
+make_level "$ORG/app/child" '{"level": "project"}'
+make_level "$ORG/platform/api/service" '{"level": "project", "parent_level": "system"}'
+make_level "$ORG/platform/broken" '{"level": '
+make_level "$ORG/platform/odd" '{"level": "division"}'
+mkdir -p "$ORG/platform/bare/.claude"
+
+OUTPUT=$(audit 2>&1)
+RC=$?
+[[ $RC -eq 1 ]] && test_pass "Exit code 1 when violations exist" || test_fail "Exit code $RC"
+[[ "$OUTPUT" == *"/app/child: project cannot be a child of project"* ]] && test_pass "Invalid edge reported via is_valid_child_level" || test_fail "Invalid edge missing"
+[[ "$OUTPUT" == *"/platform/broken: unreadable organizational-level.json"* ]] && test_pass "Malformed level file reported" || test_fail "Malformed file missing"
+[[ "$OUTPUT" == *"/platform/odd: invalid level: division"* ]] && test_pass "Unknown level reported (file read after a malformed one)" || test_fail "Unknown level missing"
+[[ "$OUTPUT" == *"/platform/bare: missing organizational-level.json"* ]] && test_pass "Missing level file reported" || test_fail "Missing file missing"
+[[ "$OUTPUT" == *"/platform/api/service: recorded parent_level system does not match parent product"* ]] && test_pass "Stale recorded parent_level reported" || test_fail "Stale parent missing"
+
+# Test 3: JSON report and parallel reads
+test_section "JSON Report"
+if command -v jq &>/dev/null; then
+    SERIAL=$(audit --json --jobs 1 2>/dev/null)
+    PARALLEL=$(audit --json --jobs 4 2>/dev/null)
+    [[ -n "$SERIAL" && "$SERIAL" == "$PARALLEL" ]] && test_pass "Parallel reads produce the same report" || test_fail "Serial and parallel reports differ"
+    SUMMARY=$(echo "$PARALLEL" | jq -c '.summary')
+    [[ "$SUMMARY" == '{"directories":10,"violations":5}' ]] && test_pass "JSON summary counts directories and violations" || test_fail "Summary: $SUMMARY"
+    PARENT=$(echo "$PARALLEL" | jq -r '.nodes[] | select(.directory == "app/child") | .parent')
+    [[ "$PARENT" == "app" ]] && test_pass "JSON nodes carry their parent" || test_fail "Parent: $PARENT"
+fi
+
+# Test 4: Unusual names and roots
+test_section "Unusual Names and Roots"
+ODD="$TEST_TMP/odd"
+mkdir -p "$ODD/team/.cfg|v1" "$ODD/team/app/.cfg|v1"
+echo '{"level": "product"}' > "$ODD/team/.cfg|v1/organizational-level.json"
+echo '{"level": "project", "parent_level": "product"}' > "$ODD/team/app/.cfg|v1/organizational-level.json"
+OUTPUT=$(cd "$ODD" && RCM_CLAUDE_DIR_NAME=".cfg|v1" HOME="$TEST_TMP/home" bash "$HIERARCHY_DETECTOR" audit 2>&1)
+if [[ "$OUTPUT" == *"✓ team/app [project]"* && "$OUTPUT" == *"2 directories, 0 violation(s)"* ]]; then
+    test_pass "Config dir names are matched literally, not as patterns"
+else
+    test_fail "Odd config dir name: $OUTPUT"
+fi
+
+# Glob characters in the name must not match other directories (.cfgv1 fits .cfg[v]*)
+GLOB="$TEST_TMP/glob"
+mkdir -p "$GLOB/team/.cfg[v]*" "$GLOB/team/app/.cfgv1"
+echo '{"level": "product"}' > "$GLOB/team/.cfg[v]*/organizational-level.json"
+echo '{"level": "project"}' > "$GLOB/team/app/.cfgv1/organizational-level.json"
+OUTPUT=$(cd "$GLOB" && RCM_CLAUDE_DIR_NAME='.cfg[v]*' HOME="$TEST_TMP/home" bash "$HIERARCHY_DETECTOR" audit 2>&1)
+if [[ "$OUTPUT" == *"✓ team [product]"* && "$OUTPUT" != *"team/app"* && "$OUTPUT" == *"1 directories, 0 violation(s)"* ]]; then
+    test_pass "Glob characters in config dir names are matched literally"
+else
+    test_fail "Glob config dir name: $OUTPUT"
+fi
+
+if command -v jq &>/dev/null; then
+    # Auditing / itself would walk the whole filesystem; report a prepared tree
+    OUTPUT=$(HOME="$TEST_TMP/home" bash -c '
+        source "$1"
+        AUDIT_NODES=(/ /srv/app)
+        AUDIT_LEVEL=([/]=company [/srv/app]=project)
+        AUDIT_PARENT=([/]="" [/srv/app]=/)
+        AUDIT_VIOLATIONS=()
+        audit_hierarchy_json /' _ "$HIERARCHY_DETECTOR" 2>&1 | jq -c '[.nodes[] | [.directory, .parent]]')
+    [[ "$OUTPUT" == '[[".",null],["srv/app","."]]' ]] && test_pass "JSON paths are relative when the root is /" || test_fail "Root / paths: $OUTPUT"
+fi
+
+# Test 5: Usage errors
+test_section "Usage"
+audit "$TEST_TMP/missing" >/dev/null 2>&1
+[[ $? -eq 2 ]] && test_pass "Exit code 2 for a missing root" || test_fail "Missing root accepted"
+audit --jobs 0 >/dev/null 2>&1
+[[ $? -eq 2 ]] && test_pass "Rejects --jobs 0" || test_fail "--jobs 0 accepted"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
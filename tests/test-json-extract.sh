@@ -0,0 +1,183 @@
+#!/usr/bin/env bash
+
+# test-json-extract.sh - Test suite for the jq-less JSON extractor
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+LIBRARY="$PROJECT_ROOT/scripts/json-extract.sh"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-json-extract-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: run_lib <json file> <bash code> (library sourced, file in $f)
+run_lib() {
+    bash -c 'source "$1"; f="$2"; eval "$3"' _ "$LIBRARY" "$1" "$2"
+}
+
+# A PATH with every tool except jq, to exercise the fallbacks
+make_nojq_path() {
+    mkdir -p "$TEST_TMP/nojq"
+    local dir tool
+    for dir in /usr/local/bin /usr/bin /bin; do
+        for tool in "$dir"/*; do
+            [[ -x "$tool" && "${tool##*/}" != "jq" && ! -e "$TEST_TMP/nojq/${tool##*/}" ]] \
+                && ln -s "$tool" "$TEST_TMP/nojq/${tool##*/}"
+        done
+    done
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  JSON Extractor - Test Suite                         ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP"
+cat > "$TEST_TMP/nested.json" <<'JSON'
+{
+  "user_role": "software-engineer",
+  "applied_template": {"id": "awesome-cto", "mode": "standard", "meta": {"level": "project"}},
+  "decoy": {"user_role": "wrong"},
+  "quote": "say \"hi\" \\ bye",
+  "multi": "line one\nline two\ttabbed",
+  "unicode": "café 😀 \/",
+  "count": 3, "ratio": -1.5e2, "enabled": false, "missing": null, "empty": "",
+  "docs": ["/quality-standards.md", "docs/a b.md#Set Up", {"nested": ["x"]}],
+  "list": []
+}
+JSON
+
+# Test 1: Script validation
+test_section "Script Validation"
+bash -n "$LIBRARY" 2>/dev/null && test_pass "json-extract.sh syntax valid" || test_fail "json-extract.sh syntax error"
+
+# Test 2: Values
+test_section "Values"
+OUTPUT=$(run_lib "$TEST_TMP/nested.json" 'json_extract "$f" user_role .applied_template.mode applied_template.meta.level count ratio enabled missing empty' 2>&1)
+EXPECTED=$(printf '%s\t%s\n' user_role software-engineer .applied_template.mode standard applied_template.meta.level project \
+    count 3 ratio -1.5e2 enabled false empty "")
+[[ "$OUTPUT" == "$EXPECTED" ]] && test_pass "Nested paths, scalars and null in one pass" || test_fail "Unexpected values: $OUTPUT"
+
+OUTPUT=$(run_lib "$TEST_TMP/nested.json" 'json_value "$f" user_role; json_value "$f" decoy.user_role' 2>&1)
+[[ "$OUTPUT" == $'software-engineer\nwrong' ]] && test_pass "Keys are matched by position, not by name anywhere" || test_fail "Got: $OUTPUT"
+
+OUTPUT=$(run_lib "$TEST_TMP/nested.json" 'json_read "$f" quote multi unicode && printf "%s|" "${JSON_VALUES[quote]}" "${JSON_VALUES[multi]}" "${JSON_VALUES[unicode]}"' 2>&1)
+if [[ "$OUTPUT" == 'say "hi" \ bye|line one'$'\n''line two'$'\t''tabbed|café 😀 /|' ]]; then
+    test_pass "Escaped quotes, backslashes, newlines and \\u surrogate pairs are decoded"
+else
+    test_fail "Escapes not decoded: $OUTPUT"
+fi
+
+OUTPUT=$(run_lib "$TEST_TMP/nested.json" 'json_value "$f" ".docs[]"; json_value "$f" "docs[1]"; json_value "$f" "docs[2].nested"; json_value "$f" "list[]" || echo none' 2>&1)
+EXPECTED='/quality-standards.md
+docs/a b.md#Set Up
+{"nested": ["x"]}
+docs/a b.md#Set Up
+["x"]
+none'
+[[ "$OUTPUT" == "$EXPECTED" ]] && test_pass "Array elements, indexes and containers as JSON text" || test_fail "Unexpected array values: $OUTPUT"
+
+# Test 3: Errors
+test_section "Errors"
+printf '{"user_role": "a",\n "broken": [1, 2}\n' > "$TEST_TMP/broken.json"
+OUTPUT=$(run_lib "$TEST_TMP/broken.json" 'json_extract "$f" user_role' 2>&1)
+EXIT_CODE=$?
+[[ $EXIT_CODE -eq 1 && -z "$OUTPUT" ]] && test_pass "Malformed JSON fails without partial output" || test_fail "Malformed JSON accepted (exit $EXIT_CODE): $OUTPUT"
+
+OUTPUT=$(run_lib "$TEST_TMP/absent.json" 'json_value "$f" user_role || echo rc=$?' 2>&1)
+[[ "$OUTPUT" == "rc=1" ]] && test_pass "A missing file returns 1 quietly" || test_fail "Got: $OUTPUT"
+
+# Test 4: Parity with jq
+test_section "Parity With jq"
+if command -v jq &>/dev/null; then
+    MISMATCH=""
+    for path in user_role applied_template.mode quote multi unicode count enabled missing empty 'docs[1]'; do
+        OURS=$(run_lib "$TEST_TMP/nested.json" "json_value \"\$f\" '$path'" 2>&1)
+        THEIRS=$(jq -r ".$path | select(. != null)" "$TEST_TMP/nested.json")
+        [[ "$OURS" == "$THEIRS" ]] || MISMATCH+=" $path"
+    done
+    [[ -z "$MISMATCH" ]] && test_pass "Values match jq -r" || test_fail "Differs from jq for:$MISMATCH"
+else
+    echo "jq not found; skipping parity check"
+fi
+
+# Test 5: Fallbacks without jq
+test_section "Fallbacks Without jq"
+make_nojq_path
+PROJECT="$TEST_TMP/project"
+mkdir -p "$PROJECT/.claude/role-guides" "$PROJECT/docs" "$TEST_TMP/home/.claude"
+cat > "$PROJECT/.claude/preferences.json" <<'JSON'
+{
+  "applied_template": {"id": "t", "user_role": "not-this"},
+  "user_role": "software-engineer"
+}
+JSON
+echo '{"level": "project", "parent_level": "product"}' > "$PROJECT/.claude/organizational-level.json"
+cat > "$PROJECT/.claude/role-guides/software-engineer-guide.md" <<'GUIDE'
+# Software Engineer
+
+## Document References
+
+- `docs/design "v2".md`
+- docs/setup.md
+
+## Responsibilities
+GUIDE
+echo "# Design" > "$PROJECT/docs/design \"v2\".md"
+echo "# Setup" > "$PROJECT/docs/setup.md"
+
+OUTPUT=$(cd "$PROJECT" && PATH="$TEST_TMP/nojq" HOME="$TEST_TMP/home" \
+    bash -c 'source "$1"; get_preference user_role' _ "$ROLE_MANAGER" 2>&1)
+[[ "$OUTPUT" == "software-engineer" ]] && test_pass "get_preference reads the top-level key without jq" || test_fail "Unexpected role: $OUTPUT"
+
+OUTPUT=$(cd "$PROJECT" && PATH="$TEST_TMP/nojq" HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/packs" \
+    bash "$ROLE_MANAGER" load-role-context 2>&1)
+if [[ "$(grep -c '^### Document:' <<< "$OUTPUT")" == "2" && "$OUTPUT" == *"# Design"* && "$OUTPUT" == *"# Setup"* ]]; then
+    test_pass "load-role-context loads the guide's documents without jq"
+else
+    test_fail "Documents not loaded without jq: $OUTPUT"
+fi
+
+OUTPUT=$(PATH="$TEST_TMP/nojq" bash -c 'source "$1"; extract_document_references "$2"' _ "$ROLE_MANAGER" \
+    "$PROJECT/.claude/role-guides/software-engineer-guide.md" 2>&1)
+if [[ "$OUTPUT" == '["docs/design \"v2\".md","docs/setup.md"]' ]]; then
+    test_pass "extract_document_references escapes its JSON without jq"
+else
+    test_fail "Unexpected JSON: $OUTPUT"
+fi
+
+OUTPUT=$(PATH="$TEST_TMP/nojq" bash -c 'source "$1"; get_level_value "$2"' _ "$PROJECT_ROOT/scripts/hierarchy-detector.sh" \
+    "$PROJECT/.claude" 2>&1)
+[[ "$OUTPUT" == "project" ]] && test_pass "get_level_value reads the level without jq" || test_fail "Got level: $OUTPUT"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
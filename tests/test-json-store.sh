@@ -0,0 +1,174 @@
+#!/usr/bin/env bash
+
+# test-json-store.sh - Test suite for locked, atomic JSON updates (json-store.sh)
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+JSON_STORE="$PROJECT_ROOT/scripts/json-store.sh"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-json-store-$$"
+WRITERS=40
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+mkdir -p "$TEST_TMP/store" "$TEST_TMP/home" "$TEST_TMP/project/.claude"
+
+# Usage: store <function> [args...] (runs a json-store.sh function in a fresh shell)
+store() {
+    bash -c 'source "$0"; "$@"' "$JSON_STORE" "$@"
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  JSON Store (locking + atomic writes) - Test Suite   ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Script validation
+test_section "Script Validation"
+bash -n "$JSON_STORE" 2>/dev/null && test_pass "json-store.sh syntax valid" || test_fail "json-store.sh syntax error"
+
+# Test 2: Transactional updates
+test_section "Updates"
+FILE="$TEST_TMP/store/prefs.json"
+echo '{"keep": {"nested": [1, 2]}}' > "$FILE"
+store json_set_strings "$FILE" user_role "qa-engineer" theme 'dark "mode"'
+if jq -e '.user_role == "qa-engineer" and .theme == "dark \"mode\"" and .keep.nested == [1, 2]' "$FILE" >/dev/null 2>&1; then
+    test_pass "json_set_strings sets several keys and keeps the rest"
+else
+    test_fail "json_set_strings result: $(cat "$FILE")"
+fi
+
+store json_update "$TEST_TMP/store/new.json" '.count = ($n | tonumber)' --arg n 3
+if [[ "$(jq -r '.count' "$TEST_TMP/store/new.json" 2>/dev/null)" == "3" ]]; then
+    test_pass "json_update creates missing files"
+else
+    test_fail "json_update did not create the file"
+fi
+
+BEFORE="$(cat "$FILE")"
+if ! store json_update "$FILE" '.broken = (' 2>/dev/null && [[ "$(cat "$FILE")" == "$BEFORE" ]]; then
+    test_pass "Failed update leaves the file unchanged"
+else
+    test_fail "Failed update modified the file"
+fi
+
+rm -f "$TEST_TMP/store/sed.json"
+store _json_set_strings_sed "$TEST_TMP/store/sed.json" a 1 b 2
+if jq -e '.a == "1" and .b == "2"' "$TEST_TMP/store/sed.json" >/dev/null 2>&1; then
+    test_pass "jq-less fallback produces valid JSON from an empty file"
+else
+    test_fail "Fallback output invalid: $(cat "$TEST_TMP/store/sed.json")"
+fi
+
+# Test 3: Concurrent writers
+test_section "Concurrent Writers ($WRITERS processes)"
+FILE="$TEST_TMP/store/concurrent.json"
+echo '{}' > "$FILE"
+
+# A reader polls the file the whole time; every read must parse
+(
+    torn=0
+    while [[ ! -f "$TEST_TMP/done" ]]; do
+        jq -e . "$FILE" >/dev/null 2>&1 || torn=$((torn + 1))
+    done
+    echo "$torn" > "$TEST_TMP/torn"
+) &
+READER=$!
+
+for i in $(seq 1 $WRITERS); do
+    store json_set_strings "$FILE" "key$i" "value$i" "last" "$i" &
+done
+wait $(jobs -p | grep -v "^$READER$")
+touch "$TEST_TMP/done"
+wait "$READER"
+
+if [[ "$(jq '[keys[] | select(startswith("key"))] | length' "$FILE" 2>/dev/null)" == "$WRITERS" ]]; then
+    test_pass "No lost updates across $WRITERS concurrent json_set_strings"
+else
+    test_fail "Lost updates: $(jq -c 'keys | length' "$FILE" 2>/dev/null) keys present"
+fi
+
+if [[ "$(cat "$TEST_TMP/torn" 2>/dev/null)" == "0" ]]; then
+    test_pass "Concurrent reader never saw a torn file"
+else
+    test_fail "Reader saw $(cat "$TEST_TMP/torn" 2>/dev/null) unparsable reads"
+fi
+
+if [[ -z "$(find "$TEST_TMP/store" -name '*.tmp.*' -o -name '.rcm-lock')" ]]; then
+    test_pass "No temp or lock files left behind"
+else
+    test_fail "Leftover files: $(ls -A "$TEST_TMP/store")"
+fi
+
+# Test 4: Callers in role-manager.sh
+test_section "Role Manager Writers"
+for i in $(seq 1 20); do
+    (cd "$TEST_TMP/project" && HOME="$TEST_TMP/home" bash -c \
+        'source "$1"; set_preference "pref_$2" "v$2" project 2>/dev/null' _ "$ROLE_MANAGER" "$i") &
+done
+wait
+if [[ "$(jq '[keys[] | select(startswith("pref_"))] | length' "$TEST_TMP/project/.claude/preferences.json" 2>/dev/null)" == "20" ]]; then
+    test_pass "Concurrent set_preference calls all persisted"
+else
+    test_fail "set_preference lost updates: $(cat "$TEST_TMP/project/.claude/preferences.json")"
+fi
+
+for i in $(seq 1 20); do
+    (cd "$TEST_TMP/project" && HOME="$TEST_TMP/home" bash -c \
+        'source "$1"; write_role_references "$PWD/.claude" "role-$2" "[\"docs/$2.md\"]" "[]"' _ "$ROLE_MANAGER" "$i") &
+done
+wait
+if [[ "$(jq 'keys | length' "$TEST_TMP/project/.claude/role-references.json" 2>/dev/null)" == "20" ]] &&
+   jq -e '.["role-7"].default_documents == ["docs/7.md"]' "$TEST_TMP/project/.claude/role-references.json" >/dev/null 2>&1; then
+    test_pass "Concurrent write_role_references keep every role"
+else
+    test_fail "write_role_references lost roles: $(jq -c 'keys' "$TEST_TMP/project/.claude/role-references.json" 2>/dev/null)"
+fi
+
+# Test 5: Lock timeout
+test_section "Lock Timeout"
+if command -v flock &>/dev/null; then
+    FILE="$TEST_TMP/store/prefs.json"
+    BEFORE="$(cat "$FILE")"
+    flock -x "$TEST_TMP/store" sleep 3 &
+    HOLDER=$!
+    sleep 0.3
+    if ! RCM_LOCK_TIMEOUT=1 store json_set_strings "$FILE" blocked yes 2>/dev/null && [[ "$(cat "$FILE")" == "$BEFORE" ]]; then
+        test_pass "Writer gives up after RCM_LOCK_TIMEOUT without writing"
+    else
+        test_fail "Writer ignored the held lock"
+    fi
+    wait "$HOLDER"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
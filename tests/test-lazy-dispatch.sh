@@ -0,0 +1,217 @@
+#!/usr/bin/env bash
+
+# test-lazy-dispatch.sh - Test suite for role-manager.sh lazy function groups and per-command entry scripts
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-lazy-dispatch-$$"
+PROJECT="$TEST_TMP/project"
+ENTRIES="$TEST_TMP/entries"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: in_project <bash code> (role-manager sourced, run from the project)
+in_project() {
+    (cd "$PROJECT" && HOME="$TEST_TMP/home" RCM_SETUP_STATE_DIR="$TEST_TMP/state" \
+        bash -c 'source "$1"; eval "$2"' _ "$ROLE_MANAGER" "$1")
+}
+
+# Usage: run_in_project <script> [args...]
+run_in_project() {
+    (cd "$PROJECT" && HOME="$TEST_TMP/home" RCM_SETUP_STATE_DIR="$TEST_TMP/state" bash "$@")
+}
+
+# Usage: median_ms <runs> <script> [args...] (median wall time in the project)
+median_ms() {
+    local runs="$1"
+    local start end
+    local times=()
+    shift
+    for _ in $(seq "$runs"); do
+        start=$(date +%s%N)
+        run_in_project "$@" > /dev/null 2>&1
+        end=$(date +%s%N)
+        times+=($(( (end - start) / 1000000 )))
+    done
+    printf '%s\n' "${times[@]}" | sort -n | sed -n "$(( (runs + 1) / 2 ))p"
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Lazy Dispatch - Test Suite                          ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP/home" "$PROJECT/.claude/role-guides" "$PROJECT/docs"
+cat > "$PROJECT/.claude/role-guides/software-engineer-guide.md" <<'GUIDE'
+# Software Engineer Guide
+
+## Document References
+
+- `docs/standards.md`
+- docs/missing.md
+GUIDE
+echo "# Standards" > "$PROJECT/docs/standards.md"
+echo '{"level": "project"}' > "$PROJECT/.claude/organizational-level.json"
+echo '{"user_role": "software-engineer"}' > "$PROJECT/.claude/preferences.json"
+
+# Test 1: Group tables
+test_section "Group Tables"
+MISMATCH=""
+for file in "$PROJECT_ROOT"/scripts/role-manager/*.sh; do
+    group=$(basename "$file" .sh)
+    defined=$(grep -oE '^[a-z_]+\(\)' "$file" | tr -d '()' | sort | tr '\n' ' ')
+    listed=$(bash -c 'source "$1"; printf "%s\n" ${ROLE_MANAGER_GROUPS[$2]:-}' _ "$ROLE_MANAGER" "$group" | sort | tr '\n' ' ')
+    [[ "$defined" == "$listed" ]] || MISMATCH+=" $group"
+done
+GROUPS_LISTED=$(bash -c 'source "$1"; echo ${#ROLE_MANAGER_GROUPS[@]}' _ "$ROLE_MANAGER")
+if [[ -z "$MISMATCH" && "$GROUPS_LISTED" -eq $(ls "$PROJECT_ROOT"/scripts/role-manager/*.sh | wc -l) ]]; then
+    test_pass "ROLE_MANAGER_GROUPS lists exactly the functions each group file defines"
+else
+    test_fail "Group tables out of date:$MISMATCH"
+fi
+
+# Every group or helper a command can reach is preloaded, or loaded by the
+# function that needs it, so no stub loads a file inside a subshell per call
+OUTPUT=$(bash -c '
+    source "$1"
+    declare -A owner=()
+    for unit in "${!ROLE_MANAGER_GROUPS[@]}"; do load_function_group "$unit"; for fn in ${ROLE_MANAGER_GROUPS[$unit]}; do owner[$fn]=$unit; done; done
+    for unit in "${!HELPER_SCRIPT_FUNCTIONS[@]}"; do load_helper_script "$unit"; for fn in ${HELPER_SCRIPT_FUNCTIONS[$unit]}; do owner[$fn]=$unit; done; done
+    for handler in "${!COMMAND_GROUPS[@]}"; do
+        declare -A seen=()
+        queue=("$handler")
+        bodies=""
+        while [[ ${#queue[@]} -gt 0 ]]; do
+            fn="${queue[0]}"; queue=("${queue[@]:1}")
+            [[ -z "${seen[$fn]:-}" ]] || continue
+            seen[$fn]=1
+            body="$(declare -f "$fn")"; bodies+="$body"
+            for word in ${body//[^A-Za-z0-9_]/ }; do
+                [[ -z "${seen[$word]:-}" ]] && declare -F "$word" > /dev/null && queue+=("$word")
+            done
+        done
+        for fn in "${!seen[@]}"; do
+            unit="${owner[$fn]:-}"
+            [[ -z "$unit" || " ${COMMAND_GROUPS[$handler]} " == *" $unit "* || "$bodies" == *"load_helper_script $unit"* ]] \
+                || echo "$handler needs $unit ($fn)"
+        done
+        unset seen
+    done' _ "$ROLE_MANAGER" 2>&1 | sort -u)
+[[ -z "$OUTPUT" ]] && test_pass "COMMAND_GROUPS covers every function each command reaches" || test_fail "Missing from COMMAND_GROUPS: $OUTPUT"
+
+# Test 2: Sourcing
+test_section "Sourcing"
+OUTPUT=$(in_project 'echo "${!ROLE_MANAGER_LOADED[@]}"; heading_anchor "Code Review: Basics"; echo "$HEADING_ANCHOR"; get_current_role .claude; echo "${!ROLE_MANAGER_LOADED[@]}"' 2>&1)
+if [[ "$OUTPUT" == $'\ncode-review-basics\nsoftware-engineer\n'* && "$OUTPUT" == *documents* && "$OUTPUT" == *roles* && "$OUTPUT" != *layers* ]]; then
+    test_pass "Sourcing loads no group; a function loads its own group on first call"
+else
+    test_fail "Unexpected sourcing: $OUTPUT"
+fi
+
+OUTPUT=$(in_project 'before="$(declare -f find_claude_dir main)"; get_level_value "$PWD/.claude"; validate_hierarchy "$PWD/.claude" &> /dev/null && echo valid; [[ "$(declare -f find_claude_dir main)" == "$before" ]] && echo kept' 2>&1)
+if [[ "$OUTPUT" == $'project\nvalid\nkept' ]]; then
+    test_pass "Helper script functions load on first call without replacing find_claude_dir or main"
+else
+    test_fail "Unexpected helper loading: $OUTPUT"
+fi
+
+# Test 3: Dispatcher
+test_section "Dispatcher"
+OUTPUT=$(in_project 'main list-roles-json > /dev/null; echo "${!ROLE_MANAGER_LOADED[@]}"' 2>&1)
+[[ "$OUTPUT" == "role-selection" ]] && test_pass "A command loads only its own groups" || test_fail "Loaded: $OUTPUT"
+
+run_in_project "$ROLE_MANAGER" init > /dev/null 2>&1
+OUTPUT=$(run_in_project "$ROLE_MANAGER" show 2>&1)
+[[ "$OUTPUT" == *"Current role: software-engineer"*"✓ docs/standards.md"*"! docs/missing.md"* ]] \
+    && test_pass "Short aliases still dispatch" || test_fail "Unexpected show output: $OUTPUT"
+
+OUTPUT=$(run_in_project "$ROLE_MANAGER" no-such-command 2>&1)
+[[ $? -eq 2 && "$OUTPUT" == "Usage: "*"|setup-state|build-entries} [args...]" ]] \
+    && test_pass "An unknown command prints usage and exits 2" || test_fail "Unexpected: $OUTPUT"
+
+# Test 4: Per-command entry scripts
+test_section "Entry Scripts"
+OUTPUT=$(run_in_project "$ROLE_MANAGER" build-entries --output "$ENTRIES" 2>&1)
+if [[ $? -eq 0 && -x "$ENTRIES/load-role-context.sh" && -x "$ENTRIES/setup-state.sh" && ! -e "$ENTRIES/add-role-guides.sh" && ! -e "$ENTRIES/build-entries.sh" ]] \
+        && ! grep -qE "(load_function_group|load_helper_script) [a-z.-]+ && " "$ENTRIES"/*.sh; then
+    test_pass "build-entries writes standalone scripts without stubs"
+else
+    test_fail "Unexpected entries: $OUTPUT"
+fi
+
+LINES_SETUP=$(wc -l < "$ENTRIES/setup-state.sh")
+LINES_LOAD=$(wc -l < "$ENTRIES/load-role-context.sh")
+if ! grep -q "^cmd_load_role_context ()" "$ENTRIES/setup-state.sh" && [[ $LINES_SETUP -lt $LINES_LOAD ]]; then
+    test_pass "An entry holds only the functions its command reaches ($LINES_SETUP vs $LINES_LOAD lines)"
+else
+    test_fail "setup-state entry is not minimal ($LINES_SETUP lines)"
+fi
+
+BAD=""
+for args in "load-role-context --quiet" "load-role-context" "setup-state --json" "show-role-context" "list-roles-json" "get-all-roles-by-level"; do
+    read -r -a argv <<< "$args"
+    EXPECTED=$(run_in_project "$ROLE_MANAGER" "${argv[@]}" 2>&1; echo "exit $?")
+    ACTUAL=$(run_in_project "$ENTRIES/${argv[0]}.sh" "${argv[@]:1}" 2>&1; echo "exit $?")
+    [[ "$ACTUAL" == "$EXPECTED" ]] || BAD+=" '$args'"
+done
+[[ -z "$BAD" ]] && test_pass "Entry output matches the dispatcher" || test_fail "Entry output differs for:$BAD"
+
+sed -i 's/^cmd_list_roles_json "\$@"$/echo from-entry/' "$ENTRIES/list-roles-json.sh"
+FRESH=$(run_in_project "$ENTRIES/list-roles-json.sh" 2>&1)
+touch -d '2000-01-01' "$ENTRIES/list-roles-json.sh"
+STALE=$(run_in_project "$ENTRIES/list-roles-json.sh" 2>&1)
+if [[ "$FRESH" == "from-entry" && "$STALE" == "$(run_in_project "$ROLE_MANAGER" list-roles-json 2>&1)" ]]; then
+    test_pass "An entry older than its sources runs the command through role-manager.sh"
+else
+    test_fail "Freshness check failed: fresh '$FRESH', stale '$STALE'"
+fi
+
+# Test 5: Startup cost
+test_section "Performance"
+cat > "$TEST_TMP/eager.sh" <<EOF
+source "$ROLE_MANAGER"
+for unit in "\${!ROLE_MANAGER_GROUPS[@]}"; do load_function_group "\$unit"; done
+for unit in "\${!HELPER_SCRIPT_FUNCTIONS[@]}"; do load_helper_script "\$unit"; done
+main "\$@"
+EOF
+EAGER=$(median_ms 7 "$TEST_TMP/eager.sh" setup-state --json)
+LAZY=$(median_ms 7 "$ROLE_MANAGER" setup-state --json)
+ENTRY=$(median_ms 7 "$ENTRIES/setup-state.sh" --json)
+if [[ $LAZY -lt $EAGER && $ENTRY -le $LAZY ]]; then
+    test_pass "setup-state starts faster lazily: ${EAGER}ms eager, ${LAZY}ms lazy, ${ENTRY}ms entry"
+else
+    test_fail "No startup saving: ${EAGER}ms eager, ${LAZY}ms lazy, ${ENTRY}ms entry"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
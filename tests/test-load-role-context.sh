@@ -0,0 +1,432 @@
+#!/usr/bin/env bash
+
+# test-load-role-context.sh - Test suite for /load-role-context output modes
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-load-role-context-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Create a project whose role guide references present, empty and missing documents
+setup_test_env() {
+    rm -rf "$TEST_TMP"
+    mkdir -p "$TEST_TMP/home" "$TEST_TMP/project/.claude/role-guides" "$TEST_TMP/project/docs"
+    cat > "$TEST_TMP/project/.claude/role-guides/software-engineer-guide.md" <<'GUIDE'
+# Software Engineer Guide
+
+## Document References
+
+- `docs/standards.md`
+- /docs/testing.md
+- docs/empty.md
+- docs/missing.md
+
+## Responsibilities
+GUIDE
+    echo "# Standards" > "$TEST_TMP/project/docs/standards.md"
+    echo "# Testing" > "$TEST_TMP/project/docs/testing.md"
+    : > "$TEST_TMP/project/docs/empty.md"
+    echo '{"user_role": "software-engineer"}' > "$TEST_TMP/project/.claude/preferences.json"
+}
+
+# Usage: run_role_manager [args...] (runs in the test project with an isolated HOME)
+run_role_manager() {
+    (cd "$TEST_TMP/project" && HOME="$TEST_TMP/home" bash "$ROLE_MANAGER" "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Load Role Context - Test Suite                      ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Quiet mode summary
+test_section "Quiet Mode"
+setup_test_env
+OUTPUT=$(run_role_manager load-role-context --quiet 2>/dev/null)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 0 && "$OUTPUT" == "✓ Role context loaded: software-engineer (2 documents)" ]]; then
+    test_pass "Quiet mode counts non-empty, existing documents"
+else
+    test_fail "Unexpected quiet output (exit $EXIT_CODE): $OUTPUT"
+fi
+
+NORMAL_COUNT=$(run_role_manager load-role-context 2>/dev/null | grep -c '^### Document:')
+if [[ "$NORMAL_COUNT" == "2" ]]; then
+    test_pass "Quiet count matches documents loaded in normal mode"
+else
+    test_fail "Normal mode loaded $NORMAL_COUNT documents"
+fi
+
+if command -v jq &>/dev/null; then
+    RCM_TRACE="$TEST_TMP/trace.jsonl" run_role_manager load-role-context --quiet >/dev/null 2>&1
+    if ! jq -s -e 'any(.[]; .ev == "exec" and .cmd == "cat")' "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+        test_pass "Quiet mode does not read document contents"
+    else
+        test_fail "Quiet mode still runs cat on documents"
+    fi
+fi
+
+# Test 2: Prefetch
+test_section "Prefetch"
+OUTPUT_PREFETCH=$(run_role_manager load-role-context --quiet --prefetch 2>/dev/null)
+if [[ "$OUTPUT_PREFETCH" == "$OUTPUT" ]]; then
+    test_pass "--prefetch does not change the summary"
+else
+    test_fail "--prefetch changed output: $OUTPUT_PREFETCH"
+fi
+
+# The hook captures stdout; a prefetch holding the pipe open would block it.
+# A slow cat shim stands in for reading large documents from a cold cache.
+mkdir -p "$TEST_TMP/bin"
+printf '#!/bin/sh\nsleep 3\nexec %s "$@"\n' "$(command -v cat)" > "$TEST_TMP/bin/cat"
+chmod +x "$TEST_TMP/bin/cat"
+START=$(date +%s)
+(cd "$TEST_TMP/project" && PATH="$TEST_TMP/bin:$PATH" HOME="$TEST_TMP/home" \
+    bash "$ROLE_MANAGER" load-role-context --quiet --prefetch | cat) >/dev/null 2>&1
+if [[ $(( $(date +%s) - START )) -lt 3 ]]; then
+    test_pass "Prefetch runs detached from the caller's output"
+else
+    test_fail "Prefetch blocked the caller"
+fi
+
+# Test 3: Inherited context layers
+test_section "Inherited Context"
+ORG="$TEST_TMP/org"
+mkdir -p "$ORG/.claude/role-guides" "$ORG/standards" "$ORG/product/.claude/role-guides" \
+    "$ORG/product/app/.claude/role-guides"
+echo '{"level": "company"}' > "$ORG/.claude/organizational-level.json"
+echo '{"level": "product"}' > "$ORG/product/.claude/organizational-level.json"
+echo '{"level": "project"}' > "$ORG/product/app/.claude/organizational-level.json"
+printf '# Company SE\n\n## Document References\n\n- standards/coding.md\n- standards/later.md\n' \
+    > "$ORG/.claude/role-guides/software-engineer-guide.md"
+echo "Company coding standard" > "$ORG/standards/coding.md"
+printf '# Product SE\n\nProduct conventions\n' > "$ORG/product/.claude/role-guides/software-engineer-guide.md"
+printf '# App SE\n' > "$ORG/product/app/.claude/role-guides/software-engineer-guide.md"
+echo '{"user_role": "software-engineer"}' > "$ORG/product/app/.claude/preferences.json"
+
+# Usage: run_in_app [args...] (runs in the nested project with a private layer cache)
+run_in_app() {
+    (cd "$ORG/product/app" && HOME="$TEST_TMP/home" RCM_LAYER_CACHE_DIR="$TEST_TMP/layers" \
+        bash "$ROLE_MANAGER" "$@")
+}
+
+OUTPUT=$(run_in_app load-role-context 2>/dev/null)
+[[ "$OUTPUT" != *"Inherited Context"* ]] && test_pass "Ancestor levels are not loaded without --inherit" || test_fail "Layers loaded without --inherit"
+
+OUTPUT=$(run_in_app load-role-context --inherit 2>/dev/null)
+if [[ "$OUTPUT" == *"## Inherited Context: company"*"Company coding standard"*"## Inherited Context: product"*"Product conventions"* ]]; then
+    test_pass "--inherit appends ancestor layers, company first"
+else
+    test_fail "Inherited layers missing or out of order"
+fi
+
+OUTPUT=$(run_in_app load-role-context --verbose --inherit 2>/dev/null)
+[[ "$OUTPUT" == *"company: 1 documents (cached)"*"product: 0 documents (cached)"* ]] \
+    && test_pass "Unchanged layers are reused from the cache" || test_fail "Layers rebuilt without changes"
+
+sleep 0.01
+echo "Company coding standard v2" > "$ORG/standards/coding.md"
+OUTPUT=$(run_in_app load-role-context --verbose --inherit 2>/dev/null)
+if [[ "$OUTPUT" == *"company: 1 documents (built)"*"product: 0 documents (cached)"* && "$OUTPUT" == *"standard v2"* ]]; then
+    test_pass "Only the layer whose document changed is rebuilt"
+else
+    test_fail "Changed document did not rebuild exactly one layer"
+fi
+
+echo "Added later" > "$ORG/standards/later.md"
+OUTPUT=$(run_in_app load-role-context --quiet --inherit 2>/dev/null)
+[[ "$OUTPUT" == "✓ Role context loaded: software-engineer (2 documents, 2 inherited levels)" ]] \
+    && test_pass "A previously missing document rebuilds its layer and is counted" || test_fail "Quiet inherit output: $OUTPUT"
+
+echo "Company coding standard v1" > "$ORG/standards/coding.md"
+touch -d "2001-01-01" "$ORG/standards/coding.md"
+OUTPUT=$(run_in_app load-role-context --verbose --inherit 2>/dev/null)
+[[ "$OUTPUT" == *"company: 2 documents (built)"* && "$OUTPUT" == *"standard v1"* ]] \
+    && test_pass "A document restored with an older mtime rebuilds its layer" || test_fail "Older copy not picked up: $OUTPUT"
+
+export RCM_PACK_CACHE_DIR="$TEST_TMP/inherit-packs" RCM_SESSION_STATE_DIR="$TEST_TMP/inherit-sessions"
+run_in_app load-role-context --inherit --since-last s1 > /dev/null 2>&1
+OUTPUT=$(run_in_app load-role-context --inherit --since-last s1 2>/dev/null)
+if [[ "$OUTPUT" == *"## Inherited Context: company"*"Unchanged (already provided in this session):"*"  - Role guide: $ORG/.claude/role-guides/software-engineer-guide.md"*"  - standards/coding.md"*"  - standards/later.md"* \
+      && "$OUTPUT" != *"Company coding standard"* && "$OUTPUT" != *"Product conventions"* ]]; then
+    test_pass "With --since-last, unchanged inherited documents are listed, not repeated"
+else
+    test_fail "Unexpected inherited delta: $OUTPUT"
+fi
+
+echo "Added later v2" > "$ORG/standards/later.md"
+OUTPUT=$(run_in_app load-role-context --inherit --since-last s1 2>/dev/null)
+if [[ "$OUTPUT" == *"  - standards/coding.md"*"### Document: standards/later.md"$'\n'"---"$'\n'"Added later v2"* \
+      && "$OUTPUT" != *"Company coding standard"* && "$OUTPUT" != *"Product conventions"* ]]; then
+    test_pass "Only the inherited document that changed is emitted in full"
+else
+    test_fail "Unexpected inherited delta after an edit: $OUTPUT"
+fi
+
+if command -v python3 &>/dev/null; then
+    run_in_app load-role-context --inherit --since-last s2 --format ndjson > /dev/null 2>&1
+    echo "Product conventions v2" >> "$ORG/product/.claude/role-guides/software-engineer-guide.md"
+    OUTPUT=$(run_in_app load-role-context --inherit --since-last s2 --format ndjson 2>/dev/null | python3 -c '
+import json, sys
+for r in map(json.loads, sys.stdin):
+    if r["type"] == "layer":
+        print(r["level"], r.get("unchanged", False), "content" in r)
+')
+    [[ "$OUTPUT" == $'company True False\nproduct False True' ]] \
+        && test_pass "Structured delta output marks unchanged layers" || test_fail "Unexpected layer records: $OUTPUT"
+fi
+unset RCM_PACK_CACHE_DIR RCM_SESSION_STATE_DIR
+
+# Test 4: Packed context store
+test_section "Packed Store"
+setup_test_env
+export RCM_PACK_CACHE_DIR="$TEST_TMP/packs"
+PLAIN=$(RCM_PACK_CACHE_DIR=/dev/null/none run_role_manager load-role-context 2>/dev/null)
+PACKED_FIRST=$(run_role_manager load-role-context 2>/dev/null)
+PACK_FILE=$(ls "$RCM_PACK_CACHE_DIR"/*.pack 2>/dev/null | head -1)
+PACKED=$(run_role_manager load-role-context 2>/dev/null)
+if [[ -n "$PACK_FILE" && "$PACKED_FIRST" == "$PLAIN" && "$PACKED" == "$PLAIN" ]]; then
+    test_pass "Context served from the pack matches reading each document"
+else
+    test_fail "Packed output differs from unpacked output (pack: ${PACK_FILE:-none})"
+fi
+
+if command -v jq &>/dev/null; then
+    rm -f "$TEST_TMP/trace.jsonl"
+    RCM_TRACE="$TEST_TMP/trace.jsonl" run_role_manager load-role-context >/dev/null 2>&1
+    if ! jq -s -e 'any(.[]; .ev == "exec" and (.cmd == "cat" or .cmd == "sha256sum"))' "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+        test_pass "A valid pack is read without per-document reads"
+    else
+        test_fail "Loader read documents individually despite a valid pack"
+    fi
+fi
+
+sleep 0.01
+echo "# Standards v2" > "$TEST_TMP/project/docs/standards.md"
+OUTPUT=$(run_role_manager load-role-context 2>/dev/null)
+[[ "$OUTPUT" == *"# Standards v2"* ]] && test_pass "An edited document invalidates the pack" || test_fail "Stale document served from the pack"
+
+echo "# Now present" > "$TEST_TMP/project/docs/missing.md"
+OUTPUT=$(run_role_manager load-role-context --quiet 2>/dev/null)
+[[ "$OUTPUT" == *"(3 documents)"* ]] && test_pass "A newly created document invalidates the pack" || test_fail "Quiet output after creating a document: $OUTPUT"
+
+echo "# Local standards" > "$TEST_TMP/project/docs/standards.md.new"
+mv "$TEST_TMP/project/docs/standards.md.new" "$TEST_TMP/project/docs/standards.md"
+OUTPUT=$(run_role_manager load-role-context 2>/dev/null)
+[[ "$OUTPUT" == *"# Local standards"* ]] && test_pass "Replacing a document by rename invalidates the pack" || test_fail "Renamed document not picked up"
+
+# From a subdirectory, docs/testing.md resolves to the project root until the
+# subdirectory gets its own copy, which must take precedence over the pack
+mkdir -p "$TEST_TMP/project/sub/docs"
+(cd "$TEST_TMP/project/sub" && HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/subpacks" \
+    bash "$ROLE_MANAGER" load-role-context >/dev/null 2>&1)
+echo "# Sub testing" > "$TEST_TMP/project/sub/docs/testing.md"
+OUTPUT=$(cd "$TEST_TMP/project/sub" && HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/subpacks" \
+    bash "$ROLE_MANAGER" load-role-context 2>/dev/null)
+[[ "$OUTPUT" == *"# Sub testing"* ]] && test_pass "A document shadowing a packed path invalidates the pack" || test_fail "Shadowing document ignored"
+
+PACK_FILE=$(ls "$RCM_PACK_CACHE_DIR"/*.pack 2>/dev/null | head -1)
+if command -v python3 &>/dev/null && [[ -n "$PACK_FILE" ]]; then
+    VERIFY=$(python3 "$PROJECT_ROOT/scripts/context_pack.py" verify "$PACK_FILE" 2>&1)
+    CAT=$(python3 "$PROJECT_ROOT/scripts/context_pack.py" cat "$PACK_FILE" docs/standards.md 2>&1)
+    if [[ $? -eq 0 && "$VERIFY" == "✓"* && "$CAT" == "# Local standards" ]]; then
+        test_pass "context_pack.py verifies hashes and serves documents from the mapping"
+    else
+        test_fail "context_pack.py: $VERIFY / $CAT"
+    fi
+fi
+
+run_role_manager load-role-context > /dev/null 2>&1
+echo "# Restored standards" > "$TEST_TMP/project/docs/standards.md"
+touch -d "2001-01-01" "$TEST_TMP/project/docs/standards.md"
+OUTPUT=$(run_role_manager load-role-context 2>/dev/null)
+[[ "$OUTPUT" == *"# Restored standards"* ]] && test_pass "A document restored with an older mtime invalidates the pack" || test_fail "Older copy not picked up"
+unset RCM_PACK_CACHE_DIR
+
+# Test 5: Delta mode
+test_section "Since Last Session"
+setup_test_env
+export RCM_PACK_CACHE_DIR="$TEST_TMP/packs" RCM_SESSION_STATE_DIR="$TEST_TMP/sessions"
+FULL=$(run_role_manager load-role-context 2>/dev/null)
+FIRST=$(run_role_manager load-role-context --since-last s1 2>/dev/null)
+[[ "$FIRST" == "$FULL" ]] && test_pass "The first load emits the full context" || test_fail "First --since-last load differs from a full load"
+
+OUTPUT=$(run_role_manager load-role-context --since-last 2>&1)
+[[ $? -eq 1 && "$OUTPUT" == *"--since-last needs the ID of the session"* ]] \
+    && test_pass "--since-last without a session ID is an error" || test_fail "Unexpected: $OUTPUT"
+
+OUTPUT=$(run_role_manager load-role-context --since-last s1 2>/dev/null)
+if [[ "$OUTPUT" == *"role guide is unchanged"* && "$OUTPUT" == *"  - docs/standards.md"*"  - /docs/testing.md"* \
+      && "$OUTPUT" != *"### Document:"* && ${#OUTPUT} -lt ${#FULL} ]]; then
+    test_pass "An unchanged context is listed, not repeated"
+else
+    test_fail "Unexpected repeat load: $OUTPUT"
+fi
+
+OUTPUT=$(run_role_manager load-role-context --since-last=s2 2>/dev/null)
+[[ "$OUTPUT" == "$FULL" ]] && test_pass "Another session in the same directory gets the full context" || test_fail "Delta leaked across sessions: $OUTPUT"
+
+sleep 0.01
+echo "# Testing v2" > "$TEST_TMP/project/docs/testing.md"
+OUTPUT=$(run_role_manager load-role-context --since-last s1 2>/dev/null)
+if [[ "$OUTPUT" == *"### Document: /docs/testing.md"$'\n'"---"$'\n'"# Testing v2"* && "$OUTPUT" == *"  - docs/standards.md"* \
+      && "$OUTPUT" != *"# Standards"* ]]; then
+    test_pass "Only documents whose hash changed are emitted in full"
+else
+    test_fail "Unexpected delta: $OUTPUT"
+fi
+
+sed -i '/standards.md/d' "$TEST_TMP/project/.claude/role-guides/software-engineer-guide.md"
+OUTPUT=$(run_role_manager load-role-context --since-last s1 2>/dev/null)
+if [[ "$OUTPUT" == *"role guide has changed"*"## Document References"* && "$OUTPUT" == *"no longer part"*"  - docs/standards.md"* ]]; then
+    test_pass "A changed guide is re-emitted and dropped documents are listed"
+else
+    test_fail "Unexpected output after editing the guide: $OUTPUT"
+fi
+
+mkdir -p "$TEST_TMP/project/.claude/role-guides"
+cp "$TEST_TMP/project/.claude/role-guides/software-engineer-guide.md" "$TEST_TMP/project/.claude/role-guides/qa-engineer-guide.md"
+echo '{"user_role": "qa-engineer"}' > "$TEST_TMP/project/.claude/preferences.json"
+OUTPUT=$(run_role_manager load-role-context --since-last s1 2>/dev/null)
+[[ "$OUTPUT" == "=== ROLE CONTEXT LOADED ==="* && "$OUTPUT" == *"# Testing v2"* ]] \
+    && test_pass "A role change emits the full context" || test_fail "Role change produced a delta: $OUTPUT"
+
+cp -r "$TEST_TMP/project" "$TEST_TMP/project2"
+OUTPUT=$(cd "$TEST_TMP/project2" && HOME="$TEST_TMP/home" bash "$ROLE_MANAGER" load-role-context --since-last s1 2>/dev/null)
+[[ "$OUTPUT" == "=== ROLE CONTEXT LOADED ==="* && "$OUTPUT" == *"# Testing v2"* ]] && test_pass "A different config dir in the same session emits the full context" || test_fail "Delta across config dirs: $OUTPUT"
+unset RCM_PACK_CACHE_DIR RCM_SESSION_STATE_DIR
+
+# Test 6: Structured output
+test_section "Structured Output"
+setup_test_env
+printf 'Quote " backslash \\ tab\t bell \001 caf\xc3\xa9\n' > "$TEST_TMP/project/docs/standards.md"
+if command -v python3 &>/dev/null; then
+    CHECK='
+import hashlib, json, sys
+records = [json.loads(line) for line in sys.stdin]
+docs = [r for r in records if r["type"] == "document"]
+ok = all(hashlib.sha256(d["content"].encode()).hexdigest() == d["sha256"] and len(d["content"].encode()) == d["size"]
+         for d in docs)
+print([r["type"] for r in records], [d["ref"] for d in docs], ok, records[-1])
+'
+    for cache in "$TEST_TMP/packs" /dev/null/none; do
+        OUTPUT=$(RCM_PACK_CACHE_DIR="$cache" run_role_manager load-role-context --format ndjson 2>&1 | python3 -c "$CHECK" 2>&1)
+        if [[ "$OUTPUT" == "['context', 'guide', 'document', 'document', 'missing', 'end'] ['docs/standards.md', '/docs/testing.md'] True {'type': 'end', 'documents': 2, 'unchanged': 0, 'missing': 1}" ]]; then
+            test_pass "NDJSON records carry exact content, size and hash (cache: $cache)"
+        else
+            test_fail "Unexpected NDJSON (cache: $cache): $OUTPUT"
+        fi
+    done
+
+    # Each document is read (from the pack, or from its file and hashed) only
+    # after the previous record was written
+    for reader in read_context_pack_entry sha256_string; do
+        cache="$TEST_TMP/packs"
+        [[ "$reader" == sha256_string ]] && cache=/dev/null/none
+        OUTPUT=$(cd "$TEST_TMP/project" && HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$cache" \
+            READ_RECORD='{"type":"read"}' bash -c '
+            source "$1"
+            load_function_group packs
+            eval "traced_$(declare -f "$2")"
+            eval "$2() { echo \"\$READ_RECORD\"; traced_$2 \"\$@\"; }"
+            cmd_load_role_context --format ndjson' _ "$ROLE_MANAGER" "$reader" 2>&1 \
+            | python3 -c '
+import json, sys
+types = [json.loads(line)["type"] for line in sys.stdin]
+print(types.index("document") < len(types) - 1 - types[::-1].index("read"), types[:types.index("end") + 1].count("document"))
+' 2>&1)
+        [[ "$OUTPUT" == "True 2" ]] && test_pass "NDJSON records are written as documents are read ($reader)" || test_fail "Records not streamed ($reader): $OUTPUT"
+    done
+
+    OUTPUT=$(RCM_PACK_CACHE_DIR="$TEST_TMP/packs" run_role_manager load-role-context --format=json 2>&1 | python3 -c '
+import json, sys
+r = json.load(sys.stdin)
+print(r["role"], r["scope"], r["guide"]["path"].endswith("software-engineer-guide.md"), [d["ref"] for d in r["documents"]], r["missing"], r["loaded"])
+' 2>&1)
+    [[ "$OUTPUT" == "software-engineer project True ['docs/standards.md', '/docs/testing.md'] ['docs/missing.md'] 2" ]] \
+        && test_pass "--format json prints one object with the same fields" || test_fail "Unexpected JSON: $OUTPUT"
+
+    export RCM_PACK_CACHE_DIR="$TEST_TMP/packs" RCM_SESSION_STATE_DIR="$TEST_TMP/sessions"
+    run_role_manager load-role-context --since-last s3 --format ndjson > /dev/null 2>&1
+    sleep 0.01
+    echo "# Testing v3" > "$TEST_TMP/project/docs/testing.md"
+    OUTPUT=$(run_role_manager load-role-context --since-last s3 --format ndjson 2>&1 | python3 -c '
+import json, sys
+for r in map(json.loads, sys.stdin):
+    if r["type"] in ("guide", "document"):
+        print(r.get("ref", "guide"), r.get("unchanged", False), "content" in r)
+' 2>&1)
+    [[ "$OUTPUT" == "guide True False"$'\n'"docs/standards.md True False"$'\n'"/docs/testing.md False True" ]] \
+        && test_pass "With --since-last, unchanged entries are sent without content" || test_fail "Unexpected delta records: $OUTPUT"
+    unset RCM_PACK_CACHE_DIR RCM_SESSION_STATE_DIR
+
+    # Latin-1 bytes are not UTF-8: content keeps its bytes, names are repaired
+    printf 'Latin-1 caf\xe9 \xff\n' > "$TEST_TMP/project/docs/testing.md"
+    sed -i "s|^- docs/missing.md$|&\n- docs/r$(printf '\xe9')sum$(printf '\xe9').md|" "$TEST_TMP/project/.claude/role-guides/software-engineer-guide.md"
+    CHECK_BYTES='
+import base64, hashlib, json, sys
+text = sys.stdin.buffer.read().decode("utf-8")
+records = [json.loads(line) for line in text.splitlines()] if sys.argv[1] == "ndjson" else [json.loads(text)]
+if sys.argv[1] == "json":
+    r = records[0]
+    records = [dict(r["guide"], type="guide")] + [dict(d, type="document") for d in r["documents"]] \
+        + [{"type": "missing", "ref": m} for m in r["missing"]]
+for r in records:
+    if r["type"] in ("guide", "document"):
+        raw = base64.b64decode(r["content"]) if r.get("encoding") == "base64" else r["content"].encode()
+        assert hashlib.sha256(raw).hexdigest() == r["sha256"] and len(raw) == r["size"], r
+        print(r.get("ref", "guide"), r.get("encoding", "-"))
+    elif r["type"] == "missing":
+        print("missing", r["ref"])
+'
+    for format in ndjson json; do
+        OUTPUT=$(RCM_PACK_CACHE_DIR="$TEST_TMP/packs" run_role_manager load-role-context --format $format 2>&1 \
+            | python3 -c "$CHECK_BYTES" $format 2>&1)
+        if [[ "$OUTPUT" == "guide base64"$'\n'"docs/standards.md -"$'\n'"/docs/testing.md base64"$'\n'"missing docs/missing.md"$'\n'"missing docs/r"$'\xef\xbf\xbd'"sum"$'\xef\xbf\xbd'".md" ]]; then
+            test_pass "Non-UTF-8 content is sent as base64 and names stay valid JSON ($format)"
+        else
+            test_fail "Unexpected $format output for non-UTF-8 input: $OUTPUT"
+        fi
+    done
+fi
+
+OUTPUT=$(run_role_manager load-role-context --quiet --format json 2>&1)
+[[ "$OUTPUT" == '{"role":"software-engineer","documents":2,"inherited_levels":0}' ]] \
+    && test_pass "Quiet mode prints a JSON summary" || test_fail "Unexpected quiet JSON: $OUTPUT"
+
+OUTPUT=$(run_role_manager load-role-context --format xml 2>&1)
+[[ $? -eq 1 && "$OUTPUT" == *"--format must be"* ]] && test_pass "An unknown format is rejected" || test_fail "Unknown format accepted: $OUTPUT"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
@@ -0,0 +1,161 @@
+#!/usr/bin/env bash
+
+# test-setup-state.sh - Test suite for the shared setup-state probe
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-setup-state-$$"
+PROJECT="$TEST_TMP/project"
+STATE_DIR="$TEST_TMP/state"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v jq &>/dev/null; then
+    echo "jq not found; skipping"
+    exit 0
+fi
+
+# Usage: in_project <bash code> (role-manager sourced, run from the project)
+in_project() {
+    (cd "$PROJECT" && HOME="$TEST_TMP/home" RCM_SETUP_STATE_DIR="$STATE_DIR" \
+        bash -c 'source "$1"; eval "$2"' _ "$ROLE_MANAGER" "$1")
+}
+
+# Usage: setup_state [args...]
+setup_state() {
+    (cd "$PROJECT" && HOME="$TEST_TMP/home" RCM_SETUP_STATE_DIR="$STATE_DIR" \
+        bash "$ROLE_MANAGER" setup-state "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Setup State Probe - Test Suite                      ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+LATEST=$(jq -r '.bundled[] | select(.id == "software-org") | .version' "$PROJECT_ROOT/templates/registry.json")
+mkdir -p "$PROJECT/.claude/role-guides/engineering" "$TEST_TMP/home/.claude"
+echo "# Engineer" > "$PROJECT/.claude/role-guides/engineering/software-engineer-guide.md"
+echo '{"level": "project"}' > "$PROJECT/.claude/organizational-level.json"
+cat > "$PROJECT/.claude/preferences.json" <<JSON
+{"user_role": "software-engineer", "applied_template": {"id": "software-org", "version": "$LATEST"}}
+JSON
+
+# Test 1: Probing
+test_section "Probing"
+OUTPUT=$(in_project 'check_setup_complete && echo complete; get_missing_setup_items | jq -c .; check_template_updates' 2>&1)
+if [[ "$OUTPUT" == $'complete\n["role-references.json (will be created)"]\nfalse' ]]; then
+    test_pass "The checks report a complete setup with an up-to-date template"
+else
+    test_fail "Unexpected checks: $OUTPUT"
+fi
+
+OUTPUT=$(in_project 'check_setup_complete .claude; probe_setup_state "$PWD/.claude"; echo "${SETUP_STATE[guide_count]} ${SETUP_STATE[template_id]} ${SETUP_STATE[latest_version]}"; ls "$RCM_SETUP_STATE_DIR" | wc -l' 2>&1)
+if [[ "$OUTPUT" == $'1 software-org '"$LATEST"$'\n1' ]]; then
+    test_pass "Relative and absolute config dirs share one cached entry"
+else
+    test_fail "Unexpected probe: $OUTPUT"
+fi
+
+# Test 2: Caching
+test_section "Caching"
+OUTPUT=$(in_project 'find() { echo "find called" >&2; command find "$@"; }; jq() { echo "jq called" >&2; command jq "$@"; }
+    check_setup_complete; get_missing_setup_items > /dev/null; check_template_updates' 2>&1)
+[[ "$OUTPUT" == "false" ]] && test_pass "A fresh entry answers all three checks without find or jq" || test_fail "Probe repeated: $OUTPUT"
+
+echo "# Architect" > "$PROJECT/.claude/role-guides/engineering/architect-guide.md"
+OUTPUT=$(in_project 'probe_setup_state .claude; echo "${SETUP_STATE[guide_count]}"' 2>&1)
+[[ "$OUTPUT" == "2" ]] && test_pass "Adding a role guide invalidates the entry" || test_fail "Stale guide count: $OUTPUT"
+
+cp -p "$PROJECT/.claude/preferences.json" "$TEST_TMP/preferences.old"
+sleep 1
+cat > "$PROJECT/.claude/preferences.json" <<'JSON'
+{"user_role": "software-engineer", "applied_template": {"id": "software-org", "version": "0.0.1"}}
+JSON
+OUTPUT=$(in_project 'check_template_updates' 2>&1)
+[[ "$OUTPUT" == "true" ]] && test_pass "Editing preferences invalidates the entry and an update is detected" || test_fail "Update not detected: $OUTPUT"
+
+cp -p "$PROJECT/.claude/preferences.json" "$TEST_TMP/preferences.new"
+cp -p "$TEST_TMP/preferences.old" "$PROJECT/.claude/preferences.json"
+OUTPUT=$(in_project 'check_template_updates' 2>&1)
+[[ "$OUTPUT" == "false" ]] && test_pass "Preferences restored with an older mtime invalidate the entry" || test_fail "Stale entry served: $OUTPUT"
+cp -p "$TEST_TMP/preferences.new" "$PROJECT/.claude/preferences.json"
+
+rm "$PROJECT/.claude/organizational-level.json"
+mkdir -p "$PROJECT/.claude/role-guides/product"
+OUTPUT=$(in_project 'get_missing_setup_items | jq -r ".[0]"' 2>&1)
+[[ "$OUTPUT" == "organizational-level.json (recommended)" ]] && test_pass "Removed files are picked up" || test_fail "Got: $OUTPUT"
+
+# Test 3: setup-state command
+test_section "setup-state Command"
+OUTPUT=$(setup_state --json 2>&1)
+if jq -e --arg latest "$LATEST" '
+        length == 2 and .[0].scope == "global" and .[0].complete == false
+        and .[1].scope == "project" and .[1].complete == true and .[1].guide_count == 2
+        and .[1].template_status == "update-available" and .[1].latest_version == $latest
+        and .[1].user_role == "software-engineer"' <<< "$OUTPUT" > /dev/null 2>&1; then
+    test_pass "--json reports both scopes"
+else
+    test_fail "Unexpected JSON: $OUTPUT"
+fi
+
+OUTPUT=$(setup_state --project 2>&1)
+if [[ "$OUTPUT" == *"project $PROJECT/.claude: complete (2 role guides), template software-org update available (v0.0.1 → v$LATEST)"* && "$OUTPUT" != *global* ]]; then
+    test_pass "--project prints one scope as text"
+else
+    test_fail "Unexpected text: $OUTPUT"
+fi
+
+OUTPUT=$(cd "$TEST_TMP" && HOME="$TEST_TMP/home" RCM_SETUP_STATE_DIR="$STATE_DIR" bash "$ROLE_MANAGER" setup-state --project 2>&1)
+[[ $? -eq 1 && "$OUTPUT" == *"Not in a project context"* ]] && test_pass "--project outside a project exits 1" || test_fail "Got: $OUTPUT"
+
+# Test 4: Concurrent probes
+test_section "Concurrency"
+rm -rf "$STATE_DIR"
+echo "# PM" > "$PROJECT/.claude/role-guides/product/product-manager-guide.md"
+for i in 1 2 3 4 5 6; do
+    setup_state --json > "$TEST_TMP/concurrent-$i.json" 2>&1 &
+done
+wait
+BAD=""
+for i in 1 2 3 4 5 6; do
+    jq -e '.[1].guide_count == 3' "$TEST_TMP/concurrent-$i.json" > /dev/null 2>&1 || BAD+=" $i"
+done
+LEFTOVERS=$(find "$STATE_DIR" -name "*.tmp.*" | wc -l)
+if [[ -z "$BAD" && $LEFTOVERS -eq 0 ]] && head -1 "$STATE_DIR"/*project* | grep -q "^RCMSETUP 2$"; then
+    test_pass "Concurrent probes agree and leave one complete entry"
+else
+    test_fail "Concurrent probes failed:$BAD (temp files left: $LEFTOVERS)"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
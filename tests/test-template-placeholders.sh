@@ -0,0 +1,181 @@
+#!/usr/bin/env bash
+
+# test-template-placeholders.sh - Test suite for placeholder substitution in apply
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-template-placeholders-$$"
+PLUGIN="$TEST_TMP/plugin"
+TEMPLATE_MANAGER="$PLUGIN/scripts/template-manager.sh"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v jq &>/dev/null; then
+    echo "jq not found; skipping"
+    exit 0
+fi
+
+# A plugin install with a small template full of placeholders
+setup_plugin() {
+    local template="$PLUGIN/templates/core/mini"
+    mkdir -p "$PLUGIN/scripts" "$template/.claude/role-guides" "$template/fundraising/updates" "$TEST_TMP/home"
+    cp "$PROJECT_ROOT"/scripts/*.sh "$PLUGIN/scripts/"
+    cat > "$PLUGIN/templates/registry.json" <<'JSON'
+{"bundled": [{"id": "mini", "name": "Mini", "version": "1.0.0", "path": "templates/core/mini"}]}
+JSON
+    cat > "$template/manifest.json" <<'JSON'
+{
+  "id": "mini", "name": "Mini", "version": "1.0.0", "description": "Test template",
+  "content_structure": {
+    "claude_config": {"path": ".claude"},
+    "root_docs": {"path": ".", "files": ["README.md", "notes.txt"]},
+    "fundraising_docs": {"path": "fundraising"}
+  },
+  "application_modes": {
+    "minimal": {"includes": ["claude_config"]},
+    "complete": {"includes": ["claude_config", "root_docs", "fundraising_docs"]}
+  }
+}
+JSON
+    echo "# Founder at [Company Name]" > "$template/.claude/role-guides/founder-guide.md"
+    cat > "$template/README.md" <<'MD'
+# [Company Name] Operating Docs
+
+Owner: [Name] | Updated: [Date]
+See [Company Name](https://example.com) and [the guide][Company Name].
+- [ ] Review with [Name] by [Deadline]
+MD
+    echo "[Company Name] stays as is in [Name]" > "$template/notes.txt"
+    cat > "$template/fundraising/updates/investor-update.md" <<'MD'
+**Subject:** [Company Name] - [Month] Update
+Prepared by [Name] on [Date]. Runway: [Count] months
+MD
+    printf 'Closing note for [Company Name]' > "$template/fundraising/tail.md"
+    printf '# Plain\n\n- [x] nothing to fill in\n\n' > "$template/fundraising/plain.md"
+    cat > "$TEST_TMP/vars.json" <<'JSON'
+{"Company Name": "Acme \"Rockets\" & Co\\", "[Name]": "Dana\nLee", "Date": "2026-10-19", "Count": 18}
+JSON
+}
+
+# Usage: apply_in <dir> [args...]
+apply_in() {
+    local dir="$1"
+    shift
+    mkdir -p "$dir"
+    (cd "$dir" && HOME="$TEST_TMP/home" bash "$TEMPLATE_MANAGER" apply mini complete "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Template Placeholders - Test Suite                  ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+setup_plugin
+
+# Test 1: Script validation
+test_section "Script Validation"
+bash -n "$TEMPLATE_MANAGER" 2>/dev/null && test_pass "template-manager.sh syntax valid" || test_fail "template-manager.sh syntax error"
+
+# Test 2: Substitution
+test_section "Substitution"
+REPO="$TEST_TMP/repo"
+OUTPUT=$(apply_in "$REPO" --vars "$TEST_TMP/vars.json" --placeholder-report "$TEST_TMP/report.json" 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 0 && "$(head -1 "$REPO/README.md")" == '# Acme "Rockets" & Co\ Operating Docs' \
+      && "$(cat "$REPO/.claude/role-guides/founder-guide.md")" == '# Founder at Acme "Rockets" & Co\' ]]; then
+    test_pass "Values with quotes, backslashes and & are substituted in root docs and the config dir"
+else
+    test_fail "Unexpected substitution (exit $EXIT_CODE): $OUTPUT"
+fi
+
+if [[ "$(cat "$REPO/fundraising/updates/investor-update.md")" == '**Subject:** Acme "Rockets" & Co\ - [Month] Update
+Prepared by Dana
+Lee on 2026-10-19. Runway: 18 months' ]]; then
+    test_pass "Nested directories, multi-line and numeric values"
+else
+    test_fail "investor-update.md: $(cat "$REPO/fundraising/updates/investor-update.md")"
+fi
+
+if grep -qF 'See [Company Name](https://example.com) and [the guide][Company Name].' "$REPO/README.md" \
+      && grep -qF -- '- [ ] Review with Dana' "$REPO/README.md" \
+      && [[ "$(cat "$REPO/notes.txt")" == "[Company Name] stays as is in [Name]" ]]; then
+    test_pass "Links, task boxes and non-Markdown files are left alone"
+else
+    test_fail "Unexpected changes: $(cat "$REPO/README.md" "$REPO/notes.txt")"
+fi
+
+if cmp -s <(printf 'Closing note for Acme "Rockets" & Co\\') "$REPO/fundraising/tail.md" \
+      && cmp -s "$PLUGIN/templates/core/mini/fundraising/plain.md" "$REPO/fundraising/plain.md" \
+      && [[ "$(tail -c 1 "$REPO/README.md" | od -An -c | tr -d ' ')" == '\n' ]]; then
+    test_pass "Final newlines are kept or left out as in the template, and files without placeholders are byte-identical"
+else
+    test_fail "Unexpected bytes: $(od -c "$REPO/fundraising/tail.md" | head -3)"
+fi
+
+# Test 3: Unresolved placeholders
+test_section "Unresolved Placeholders"
+if [[ "$OUTPUT" == *"Placeholders: 10 substituted in 4 files"* && "$OUTPUT" == *"Unresolved placeholders: 2 distinct, 2 occurrences"* \
+      && "$OUTPUT" == *"[Deadline]  1 in 1 file"* && "$OUTPUT" == *"[Month]  1 in 1 file"* ]]; then
+    test_pass "Summary counts substitutions and lists unresolved placeholders"
+else
+    test_fail "Unexpected summary: $OUTPUT"
+fi
+
+if jq -e '.substituted == 10 and .files_changed == 4
+        and .unresolved == [{placeholder: "Deadline", count: 1, files: ["README.md"]},
+                            {placeholder: "Month", count: 1, files: ["fundraising/updates/investor-update.md"]}]' \
+        "$TEST_TMP/report.json" >/dev/null 2>&1; then
+    test_pass "--placeholder-report lists every unresolved placeholder with its files"
+else
+    test_fail "Report: $(cat "$TEST_TMP/report.json" 2>/dev/null)"
+fi
+
+# Test 4: Without variables and invalid variables
+test_section "Options"
+apply_in "$TEST_TMP/plain" > /dev/null 2>&1
+if cmp -s "$PLUGIN/templates/core/mini/README.md" "$TEST_TMP/plain/README.md"; then
+    test_pass "Without --vars files are copied verbatim"
+else
+    test_fail "README.md changed without --vars"
+fi
+
+echo '{"Company Name": {"nested": true}}' > "$TEST_TMP/bad.json"
+OUTPUT=$(apply_in "$TEST_TMP/bad" --vars "$TEST_TMP/bad.json" 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 1 && "$OUTPUT" == *"Variables file must be a JSON object"* && ! -e "$TEST_TMP/bad/.claude" ]]; then
+    test_pass "An invalid variables file fails before anything is copied"
+else
+    test_fail "Unexpected result (exit $EXIT_CODE): $OUTPUT"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
@@ -0,0 +1,192 @@
+#!/usr/bin/env bash
+
+# test-trace.sh - Test suite for RCM_TRACE tracing (trace.sh) and trace-report.py
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+TRACE_REPORT="$PROJECT_ROOT/scripts/trace-report.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-trace-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Create a project with a role guide that references two documents
+setup_test_env() {
+    rm -rf "$TEST_TMP"
+    mkdir -p "$TEST_TMP/home" "$TEST_TMP/project/.claude/role-guides" "$TEST_TMP/project/docs"
+    cat > "$TEST_TMP/project/.claude/role-guides/software-engineer-guide.md" <<'EOF'
+# Software Engineer Guide
+
+## Document References
+
+- `docs/standards.md`
+- /docs/testing.md
+
+## Responsibilities
+EOF
+    echo "# Standards" > "$TEST_TMP/project/docs/standards.md"
+    echo "# Testing" > "$TEST_TMP/project/docs/testing.md"
+    echo '{"user_role": "software-engineer"}' > "$TEST_TMP/project/.claude/preferences.json"
+}
+
+# Usage: run_role_manager [args...] (runs in the test project with an isolated HOME)
+run_role_manager() {
+    (cd "$TEST_TMP/project" && HOME="$TEST_TMP/home" bash "$ROLE_MANAGER" "$@")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Structured Tracing - Test Suite                     ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Test 1: Script validation
+test_section "Script Validation"
+bash -n "$PROJECT_ROOT/scripts/trace.sh" 2>/dev/null && test_pass "trace.sh syntax valid" || test_fail "trace.sh syntax error"
+python3 -m py_compile "$TRACE_REPORT" 2>/dev/null && test_pass "trace-report.py compiles" || test_fail "trace-report.py does not compile"
+
+# Test 2: Tracing is off by default
+test_section "Tracing Disabled"
+setup_test_env
+unset RCM_TRACE
+OUTPUT_PLAIN=$(run_role_manager load-role-context --quiet 2>/dev/null)
+if [[ ! -e "$TEST_TMP/trace.jsonl" ]]; then
+    test_pass "No trace file written without RCM_TRACE"
+else
+    test_fail "Trace file written without RCM_TRACE"
+fi
+
+# Test 3: Trace file contents
+test_section "Trace Events"
+setup_test_env
+OUTPUT_TRACED=$(RCM_TRACE="$TEST_TMP/trace.jsonl" run_role_manager load-role-context --quiet 2>/dev/null)
+
+if [[ "$OUTPUT_TRACED" == "$OUTPUT_PLAIN" ]]; then
+    test_pass "Tracing does not change command output"
+else
+    test_fail "Tracing changed command output (got: $OUTPUT_TRACED)"
+fi
+
+if [[ -s "$TEST_TMP/trace.jsonl" ]] && jq -e . "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+    test_pass "Trace file contains valid JSON lines"
+else
+    test_fail "Trace file missing or not valid JSON lines"
+fi
+
+if jq -s -e 'any(.[]; .ev == "enter" and .fn == "cmd_load_role_context")' "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+    test_pass "Function entry recorded for cmd_load_role_context"
+else
+    test_fail "No entry event for cmd_load_role_context"
+fi
+
+if jq -s -e 'any(.[]; .ev == "exit" and .fn == "get_preference")' "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+    test_pass "Function exit recorded for get_preference"
+else
+    test_fail "No exit event for get_preference"
+fi
+
+if jq -s -e 'any(.[]; .ev == "exec" and .cmd == "jq" and (.stack | test("cmd_load_role_context")))' "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+    test_pass "External jq fork recorded with its call stack"
+else
+    test_fail "No exec event for jq"
+fi
+
+if jq -s -e 'any(.[]; .ev == "end")' "$TEST_TMP/trace.jsonl" >/dev/null 2>&1; then
+    test_pass "End-of-process event recorded"
+else
+    test_fail "No end event recorded"
+fi
+
+cat > "$TEST_TMP/traps.sh" <<EOF
+trap 'echo early-handler' EXIT
+source "$PROJECT_ROOT/scripts/path-config.sh"
+trap 'echo late-handler' EXIT
+exit 3
+EOF
+OUTPUT=$(RCM_TRACE="$TEST_TMP/traps.jsonl" bash "$TEST_TMP/traps.sh" 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 3 && "$OUTPUT" == "late-handler" ]] \
+        && jq -s -e 'last | .ev == "end" and .rc == 3' "$TEST_TMP/traps.jsonl" >/dev/null 2>&1 \
+        && [[ "$(RCM_TRACE="$TEST_TMP/traps2.jsonl" bash -c 'trap "echo kept" EXIT; source "$1"' _ "$PROJECT_ROOT/scripts/path-config.sh")" == "kept" ]] \
+        && jq -s -e 'last | .ev == "end"' "$TEST_TMP/traps2.jsonl" >/dev/null 2>&1; then
+    test_pass "The traced script's EXIT traps run and the end event is still recorded"
+else
+    test_fail "EXIT traps not chained (exit $EXIT_CODE): $OUTPUT"
+fi
+
+# Test 4: Report tool
+test_section "Trace Report"
+REPORT=$(python3 "$TRACE_REPORT" "$TEST_TMP/trace.jsonl" 2>&1)
+if echo "$REPORT" | grep -q "cmd_load_role_context"; then
+    test_pass "Table report lists traced functions"
+else
+    test_fail "Table report missing cmd_load_role_context"
+fi
+
+FOLDED=$(python3 "$TRACE_REPORT" --folded "$TEST_TMP/trace.jsonl" 2>&1)
+if [[ -n "$FOLDED" ]] && echo "$FOLDED" | grep -Eqv '^[^ ]+ [0-9]+$'; then
+    test_fail "Folded output has malformed lines"
+elif echo "$FOLDED" | grep -q ';exec:jq [0-9]'; then
+    test_pass "Folded output is flame-graph compatible"
+else
+    test_fail "Folded output missing exec frames"
+fi
+
+SUMMARY=$(python3 "$TRACE_REPORT" --json "$TEST_TMP/trace.jsonl" 2>&1)
+if echo "$SUMMARY" | jq -e '.forks > 0 and (.functions | map(select(.name == "get_preference" and .inclusive_us >= .exclusive_us)) | length == 1)' >/dev/null 2>&1; then
+    test_pass "JSON summary has forks and inclusive >= exclusive time"
+else
+    test_fail "JSON summary inconsistent"
+fi
+
+# Test 5: Synthetic trace aggregation
+test_section "Aggregation"
+cat > "$TEST_TMP/synthetic.jsonl" <<'EOF'
+{"ts":1000,"pid":1,"ev":"enter","fn":"outer","depth":2,"stack":"s.sh;outer"}
+{"ts":1100,"pid":1,"ev":"enter","fn":"inner","depth":3,"stack":"s.sh;outer;inner"}
+{"ts":1200,"pid":1,"ev":"exec","cmd":"jq","dur":300,"rc":0,"stack":"s.sh;outer;inner"}
+{"ts":1600,"pid":1,"ev":"exit","fn":"inner","depth":3}
+{"ts":2000,"pid":1,"ev":"exit","fn":"outer","depth":2}
+EOF
+SYNTH=$(python3 "$TRACE_REPORT" --json "$TEST_TMP/synthetic.jsonl")
+if [[ "$(echo "$SYNTH" | jq '.functions[] | select(.name == "outer") | [.inclusive_us, .exclusive_us] | join(",")' -r)" == "1000,500" ]]; then
+    test_pass "Inclusive/exclusive time for outer frame"
+else
+    test_fail "Wrong outer timings: $(echo "$SYNTH" | jq -c '.functions[] | select(.name == "outer")')"
+fi
+if [[ "$(echo "$SYNTH" | jq '.functions[] | select(.name == "inner") | [.exclusive_us, .forks] | join(",")' -r)" == "200,1" ]]; then
+    test_pass "Fork attributed to calling function"
+else
+    test_fail "Wrong inner timings: $(echo "$SYNTH" | jq -c '.functions[] | select(.name == "inner")')"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
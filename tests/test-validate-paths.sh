@@ -0,0 +1,158 @@
+#!/usr/bin/env bash
+
+# test-validate-paths.sh - Test suite for tree-wide paths.json schema validation
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+VALIDATOR="$PROJECT_ROOT/scripts/validate-paths.py"
+PATH_CONFIG="$PROJECT_ROOT/scripts/path-config.sh"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-validate-paths-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+# Usage: report_query <report> <python expression over r>
+report_query() {
+    python3 -c 'import json, sys; r = json.load(open(sys.argv[1])); print(eval(sys.argv[2]))' "$1" "$2"
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  paths.json Tree Validation - Test Suite             ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+# Fixture tree: root manifest switches the config dir name to .myorg
+ROOT="$TEST_TMP/org"
+mkdir -p "$ROOT/.claude" "$ROOT/good/.claude" "$ROOT/bad/.claude" "$ROOT/custom/.myorg" \
+    "$ROOT/deps/node_modules/pkg/.claude" "$ROOT/inside/.myorg/nested/.claude" "$ROOT/plain/src"
+echo '{"claude_dir_name": ".myorg", "version": "1.0.0"}' > "$ROOT/.claude/paths.json"
+echo '{"role_guides_dir": "guides", "description": "Team config"}' > "$ROOT/good/.claude/paths.json"
+cat > "$ROOT/bad/.claude/paths.json" <<'JSON'
+{"claude_dir_name": "../escape", "role_guides_dir": "a/b", "version": "one", "extra": true,
+ "additional_config_dirs": ["x", "x"]}
+JSON
+echo '{"role_guides_dir": "roles"}' > "$ROOT/custom/.myorg/paths.json"
+echo '{}' > "$ROOT/deps/node_modules/pkg/.claude/paths.json"
+echo '{}' > "$ROOT/inside/.myorg/nested/.claude/paths.json"
+
+# Test 1: Discovery and pruning
+test_section "Discovery"
+python3 "$VALIDATOR" "$ROOT" --output "$TEST_TMP/report.json" 2>/dev/null
+RC=$?
+[[ $RC -eq 1 ]] && test_pass "Exit code 1 when a manifest is invalid" || test_fail "Exit code $RC"
+
+MANIFESTS=$(report_query "$TEST_TMP/report.json" "' '.join(d['manifest'] for d in r['directories'])")
+[[ "$MANIFESTS" == ".claude/paths.json bad/.claude/paths.json custom/.myorg/paths.json good/.claude/paths.json" ]] \
+    && test_pass "Finds manifests in .claude and the configured directory name" \
+    || test_fail "Manifests: $MANIFESTS"
+
+[[ "$MANIFESTS" != *node_modules* && "$MANIFESTS" != *nested* ]] \
+    && test_pass "Does not descend into node_modules or configuration directories" \
+    || test_fail "Pruning: $MANIFESTS"
+
+# Test 2: Schema errors
+test_section "Schema Errors"
+ERRORS=$(report_query "$TEST_TMP/report.json" "sorted(set(e['path'] for d in r['directories'] if d['manifest'].startswith('bad') for e in d['errors']))")
+[[ "$ERRORS" == "['/additional_config_dirs', '/claude_dir_name', '/extra', '/role_guides_dir', '/version']" ]] \
+    && test_pass "Reports pattern, traversal, uniqueness and unknown-property errors" \
+    || test_fail "Errors: $ERRORS"
+
+MESSAGE=$(report_query "$TEST_TMP/report.json" "[e['message'] for d in r['directories'] for e in d['errors'] if e['path'] == '/claude_dir_name'][-1]")
+[[ "$MESSAGE" == *"path traversal"* ]] && test_pass "Negated patterns report their schema description" || test_fail "Message: $MESSAGE"
+
+echo '{"claude_dir_name": ' > "$ROOT/good/.claude/paths.json"
+python3 "$VALIDATOR" "$ROOT" --invalid-only --output "$TEST_TMP/broken.json" 2>/dev/null
+MESSAGE=$(report_query "$TEST_TMP/broken.json" "[e['message'] for d in r['directories'] if d['directory'] == 'good' for e in d['errors']]")
+[[ "$MESSAGE" == *"invalid JSON"* ]] && test_pass "Malformed JSON is reported per manifest" || test_fail "Malformed: $MESSAGE"
+echo '{"role_guides_dir": "guides", "description": "Team config"}' > "$ROOT/good/.claude/paths.json"
+
+# Test 3: Effective values
+test_section "Effective Values"
+VALUES=$(report_query "$TEST_TMP/report.json" "[(d['effective']['claude_dir_name'], d['effective']['role_guides_dir'], d['effective']['manifest']) for d in r['directories'] if d['directory'] in ('good', 'custom')]")
+[[ "$VALUES" == "[('.myorg', 'role-guides', '.claude/paths.json'), ('.claude', 'guides', 'good/.claude/paths.json')]" ]] \
+    && test_pass "Effective values follow the nearest .claude/paths.json" \
+    || test_fail "Effective: $VALUES"
+
+WARNINGS=$(report_query "$TEST_TMP/report.json" "[d['directory'] for d in r['directories'] if d['warnings']]")
+[[ "$WARNINGS" == "['custom']" ]] && test_pass "Warns about manifests path-config.sh never reads" || test_fail "Warnings: $WARNINGS"
+
+RCM_ROLE_GUIDES_DIR=env-guides python3 "$VALIDATOR" "$ROOT" --output "$TEST_TMP/env.json" 2>/dev/null
+VALUES=$(report_query "$TEST_TMP/env.json" "{(d['effective']['role_guides_dir'], d['effective']['source']['role_guides_dir']) for d in r['directories']}")
+[[ "$VALUES" == "{('env-guides', 'env')}" ]] && test_pass "Environment overrides win" || test_fail "Env: $VALUES"
+
+# Like find_paths_manifest, the lookup continues above the audited root, then tries ~/.claude
+HOME="$TEST_TMP/home" python3 "$VALIDATOR" "$ROOT/custom" --claude-dir-name .myorg --output "$TEST_TMP/sub.json" 2>/dev/null
+VALUES=$(report_query "$TEST_TMP/sub.json" "[(d['effective']['claude_dir_name'], d['effective']['manifest']) for d in r['directories']]")
+SHELL_MANIFEST=$(HOME="$TEST_TMP/home" bash -c 'source "$1"; find_paths_manifest "$2"' _ "$PATH_CONFIG" "$ROOT/custom")
+[[ "$VALUES" == "[('.myorg', '$SHELL_MANIFEST')]" ]] \
+    && test_pass "Manifests above the audited root apply, as in path-config.sh" || test_fail "Above root: $VALUES (shell: $SHELL_MANIFEST)"
+
+mkdir -p "$TEST_TMP/home/.claude" "$TEST_TMP/lone/repo/.myorg"
+echo '{"role_guides_dir": "home-guides"}' > "$TEST_TMP/home/.claude/paths.json"
+echo '{}' > "$TEST_TMP/lone/repo/.myorg/paths.json"
+HOME="$TEST_TMP/home" python3 "$VALIDATOR" "$TEST_TMP/lone" --claude-dir-name .myorg --output "$TEST_TMP/home.json" 2>/dev/null
+VALUES=$(report_query "$TEST_TMP/home.json" "[(d['effective']['role_guides_dir'], d['effective']['manifest']) for d in r['directories']]")
+[[ "$VALUES" == "[('home-guides', '$TEST_TMP/home/.claude/paths.json')]" ]] \
+    && test_pass "~/.claude/paths.json is the last manifest tried" || test_fail "Global manifest: $VALUES"
+
+# Test 4: Parallel validation matches serial
+test_section "Parallel Validation"
+BIG="$TEST_TMP/many"
+python3 - "$BIG" <<'PYEOF'
+import json, os, sys
+for i in range(200):
+    d = os.path.join(sys.argv[1], f'team-{i % 10}', f'repo-{i}', '.claude')
+    os.makedirs(d)
+    with open(os.path.join(d, 'paths.json'), 'w') as f:
+        json.dump({'role_guides_dir': 'bad dir' if i % 7 == 0 else 'guides'}, f)
+PYEOF
+python3 "$VALIDATOR" "$BIG" --jobs 1 --output "$TEST_TMP/serial.json" 2>/dev/null
+python3 "$VALIDATOR" "$BIG" --jobs 4 --output "$TEST_TMP/parallel.json" 2>/dev/null
+if cmp -s "$TEST_TMP/serial.json" "$TEST_TMP/parallel.json"; then
+    test_pass "Parallel report is identical to the serial one"
+else
+    test_fail "Parallel and serial reports differ"
+fi
+SUMMARY=$(report_query "$TEST_TMP/parallel.json" "(r['summary']['manifests'], r['summary']['invalid'])")
+[[ "$SUMMARY" == "(200, 29)" ]] && test_pass "Summary counts manifests and invalid files" || test_fail "Summary: $SUMMARY"
+
+# Test 5: CLI
+test_section "CLI"
+python3 "$VALIDATOR" "$TEST_TMP/missing" >/dev/null 2>&1
+[[ $? -eq 2 ]] && test_pass "Exit code 2 for a missing root" || test_fail "Missing root not rejected"
+
+rm -rf "$ROOT/bad"
+OUTPUT=$(bash "$PATH_CONFIG" audit "$ROOT" 2>/dev/null)
+RC=$?
+[[ $RC -eq 0 && "$OUTPUT" == *'"invalid": 0'* ]] && test_pass "path-config.sh audit delegates to the validator" || test_fail "audit: rc=$RC"
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi
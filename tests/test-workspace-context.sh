@@ -0,0 +1,205 @@
+#!/usr/bin/env bash
+
+# test-workspace-context.sh - Test suite for the async multi-workspace loader
+
+set -o pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+ROLE_MANAGER="$PROJECT_ROOT/scripts/role-manager.sh"
+LOADER="$PROJECT_ROOT/scripts/workspace_context.py"
+TESTS_PASSED=0
+TESTS_FAILED=0
+TEST_TMP="/tmp/test-workspace-context-$$"
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+NC='\033[0m'
+
+test_pass() { echo -e "${GREEN}✓${NC} $1"; ((TESTS_PASSED++)); return 0; }
+test_fail() { echo -e "${RED}✗${NC} $1"; ((TESTS_FAILED++)); return 0; }
+test_section() { echo ""; echo "═══ $1 ═══"; }
+
+cleanup() {
+    rm -rf "$TEST_TMP"
+}
+trap cleanup EXIT
+
+if ! command -v python3 &>/dev/null; then
+    echo "python3 not found; skipping"
+    exit 0
+fi
+
+# Usage: make_workspace <name> <role> <doc refs...>
+# Creates $TEST_TMP/<name> with a role guide referencing the given documents
+make_workspace() {
+    local ws="$TEST_TMP/$1"
+    local role="$2"
+    shift 2
+    mkdir -p "$ws/.claude/role-guides" "$ws/docs"
+    echo "{\"user_role\": \"$role\"}" > "$ws/.claude/preferences.json"
+    {
+        printf '# %s guide\n\n## Document References\n\n' "$role"
+        local ref
+        for ref in "$@"; do
+            printf -- '- %s\n' "$ref"
+        done
+        printf '\n## Responsibilities\n'
+    } > "$ws/.claude/role-guides/$role-guide.md"
+}
+
+# Usage: run_loader [args...] (isolated HOME and pack cache)
+run_loader() {
+    HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/packs" python3 "$LOADER" "$@"
+}
+
+# Usage: run_api <python code> (workspace_context importable, isolated HOME)
+run_api() {
+    (cd "$PROJECT_ROOT/scripts" && HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/packs" \
+        python3 -c "$1")
+}
+
+echo "╔═══════════════════════════════════════════════════════╗"
+echo "║  Workspace Context Loader - Test Suite               ║"
+echo "╚═══════════════════════════════════════════════════════╝"
+
+mkdir -p "$TEST_TMP/home/.claude/docs" "$TEST_TMP/plain"
+echo "# Shared policy" > "$TEST_TMP/home/.claude/docs/policy.md"
+make_workspace api software-engineer docs/api.md docs/policy.md docs/absent.md
+make_workspace web frontend-engineer docs/web.md docs/policy.md docs/empty.md
+echo "# API" > "$TEST_TMP/api/docs/api.md"
+echo "# Web" > "$TEST_TMP/web/docs/web.md"
+: > "$TEST_TMP/web/docs/empty.md"
+
+# Test 1: Structured results
+test_section "Structured Results"
+JSON=$(run_loader --json "$TEST_TMP/api" "$TEST_TMP/web" "$TEST_TMP/plain" 2>&1)
+EXIT_CODE=$?
+SUMMARY=$(python3 -c '
+import json, sys
+for r in json.load(sys.stdin):
+    print(r["role"], ",".join(d["ref"] for d in r["documents"]), ",".join(r["missing"]), r["bytes"] > 0)
+' <<< "$JSON" 2>&1)
+EXPECTED="software-engineer docs/api.md,docs/policy.md docs/absent.md True
+frontend-engineer docs/web.md,docs/policy.md  True
+None   False"
+if [[ $EXIT_CODE -eq 0 && "$SUMMARY" == "$EXPECTED" ]]; then
+    test_pass "Roles, documents and missing references per workspace, in input order"
+else
+    test_fail "Unexpected results (exit $EXIT_CODE): $SUMMARY"
+fi
+
+for ws in api web; do
+    EXPECTED_COUNT=$(cd "$TEST_TMP/$ws" && HOME="$TEST_TMP/home" RCM_PACK_CACHE_DIR="$TEST_TMP/packs" \
+        bash "$ROLE_MANAGER" load-role-context 2>/dev/null | grep -c '^### Document:')
+    COUNT=$(run_loader --json "$TEST_TMP/$ws" | python3 -c 'import json,sys; print(len(json.load(sys.stdin)[0]["documents"]))')
+    if [[ "$COUNT" == "$EXPECTED_COUNT" ]]; then
+        test_pass "$ws: document count matches load-role-context ($COUNT)"
+    else
+        test_fail "$ws: loader found $COUNT documents, load-role-context $EXPECTED_COUNT"
+    fi
+done
+
+# Test 2: Packed store reuse (load-role-context above wrote the packs)
+test_section "Packed Store"
+SOURCE=$(run_loader --json "$TEST_TMP/api" | python3 -c 'import json,sys; r=json.load(sys.stdin)[0]; print(r["source"], [d["ref"] for d in r["documents"]], r["missing"])')
+if [[ "$SOURCE" == "pack ['docs/api.md', 'docs/policy.md'] ['docs/absent.md']" ]]; then
+    test_pass "A fresh pack is used with the same results"
+else
+    test_fail "Pack not used or results differ: $SOURCE"
+fi
+
+OUTPUT=$(run_api "
+import asyncio
+import workspace_context as wc
+reads = []
+original = wc._read_bytes
+wc._read_bytes = lambda path: reads.append(path) or original(path)
+ctx = asyncio.run(wc.load_contexts(['$TEST_TMP/api']))[0]
+print(ctx.source, ctx.bytes, reads)
+" 2>&1)
+GUIDE_BYTES=$(wc -c < "$TEST_TMP/api/.claude/role-guides/software-engineer-guide.md")
+DOC_BYTES=$(cat "$TEST_TMP/api/docs/api.md" "$TEST_TMP/home/.claude/docs/policy.md" | wc -c)
+if [[ "$OUTPUT" == "pack $((GUIDE_BYTES + DOC_BYTES)) []" ]]; then
+    test_pass "The role guide is taken from the pack, not re-read"
+else
+    test_fail "Pack load read files: $OUTPUT"
+fi
+
+sleep 0.01
+echo "# API v2" > "$TEST_TMP/api/docs/api.md"
+SOURCE=$(run_loader --json --content "$TEST_TMP/api" | python3 -c 'import json,sys; r=json.load(sys.stdin)[0]; print(r["source"], r["documents"][0]["content"].strip())')
+[[ "$SOURCE" == "files # API v2" ]] && test_pass "A stale pack falls back to reading files" || test_fail "Stale pack served: $SOURCE"
+
+# Test 3: Path configuration (resolved by path-config.sh)
+test_section "Path Configuration"
+make_workspace custom qa-engineer docs/qa.md
+mv "$TEST_TMP/custom/.claude/role-guides" "$TEST_TMP/custom/.claude/guides"
+echo '{"role_guides_dir": "guides"}' > "$TEST_TMP/custom/.claude/paths.json"
+echo "# QA" > "$TEST_TMP/custom/docs/qa.md"
+SUMMARY=$(run_loader --json "$TEST_TMP/custom" | python3 -c 'import json,sys; r=json.load(sys.stdin)[0]; print(r["role_guide"], [d["ref"] for d in r["documents"]])' 2>&1)
+if [[ "$SUMMARY" == "$TEST_TMP/custom/.claude/guides/qa-engineer-guide.md ['docs/qa.md']" ]]; then
+    test_pass "role_guides_dir from the project paths.json"
+else
+    test_fail "paths.json ignored: $SUMMARY"
+fi
+SUMMARY=$(RCM_ROLE_GUIDES_DIR=role-guides run_loader --json "$TEST_TMP/custom" | python3 -c 'import json,sys; r=json.load(sys.stdin)[0]; print(r["role"], r["error"])' 2>&1)
+[[ "$SUMMARY" == "qa-engineer role guide not found" ]] && test_pass "RCM_ROLE_GUIDES_DIR takes precedence over paths.json" || test_fail "Environment override ignored: $SUMMARY"
+
+# Test 4: Shared, bounded read pool
+test_section "Read Pool"
+OUTPUT=$(run_api "
+import asyncio, collections, threading, time
+import workspace_context as wc
+reads = collections.Counter()
+active = [0, 0]
+lock = threading.Lock()
+original = wc._read_bytes
+def tracked(path):
+    with lock:
+        reads[path] += 1
+        active[0] += 1
+        active[1] = max(active)
+    time.sleep(0.02)
+    try:
+        return original(path)
+    finally:
+        with lock:
+            active[0] -= 1
+wc._read_bytes = tracked
+workspaces = ['$TEST_TMP/api', '$TEST_TMP/web'] * 3
+results = asyncio.run(wc.load_contexts(workspaces, max_reads=2, env={'HOME': '$TEST_TMP/home', 'RCM_PACK_CACHE_DIR': '/nonexistent'}))
+print(reads['$TEST_TMP/home/.claude/docs/policy.md'], active[1], len(results))
+" 2>&1)
+read -r POLICY_READS PEAK COUNT <<< "$OUTPUT"
+[[ "$POLICY_READS" == "1" ]] && test_pass "A document shared by workspaces is read once" || test_fail "Shared document read $POLICY_READS times ($OUTPUT)"
+[[ "$PEAK" -le 2 && "$PEAK" -ge 1 ]] && test_pass "Concurrent reads stay within --max-reads ($PEAK)" || test_fail "Peak concurrency $PEAK exceeds 2"
+[[ "$COUNT" == "6" ]] && test_pass "Duplicate workspaces each get a result" || test_fail "Got $COUNT results for 6 workspaces"
+
+# Test 5: Errors
+test_section "Errors"
+OUTPUT=$(run_loader "$TEST_TMP/api" "$TEST_TMP/nonexistent" 2>&1)
+EXIT_CODE=$?
+if [[ $EXIT_CODE -eq 1 && "$OUTPUT" == *"✓ $TEST_TMP/api: software-engineer"* && "$OUTPUT" == *"✗ $TEST_TMP/nonexistent"* ]]; then
+    test_pass "A failing workspace is reported without affecting the others"
+else
+    test_fail "Unexpected error handling (exit $EXIT_CODE): $OUTPUT"
+fi
+
+# Summary
+echo ""
+echo "═══════════════════════════════════════════════════════"
+echo "TEST SUMMARY"
+echo "═══════════════════════════════════════════════════════"
+echo -e "${GREEN}Passed: $TESTS_PASSED${NC}"
+echo -e "${RED}Failed: $TESTS_FAILED${NC}"
+echo "Total:  $((TESTS_PASSED + TESTS_FAILED))"
+echo "═══════════════════════════════════════════════════════"
+
+if [[ $TESTS_FAILED -eq 0 ]]; then
+    echo -e "${GREEN}✓ All tests passed!${NC}"
+    exit 0
+else
+    echo -e "${RED}✗ Some tests failed${NC}"
+    exit 1
+fi